@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from auth import apply_page_visibility_filter
+import aquecimento
 
 st.set_page_config(
     page_title="Central de Dashboards",
@@ -9,6 +10,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Aquece os caches dos dashboards em segundo plano (uma thread por processo)
+aquecimento.iniciar()
+
 
 # --- Autenticação simples ---
 try:
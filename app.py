@@ -1,46 +1,25 @@
 import streamlit as st
 import os
-import requests
-from pathlib import Path
+import time
 
-def baixar_arquivo_google_drive(id_arquivo, destino):
+import download_dados
+
+def acompanhar_download(estado):
     """
-    Baixa um arquivo do Google Drive usando o ID do arquivo.
+    Mostra a barra de progresso de um download em andamento (thread de
+    download_dados) até ele terminar. Devolve True se o arquivo ficou pronto.
     """
-    # Cria o diretório se não existir
-    os.makedirs(os.path.dirname(destino), exist_ok=True)
-    
-    # URL para download direto do Google Drive
-    url = f"https://drive.google.com/uc?export=download&id={id_arquivo}"
-    
-    # Faz o download do arquivo
-    try:
-        r = requests.get(url, stream=True)
-        r.raise_for_status()  # Verifica se houve erros na requisição
-        
-        # Mostra barra de progresso
-        progress_text = "Baixando arquivo de dados..."
-        progress_bar = st.progress(0, text=progress_text)
-        
-        # Calcula o tamanho total do arquivo
-        total_size = int(r.headers.get('content-length', 0))
-        bytes_downloaded = 0
-        
-        with open(destino, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    bytes_downloaded += len(chunk)
-                    # Atualiza a barra de progresso
-                    if total_size > 0:
-                        progress = min(int((bytes_downloaded / total_size) * 100), 100)
-                        progress_bar.progress(progress, text=f"{progress_text} {progress}%")
-        
-        progress_bar.empty()
-        return True
-    except Exception as e:
-        st.error(f"Erro ao baixar o arquivo: {str(e)}")
-        return False
+    progress_text = "Baixando arquivo de dados..."
+    progress_bar = st.progress(0, text=progress_text)
+    while estado.rodando:
+        if estado.fracao is not None:
+            progress = int(estado.fracao * 100)
+            progress_bar.progress(progress, text=f"{progress_text} {progress}%")
+        time.sleep(0.2)
+    progress_bar.empty()
+    if estado.erro:
+        st.error(f"Erro ao baixar o arquivo: {estado.erro}")
+    return estado.erro is None
 
 # Configuração da página
 st.set_page_config(page_title="Dashboard FeeBased", layout="wide")
@@ -49,10 +28,18 @@ st.set_page_config(page_title="Dashboard FeeBased", layout="wide")
 caminho_dados = "data/receitas.xlsx"  # Ajuste a extensão se for diferente
 id_arquivo_google_drive = "1Z9_D08uNfdSajxS1guU-9McnjfIUWgxT"
 
+sha256_esperado = os.environ.get("DBV_RECEITAS_SHA256") or None
+
+# Download/revalidação em segundo plano (download_dados.py): com uma cópia
+# local a página segue na hora com ela, e a nova versão (se houver) substitui
+# o arquivo atomicamente quando terminar. Sem cópia, espera o primeiro download.
+estado_download = download_dados.iniciar(
+    download_dados.url_google_drive(id_arquivo_google_drive), caminho_dados, sha256=sha256_esperado,
+)
 if not os.path.exists(caminho_dados):
     with st.spinner('Preparando os dados...'):
-        sucesso = baixar_arquivo_google_drive(id_arquivo_google_drive, caminho_dados)
-        if not sucesso:
+        sucesso = acompanhar_download(estado_download)
+        if not sucesso or not os.path.exists(caminho_dados):
             st.error("Não foi possível baixar o arquivo de dados. Por favor, verifique sua conexão.")
             st.stop()
 
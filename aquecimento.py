@@ -0,0 +1,210 @@
+# aquecimento.py
+# Aquecimento dos caches em segundo plano, na subida do servidor e a cada
+# nova geração dos bancos (ETL).
+#
+# Sem isso, a primeira TV/usuário que abre o Salão depois de um restart ou de
+# uma atualização dos .db paga a carga fria inteira: leitura do SQLite,
+# tratamento, agregados mensais, descoberta da tabela de NPS, índice de metas
+# e imports pesados (plotly). Aqui uma thread daemon por processo (worker):
+#   1. aquece tudo assim que é iniciada;
+#   2. a cada DBV_AQUECIMENTO_S segundos (padrão 30) compara a geração
+#      (mtime, tamanho) dos bancos e, se algum mudou, aquece de novo.
+# Os loaders pedem sempre a geração atual do arquivo: logo depois de o ETL
+# regravar um .db, a sessão que chegar antes de esta thread terminar monta a
+# nova geração ela mesma (carga fria, em paralelo com o aquecimento). O
+# aquecimento encurta essa janela para o intervalo de verificação; não serve
+# a geração anterior enquanto a nova carrega.
+#
+# As entradas aquecidas por geração (NPS, transferências) não têm TTL no
+# cache de loaders: só saem quando a geração muda ou pelo orçamento de
+# memória, então não esfriam entre duas gerações.
+#
+# Uso (no topo do Home.py e das páginas servidas nas TVs):
+#     aquecimento.iniciar()       # idempotente: uma thread por processo
+#
+# Variável de ambiente:
+#     DBV_AQUECIMENTO_S   intervalo de verificação em segundos; "off" desliga
+#
+# Cada aquecimento é registrado como uma execução "aquecimento" no log de
+# instrumentacao.py (DBV_PERF_LOG), com o tempo de cada etapa.
+#
+# Não importa Streamlit: roda fora do contexto de sessão.
+
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from instrumentacao import etapa, finalizar_execucao, iniciar_execucao
+
+INTERVALO_ENV_VAR = "DBV_AQUECIMENTO_S"
+INTERVALO_PADRAO_S = 30.0
+_DESLIGADO = ("off", "0", "false", "nao", "não")
+
+# Última rodada (lido pelo painel de desempenho/benchmarks)
+estado: Dict[str, Any] = {"rodadas": 0, "ultima": None, "segundos": None, "erros": []}
+
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_parar = threading.Event()
+
+
+def intervalo_configurado() -> Optional[float]:
+    """Intervalo de verificação em segundos (None se desligado)."""
+    valor = os.environ.get(INTERVALO_ENV_VAR, "").strip()
+    if valor.lower() in _DESLIGADO:
+        return None
+    try:
+        return max(1.0, float(valor)) if valor else INTERVALO_PADRAO_S
+    except ValueError:
+        return INTERVALO_PADRAO_S
+
+
+# =============================================================================
+# ETAPAS
+# =============================================================================
+
+def _aquecer_imports() -> None:
+    # O 1º import do plotly custa centenas de ms no 1º rerun
+    import plotly.graph_objects  # noqa: F401
+
+
+def _aquecer_positivador() -> None:
+    from dados_positivador import metadados_positivador, obter_dados_positivador
+
+    meta = metadados_positivador()
+    dados = obter_dados_positivador()
+    if dados is None:
+        return
+    dados.ano_corrente
+    dados.mensal_assessor_corrente
+    dados.mensal
+    for ano in sorted({int(m[:4]) for m in (meta.meses if meta else ())}):
+        dados.auc_inicial_ano(ano)
+
+
+def _aquecer_objetivos() -> None:
+    from dados_objetivos import obter_indice_objetivos
+
+    obter_indice_objetivos().curva_rumo_1bi()
+
+
+def _aquecer_nps() -> None:
+    from dados_nps import obter_dados_nps
+
+    obter_dados_nps()
+
+
+def _aquecer_transferencias() -> None:
+    from dados_transferencias import obter_fluxo_transferencias
+
+    obter_fluxo_transferencias()
+
+
+def _aquecer_habilitacoes() -> None:
+    from dados_habilitacoes import obter_painel_habilitacoes
+
+    obter_painel_habilitacoes().atingimento_e_ritmo()
+
+
+ETAPAS: List[Tuple[str, Callable[[], None]]] = [
+    ("imports", _aquecer_imports),
+    ("positivador", _aquecer_positivador),
+    ("objetivos", _aquecer_objetivos),
+    ("nps", _aquecer_nps),
+    ("transferencias", _aquecer_transferencias),
+    ("habilitacoes", _aquecer_habilitacoes),
+]
+
+
+def geracoes() -> Dict[str, Optional[Tuple[int, int]]]:
+    """Geração atual de cada banco aquecido (None se o arquivo não existe)."""
+    from dados_habilitacoes import localizar_db_habilitacoes
+    from dados_nps import localizar_db_nps
+    from dados_objetivos import localizar_db_objetivos
+    from dados_positivador import localizar_db_positivador
+    from dados_transferencias import localizar_db_transferencias
+    from db_utils import db_generation
+
+    caminhos: Dict[str, Optional[Path]] = {
+        "positivador": localizar_db_positivador(),
+        "objetivos": localizar_db_objetivos(),
+        "nps": localizar_db_nps(),
+        "transferencias": localizar_db_transferencias(),
+        "habilitacoes": localizar_db_habilitacoes(),
+    }
+    out: Dict[str, Optional[Tuple[int, int]]] = {}
+    for nome, caminho in caminhos.items():
+        try:
+            out[nome] = db_generation(caminho) if caminho else None
+        except OSError:
+            out[nome] = None  # arquivo sendo trocado pelo ETL: tenta na próxima
+    return out
+
+
+def aquecer() -> Dict[str, float]:
+    """Roda todas as etapas (erros de uma não impedem as outras). Devolve segundos por etapa."""
+    tempos: Dict[str, float] = {}
+    erros: List[str] = []
+    iniciar_execucao("aquecimento")
+    inicio_total = time.perf_counter()
+    for nome, func in ETAPAS:
+        inicio = time.perf_counter()
+        with etapa(f"aquecimento: {nome}"):
+            try:
+                func()
+            except Exception as e:
+                erros.append(f"{nome}: {type(e).__name__}: {e}")
+        tempos[nome] = round(time.perf_counter() - inicio, 6)
+    finalizar_execucao()
+
+    estado.update(
+        rodadas=estado["rodadas"] + 1,
+        ultima=datetime.now().isoformat(timespec="seconds"),
+        segundos=round(time.perf_counter() - inicio_total, 6),
+        erros=erros,
+    )
+    return tempos
+
+
+# =============================================================================
+# THREAD
+# =============================================================================
+
+def _laco(intervalo: float) -> None:
+    vistas = None
+    while not _parar.is_set():
+        atuais = geracoes()
+        if atuais != vistas:
+            aquecer()
+            vistas = atuais
+        _parar.wait(intervalo)
+
+
+def iniciar() -> bool:
+    """
+    Sobe a thread de aquecimento do processo, se ainda não existir e se não
+    estiver desligada. Devolve True se a thread está rodando.
+    """
+    global _thread
+    intervalo = intervalo_configurado()
+    if intervalo is None:
+        return False
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _parar.clear()
+            _thread = threading.Thread(target=_laco, args=(intervalo,), name="dbv-aquecimento", daemon=True)
+            _thread.start()
+    return True
+
+
+def parar(timeout: Optional[float] = None) -> None:
+    """Encerra a thread (usado por benchmarks/testes)."""
+    global _thread
+    _parar.set()
+    with _lock:
+        if _thread is not None:
+            _thread.join(timeout)
+            _thread = None
@@ -2,11 +2,14 @@ import json
 import streamlit as st
 import streamlit.components.v1 as components
 
+from db_utils import RevenueScope
+
 _PAGE_DISPLAY_NAMES = {
     'Home.py': 'Home',
     'Dashboard_Áreas.py': 'Dashboard Áreas',
     'Dashboard_Captação.py': 'Dashboard Captação',
     'Dashboard_FeeBased.py': 'Dashboard FeeBased',
+    'Dashboard_Habilitações.py': 'Dashboard Habilitações',
     'Dashboard_Receitas.py': 'Dashboard Receitas',
     'Dashboard_Visão_Assessor.py': 'Dashboard Visão Assessor',
 }
@@ -48,6 +51,16 @@ def user_has_access_to_linha(linha: str) -> bool:
         return True  # nenhum filtro → acesso total (usuário mestre)
     return linha in linhas
 
+def user_revenue_scope() -> RevenueScope:
+    """
+    Escopo de linhas de receita da sessão, para leituras com filtro no SQL
+    (db_utils.read_sql_scoped): o head só busca as próprias linhas. Sessão
+    sem login não vê nenhuma linha (sem 'linhas_permitidas' seria acesso total).
+    """
+    if not st.session_state.get('autenticado'):
+        return RevenueScope(())
+    return RevenueScope.from_permissions(st.session_state.get('linhas_permitidas'))
+
 def is_head_user() -> bool:
     """Indica se o usuário logado é um head (possui linhas restritas)."""
     linhas = st.session_state.get('linhas_permitidas')
@@ -0,0 +1,6 @@
+# benchmarks/
+# Suíte de benchmarks dos dashboards DBV Capital com bases sintéticas.
+#
+#     python -m benchmarks.executar --escalas 1 10 100
+#
+# Ver benchmarks/executar.py para as opções (comparação com execução anterior).
@@ -0,0 +1,297 @@
+# benchmarks/carga.py
+# Teste de carga dos dashboards: N sessões simultâneas (TVs/usuários) em
+# 1 processo vs. N processos (modo deploy/servir.py), sobre as bases
+# sintéticas (benchmarks/dados_sinteticos.py).
+#
+# Cada sessão é um AppTest (streamlit.testing) rodando em uma thread própria,
+# como uma sessão real dentro de um worker: faz o login no Home.py (usuário
+# mestre de teste, com secrets fixos no processo) e depois roda a página do Salão
+# `--rodadas` vezes. As sessões são divididas entre os processos; em cada
+# processo o cache (st.cache_data, handles por geração) é aquecido antes de
+# começar a medir.
+#
+# Uso:
+#     python -m benchmarks.carga --sessoes 8 --processos 1 4
+#     python -m benchmarks.carga --sessoes 16 --rodadas 5 --escala 10
+#     DBV_DATA_DIR=/tmp/bases python -m benchmarks.carga --sem-gerar
+#
+# Para cada configuração imprime a vazão (reruns/s e por núcleo), a latência
+# p50/p95 dos reruns do Salão e do login, e por sessão o pico de memória
+# (RSS) e o tempo de CPU. Memória e CPU são medidas por processo
+# (getrusage) e divididas pelas sessões dele: o pico é o acréscimo sobre o
+# processo já aquecido. Ganho real de N processos exige núcleos livres: em
+# máquina de 1 núcleo N processos não rendem mais que 1.
+#
+# Os números são só em processo: as sessões AppTest chamam o script direto
+# (com ast.parse, Runtime e st.secrets ajustados abaixo), sem HTTP/websocket,
+# sem o Caddy e sem a sessão fixa do deploy/servir.py. Medem a vazão dos
+# reruns com N processos; o custo do proxy e do protocolo não entra.
+
+import argparse
+import ast
+import json
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+
+PAGINA_HOME = RAIZ / "Home.py"
+PAGINA_SALAO = RAIZ / "pages" / "Dashboard_Salão_Atualizado.py"
+
+# Credenciais só do teste (o AppTest não lê .streamlit/secrets.toml)
+USUARIO_CARGA = "carga"
+SENHA_CARGA = "carga"
+
+
+# =============================================================================
+# WORKER (UM PROCESSO)
+# =============================================================================
+
+def _serializar_ast_parse() -> None:
+    """
+    O AppTest recompila a página a cada rerun (o servidor compila uma vez) e,
+    no CPython 3.11, ast.parse concorrente em threads pode falhar com
+    "AST constructor recursion depth mismatch". Só o parse é serializado.
+    """
+    original = ast.parse
+    lock = threading.Lock()
+
+    def parse(*args, **kwargs):
+        with lock:
+            return original(*args, **kwargs)
+
+    ast.parse = parse
+
+
+def _compartilhar_runtime_e_secrets() -> None:
+    """
+    O AppTest instala um Runtime falso (Runtime._instance) e os secrets em
+    variáveis globais no início de cada run e os apaga no fim: com várias
+    sessões em threads, o fim de uma run derrubava a outra ("Runtime hasn't
+    been created!"). Aqui o último runtime criado continua valendo e os
+    secrets de teste ficam fixos no processo.
+    """
+    import streamlit as st
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.secrets import Secrets
+
+    ultimo: List[Runtime] = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            ultimo[:] = [cls._instance]
+            return cls._instance
+        if ultimo:
+            return ultimo[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    def exists(cls):
+        return cls._instance is not None or bool(ultimo)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+    secrets = Secrets()
+    secrets._secrets = {"auth": {"master_user": USUARIO_CARGA, "master_password": SENHA_CARGA}}
+    st.secrets = secrets
+
+
+def _rss_pico_mb() -> float:
+    """Pico de RSS do processo (ru_maxrss é KB no Linux e bytes no macOS)."""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _cpu_s() -> float:
+    uso = resource.getrusage(resource.RUSAGE_SELF)
+    return uso.ru_utime + uso.ru_stime
+
+
+def _login(tempos: List[float], erros: List[str]) -> None:
+    """Login pelo formulário do Home.py (como um usuário abrindo o app)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(PAGINA_HOME), default_timeout=600)
+    inicio = time.perf_counter()
+    at.run()
+    at.text_input(key="usuario_login").input(USUARIO_CARGA)
+    at.text_input(key="senha_login").input(SENHA_CARGA)
+    at.button(key="btn_login").click().run()
+    tempos.append(time.perf_counter() - inicio)
+    erros.extend(str(e.value) for e in at.exception)
+    if not at.session_state["autenticado"]:
+        erros.append("login não autenticou a sessão")
+
+
+def _rodar_sessao(rodadas: int, tempos: Dict[str, List[float]], erros: List[str]) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    _login(tempos["login"], erros)
+
+    at = AppTest.from_file(str(PAGINA_SALAO), default_timeout=600)
+    at.session_state["autenticado"] = True
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        at.run()
+        tempos["salao"].append(time.perf_counter() - inicio)
+        erros.extend(str(e.value) for e in at.exception)
+
+
+def _processo(sessoes: int, rodadas: int, barreira, fila) -> None:
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+    _serializar_ast_parse()
+    _compartilhar_runtime_e_secrets()
+
+    # Aquecimento: carrega bases/caches do processo fora da medição
+    _rodar_sessao(1, {"login": [], "salao": []}, [])
+    rss_base = _rss_pico_mb()
+
+    tempos: Dict[str, List[float]] = {"login": [], "salao": []}
+    erros: List[str] = []
+    threads = [
+        threading.Thread(target=_rodar_sessao, args=(rodadas, tempos, erros), daemon=True)
+        for _ in range(sessoes)
+    ]
+    barreira.wait()
+    cpu_inicio = _cpu_s()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    fila.put({
+        "pid": os.getpid(),
+        "sessoes": sessoes,
+        "tempos": tempos,
+        "erros": erros[:5],
+        "cpu_s": _cpu_s() - cpu_inicio,
+        "rss_base_mb": rss_base,
+        "rss_pico_mb": _rss_pico_mb(),
+    })
+
+
+# =============================================================================
+# ORQUESTRAÇÃO
+# =============================================================================
+
+def _percentil(valores: List[float], p: int) -> float:
+    if not valores:
+        return 0.0
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+def medir_configuracao(processos: int, sessoes: int, rodadas: int) -> Dict[str, float]:
+    """Roda `sessoes` sessões divididas em `processos` processos e mede vazão, latência e recursos."""
+    processos = max(1, min(processos, sessoes))
+    ctx = mp.get_context("spawn")
+    barreira = ctx.Barrier(processos + 1)
+    fila = ctx.Queue()
+
+    divisao = [sessoes // processos + (1 if i < sessoes % processos else 0) for i in range(processos)]
+    procs = [ctx.Process(target=_processo, args=(n, rodadas, barreira, fila)) for n in divisao]
+    for p in procs:
+        p.start()
+
+    barreira.wait()
+    inicio = time.perf_counter()
+    resultados = [fila.get() for _ in procs]
+    parede = time.perf_counter() - inicio
+    for p in procs:
+        p.join()
+
+    salao = [t for r in resultados for t in r["tempos"]["salao"]]
+    login = [t for r in resultados for t in r["tempos"]["login"]]
+    for r in resultados:
+        for erro in r["erros"]:
+            print(f"   aviso (pid {r['pid']}): {erro}")
+
+    nucleos = os.cpu_count() or 1
+    vazao = len(salao) / parede if parede > 0 else 0.0
+    cpu_total = sum(r["cpu_s"] for r in resultados)
+    rss_sessao = [max(0.0, r["rss_pico_mb"] - r["rss_base_mb"]) / r["sessoes"] for r in resultados]
+    return {
+        "processos": processos,
+        "sessoes": sessoes,
+        "reruns": len(salao),
+        "parede_s": round(parede, 3),
+        "reruns_por_s": round(vazao, 3),
+        "reruns_por_s_por_nucleo": round(vazao / min(nucleos, processos), 3),
+        "rerun_medio_s": round(statistics.mean(salao), 3) if salao else 0.0,
+        "rerun_p50_s": round(_percentil(salao, 50), 3),
+        "rerun_p95_s": round(_percentil(salao, 95), 3),
+        "login_p50_s": round(_percentil(login, 50), 3),
+        "login_p95_s": round(_percentil(login, 95), 3),
+        "cpu_s_por_sessao": round(cpu_total / sessoes, 3),
+        "cpu_ms_por_rerun": round(cpu_total / max(1, len(salao) + len(login)) * 1000, 1),
+        "rss_pico_mb_por_processo": round(max(r["rss_pico_mb"] for r in resultados), 1),
+        "rss_pico_mb_por_sessao": round(max(rss_sessao), 1),
+    }
+
+
+def _preparar_bases(escala: int) -> Path:
+    """Gera as bases sintéticas numa pasta temporária e aponta DBV_DATA_DIR para ela."""
+    from benchmarks.dados_sinteticos import gerar_bases
+
+    pasta = Path(tempfile.mkdtemp(prefix="dbv_carga_")) / f"escala_{escala}"
+    info = gerar_bases(pasta, escala)
+    for base, registro in info.items():
+        print(f"   {base}: {registro['linhas']:,} linhas")
+    # Herdado pelos processos (spawn copia o ambiente)
+    os.environ["DBV_DATA_DIR"] = str(pasta)
+    return pasta
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga dos dashboards (sessões simultâneas).")
+    parser.add_argument("--sessoes", type=int, default=8, help="Sessões simultâneas (padrão: 8)")
+    parser.add_argument("--rodadas", type=int, default=3, help="Reruns do Salão por sessão (padrão: 3)")
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="Configurações de processos a comparar (padrão: 1 e nº de núcleos)")
+    parser.add_argument("--escala", type=int, default=1,
+                        help="Escala das bases sintéticas geradas (padrão: 1x o tamanho atual)")
+    parser.add_argument("--sem-gerar", action="store_true",
+                        help="Não gera bases: usa as de DBV_DATA_DIR (ou a pasta padrão)")
+    parser.add_argument("--saida", type=Path, default=None, help="Grava o resultado em JSON")
+    args = parser.parse_args(argv)
+
+    if not args.sem_gerar:
+        print(f"Gerando bases sintéticas ({args.escala}x)...")
+        _preparar_bases(args.escala)
+
+    print(f"Núcleos: {os.cpu_count()} | sessões: {args.sessoes} | reruns por sessão: {args.rodadas}")
+    print("Sessões AppTest em processo: sem HTTP/websocket, sem Caddy e sem sessão fixa.")
+    resultados = []
+    for n in dict.fromkeys(args.processos):
+        print(f"\n=== {n} processo(s) ===")
+        r = medir_configuracao(n, args.sessoes, args.rodadas)
+        resultados.append(r)
+        print(
+            f"   {r['reruns']} reruns em {r['parede_s']:.2f}s -> {r['reruns_por_s']:.2f} reruns/s "
+            f"({r['reruns_por_s_por_nucleo']:.2f}/núcleo)\n"
+            f"   rerun p50 {r['rerun_p50_s'] * 1000:.0f} ms | p95 {r['rerun_p95_s'] * 1000:.0f} ms | "
+            f"login p50 {r['login_p50_s'] * 1000:.0f} ms | p95 {r['login_p95_s'] * 1000:.0f} ms\n"
+            f"   por sessão: CPU {r['cpu_s_por_sessao']:.2f}s, pico RSS +{r['rss_pico_mb_por_sessao']:.1f} MB "
+            f"(processo: {r['rss_pico_mb_por_processo']:.0f} MB)"
+        )
+
+    if args.saida:
+        args.saida.parent.mkdir(parents=True, exist_ok=True)
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nResultado salvo em: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
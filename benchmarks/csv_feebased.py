@@ -0,0 +1,80 @@
+# benchmarks/csv_feebased.py
+# Carga do export FeeBased (CSV): utils.load_data (inferência de tipos +
+# parse de data misto) vs. utils.load_data_rapido (tudo como texto, motor
+# PyArrow, tipagem só de PL/Taxa/data e cache pelo sha256 do arquivo).
+#
+# Uso:
+#     python -m benchmarks.csv_feebased --linhas 1000000
+#     python -m benchmarks.csv_feebased --linhas 1000000 --repeticoes 5 --csv /tmp/feebased.csv
+#
+# Mede, em segundos (mediana das repetições):
+#   - legado: load_data sem o st.cache_data (função original)
+#   - rápido (frio): ler_csv_tipado, sem cache
+#   - rápido (cache): load_data_rapido com o arquivo já lido (hash + lookup)
+# e confere que as somas de PL/Taxa e as datas válidas batem entre os dois.
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from benchmarks.dados_sinteticos import LINHAS_BASE, gerar_feebased  # noqa: E402
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+import utils  # noqa: E402
+
+
+def _mediana(funcao: Callable[[], object], repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Carga do CSV FeeBased: load_data vs. load_data_rapido.")
+    parser.add_argument("--linhas", type=int, default=1_000_000, help="Linhas do CSV (padrão: 1000000)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--csv", type=Path, default=None, help="Caminho do CSV gerado (padrão: temporário)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    escala = max(1, -(-args.linhas // LINHAS_BASE["feebased"]))
+    with tempfile.TemporaryDirectory(prefix="feebased_") as tmp:
+        caminho = args.csv or Path(tmp) / "feebased.csv"
+        inicio = time.perf_counter()
+        gerar_feebased(escala, np.random.default_rng(args.seed)).head(args.linhas).to_csv(caminho, index=False)
+        print(f"CSV: {caminho} ({args.linhas:,} linhas, {caminho.stat().st_size / 1e6:.1f} MB, "
+              f"gerado em {time.perf_counter() - inicio:.1f}s); motor: {utils.MOTOR_CSV}")
+
+        legado = utils.load_data.__wrapped__(str(caminho))
+        rapido = utils.load_data_rapido(str(caminho))
+        for col in utils.COLUNAS_NUMERICAS:
+            if not np.isclose(legado[col].sum(), rapido[col].sum()):
+                print(f"DIVERGÊNCIA em {col}: {legado[col].sum()} vs {rapido[col].sum()}")
+                return 1
+        if not legado[utils.COLUNA_DATA].equals(rapido[utils.COLUNA_DATA]):
+            print(f"DIVERGÊNCIA em {utils.COLUNA_DATA}")
+            return 1
+
+        tempos = {
+            "legado": _mediana(lambda: utils.load_data.__wrapped__(str(caminho)), args.repeticoes),
+            "rápido (frio)": _mediana(lambda: utils.ler_csv_tipado(str(caminho)), args.repeticoes),
+            "rápido (cache)": _mediana(lambda: utils.load_data_rapido(str(caminho)), args.repeticoes),
+        }
+    for nome, segundos in tempos.items():
+        print(f"{nome:>15}: {segundos:8.3f}s  ({tempos['legado'] / segundos:6.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,462 @@
+# benchmarks/dados_sinteticos.py
+# Gerador de bases sintéticas (Positivador, Objetivos, NPS, Mesa RV,
+# Diversificador, Receitas, Habilitações, Transferências e FeeBased) em
+# múltiplos do tamanho atual das bases de produção.
+#
+# Positivador, Mesa RV e Diversificador são gerados como CSV no layout do
+# export e convertidos pelo próprio converter_para_sqlite (criar_tabela_*),
+# então o tempo do conversor entra no benchmark. Objetivos e NPS não têm
+# criar_tabela_* compatível com o que o Dashboard Salão lê, então são gravados
+# direto no layout das bases reais (tabelas "objetivos" e "nps_data").
+# Receitas, Habilitações, Transferências e FeeBased são gravadas direto no
+# layout convertido (criar_tabela_*, com os índices): o parse linha a linha
+# do conversor levaria minutos em escala 10. O FeeBased também sai como CSV
+# (gerar_feebased, para benchmarks/csv_feebased.py).
+#
+# Fora do gerador: Produtos, Clientes, AUC, Ajustes, CalorMap, Lista de Dados
+# e Positivador_DBV. Nenhuma página, loader ou o aquecimento deste código lê
+# esses bancos; com DBV_DATA_DIR apontando para a pasta sintética eles
+# simplesmente não existem (db_utils.localizar_db não cai nos de produção).
+
+import contextlib
+import io
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import converter_para_sqlite  # noqa: E402
+
+# Linhas das bases de produção (escala 1x)
+LINHAS_BASE = {
+    "positivador": 1512,
+    "nps": 903,
+    "mesa_rv": 10094,
+    "diversificador": 18239,
+    # Sem cópia da base de produção no repositório: estimativa (36 meses)
+    "receitas": 36000,
+    "habilitacoes": 446,
+    "transferencias": 1723,
+    # Export FeeBased (CSV do dashboard.py / utils.load_data e o .db)
+    "feebased": 222,
+}
+
+# Nomes dos arquivos iguais aos de produção (lidos via DBV_DATA_DIR)
+ARQUIVOS_DB = {
+    "positivador": "DBV Capital_Positivador.db",
+    "objetivos": "DBV Capital_Objetivos.db",
+    "nps": "DBV Capital_NPS.db",
+    "mesa_rv": "DBV Capital_AUC Mesa RV.db",
+    "diversificador": "DBV Capital_Diversificador.db",
+    "receitas": "DBV Capital_Receitas.db",
+    "habilitacoes": "DBV Capital_Habilitacoes.db",
+    "transferencias": "DBV Capital_Transferências.db",
+    "feebased": "DBV Capital_FeeBased.db",
+}
+
+# Bases gravadas direto no layout convertido: função criar_tabela_* do conversor
+CRIAR_TABELA = {
+    "receitas": converter_para_sqlite.criar_tabela_receitas,
+    "habilitacoes": converter_para_sqlite.criar_tabela_habilitacoes,
+    "transferencias": converter_para_sqlite.criar_tabela_transferencias,
+    "feebased": converter_para_sqlite.criar_tabela_fee_based,
+}
+
+# Tipo usado em converter_para_sqlite.importar_csv_para_sqlite
+TIPOS_CONVERSOR = {
+    "positivador": "positivador",
+    "mesa_rv": "mesarv",
+    "diversificador": "diversificador",
+}
+
+# Posições mensais do Positivador (histórico de 12 meses até DATA_REFERENCIA)
+MESES_POSICAO = 12
+DATA_REFERENCIA = pd.Timestamp("2025-12-08")
+
+N_ASSESSORES = 28
+ASSESSORES = [f"A{23000 + 17 * i:05d}" for i in range(N_ASSESSORES)]
+
+COLUNAS_POSITIVADOR = [
+    "Assessor", "Cliente", "Profissão", "Sexo", "Segmento", "Data de Cadastro",
+    "Fez Segundo Aporte?", "Data de Nascimento", "Status", "Ativou em M?",
+    "Evadiu em M?", "Operou Bolsa?", "Operou Fundo?", "Operou Renda Fixa?",
+    "Aplicação Financeira Declarada Ajustada", "Receita no Mês", "Receita Bovespa",
+    "Receita Futuros", "Receita RF Bancários", "Receita RF Privados",
+    "Receita RF Públicos", "Captação Bruta em M", "Resgate em M",
+    "Captação Líquida em M", "Captação TED", "Captação ST", "Captação OTA",
+    "Captação RF", "Captação TD", "Captação PREV", "Net em M 1", "Net Em M",
+    "Net Renda Fixa", "Net Fundos Imobiliários", "Net Renda Variável", "Net Fundos",
+    "Net Financeiro", "Net Previdência", "Net Outros", "Receita Aluguel",
+    "Receita Complemento Pacote Corretagem", "Tipo Pessoa", "Data Posição",
+    "Data Atualização",
+]
+
+
+def _escolher(rng: np.random.Generator, valores, n: int, p=None) -> np.ndarray:
+    return np.asarray(valores, dtype=object)[rng.choice(len(valores), size=n, p=p)]
+
+
+def _dinheiro(rng: np.random.Generator, n: int, media: float) -> np.ndarray:
+    return np.round(rng.lognormal(np.log(media), 1.0, n), 2)
+
+
+# =============================================================================
+# GERADORES (DataFrames no layout de origem)
+# =============================================================================
+
+def gerar_positivador(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    n_clientes = max(1, LINHAS_BASE["positivador"] * escala // MESES_POSICAO)
+    datas = pd.date_range(end=DATA_REFERENCIA, periods=MESES_POSICAO, freq="MS")
+    datas = datas + pd.Timedelta(days=DATA_REFERENCIA.day - 1)
+
+    clientes = np.arange(1_000_000, 1_000_000 + n_clientes).astype(str)
+    assessor_cliente = _escolher(rng, ASSESSORES, n_clientes)
+    n = n_clientes * len(datas)
+
+    df = pd.DataFrame({c: [""] * n for c in COLUNAS_POSITIVADOR})
+    df["Cliente"] = np.tile(clientes, len(datas))
+    df["Assessor"] = np.tile(assessor_cliente, len(datas))
+    df["Profissão"] = _escolher(rng, ["ADMINISTRADOR", "ADVOGADO", "ENGENHEIRO", "MEDICO", "OUTROS"], n)
+    df["Sexo"] = _escolher(rng, ["F", "M"], n)
+    df["Segmento"] = _escolher(
+        rng, ["Express", "NÃO DISPONÍVEL", "Plus", "Private", "Unique"], n,
+        p=[0.35, 0.61, 0.02, 0.005, 0.015],
+    )
+    df["Status"] = _escolher(rng, ["ATIVO", "INATIVO"], n, p=[0.7, 0.3])
+    df["Tipo Pessoa"] = _escolher(rng, ["PESSOA FÍSICA", "PESSOA JURÍDICA"], n, p=[0.95, 0.05])
+    for c in ("Fez Segundo Aporte?", "Ativou em M?", "Evadiu em M?", "Operou Bolsa?",
+              "Operou Fundo?", "Operou Renda Fixa?"):
+        df[c] = _escolher(rng, ["Sim", "Não"], n)
+    df["Data de Cadastro"] = "14/09/2022"
+    df["Data de Nascimento"] = "22/08/1989"
+
+    net = _dinheiro(rng, n, 150_000)
+    cap_bruta = _dinheiro(rng, n, 5_000)
+    resgate = -_dinheiro(rng, n, 4_000)
+    df["Net Em M"] = net
+    df["Net em M 1"] = np.round(net * rng.uniform(0.95, 1.05, n), 2)
+    df["Captação Bruta em M"] = cap_bruta
+    df["Resgate em M"] = resgate
+    df["Captação Líquida em M"] = np.round(cap_bruta + resgate, 2)
+    df["Receita no Mês"] = _dinheiro(rng, n, 300)
+    df["Net Renda Fixa"] = np.round(net * 0.4, 2)
+    df["Net Renda Variável"] = np.round(net * 0.2, 2)
+    df["Net Fundos"] = np.round(net * 0.3, 2)
+    df["Net Financeiro"] = np.round(net * 0.1, 2)
+
+    df["Data Posição"] = np.repeat(datas.strftime("%Y-%m-%d"), n_clientes)
+    df["Data Atualização"] = DATA_REFERENCIA.strftime("%Y-%m-%d")
+    return df
+
+
+def gerar_objetivos() -> pd.DataFrame:
+    """Metas anuais (3 linhas em produção; não escala com o volume)."""
+    return pd.DataFrame({
+        "Objetivo": ["2025", "2026", "2027"],
+        "Ref": ["0", "1", "2"],
+        "AUC Inicial": ["340000000", "600000000", "800000000"],
+        "AUC Objetivo": ["600000000", "800000000", "1000000000"],
+        "Cap. Liq Objetivo": ["152700000", "150000000", "200000000"],
+        "Receita Objetivo": ["4000000", "6000000", "8000000"],
+        "Contas Ativadas": ["300", "400", "500"],
+        "Rentabilidade Ano": ["10000000", "12000000", "14000000"],
+        "Qtd Dias Ano": ["365", "365", "365"],
+        "Verificação AUC": ["True"] * 3,
+        "Verificação Cap": ["True"] * 3,
+        "Verificação Receita": ["True"] * 3,
+        "Verificação Contas": ["True"] * 3,
+    })
+
+
+def gerar_nps(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    n = LINHAS_BASE["nps"] * escala
+    respondido = rng.random(n) < 0.08
+    notas = _escolher(rng, ["10", "9", "8", "6", "5"], n, p=[0.8, 0.08, 0.04, 0.04, 0.04])
+    datas = DATA_REFERENCIA - pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+    return pd.DataFrame({
+        "Survey ID": np.arange(120_000_000, 120_000_000 + n),
+        "Id do Usuário": [f"u{i:09d}" for i in range(n)],
+        "Customer ID": _escolher(rng, ["CLIENTE A", "CLIENTE B", "CLIENTE C"], n),
+        "Data da Resposta": datas.strftime("%Y-%m-%d %H:%M:%S"),
+        "Pesquisa Relacionamento": _escolher(rng, ["XP aniversario", "XP onboarding"], n, p=[0.84, 0.16]),
+        "XP - Relacionamento - Aniversário - NPS Assessor": np.where(respondido, notas, None),
+        "Status": np.where(respondido, "Respondido", "Não Respondido"),
+        "Código Assessor": _escolher(rng, ASSESSORES, n),
+        "Notificação?": _escolher(rng, ["Sim", "Não"], n),
+    })
+
+
+def gerar_mesa_rv(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    n = LINHAS_BASE["mesa_rv"] * escala
+    datas = pd.date_range("2023-01-01", periods=34, freq="MS")
+    return pd.DataFrame({
+        "Data": _escolher(rng, datas.strftime("%Y-%m-%d"), n),
+        "Cliente": rng.integers(300_000, 300_000 + 400 * escala, n).astype(str),
+        "Assessor": _escolher(rng, ASSESSORES, n),
+        "Tipo": _escolher(rng, ["Auto", "Swing Trade"], n, p=[0.68, 0.32]),
+        "Mandato": _escolher(rng, ["FII Renda Levante", "FII Renda Constante", "Ações Levante", "Bunker"], n),
+        "Classe": _escolher(rng, ["Ações", "FII"], n, p=[0.68, 0.32]),
+        "AUC": _dinheiro(rng, n, 200_000),
+    })
+
+
+def gerar_diversificador(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    n = LINHAS_BASE["diversificador"] * escala
+    return pd.DataFrame({
+        "Assessor": _escolher(rng, [a[1:] for a in ASSESSORES], n),
+        "Cliente": rng.integers(2_000_000, 2_000_000 + 1250 * escala, n).astype(str),
+        "Produto": _escolher(
+            rng, ["Renda Variável", "Renda Fixa", "Fundos", "Previdência", "Somente Financeiro", "Tesouro Direto"], n,
+            p=[0.34, 0.29, 0.2, 0.05, 0.07, 0.05],
+        ),
+        "Sub Produto": _escolher(rng, ["Ação", "Emissão Bancária", "Crédito Privado", "Fundo Imobiliário", ""], n),
+        "Produto em Garantia": _escolher(rng, ["Sim", "Não"], n),
+        "CNPJ Fundo": "",
+        "Ativo": [f"ATV{i:04d}" for i in rng.integers(0, 4800, n)],
+        "Emissor": [f"EMISSOR {i:03d}" for i in rng.integers(0, 175, n)],
+        "Data de Vencimento": "15/05/2030",
+        "Quantidade": rng.integers(1, 5000, n).astype(str),
+        "NET": _dinheiro(rng, n, 20_000),
+        "Data": DATA_REFERENCIA.strftime("%d/%m/%Y"),
+    })
+
+
+def gerar_receitas(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Já no layout convertido (tabela 'dados' de criar_tabela_receitas), 36 meses de histórico."""
+    n = LINHAS_BASE["receitas"] * escala
+    datas = DATA_REFERENCIA - pd.to_timedelta(rng.integers(0, 36 * 30, n), unit="D")
+    linhas = ["Investimentos", "Seguros", "Câmbio", "Crédito", "Consórcio", "Previdência"]
+    bruta = _dinheiro(rng, n, 400)
+    escritorio = np.round(bruta * 0.8, 2)
+    imposto = np.round(escritorio * 0.1, 2)
+    liquida = np.round(escritorio - imposto, 2)
+    return pd.DataFrame({
+        "data_relatorio": DATA_REFERENCIA.strftime("%Y-%m-%d 00:00:00"),
+        "relatorio": "Comissões",
+        "fonte_receita": _escolher(rng, ["XP", "Parceiro"], n, p=[0.85, 0.15]),
+        "linha_receita": _escolher(rng, linhas, n, p=[0.6, 0.12, 0.08, 0.08, 0.06, 0.06]),
+        "categoria": _escolher(rng, ["Renda Fixa", "Renda Variável", "Fundos", "Vida", "Outros"], n),
+        "produto": [f"PRODUTO {i:03d}" for i in rng.integers(0, 120, n)],
+        "data_operacao": datas.strftime("%Y-%m-%d 00:00:00"),
+        "cliente": rng.integers(1_000_000, 1_000_000 + 126 * escala, n).astype(str),
+        "assessor": _escolher(rng, ASSESSORES, n),
+        "mesa": _escolher(rng, ["", "Mesa RV", "Mesa RF"], n, p=[0.8, 0.1, 0.1]),
+        "empresa": "DBV Capital",
+        "receita_bruta_total": bruta,
+        "receita_liquida_total": np.round(bruta * 0.9, 2),
+        "repasse_escritorio_percentual": 0.8,
+        "receita_bruta_escritorio": escritorio,
+        "imposto_percentual": 0.1,
+        "imposto_valor": imposto,
+        "receita_liquida_escritorio": liquida,
+        "repasse_dbv_percentual": 0.5,
+        "repasse_dbv_valor": np.round(liquida * 0.5, 2),
+        "repasse_mesa_percentual": 0.0,
+        "repasse_mesa_valor": 0.0,
+        "repasse_assessor_percentual": 0.5,
+        "repasse_assessor_valor": np.round(liquida * 0.5, 2),
+        "mes_ano": datas.strftime("%Y-%m"),
+    })
+
+
+def gerar_feebased(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Export FeeBased no layout do CSV (cabeçalhos originais, data DD/MM/AAAA
+    HH:MM:SS, taxa com 4 casas e P/L com "Não encontrado" em ~2% das linhas).
+    Em gerar_bases vai para o .db pelo gerar_feebased_db.
+    """
+    n = LINHAS_BASE["feebased"] * escala
+    datas = DATA_REFERENCIA - pd.to_timedelta(rng.integers(0, 730 * 86_400, n), unit="s")
+    pl = _dinheiro(rng, n, 300_000).astype(str)
+    pl[rng.random(n) < 0.02] = "Não encontrado"
+    return pd.DataFrame({
+        "Código Cliente": rng.integers(1_000_000, 1_000_000 + 200 * escala, n).astype(str),
+        "Nome Cliente": [f"CLIENTE {i:07d}" for i in range(n)],
+        "Data Contratação": datas.strftime("%d/%m/%Y %H:%M:%S"),
+        "Taxa Contratação": np.round(rng.uniform(0.003, 0.015, n), 4),
+        "Exceção RV": _escolher(rng, ["Sim", "Não"], n, p=[0.1, 0.9]),
+        "Resgate em fundo": _escolher(rng, ["Sim", "Não"], n, p=[0.05, 0.95]),
+        "Código Assessor": _escolher(rng, ASSESSORES, n),
+        "Status": _escolher(rng, ["Ativo", "Aprovado", "Pendente", "Cancelado"], n, p=[0.6, 0.15, 0.15, 0.1]),
+        "P/L": pl,
+    })
+
+
+def gerar_feebased_db(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    """O mesmo export no layout convertido (criar_tabela_fee_based)."""
+    return gerar_feebased(escala, rng).rename(columns={
+        "Código Cliente": "codigo_cliente",
+        "Nome Cliente": "nome_cliente",
+        "Data Contratação": "data_contratacao",
+        "Taxa Contratação": "taxa_contratacao",
+        "Exceção RV": "excecao_rv",
+        "Resgate em fundo": "resgate_em_fundo",
+        "Código Assessor": "codigo_assessor",
+        "Status": "status",
+        "P/L": "pl",
+    })
+
+
+# Habilitações: métricas de contagem (realizado inteiro) e de taxa (0-1)
+METRICAS_CONTAGEM_HABILITACOES = {
+    "lead_start": 2.0,
+    "carteiras_simuladas_novos_clientes": 3.0,
+    "habilitacoes_mais_300k": 1.0,
+    "habilitacoes_menos_300k": 1.0,
+}
+METRICAS_TAXA_HABILITACOES = {
+    "conversao_mais_300k": 0.9,
+    "conversao_menos_300k": 0.5,
+    "perc_contas_acessadas_hub_mais_300k": 0.9,
+    "perc_contas_acessadas_hub_menos_300k": 0.7,
+    "perc_contas_mais_300k_com_ordem_enviada": 0.45,
+    "perc_contas_menos_300k_com_ordem_enviada": 0.25,
+    "perc_contas_aportaram_mais_300k": 0.35,
+    "perc_contas_aportaram_menos_300k": 0.3,
+}
+MESES_HABILITACOES = 17
+
+
+def gerar_habilitacoes(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Layout convertido (criar_tabela_habilitacoes): uma linha por assessor e
+    mês (1º dia do mês, 17 meses até o mês anterior a DATA_REFERENCIA), com
+    realizado e meta de cada métrica.
+    """
+    n_assessores = max(1, round(LINHAS_BASE["habilitacoes"] * escala / MESES_HABILITACOES))
+    assessores = np.array([f"A{23000 + 17 * i:05d}" for i in range(n_assessores)], dtype=object)
+    meses = pd.date_range(end=DATA_REFERENCIA.to_period("M").to_timestamp() - pd.DateOffset(months=1),
+                          periods=MESES_HABILITACOES, freq="MS")
+    n = n_assessores * len(meses)
+    comercial = rng.random(n_assessores) < 0.55
+
+    df = pd.DataFrame({
+        "ano_mes": np.repeat(meses.strftime("%Y-%m-%d"), n_assessores),
+        "codigo_matriz": 19470,
+        "matriz": "DBV Capital",
+        "codigo_assessor": np.tile(assessores, len(meses)),
+        "comercial": np.where(np.tile(comercial, len(meses)), "Comercial", "Não Comercial"),
+    })
+    for metrica, meta in METRICAS_CONTAGEM_HABILITACOES.items():
+        df[metrica] = rng.poisson(meta, n).astype(float)
+        df[f"meta_{metrica}"] = meta
+    for metrica, meta in METRICAS_TAXA_HABILITACOES.items():
+        df[metrica] = np.round(rng.beta(2, 2.5, n), 4)
+        df[f"meta_{metrica}"] = meta
+    return df
+
+
+def gerar_transferencias(escala: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Layout convertido (criar_tabela_transferencias), 12 meses de solicitações.
+    Como no banco real: ~10% de clientes externos (os que entram no fluxo
+    mensal), PL só neles, ~1% de saídas e datas em dois formatos
+    (AAAA-MM-DD e DD/MM/AAAA HH:MM:SS).
+    """
+    n = LINHAS_BASE["transferencias"] * escala
+    saida = rng.random(n) < 0.014
+    externo = rng.random(n) < 0.1
+    solicitacao = DATA_REFERENCIA - pd.to_timedelta(rng.integers(0, 365 * 86_400, n), unit="s")
+    transferencia = solicitacao + pd.to_timedelta(rng.integers(0, 10, n), unit="D")
+    iso = rng.random(n) < 0.5
+    origem = _escolher(rng, ASSESSORES, n)
+    destino = _escolher(rng, ASSESSORES, n)
+    pl = np.where(externo, _dinheiro(rng, n, 150_000), np.nan)
+    return pd.DataFrame({
+        "codigo": rng.integers(100_000, 400_000, n),
+        "codigo_assessor_origem": np.where(saida | (rng.random(n) < 0.9), origem, ""),
+        "nome_assessor_origem": "",
+        "codigo_assessor_destino": np.where(~saida, destino, ""),
+        "nome_assessor_destino": [f"ASSESSOR {c}" for c in destino],
+        "data_solicitacao": np.where(iso, solicitacao.strftime("%Y-%m-%d 00:00:00"),
+                                     solicitacao.strftime("%d/%m/%Y %H:%M:%S")),
+        "data_transferencia": np.where(iso, transferencia.strftime("%Y-%m-%d 00:00:00"),
+                                       transferencia.strftime("%d/%m/%Y %H:%M:%S")),
+        "origem_solicitacao": _escolher(rng, ["PORTAL", "LUIZ.A28215", "DIEGO.A23594", ""], n,
+                                        p=[0.1, 0.4, 0.2, 0.3]),
+        "tipo": np.where(saida, "Saída", "Entrada"),
+        "status": _escolher(rng, ["Aprovado Assessor Destino", "Concluído", "Cancelado"], n,
+                            p=[0.53, 0.465, 0.005]),
+        "codigo_solicitacao": rng.integers(4_000_000, 6_000_000, n).astype(str),
+        "cliente": np.where(externo, "Externo", ""),
+        "pl": pl,
+    })
+
+
+# =============================================================================
+# GRAVAÇÃO
+# =============================================================================
+
+def _gravar_tabela(df: pd.DataFrame, caminho_db: Path, tabela: str) -> None:
+    caminho_db.unlink(missing_ok=True)
+    with sqlite3.connect(str(caminho_db)) as conn:
+        df.to_sql(tabela, conn, index=False)
+
+
+def _gravar_convertida(df: pd.DataFrame, caminho_db: Path, criar_tabela) -> None:
+    """Tabela 'dados' criada pelo criar_tabela_* do conversor (schema e índices)."""
+    caminho_db.unlink(missing_ok=True)
+    with sqlite3.connect(str(caminho_db)) as conn:
+        criar_tabela(conn)
+        df.to_sql("dados", conn, if_exists="append", index=False)
+
+
+def converter_csv(caminho_csv: Path, caminho_db: Path, tipo: str) -> None:
+    """Roda o conversor oficial em silêncio; erro se o .db não for gerado."""
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        converter_para_sqlite.importar_csv_para_sqlite(caminho_csv, caminho_db, tipo)
+    if not caminho_db.exists():
+        raise RuntimeError(f"Conversor não gerou {caminho_db.name}:\n{saida.getvalue()[-2000:]}")
+
+
+def gerar_bases(destino: Path, escala: int, seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """
+    Gera todas as bases sintéticas em `destino` (nomes iguais aos de produção)
+    e devolve, por base, linhas geradas e tempos de geração/conversão.
+    """
+    destino = Path(destino)
+    (destino / "csv").mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    geradores = {
+        "positivador": lambda: gerar_positivador(escala, rng),
+        "objetivos": gerar_objetivos,
+        "nps": lambda: gerar_nps(escala, rng),
+        "mesa_rv": lambda: gerar_mesa_rv(escala, rng),
+        "diversificador": lambda: gerar_diversificador(escala, rng),
+        "receitas": lambda: gerar_receitas(escala, rng),
+        "habilitacoes": lambda: gerar_habilitacoes(escala, rng),
+        "transferencias": lambda: gerar_transferencias(escala, rng),
+        "feebased": lambda: gerar_feebased_db(escala, rng),
+    }
+
+    info: Dict[str, Dict[str, float]] = {}
+    for base, gerar in geradores.items():
+        inicio = time.perf_counter()
+        df = gerar()
+        caminho_db = destino / ARQUIVOS_DB[base]
+        registro = {"linhas": int(len(df))}
+
+        if base in TIPOS_CONVERSOR:
+            caminho_csv = destino / "csv" / f"{Path(ARQUIVOS_DB[base]).stem}.csv"
+            df.to_csv(caminho_csv, index=False, encoding="utf-8")
+            registro["gerar_s"] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            converter_csv(caminho_csv, caminho_db, TIPOS_CONVERSOR[base])
+            registro["converter_s"] = time.perf_counter() - inicio
+        elif base in CRIAR_TABELA:
+            _gravar_convertida(df, caminho_db, CRIAR_TABELA[base])
+            registro["gerar_s"] = time.perf_counter() - inicio
+        else:
+            _gravar_tabela(df, caminho_db, "objetivos" if base == "objetivos" else "nps_data")
+            registro["gerar_s"] = time.perf_counter() - inicio
+
+        info[base] = registro
+    return info
@@ -0,0 +1,298 @@
+# benchmarks/executar.py
+# Roda a suíte de benchmarks em bases sintéticas de 1x/10x/100x o tamanho atual.
+#
+# Para cada escala:
+#   1. gera as bases (benchmarks/dados_sinteticos.py), cronometrando o conversor
+#   2. cronometra os loaders de db_utils (Diversificador, Mesa RV)
+#   3. cronometra as funções puras do pacote kpis/ (sem Streamlit)
+#   4. roda o Dashboard Salão headless (streamlit.testing) apontado para as
+#      bases sintéticas (DBV_DATA_DIR), uma vez com cache frio e N vezes com
+#      cache quente, e lê os tempos por loader/KPI/gráfico do log de
+#      instrumentacao.py (DBV_PERF_LOG)
+#
+# Uso:
+#     python -m benchmarks.executar
+#     python -m benchmarks.executar --escalas 1 10 --comparar benchmarks/resultados/anterior.json
+#
+# O resultado é salvo em benchmarks/resultados/benchmark_AAAAMMDD_HHMMSS.json.
+# Com --comparar, métricas mais lentas que a referência além da tolerância
+# são listadas como regressão e o processo sai com código 1.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+
+from aquecimento import INTERVALO_ENV_VAR  # noqa: E402
+from benchmarks.dados_sinteticos import gerar_bases  # noqa: E402
+from instrumentacao import LOG_ENV_VAR  # noqa: E402
+
+# A página fria mede a carga sem o aquecimento em segundo plano
+os.environ.setdefault(INTERVALO_ENV_VAR, "off")
+
+PAGINA_SALAO = RAIZ / "pages" / "Dashboard_Salão_Atualizado.py"
+RESULTADOS_DIR = Path(__file__).resolve().parent / "resultados"
+
+# Métricas abaixo deste tempo não entram na comparação (ruído de medição)
+PISO_COMPARACAO_S = 0.005
+
+
+# =============================================================================
+# MEDIÇÕES
+# =============================================================================
+
+def _cronometrar(func, *args, **kwargs) -> float:
+    inicio = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def medir_loaders_db_utils() -> Dict[str, float]:
+    """Loaders de db_utils (sem Streamlit), sempre com cache frio."""
+    import cache_compartilhado
+    import db_utils
+
+    cache_compartilhado.limpar()
+    db_utils._load_diversificador.cache_clear()
+    tempos = {
+        "loader: load_diversificador": _cronometrar(db_utils.load_diversificador),
+    }
+    db_utils._load_diversificador.cache_clear()
+    tempos["loader: load_diversificador (categorico)"] = _cronometrar(
+        db_utils.load_diversificador, categorical=True
+    )
+    # Mesma carga vinda de outro processo: só abre o Arrow já publicado (mmap)
+    db_utils._load_diversificador.cache_clear()
+    tempos["loader: load_diversificador (cache compartilhado)"] = _cronometrar(
+        db_utils.load_diversificador, categorical=True
+    )
+    tempos["loader: mesa_rv (read_table)"] = _cronometrar(
+        db_utils.read_table, db_utils.get_db_path_auc_mesa_rv(), "mesarv"
+    )
+    return tempos
+
+
+def medir_kpis() -> Dict[str, float]:
+    """Funções do pacote kpis/ chamadas direto sobre as bases sintéticas."""
+    import db_utils
+    import kpis
+
+    pasta = db_utils.get_db_dir()
+    df_pos = db_utils.read_table(pasta / "DBV Capital_Positivador.db", "positivador")
+    df_metas = db_utils.read_table(pasta / "DBV Capital_Objetivos.db", "objetivos")
+    df_metas["Objetivo"] = pd.to_numeric(df_metas["Objetivo"], errors="coerce")
+    df_nps = db_utils.read_table(pasta / "DBV Capital_NPS.db", "nps_data")
+
+    tempos: Dict[str, float] = {}
+
+    def cronometrar(nome, func, *args, **kwargs):
+        inicio = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        tempos[f"kpi: {nome}"] = time.perf_counter() - inicio
+        return resultado
+
+    df_pos = cronometrar("tratar_dados_positivador_mtd", kpis.tratar_dados_positivador_mtd, df_pos)
+    hoje = df_pos["Data_Posicao"].max()
+    cronometrar("calcular_indicadores_objetivos", kpis.calcular_indicadores_objetivos,
+                df_pos, df_metas, hoje, df_metas=df_metas)
+    cronometrar("obter_auc_inicial_ano", kpis.obter_auc_inicial_ano, df_pos, hoje.year)
+    cronometrar("top3_mes_cap", kpis.top3_mes_cap, df_pos)
+    cronometrar("top3_ano_cap", kpis.top3_ano_cap, df_pos)
+    rollup = cronometrar("rollup_mensal", kpis.rollup_mensal, df_pos, ["Captacao_Liquida_em_M", "Net_Em_M"])
+    cronometrar("ranking_assessores", kpis.ranking_assessores, rollup, "Captacao_Liquida_em_M", "ano")
+    cap_mensal = df_pos.groupby(df_pos["Data_Posicao"].dt.to_period("M"))["Captacao_Liquida_em_M"].sum()
+    serie = cronometrar("SerieMensal", kpis.SerieMensal, cap_mensal)
+    cronometrar("comparativos_fluxo", kpis.comparativos_fluxo, serie, hoje.to_period("M"))
+
+    df_nps = cronometrar("normalizar_colunas_nps", kpis.normalizar_colunas_nps, df_nps)
+    dfx = cronometrar("filtrar_por_pesquisa", kpis.filtrar_por_pesquisa, df_nps, "XP Aniversário")
+    cronometrar("calcular_metricas_nps", kpis.calcular_metricas_nps, dfx)
+    cronometrar("top3_assessores_por_aderencia", kpis.top3_assessores_por_aderencia, dfx)
+
+    df_rv = db_utils.read_table(db_utils.get_db_path_auc_mesa_rv(), "mesarv")
+    df_rv = df_rv.rename(columns={"auc": "auc_reais"})
+    cronometrar("top3_assessores_por_pl", kpis.top3_assessores_por_pl, df_rv)
+    return tempos
+
+
+def _agregar_log(linhas: List[dict]) -> Dict[str, float]:
+    """Soma os tempos por nome de etapa (uma mesma função pode rodar várias vezes)."""
+    tempos: Dict[str, float] = {}
+    for resumo in linhas:
+        for med in resumo["medicoes"]:
+            tempos[med["nome"]] = tempos.get(med["nome"], 0.0) + med["segundos"]
+    return tempos
+
+
+def _rodar_pagina(log: Path) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    log.unlink(missing_ok=True)
+    at = AppTest.from_file(str(PAGINA_SALAO), default_timeout=600)
+    at.session_state["autenticado"] = True
+    inicio = time.perf_counter()
+    at.run()
+    parede = time.perf_counter() - inicio
+
+    erros = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+    linhas = [json.loads(l) for l in log.read_text(encoding="utf-8").splitlines() if l.strip()]
+    return {"parede_s": parede, "tempos": _agregar_log(linhas), "erros": erros}
+
+
+def medir_pagina_salao(repeticoes: int) -> Dict[str, float]:
+    """Uma execução com cache frio e `repeticoes` com cache quente (mediana)."""
+    import streamlit as st
+
+    import cache_compartilhado
+    import dados_objetivos
+    import dados_positivador
+    from politica_cache import politica
+
+    log = Path(tempfile.mkdtemp(prefix="dbv_perf_")) / "perf.jsonl"
+    os.environ[LOG_ENV_VAR] = str(log)
+    try:
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        politica.limpar()
+        dados_positivador._dados_por_geracao.cache_clear()
+        dados_objetivos._indice_por_geracao.cache_clear()
+        cache_compartilhado.limpar()
+        fria = _rodar_pagina(log)
+        quentes = [_rodar_pagina(log) for _ in range(repeticoes)]
+    finally:
+        os.environ.pop(LOG_ENV_VAR, None)
+
+    for erro in fria["erros"]:
+        print(f"   aviso (página): {erro}")
+
+    tempos = {"pagina fria: total": fria["parede_s"]}
+    tempos.update({f"pagina fria: {k}": v for k, v in fria["tempos"].items()})
+    tempos["pagina quente: total"] = statistics.median(q["parede_s"] for q in quentes)
+    for nome in quentes[0]["tempos"]:
+        tempos[f"pagina quente: {nome}"] = statistics.median(q["tempos"].get(nome, 0.0) for q in quentes)
+    return tempos
+
+
+def executar_escala(escala: int, destino: Path, repeticoes: int) -> dict:
+    print(f"\n=== Escala {escala}x ===")
+    pasta = destino / f"escala_{escala}"
+    info = gerar_bases(pasta, escala)
+
+    tempos: Dict[str, float] = {}
+    for base, registro in info.items():
+        print(f"   {base}: {registro['linhas']:,} linhas")
+        tempos[f"gerar: {base}"] = registro["gerar_s"]
+        if "converter_s" in registro:
+            tempos[f"converter: {base}"] = registro["converter_s"]
+
+    anterior = os.environ.get("DBV_DATA_DIR")
+    os.environ["DBV_DATA_DIR"] = str(pasta)
+    try:
+        tempos.update(medir_loaders_db_utils())
+        tempos.update(medir_kpis())
+        tempos.update(medir_pagina_salao(repeticoes))
+    finally:
+        if anterior is None:
+            os.environ.pop("DBV_DATA_DIR", None)
+        else:
+            os.environ["DBV_DATA_DIR"] = anterior
+
+    return {
+        "linhas": {base: registro["linhas"] for base, registro in info.items()},
+        "tempos": {k: round(v, 6) for k, v in tempos.items()},
+    }
+
+
+# =============================================================================
+# RESULTADOS
+# =============================================================================
+
+def comparar(atual: dict, referencia: dict, tolerancia: float) -> List[str]:
+    """Lista métricas que ficaram mais lentas que a referência além da tolerância."""
+    regressoes = []
+    for escala, dados in atual["escalas"].items():
+        ref = referencia.get("escalas", {}).get(escala)
+        if not ref:
+            continue
+        for nome, valor in dados["tempos"].items():
+            antes = ref["tempos"].get(nome)
+            if antes is None or max(antes, valor) < PISO_COMPARACAO_S:
+                continue
+            if valor > antes * (1 + tolerancia):
+                regressoes.append(
+                    f"{escala}x | {nome}: {antes * 1000:.1f} ms -> {valor * 1000:.1f} ms "
+                    f"({valor / antes:.2f}x)"
+                )
+    return regressoes
+
+
+def imprimir_tabela(resultado: dict) -> None:
+    df = pd.DataFrame({
+        f"{escala}x (ms)": {k: v * 1000 for k, v in dados["tempos"].items()}
+        for escala, dados in resultado["escalas"].items()
+    })
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(df.round(1).fillna("-").to_string())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks dos dashboards DBV Capital (bases sintéticas).")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100],
+                        help="Múltiplos do tamanho atual das bases (padrão: 1 10 100)")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Execuções com cache quente por escala (mediana)")
+    parser.add_argument("--destino", type=Path, default=None,
+                        help="Pasta para as bases sintéticas (padrão: pasta temporária)")
+    parser.add_argument("--saida", type=Path, default=None,
+                        help="Arquivo JSON de resultado (padrão: benchmarks/resultados/benchmark_<data>.json)")
+    parser.add_argument("--comparar", type=Path, default=None,
+                        help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.20,
+                        help="Piora relativa aceita antes de acusar regressão (padrão: 0.20)")
+    args = parser.parse_args(argv)
+
+    destino = args.destino or Path(tempfile.mkdtemp(prefix="dbv_bench_"))
+    resultado = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "escalas": {},
+    }
+    for escala in args.escalas:
+        resultado["escalas"][str(escala)] = executar_escala(escala, destino, max(1, args.repeticoes))
+
+    saida = args.saida or RESULTADOS_DIR / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print()
+    imprimir_tabela(resultado)
+    print(f"\nResultado salvo em: {saida}")
+
+    if args.comparar:
+        referencia = json.loads(args.comparar.read_text(encoding="utf-8"))
+        regressoes = comparar(resultado, referencia, args.tolerancia)
+        if regressoes:
+            print(f"\n⚠️ {len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}:")
+            for linha in regressoes:
+                print(f"   {linha}")
+            return 1
+        print(f"\n✅ Sem regressões acima de {args.tolerancia:.0%} em relação a {args.comparar.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# cache_compartilhado.py
+# Cache de DataFrames entre processos/sessões em arquivos Arrow mapeados em
+# memória (por padrão em /dev/shm, ou seja, RAM).
+#
+# Cada tabela carregada é publicada UMA vez por (arquivo .db, geração, nome)
+# e todos os processos (workers do deploy/servir.py, páginas, benchmarks)
+# abrem o mesmo arquivo com mmap: as colunas numéricas sem nulos viram views
+# somente leitura sobre as páginas do sistema operacional, sem cópia por
+# processo nem unpickle por acesso. Quando o ETL regrava o .db a geração muda,
+# uma nova versão é publicada e as antigas são apagadas.
+#
+# Uso:
+#     df = carregar_compartilhado(db_path, "positivador", lambda: ler_tabela(...))
+#
+# Variável de ambiente:
+#     DBV_CACHE_DIR   pasta dos arquivos (padrão /dev/shm/dbv_cache, ou a pasta
+#                     temporária do sistema sem /dev/shm); "off" desliga o cache
+#
+# Os DataFrames devolvidos são compartilhados e somente leitura: copie antes
+# de alterar colunas.
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from db_utils import db_generation
+
+try:  # trava entre processos (POSIX); sem ela, no pior caso dois publicam a mesma versão
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+CACHE_DIR_ENV_VAR = "DBV_CACHE_DIR"
+_DESLIGADO = ("off", "0", "false", "nao", "não")
+
+# Metadado do schema Arrow onde vão os attrs do DataFrame
+_CHAVE_ATTRS = b"dbv_attrs"
+
+_lock_local = Lock()
+_lock_estatisticas = Lock()
+
+
+def diretorio_cache() -> Optional[Path]:
+    """Pasta do cache (None se desligado por DBV_CACHE_DIR=off)."""
+    valor = os.environ.get(CACHE_DIR_ENV_VAR, "").strip()
+    if valor.lower() in _DESLIGADO:
+        return None
+    if valor:
+        return Path(valor)
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / "dbv_cache"
+
+
+def _hash_db(db_path: Path) -> str:
+    return hashlib.sha1(str(Path(db_path).resolve()).encode("utf-8")).hexdigest()[:10]
+
+
+def _prefixo(db_path: Path, nome: str) -> str:
+    """Parte fixa do nome do arquivo para (banco, nome): muda só a geração."""
+    legivel = re.sub(r"[^0-9A-Za-z_-]+", "_", f"{Path(db_path).stem}-{nome}")
+    return f"{_hash_db(db_path)}-{legivel}"
+
+
+def caminho_arquivo(db_path: Path, geracao: tuple[int, int], nome: str) -> Optional[Path]:
+    pasta = diretorio_cache()
+    if pasta is None:
+        return None
+    return pasta / f"{_prefixo(db_path, nome)}-{geracao[0]}-{geracao[1]}.arrow"
+
+
+# =============================================================================
+# LEITURA / ESCRITA
+# =============================================================================
+
+def publicar(df: pd.DataFrame, caminho: Path) -> None:
+    """Grava o DataFrame como Arrow IPC (arquivo temporário + rename atômico)."""
+    import pyarrow as pa
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[_CHAVE_ATTRS] = json.dumps(df.attrs, default=str).encode("utf-8")
+    tabela = tabela.replace_schema_metadata(metadados)
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=caminho.name, suffix=".tmp", dir=str(caminho.parent))
+    try:
+        with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, tabela.schema) as writer:
+            writer.write_table(tabela)
+        os.replace(tmp, caminho)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def abrir(caminho: Path) -> pd.DataFrame:
+    """
+    Abre o arquivo com mmap. split_blocks evita consolidar colunas em blocos
+    novos, então numéricas sem nulos ficam como views (somente leitura).
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(caminho), "r") as origem:
+        tabela = pa.ipc.open_file(origem).read_all()
+    df = tabela.to_pandas(split_blocks=True)
+    attrs = (tabela.schema.metadata or {}).get(_CHAVE_ATTRS)
+    if attrs:
+        df.attrs.update(json.loads(attrs))
+    return df
+
+
+def _caminho_trava(caminho: Path) -> Path:
+    """Trava da publicação de uma geração: '<prefixo>-<geração>.lock'."""
+    return caminho.with_suffix(".lock")
+
+
+def _remover_geracoes_antigas(caminho: Path, prefixo: str) -> None:
+    """
+    Apaga as outras gerações de (banco, nome), cada uma com a sua trava.
+    Só '<prefixo>-<mtime>-<tamanho>': outro nome que comece igual fica.
+    """
+    geracao = re.compile(rf"{re.escape(prefixo)}-\d+-\d+\.(arrow|lock)")
+    manter = {caminho, _caminho_trava(caminho)}
+    for antigo in caminho.parent.glob(f"{prefixo}-*"):
+        if antigo not in manter and geracao.fullmatch(antigo.name):
+            antigo.unlink(missing_ok=True)
+
+
+class _TravaArquivo:
+    """
+    flock exclusivo num arquivo .lock (no-op sem fcntl). O arquivo pode ser
+    apagado por outro processo enquanto esperamos a trava: depois do flock,
+    se o caminho não aponta mais para o inode travado, abre de novo.
+    """
+
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(str(self.caminho), os.O_CREAT | os.O_RDWR, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                atual = os.stat(str(self.caminho))
+            except FileNotFoundError:
+                atual = None
+            if atual is not None and atual.st_ino == os.fstat(fd).st_ino:
+                self._fd = fd
+                return self
+            os.close(fd)
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+# Estatísticas do processo (lidas pelo painel/benchmarks); sessões e o
+# aquecimento contam em threads diferentes, então só via _contar()
+estatisticas: Dict[str, int] = {"aberturas": 0, "publicacoes": 0, "falhas": 0}
+
+
+def _contar(chave: str) -> None:
+    with _lock_estatisticas:
+        estatisticas[chave] += 1
+
+
+def carregar_compartilhado(
+    db_path: Path,
+    nome: str,
+    carregar: Callable[[], pd.DataFrame],
+    geracao: Optional[tuple[int, int]] = None,
+) -> pd.DataFrame:
+    """
+    Devolve o DataFrame 'nome' do banco na geração atual a partir do cache
+    compartilhado; se ainda não publicado, chama carregar() uma vez (entre
+    todos os processos) e publica. Com o cache desligado ou em erro de
+    gravação, devolve carregar() direto.
+    """
+    geracao = geracao or db_generation(db_path)
+    caminho = caminho_arquivo(db_path, geracao, nome)
+    if caminho is None:
+        return carregar()
+
+    if caminho.exists():
+        try:
+            df = abrir(caminho)
+            _contar("aberturas")
+            return df
+        except Exception:
+            # Arquivo corrompido/truncado: republica abaixo
+            caminho.unlink(missing_ok=True)
+
+    prefixo = _prefixo(db_path, nome)
+    with _lock_local, _TravaArquivo(_caminho_trava(caminho)):
+        if not caminho.exists():
+            df = carregar()
+            try:
+                publicar(df, caminho)
+                _contar("publicacoes")
+                _remover_geracoes_antigas(caminho, prefixo)
+            except Exception:
+                # Sem espaço/permissão ou tipo não suportado pelo Arrow:
+                # segue sem cache compartilhado para esta tabela
+                _contar("falhas")
+                return df
+        df = abrir(caminho)
+        _contar("aberturas")
+        return df
+
+
+def limpar(db_path: Optional[Path] = None) -> int:
+    """
+    Apaga os arquivos do cache (de um banco ou todos), com as travas.
+    Devolve quantas tabelas apagou.
+    """
+    pasta = diretorio_cache()
+    if pasta is None or not pasta.exists():
+        return 0
+    padrao = f"{_hash_db(db_path)}-*" if db_path else "*"
+    apagados = 0
+    for arq in pasta.glob(f"{padrao}.arrow"):
+        arq.unlink(missing_ok=True)
+        apagados += 1
+    for trava in pasta.glob(f"{padrao}.lock"):
+        trava.unlink(missing_ok=True)
+    return apagados
@@ -12,20 +12,47 @@ Inspeciona um banco SQLite:
 - Mostra amostra de linhas
 - (Opcional) estatísticas básicas para colunas numéricas
 
+Modo --stats (escala com o tamanho das tabelas): as estatísticas saem do
+SQLite, sem carregar tabelas no pandas, e as tabelas de todos os bancos são
+processadas em paralelo (uma conexão somente leitura por tabela):
+- uma varredura por tabela: COUNT(*), COUNT(col), MIN/MAX de cada coluna
+- distintos por coluna: exato até --amostra linhas; acima disso, exato para
+  colunas com índice (UNIQUE/PK: igual aos não nulos, sem consulta; demais
+  índices: COUNT(DISTINCT) pelo índice) e estimado numa amostra aleatória
+  de --amostra linhas para o resto (híbrido Duj1/Shlosser de Haas e Stokes)
+- índices (colunas, único, parcial), tamanho em disco de tabela e índices
+  (dbstat) e a seletividade do ANALYZE (sqlite_stat1), se houver. O SQLite
+  não conta uso de índice em tempo de execução: tamanho e seletividade ao
+  longo do tempo são o que dá para acompanhar.
+Com --json a saída é JSON (um documento por execução; em arquivo .jsonl
+acrescenta uma linha, para acompanhar o crescimento ao longo do tempo).
+
 Uso:
   python check_db.py --db caminho/do/arquivo.db
   python check_db.py --db arquivo.db --table objetivos_pj1
   python check_db.py --db arquivo.db --like obj% --limit 20
+  python check_db.py --dir . --stats
+  python check_db.py --dir . --json historico_bancos.jsonl
+  python check_db.py --db a.db b.db --json - --workers 4
 """
 
 import argparse
+import json
 import os
 import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
 from textwrap import indent
 
 import pandas as pd
 
+AMOSTRA_PADRAO = 20_000
+MAX_TEXTO = 80  # MIN/MAX de texto são truncados no JSON
+
 
 def connect(db_path: str) -> sqlite3.Connection:
     if not os.path.exists(db_path):
@@ -56,14 +83,23 @@ def get_schema(conn: sqlite3.Connection, table: str) -> pd.DataFrame:
     return pd.read_sql_query(f"PRAGMA table_info([{table}]);", conn)
 
 
+# Índices e suas colunas numa consulta só (funções de tabela pragma_*)
+SQL_INDEXES = """
+    SELECT
+        il.name AS index_name,
+        il."unique" AS "unique",
+        (SELECT group_concat(name, ',') FROM (
+            SELECT name FROM pragma_index_info(il.name) ORDER BY seqno
+        )) AS columns,
+        il.origin AS origin,
+        il.partial AS partial
+    FROM pragma_index_list(?) AS il
+    ORDER BY il.seq;
+"""
+
+
 def get_indexes(conn: sqlite3.Connection, table: str) -> pd.DataFrame:
-    idx_list = pd.read_sql_query(f"PRAGMA index_list([{table}]);", conn)
-    rows = []
-    for _, r in idx_list.iterrows():
-        idx_name = r["name"]
-        info = pd.read_sql_query(f"PRAGMA index_info([{idx_name}]);", conn)
-        rows.append({"index_name": idx_name, "unique": r.get("unique", None), "columns": ",".join(info["name"])})
-    return pd.DataFrame(rows)
+    return pd.read_sql_query(SQL_INDEXES, conn, params=(table,))[["index_name", "unique", "columns"]]
 
 
 def null_counts(df: pd.DataFrame) -> pd.Series:
@@ -91,16 +127,245 @@ def human_size(path: str) -> str:
     return f"{b:.1f} PB"
 
 
-def main():
-    ap = argparse.ArgumentParser(description="Inspeciona um banco SQLite rapidamente.")
-    ap.add_argument("--db", required=True, help="Caminho do arquivo .db")
-    ap.add_argument("--table", help="Nome exato da tabela a inspecionar (opcional)")
-    ap.add_argument("--like", help="Filtro LIKE para nomes de tabela (ex.: obj%%) (opcional)")
-    ap.add_argument("--limit", type=int, default=10, help="Linhas de amostra por tabela (padrão: 10)")
-    args = ap.parse_args()
+# =============================================================================
+# MODO --stats (SQL, em paralelo)
+# =============================================================================
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connect_ro(db_path: str) -> sqlite3.Connection:
+    """Conexão somente leitura (não trava o ETL nem cria arquivo se não existir)."""
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+
+def _json_value(v):
+    if isinstance(v, bytes):
+        return f"<blob {len(v)} bytes>"
+    if isinstance(v, str) and len(v) > MAX_TEXTO:
+        return v[:MAX_TEXTO] + "…"
+    return v
+
+
+def _object_bytes(conn: sqlite3.Connection, name: str) -> int | None:
+    """Bytes em disco de uma tabela/índice (None se o SQLite não tiver dbstat)."""
+    try:
+        row = conn.execute("SELECT pgsize FROM dbstat('main', 1) WHERE name = ?;", (name,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else 0
+
+
+def _estimate_distinct(n_total: int, freqs: dict[int, int]) -> int:
+    """
+    Distintos de uma coluna com n_total valores não nulos, a partir da amostra
+    (freqs: quantas vezes -> quantos valores apareceram tantas vezes), pelo
+    híbrido de Haas e Stokes: teste qui-quadrado de uniformidade das
+    frequências; pouca assimetria usa Duj1, d / (1 - (1 - q) * f1 / n); muita
+    usa Shlosser. Resultado limitado a [d, N]. Coluna de ids (amostra toda
+    de únicos) dá N; poucas categorias dão d. O GEE (sqrt(N/n) * f1 + d - f1)
+    daria só sqrt(N*n) numa coluna de ids.
+    """
+    d = sum(freqs.values())
+    n = sum(k * f for k, f in freqs.items())
+    if d <= 1 or n >= n_total:
+        return d
+    q = n / n_total
+    f1 = freqs.get(1, 0)
+    chi2 = d / n * sum(k * k * f for k, f in freqs.items()) - n
+    df = d - 1
+    critical = df * (1 - 2 / (9 * df) + 1.96 * (2 / (9 * df)) ** 0.5) ** 3  # Wilson-Hilferty, 97,5%
+    if chi2 <= critical:
+        estimate = d / (1 - (1 - q) * f1 / n)
+    else:
+        numerator = sum((1 - q) ** k * f for k, f in freqs.items())
+        denominator = sum(k * q * (1 - q) ** (k - 1) * f for k, f in freqs.items())
+        estimate = d + f1 * numerator / denominator
+    return int(round(min(max(estimate, d), n_total)))
+
+
+def _exact_distinct_columns(
+    columns: list[tuple], indexes: list[tuple]
+) -> tuple[set[str], set[str]]:
+    """
+    (únicas, indexadas): colunas com valores únicos garantidos (INTEGER
+    PRIMARY KEY ou índice UNIQUE de uma coluna, não parcial) e colunas que
+    lideram algum índice não parcial (COUNT(DISTINCT) percorre o índice).
+    """
+    pk = [(c, tipo) for c, tipo, ordem in columns if ordem]
+    unique = {pk[0][0]} if len(pk) == 1 and pk[0][1].upper() == "INTEGER" else set()
+    indexed = set()
+    for _, unico, colunas, _, parcial in indexes:
+        if parcial or not colunas:
+            continue
+        nomes = colunas.split(",")
+        indexed.add(nomes[0])
+        if unico and len(nomes) == 1:
+            unique.add(nomes[0])
+    return unique, indexed - unique
+
+
+def table_stats(db_path: str, table: str, sample_size: int = AMOSTRA_PADRAO) -> dict:
+    """Estatísticas de uma tabela só com SQL (ver docstring do módulo)."""
+    start = time.perf_counter()
+    with closing(connect_ro(db_path)) as conn:
+        columns = conn.execute(
+            "SELECT name, type, pk FROM pragma_table_info(?) ORDER BY cid;", (table,)
+        ).fetchall()
+        indexes = conn.execute(SQL_INDEXES, (table,)).fetchall()
+        src = quote(table)
+
+        # Uma varredura: linhas, não nulos e MIN/MAX de todas as colunas
+        exprs = ["COUNT(*)"] + [
+            f"COUNT({quote(c)}), MIN({quote(c)}), MAX({quote(c)})" for c, _, _ in columns
+        ]
+        row = conn.execute(f"SELECT {', '.join(exprs)} FROM {src};").fetchone()
+        n_rows = row[0]
+
+        if n_rows <= sample_size:
+            exact = [True] * len(columns)
+            distinct = conn.execute(
+                f"SELECT {', '.join(f'COUNT(DISTINCT {quote(c)})' for c, _, _ in columns)} FROM {src};"
+            ).fetchone() if columns else ()
+        else:
+            unique, indexed = _exact_distinct_columns(columns, indexes)
+            exact = [c in unique or c in indexed for c, _, _ in columns]
+            if not all(exact):
+                conn.execute(
+                    f"CREATE TEMP TABLE amostra AS SELECT * FROM {src} "
+                    f"WHERE rowid IN (SELECT rowid FROM {src} ORDER BY random() LIMIT {int(sample_size)});"
+                )
+            distinct = []
+            for i, (c, _, _) in enumerate(columns):
+                if c in unique:
+                    distinct.append(row[1 + 3 * i])
+                    continue
+                if c in indexed:
+                    distinct.append(conn.execute(f"SELECT COUNT(DISTINCT {quote(c)}) FROM {src};").fetchone()[0])
+                    continue
+                freqs = dict(conn.execute(
+                    f"SELECT k, COUNT(*) FROM ("
+                    f"SELECT COUNT(*) AS k FROM temp.amostra WHERE {quote(c)} IS NOT NULL GROUP BY {quote(c)}"
+                    f") GROUP BY k;"
+                ).fetchall())
+                distinct.append(_estimate_distinct(row[1 + 3 * i], freqs))
+
+        has_stat1 = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1';"
+        ).fetchone()
+        stat1 = dict(conn.execute(
+            "SELECT idx, stat FROM sqlite_stat1 WHERE tbl = ?;", (table,)
+        ).fetchall()) if has_stat1 else {}
+
+        return {
+            "tabela": table,
+            "linhas": n_rows,
+            "bytes": _object_bytes(conn, table),
+            "colunas": [
+                {
+                    "nome": c,
+                    "tipo": tipo,
+                    "nao_nulos": row[1 + 3 * i],
+                    "nulos": n_rows - row[1 + 3 * i],
+                    "min": _json_value(row[2 + 3 * i]),
+                    "max": _json_value(row[3 + 3 * i]),
+                    "distintos": distinct[i],
+                    "distintos_exato": exact[i],
+                }
+                for i, (c, tipo, _) in enumerate(columns)
+            ],
+            "indices": [
+                {
+                    "nome": nome,
+                    "unico": bool(unico),
+                    "colunas": colunas.split(",") if colunas else [],
+                    "origem": origem,
+                    "parcial": bool(parcial),
+                    "bytes": _object_bytes(conn, nome),
+                    "stat1": stat1.get(nome),
+                }
+                for nome, unico, colunas, origem, parcial in indexes
+            ],
+            "segundos": round(time.perf_counter() - start, 4),
+        }
+
+
+def collect_stats(
+    db_paths: list[str],
+    like: str | None = None,
+    table: str | None = None,
+    sample_size: int = AMOSTRA_PADRAO,
+    workers: int | None = None,
+) -> dict:
+    """Estatísticas de todas as tabelas dos bancos, em paralelo (uma tarefa por tabela)."""
+    start = time.perf_counter()
+    tasks = []
+    for db in db_paths:
+        with closing(connect_ro(db)) as conn:
+            names = list_tables(conn, like=like)
+        tasks += [(db, t) for t in names if table is None or t == table]
+
+    with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+        futures = {task: pool.submit(table_stats, *task, sample_size) for task in tasks}
+
+    banks = []
+    for db in db_paths:
+        tables = []
+        for (task_db, t), fut in futures.items():
+            if task_db != db:
+                continue
+            try:
+                tables.append(fut.result())
+            except sqlite3.Error as e:
+                tables.append({"tabela": t, "erro": str(e)})
+        banks.append({"arquivo": db, "bytes": os.path.getsize(db), "tabelas": tables})
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "amostra": sample_size,
+        "segundos": round(time.perf_counter() - start, 4),
+        "bancos": banks,
+    }
+
+
+def print_stats(result: dict) -> None:
+    for bank in result["bancos"]:
+        print(f"\nArquivo: {bank['arquivo']} ({bank['bytes'] / 1024:.1f} KB)")
+        for t in bank["tabelas"]:
+            if "erro" in t:
+                print(f"  - {t['tabela']}: erro: {t['erro']}")
+                continue
+            print(f"  - {t['tabela']}: {t['linhas']} linhas, {len(t['colunas'])} colunas, "
+                  f"{len(t['indices'])} índices ({t['segundos']:.3f}s)")
+            cols = pd.DataFrame(t["colunas"]).set_index("nome")
+            if not cols.empty:
+                print(indent(cols[["tipo", "nulos", "distintos", "min", "max"]].to_string(), "      "))
+            for idx in t["indices"]:
+                print(f"      índice {idx['nome']} ({','.join(idx['colunas'])})"
+                      f"{' único' if idx['unico'] else ''}: {idx['bytes']} bytes, stat1={idx['stat1']}")
+    print(f"\nFeito em {result['segundos']:.2f}s.")
+
+
+def write_json(result: dict, destination: str) -> None:
+    if destination == "-":
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif destination.endswith(".jsonl"):
+        with open(destination, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    else:
+        with open(destination, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
 
-    print(f"Arquivo: {args.db} ({human_size(args.db)})")
-    conn = connect(args.db)
+# =============================================================================
+# CLI
+# =============================================================================
+
+def inspect_db(db_path: str, args: argparse.Namespace) -> None:
+    """Inspeção detalhada (modo original) de um banco."""
+    print(f"Arquivo: {db_path} ({human_size(db_path)})")
+    conn = connect(db_path)
 
     # Tabelas
     tables = list_tables(conn, like=args.like)
@@ -168,5 +433,47 @@ def main():
     conn.close()
     print("\nFeito.")
 
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspeciona um banco SQLite rapidamente.")
+    ap.add_argument("--db", nargs="+", help="Caminho(s) do(s) arquivo(s) .db")
+    ap.add_argument("--dir", help="Inspeciona todos os .db da pasta")
+    ap.add_argument("--table", help="Nome exato da tabela a inspecionar (opcional)")
+    ap.add_argument("--like", help="Filtro LIKE para nomes de tabela (ex.: obj%%) (opcional)")
+    ap.add_argument("--limit", type=int, default=10, help="Linhas de amostra por tabela (padrão: 10)")
+    ap.add_argument("--stats", action="store_true", help="Estatísticas via SQL, tabelas em paralelo")
+    ap.add_argument("--json", metavar="ARQUIVO",
+                    help="Saída JSON do modo --stats ('-' = stdout; .jsonl acrescenta uma linha)")
+    ap.add_argument("--amostra", type=int, default=AMOSTRA_PADRAO,
+                    help=f"Linhas da amostra para distintos estimados (padrão: {AMOSTRA_PADRAO})")
+    ap.add_argument("--workers", type=int, default=None, help="Threads do modo --stats (padrão: núcleos, até 8)")
+    args = ap.parse_args()
+
+    db_paths = list(args.db or [])
+    if args.dir:
+        db_paths += sorted(str(p) for p in Path(args.dir).glob("*.db"))
+    if not db_paths:
+        ap.error("informe --db ou --dir")
+    for db in db_paths:
+        if not os.path.exists(db):
+            print(f"Arquivo não encontrado: {db}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.stats or args.json:
+        # Arquivos vazios (0 bytes) não são bancos: ficam de fora
+        result = collect_stats(
+            [db for db in db_paths if os.path.getsize(db) > 0],
+            like=args.like, table=args.table, sample_size=args.amostra, workers=args.workers,
+        )
+        if args.json:
+            write_json(result, args.json)
+        else:
+            print_stats(result)
+        return
+
+    for db in db_paths:
+        inspect_db(db, args)
+
+
 if __name__ == "__main__":
     main()
@@ -65,6 +65,8 @@ def criar_tabela_receitas(conn):
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_data_operacao ON dados(data_operacao)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_mes_ao ON dados(mes_ano)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_linha_receita ON dados(linha_receita)')
+    # Filtro do head (linha_receita IN ...) + período na mesma busca no índice
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_linha_receita_mes_ano ON dados(linha_receita, mes_ano)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_assessor ON dados(assessor)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_cliente ON dados(cliente)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_empresa ON dados(empresa)')
@@ -141,123 +143,115 @@ def criar_tabela_transferencias(conn):
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_transferencias_status ON dados(status)')
     conn.commit()
 
-def criar_tabela_positivador(conn):
+# Schema tipado do Positivador (positivador e positivador_mtd): métricas em
+# REAL e datas em texto ISO (AAAA-MM-DD). Assim o SQLite faz SUM/MAX sem
+# reconverter texto e o índice de Data_Posicao atende filtros por intervalo.
+COLUNAS_POSITIVADOR = [
+    ('Assessor', 'TEXT'),
+    ('Cliente', 'TEXT'),
+    ('Profissao', 'TEXT'),
+    ('Sexo', 'TEXT'),
+    ('Segmento', 'TEXT'),
+    ('Data_Cadastro', 'TEXT'),
+    ('Fez_Segundo_Aporte', 'TEXT'),
+    ('Data_Nascimento', 'TEXT'),
+    ('Status', 'TEXT'),
+    ('Ativou_em_M', 'TEXT'),
+    ('Evadiu_em_M', 'TEXT'),
+    ('Operou_Bolsa', 'TEXT'),
+    ('Operou_Fundo', 'TEXT'),
+    ('Operou_Renda_Fixa', 'TEXT'),
+    ('Aplicacao_Financeira_Declarada_Ajustada', 'REAL'),
+    ('Receita_no_Mes', 'REAL'),
+    ('Receita_Bovespa', 'REAL'),
+    ('Receita_Futuros', 'REAL'),
+    ('Receita_RF_Bancarios', 'REAL'),
+    ('Receita_RF_Privados', 'REAL'),
+    ('Receita_RF_Publicos', 'REAL'),
+    ('Captacao_Bruta_em_M', 'REAL'),
+    ('Resgate_em_M', 'REAL'),
+    ('Captacao_Liquida_em_M', 'REAL'),
+    ('Captacao_TED', 'REAL'),
+    ('Captacao_ST', 'REAL'),
+    ('Captacao_OTA', 'REAL'),
+    ('Captacao_RF', 'REAL'),
+    ('Captacao_TD', 'REAL'),
+    ('Captacao_PREV', 'REAL'),
+    ('Net_em_M_1', 'REAL'),
+    ('Net_Em_M', 'REAL'),
+    ('Net_Renda_Fixa', 'REAL'),
+    ('Net_Fundos_Imobiliarios', 'REAL'),
+    ('Net_Renda_Variavel', 'REAL'),
+    ('Net_Fundos', 'REAL'),
+    ('Net_Financeiro', 'REAL'),
+    ('Net_Previdencia', 'REAL'),
+    ('Net_Outros', 'REAL'),
+    ('Receita_Aluguel', 'REAL'),
+    ('Receita_Complemento_Pacote_Corretagem', 'REAL'),
+    ('Tipo_Pessoa', 'TEXT'),
+    ('Data_Posicao', 'TEXT'),
+    ('Data_Atualizacao', 'TEXT'),
+]
+COLUNAS_REAL_POSITIVADOR = [nome for nome, tipo in COLUNAS_POSITIVADOR if tipo == 'REAL']
+COLUNAS_DATA_POSITIVADOR = ['Data_Cadastro', 'Data_Nascimento', 'Data_Posicao', 'Data_Atualizacao']
+
+# Tipos cuja tabela é criada com schema próprio e recebe os chunks por append
+# (os demais são recriados pelo to_sql no primeiro chunk)
+TIPOS_SCHEMA_TIPADO = ('positivador', 'positivador_mtd')
+
+
+def _criar_tabela_positivador_tipada(conn, tabela):
     cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS positivador (
-            Assessor TEXT,
-            Cliente TEXT,
-            Profissao TEXT,
-            Sexo TEXT,
-            Segmento TEXT,
-            Data_Cadastro TEXT,
-            Fez_Segundo_Aporte TEXT,
-            Data_Nascimento TEXT,
-            Status TEXT,
-            Ativou_em_M TEXT,
-            Evadiu_em_M TEXT,
-            Operou_Bolsa TEXT,
-            Operou_Fundo TEXT,
-            Operou_Renda_Fixa TEXT,
-            Aplicacao_Financeira_Declarada_Ajustada TEXT,
-            Receita_no_Mes TEXT,
-            Receita_Bovespa TEXT,
-            Receita_Futuros TEXT,
-            Receita_RF_Bancarios TEXT,
-            Receita_RF_Privados TEXT,
-            Receita_RF_Publicos TEXT,
-            Captacao_Bruta_em_M TEXT,
-            Resgate_em_M TEXT,
-            Captacao_Liquida_em_M TEXT,
-            Captacao_TED TEXT,
-            Captacao_ST TEXT,
-            Captacao_OTA TEXT,
-            Captacao_RF TEXT,
-            Captacao_TD TEXT,
-            Captacao_PREV TEXT,
-            Net_em_M_1 TEXT,
-            Net_Em_M TEXT,
-            Net_Renda_Fixa TEXT,
-            Net_Fundos_Imobiliarios TEXT,
-            Net_Renda_Variavel TEXT,
-            Net_Fundos TEXT,
-            Net_Financeiro TEXT,
-            Net_Previdencia TEXT,
-            Net_Outros TEXT,
-            Receita_Aluguel TEXT,
-            Receita_Complemento_Pacote_Corretagem TEXT,
-            Tipo_Pessoa TEXT,
-            Data_Posicao TEXT,
-            Data_Atualizacao TEXT
+    colunas = ",\n            ".join(f"{nome} {tipo}" for nome, tipo in COLUNAS_POSITIVADOR)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {tabela} (
+            {colunas}
         )
     ''')
-    conn.commit()
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_assessor ON positivador(Assessor)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_cliente ON positivador(Cliente)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_data_cadastro ON positivador(Data_Cadastro)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_status ON positivador(Status)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_segmento ON positivador(Segmento)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_data_posicao ON positivador(Data_Posicao)')
+    # Os índices são criados no fim da importação (ver importar_csv_para_sqlite):
+    # inserir com os índices já existentes deixaria a carga bem mais lenta
     conn.commit()
 
+def criar_tabela_positivador(conn):
+    _criar_tabela_positivador_tipada(conn, 'positivador')
+
 def criar_tabela_positivador_mtd(conn):
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS positivador_mtd (
-            Assessor TEXT,
-            Cliente TEXT,
-            Profissao TEXT,
-            Sexo TEXT,
-            Segmento TEXT,
-            Data_Cadastro TEXT,
-            Fez_Segundo_Aporte TEXT,
-            Data_Nascimento TEXT,
-            Status TEXT,
-            Ativou_em_M TEXT,
-            Evadiu_em_M TEXT,
-            Operou_Bolsa TEXT,
-            Operou_Fundo TEXT,
-            Operou_Renda_Fixa TEXT,
-            Aplicacao_Financeira_Declarada_Ajustada TEXT,
-            Receita_no_Mes TEXT,
-            Receita_Bovespa TEXT,
-            Receita_Futuros TEXT,
-            Receita_RF_Bancarios TEXT,
-            Receita_RF_Privados TEXT,
-            Receita_RF_Publicos TEXT,
-            Captacao_Bruta_em_M TEXT,
-            Resgate_em_M TEXT,
-            Captacao_Liquida_em_M TEXT,
-            Captacao_TED TEXT,
-            Captacao_ST TEXT,
-            Captacao_OTA TEXT,
-            Captacao_RF TEXT,
-            Captacao_TD TEXT,
-            Captacao_PREV TEXT,
-            Net_em_M_1 TEXT,
-            Net_Em_M TEXT,
-            Net_Renda_Fixa TEXT,
-            Net_Fundos_Imobiliarios TEXT,
-            Net_Renda_Variavel TEXT,
-            Net_Fundos TEXT,
-            Net_Financeiro TEXT,
-            Net_Previdencia TEXT,
-            Net_Outros TEXT,
-            Receita_Aluguel TEXT,
-            Receita_Complemento_Pacote_Corretagem TEXT,
-            Tipo_Pessoa TEXT,
-            Data_Posicao TEXT,
-            Data_Atualizacao TEXT
-        )
-    ''')
-    conn.commit()
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_assessor ON positivador_mtd(Assessor)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_cliente ON positivador_mtd(Cliente)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_data_cadastro ON positivador_mtd(Data_Cadastro)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_status ON positivador_mtd(Status)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_segmento ON positivador_mtd(Segmento)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_mtd_data_posicao ON positivador_mtd(Data_Posicao)')
-    conn.commit()
+    _criar_tabela_positivador_tipada(conn, 'positivador_mtd')
+
+
+def numero_br_vetorizado(serie):
+    """
+    Mesmas regras do parse_number_br_robusto, sobre a coluna inteira:
+    tira 'R$' e espaços; com '.' e ',' o ponto é milhar; vírgula vira ponto.
+    Inválidos/vazios viram NaN (NULL no banco).
+    """
+    try:
+        # Caminho rápido: coluna já está em formato numérico simples
+        return pd.to_numeric(serie.where(serie.str.strip() != ''), errors='raise').astype('float64')
+    except (ValueError, TypeError):
+        pass
+    s = serie.astype('string').str.strip()
+    s = s.str.replace('R$', '', regex=False).str.replace(' ', '', regex=False)
+    milhar = s.str.contains('.', regex=False) & s.str.contains(',', regex=False)
+    s = s.mask(milhar, s.str.replace('.', '', regex=False))
+    s = s.str.replace(',', '.', regex=False)
+    return pd.to_numeric(s, errors='coerce').astype('float64')
+
+
+def data_iso_vetorizada(serie):
+    """
+    Datas ISO (AAAA-MM-DD ou AAAA/MM/DD) ou brasileiras (dd/mm/aaaa), com ou
+    sem hora, para texto AAAA-MM-DD. O que não casar com nenhum dos dois
+    formatos passa pelo parser genérico (dayfirst). Inválidas viram NULL.
+    """
+    s = serie.astype('string').str.strip()
+    dia = s.str.slice(0, 10)
+    dt = pd.to_datetime(dia.str.replace('/', '-', regex=False), format='%Y-%m-%d', errors='coerce')
+    dt = dt.fillna(pd.to_datetime(dia, format='%d/%m/%Y', errors='coerce'))
+    resto = dt.isna() & s.fillna('').ne('')
+    if resto.any():
+        dt[resto] = pd.to_datetime(s[resto], errors='coerce', dayfirst=True, format='mixed')
+    return dt.dt.strftime('%Y-%m-%d').astype(object).where(dt.notna(), None)
 
 def criar_tabela_diversificador(conn):
     cursor = conn.cursor()
@@ -752,6 +746,13 @@ def importar_csv_para_sqlite(caminho_arquivo, caminho_saida, tipo):
                     if col in chunk.columns:
                         chunk[col] = pd.to_datetime(chunk[col], errors='coerce', dayfirst=True).dt.strftime('%Y-%m-%d')
 
+            # ----------- POSITIVADOR: métricas REAL e datas ISO (vetorizado) -----------
+            elif tipo in TIPOS_SCHEMA_TIPADO:
+                for col in [c for c in COLUNAS_REAL_POSITIVADOR if c in chunk.columns]:
+                    chunk[col] = numero_br_vetorizado(chunk[col])
+                for col in [c for c in COLUNAS_DATA_POSITIVADOR if c in chunk.columns]:
+                    chunk[col] = data_iso_vetorizada(chunk[col])
+
             # ----------- NOVO: PRODUTOS (ISO-first, sem inversão) -----------------
             import re
 
@@ -956,7 +957,12 @@ def importar_csv_para_sqlite(caminho_arquivo, caminho_saida, tipo):
                 table_name = 'mesarv'
             else:
                 table_name = 'dados'
-            chunk.to_sql(table_name, conn, if_exists='replace' if first_chunk else 'append', index=False)
+            if tipo in TIPOS_SCHEMA_TIPADO:
+                # Mantém o schema tipado criado acima (replace recriaria tudo como TEXT)
+                if_exists = 'append'
+            else:
+                if_exists = 'replace' if first_chunk else 'append'
+            chunk.to_sql(table_name, conn, if_exists=if_exists, index=False)
 
             if first_chunk:
                 print(f"Estrutura do arquivo {os.path.basename(caminho_arquivo)}:")
@@ -982,6 +988,8 @@ def importar_csv_para_sqlite(caminho_arquivo, caminho_saida, tipo):
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_cliente ON dados(cliente)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_empresa ON dados(empresa)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_linha_receita ON dados(linha_receita)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_linha_receita_mes_ano ON dados(linha_receita, mes_ano)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_mes_ao ON dados(mes_ano)')
         elif tipo == 'habilitacoes':
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_habilitacoes_codigo_assessor ON dados(codigo_assessor)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_habilitacoes_ano_mes ON dados(ano_mes)')
@@ -993,6 +1001,14 @@ def importar_csv_para_sqlite(caminho_arquivo, caminho_saida, tipo):
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_transferencias_data_solicitacao ON dados(data_solicitacao)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_transferencias_data_transferencia ON dados(data_transferencia)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_transferencias_status ON dados(status)')
+            # Fluxo mensal por assessor (entradas/saídas de clientes externos) lido
+            # pelo Salão; sem a tabela o loader agrega na hora, então falha só avisa
+            try:
+                from dados_transferencias import materializar_fluxo_mensal
+                n_fluxo = materializar_fluxo_mensal(conn)
+                print(f"Fluxo mensal de transferências: {n_fluxo:,} linhas")
+            except Exception as e:
+                print(f"Aviso: fluxo mensal de transferências não gerado ({e}).")
         elif tipo == 'positivador':
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_assessor ON positivador(Assessor)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_positivador_cliente ON positivador(Cliente)')
@@ -1031,6 +1047,17 @@ def importar_csv_para_sqlite(caminho_arquivo, caminho_saida, tipo):
         print(f"\nArquivo {os.path.basename(caminho_arquivo)} convertido com sucesso para SQLite!")
         print(f"Arquivo gerado: {os.path.abspath(caminho_saida)}")
 
+        if tipo in TIPOS_SCHEMA_TIPADO:
+            # Partições mensais em Parquet (lidas pelos cards do mês/ano corrente);
+            # sem elas os dashboards leem do SQLite, então falha aqui só avisa
+            try:
+                from particoes_positivador import exportar_particoes
+                pasta = exportar_particoes(Path(caminho_saida))
+                if pasta is not None:
+                    print(f"Partições mensais: {pasta}")
+            except Exception as e:
+                print(f"Aviso: partições mensais não geradas ({e}).")
+
     except Exception as e:
         print(f"\nErro ao processar o arquivo {os.path.basename(caminho_arquivo)}:")
         print(str(e))
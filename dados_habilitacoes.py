@@ -0,0 +1,63 @@
+# dados_habilitacoes.py
+# Painel de Habilitações (kpis.PainelHabilitacoes), montado uma vez por
+# geração do DBV Capital_Habilitacoes.db.
+#
+# A tabela 'dados' é lida inteira (poucas linhas por assessor/mês) e os pares
+# realizado/meta são empilhados no formato longo na montagem; páginas e
+# aquecimento só recortam os arrays. Quando o ETL regrava o banco, a geração
+# muda e o painel é remontado. Sem banco (ou sem a tabela), o painel fica
+# vazio.
+#
+# Bancos gravados antes do schema tipado guardam os números como TEXT: a
+# conversão numérica fica na montagem do painel.
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e pelo
+# aquecimento em segundo plano (aquecimento.py).
+
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from db_utils import db_generation, localizar_db
+from instrumentacao import etapa
+from kpis import PainelHabilitacoes
+
+ARQUIVO_HABILITACOES = "DBV Capital_Habilitacoes.db"
+TABELA_HABILITACOES = "dados"
+
+
+def localizar_db_habilitacoes() -> Optional[Path]:
+    return localizar_db(ARQUIVO_HABILITACOES)
+
+
+def _ler_habilitacoes(db_path: Path) -> pd.DataFrame:
+    with sqlite3.connect(str(db_path)) as conn:
+        existe = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?;", (TABELA_HABILITACOES,)
+        ).fetchone()
+        if not existe:
+            return pd.DataFrame()
+        return pd.read_sql_query(f'SELECT * FROM "{TABELA_HABILITACOES}";', conn)
+
+
+@lru_cache(maxsize=2)
+def _painel_por_geracao(db_path: Path, geracao: tuple[int, int]) -> PainelHabilitacoes:
+    with etapa("habilitações: leitura do banco") as med:
+        df = _ler_habilitacoes(db_path)
+        med.linhas_saida = len(df)
+    with etapa("habilitações: formato longo") as med:
+        med.linhas_entrada = len(df)
+        painel = PainelHabilitacoes(df)
+        med.linhas_saida = len(painel)
+    return painel
+
+
+def obter_painel_habilitacoes() -> PainelHabilitacoes:
+    """Painel da geração atual do banco de Habilitações (vazio se não houver banco)."""
+    db_path = localizar_db_habilitacoes()
+    if db_path is None:
+        return PainelHabilitacoes()
+    return _painel_por_geracao(db_path, db_generation(db_path))
@@ -0,0 +1,81 @@
+# dados_nps.py
+# Tabela de respostas NPS, lida uma vez por geração do .db.
+#
+# O banco de NPS pode ter mais de uma tabela: a escolhida é a que, depois de
+# normalizada (kpis.normalizar_colunas_nps), tem mais colunas esperadas
+# (pesquisa, assessor, data de resposta, nota). A descoberta e a leitura
+# entram no cache de loaders (politica_cache) com a geração na chave: quando o
+# ETL regrava o banco, a próxima chamada relê.
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e pelo
+# aquecimento em segundo plano (aquecimento.py).
+
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from db_utils import db_generation, localizar_db
+from instrumentacao import etapa
+from kpis import normalizar_colunas_nps
+from politica_cache import politica
+
+ARQUIVO_NPS = "DBV Capital_NPS.db"
+
+# Linhas lidas de cada tabela para pontuar as candidatas
+LINHAS_AMOSTRA = 200
+
+
+def localizar_db_nps() -> Optional[Path]:
+    return localizar_db(ARQUIVO_NPS)
+
+
+def _pontuar_tabela(conn: sqlite3.Connection, tabela: str) -> int:
+    try:
+        amostra = pd.read_sql_query(f'SELECT * FROM "{tabela}" LIMIT {LINHAS_AMOSTRA};', conn)
+    except Exception:
+        return -1
+    cols = normalizar_colunas_nps(amostra).columns
+    return (
+        int("pesquisa_relacionamento" in cols or "pesquisa_relacionamento_norm" in cols)
+        + int("codigo_assessor" in cols)
+        + int("data_resposta" in cols)
+        + int("nota" in cols)
+    )
+
+
+def _ler_nps(db_path: Path) -> pd.DataFrame:
+    with sqlite3.connect(str(db_path)) as conn:
+        tabelas = [
+            r[0]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';"
+            )
+        ]
+        if not tabelas:
+            raise LookupError("Nenhuma tabela encontrada no banco NPS.")
+        # max() fica com a primeira em caso de empate, como antes
+        candidata = max(tabelas, key=lambda t: _pontuar_tabela(conn, t))
+        df = pd.read_sql_query(f'SELECT * FROM "{candidata}";', conn)
+    return normalizar_colunas_nps(df)
+
+
+# Sem TTL: a geração está na chave (e o aquecimento não reaquece por tempo)
+@politica.cache("nps")
+def _nps_por_geracao(db_path: Path, geracao: tuple[int, int]) -> pd.DataFrame:
+    with etapa("nps: leitura do banco") as med:
+        df = _ler_nps(db_path)
+        med.linhas_saida = len(df)
+        return df
+
+
+def obter_dados_nps() -> Optional[pd.DataFrame]:
+    """
+    Respostas NPS normalizadas da geração atual do banco (None se não houver
+    banco). LookupError se o banco não tiver tabelas.
+    """
+    db_path = localizar_db_nps()
+    if db_path is None:
+        return None
+    return _nps_por_geracao(db_path, db_generation(db_path))
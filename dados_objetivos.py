@@ -0,0 +1,54 @@
+# dados_objetivos.py
+# Índice da tabela objetivos (kpis.IndiceObjetivos), compartilhado por geração
+# do .db.
+#
+# As metas são lidas e indexadas por (ano, coluna) uma única vez por geração
+# do arquivo; quando o banco é regravado, a geração muda e o índice é
+# remontado. Sem banco (ou sem a tabela), o índice fica vazio e as consultas
+# caem nos fallbacks.
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e workers.
+
+import sqlite3
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from db_utils import db_generation, localizar_db
+from instrumentacao import etapa
+from kpis import IndiceObjetivos
+
+ARQUIVO_OBJETIVOS = "DBV Capital_Objetivos.db"
+TABELA_OBJETIVOS = "objetivos"
+
+
+def localizar_db_objetivos() -> Optional[Path]:
+    return localizar_db(ARQUIVO_OBJETIVOS)
+
+
+def _ler_objetivos(db_path: Path) -> pd.DataFrame:
+    with sqlite3.connect(str(db_path)) as conn:
+        existe = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?;", (TABELA_OBJETIVOS,)
+        ).fetchone()
+        if not existe:
+            return pd.DataFrame()
+        return pd.read_sql_query(f'SELECT * FROM "{TABELA_OBJETIVOS}";', conn)
+
+
+@lru_cache(maxsize=2)
+def _indice_por_geracao(db_path: Path, geracao: tuple[int, int]) -> IndiceObjetivos:
+    with etapa("objetivos: índice de metas") as med:
+        df = _ler_objetivos(db_path)
+        med.linhas_saida = len(df)
+        return IndiceObjetivos(df)
+
+
+def obter_indice_objetivos() -> IndiceObjetivos:
+    """Índice de metas da geração atual do banco de Objetivos (vazio se não houver banco)."""
+    db_path = localizar_db_objetivos()
+    if db_path is None:
+        return IndiceObjetivos()
+    return _indice_por_geracao(db_path, db_generation(db_path))
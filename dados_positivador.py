@@ -0,0 +1,410 @@
+# dados_positivador.py
+# Handle único da tabela do Positivador, compartilhado por geração do .db.
+#
+# A tabela é lida (com colunas Categorical) e tratada uma única vez por
+# geração do arquivo, sob demanda, e o mesmo objeto atende todas as sessões
+# do processo. Os DataFrames expostos são compartilhados: quem precisar
+# alterar colunas deve trabalhar sobre uma cópia.
+#
+# Perguntas de metadados (última data de posição, meses disponíveis) são
+# respondidas direto no SQLite por metadados_positivador(), sem carregar a
+# tabela.
+#
+# Recortes por mês (DadosPositivador.meses/ano_corrente) leem só as partições mensais
+# pedidas (particoes_positivador.py) ou, sem export atual, fazem range scan em
+# Data_Posicao no SQLite: os cards do mês/ano corrente não dependem do tamanho
+# do histórico.
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e workers.
+
+import sqlite3
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from db_utils import (
+    CATEGORICAL_POSITIVADOR,
+    db_generation,
+    localizar_db,
+    read_table_shared,
+    to_shared_categoricals,
+)
+from instrumentacao import etapa
+from kpis import (
+    SerieMensal,
+    converter_data_posicao,
+    obter_auc_inicial_ano,
+    rollup_mensal,
+    tratar_dados_positivador_mtd,
+)
+
+ARQUIVOS_POSITIVADOR = ("DBV Capital_Positivador.db", "DBV Capital_Positivador_MTD.db")
+TABELAS_POSITIVADOR = ("positivador", "positivador_mtd")
+# Métricas agregadas por (mês, assessor) para os rankings da TV
+METRICAS_RANKING = ("Captacao_Liquida_em_M", "Net_Em_M")
+# Nome gravado pelo conversor (ISO, indexado) e nome do export bruto (dd/mm/aaaa)
+COLUNAS_DATA_POSICAO = ("Data_Posicao", "Data Posição")
+
+
+def localizar_db_positivador() -> Optional[Path]:
+    """Banco novo (DBV Capital_Positivador.db) ou, na falta dele, o antigo MTD."""
+    return localizar_db(*ARQUIVOS_POSITIVADOR)
+
+
+def _tabela_positivador(conn: sqlite3.Connection) -> Optional[str]:
+    """positivador > positivador_mtd > primeira tabela do banco."""
+    tabs = [
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid;"
+        )
+    ]
+    if not tabs:
+        return None
+    return next((t for t in TABELAS_POSITIVADOR if t in tabs), tabs[0])
+
+
+def _schema_tipado(conn: sqlite3.Connection, table: str) -> bool:
+    """
+    Tabela gravada pelo conversor com schema tipado (métricas REAL, datas ISO):
+    somas e filtros por data podem ir direto para o SQLite.
+    """
+    tipos = {r[1]: (r[2] or "").upper() for r in conn.execute(f'PRAGMA table_info("{table}");')}
+    return tipos.get("Net_Em_M") == "REAL" and "Data_Posicao" in tipos
+
+
+class DadosPositivador:
+    """
+    Visões da tabela do Positivador calculadas sob demanda e guardadas:
+    - bruto:   tabela como está no banco (texto repetitivo como Categorical),
+      via cache compartilhado entre processos (somente leitura)
+    - tratado: colunas normalizadas (kpis.tratar_dados_positivador_mtd)
+    - mensal:  AUC e clientes com AUC > 0 por mês (gráfico de crescimento)
+    - mensal_assessor: métricas por (mês, assessor), base dos rankings
+      (kpis.ranking_assessores)
+    - serie(coluna): série mensal com soma acumulada do agregado mensal, para
+      janelas móveis e comparativos (kpis.periodos)
+    - meses(lista) / ano_corrente: tratado só dos meses pedidos, lido das
+      partições mensais (ou do SQLite) sem carregar o histórico; e
+      mensal_assessor_corrente, o mensal_assessor desse recorte
+
+    Em bancos com schema tipado (converter_para_sqlite) o agregado mensal e o
+    AUC inicial do ano são calculados no SQLite (SUM por mês; MIN/SUM com
+    range scan no índice de Data_Posicao), sem depender do tratado.
+    """
+
+    def __init__(self, db_path: Path, geracao: tuple[int, int]):
+        self.db_path = Path(db_path)
+        self.geracao = geracao
+        self._lock = Lock()
+        self._bruto: Optional[pd.DataFrame] = None
+        self._tratado: Optional[pd.DataFrame] = None
+        self._mensal: Optional[pd.DataFrame] = None
+        self._mensal_assessor: Optional[pd.DataFrame] = None
+        self._mensal_assessor_corrente: Optional[pd.DataFrame] = None
+        self._auc_inicial: Dict[int, float] = {}
+        self._series: Dict[str, SerieMensal] = {}
+        self._recortes: Dict[Tuple[str, ...], pd.DataFrame] = {}
+        self._tabela_sql: Optional[Tuple[str, Tuple[str, ...]]] = None
+        self._tabela_sql_lida = False
+
+    def tabela_tipada(self) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """(tabela, colunas) se o banco tem schema tipado; None caso contrário."""
+        if not self._tabela_sql_lida:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                table = _tabela_positivador(conn)
+                if table is not None and _schema_tipado(conn, table):
+                    colunas = tuple(r[1] for r in conn.execute(f'PRAGMA table_info("{table}");'))
+                    self._tabela_sql = (table, colunas)
+            self._tabela_sql_lida = True
+        return self._tabela_sql
+
+    def _ler_tabela(self) -> pd.DataFrame:
+        with sqlite3.connect(str(self.db_path)) as conn:
+            table = _tabela_positivador(conn)
+        if table is None:
+            return pd.DataFrame()
+        # Publicada uma vez por geração no cache entre processos (mmap)
+        return read_table_shared(self.db_path, table, categorical=CATEGORICAL_POSITIVADOR)
+
+    @property
+    def bruto(self) -> pd.DataFrame:
+        if self._bruto is None:
+            with self._lock:
+                if self._bruto is None:
+                    with etapa("positivador: leitura do banco") as med:
+                        self._bruto = self._ler_tabela()
+                        med.linhas_saida = len(self._bruto)
+        return self._bruto
+
+    @property
+    def tratado(self) -> pd.DataFrame:
+        if self._tratado is None:
+            bruto = self.bruto
+            with self._lock:
+                if self._tratado is None:
+                    with etapa("positivador: tratamento", linhas_entrada=len(bruto)):
+                        self._tratado = tratar_dados_positivador_mtd(bruto.copy())
+        return self._tratado
+
+    @property
+    def mensal(self) -> pd.DataFrame:
+        """
+        Colunas: ano_mes (AAAA-MM), Net_Em_M, Captacao_Liquida_em_M (se houver),
+        clientes_positivo, data (1º dia do mês).
+        """
+        if self._mensal is None and self.tabela_tipada() is not None:
+            with self._lock:
+                if self._mensal is None:
+                    with etapa("positivador: agregado mensal (SQL)") as med:
+                        self._mensal = self._agregar_mensal_sql()
+                        med.linhas_saida = len(self._mensal)
+        if self._mensal is None:
+            df = self.tratado
+            with self._lock:
+                if self._mensal is None:
+                    with etapa("positivador: agregado mensal", linhas_entrada=len(df)):
+                        self._mensal = self._agregar_mensal(df)
+        return self._mensal
+
+    @property
+    def mensal_assessor(self) -> pd.DataFrame:
+        """kpis.rollup_mensal do tratado para METRICAS_RANKING, por assessor_code."""
+        if self._mensal_assessor is None:
+            df = self.tratado
+            with self._lock:
+                if self._mensal_assessor is None:
+                    with etapa("positivador: agregado mensal por assessor", linhas_entrada=len(df)) as med:
+                        self._mensal_assessor = rollup_mensal(df, METRICAS_RANKING)
+                        med.linhas_saida = len(self._mensal_assessor)
+        return self._mensal_assessor
+
+    @property
+    def mensal_assessor_corrente(self) -> pd.DataFrame:
+        """
+        mensal_assessor só do ano corrente (ver ano_corrente). Os rankings pegam
+        o último mês/ano com valor != 0: se o ano corrente não tiver nenhum em
+        alguma métrica, devolve o mensal_assessor completo.
+        """
+        if self._mensal_assessor_corrente is None:
+            df = self.ano_corrente
+            with etapa("positivador: agregado mensal por assessor (ano corrente)", linhas_entrada=len(df)):
+                rollup = rollup_mensal(df, METRICAS_RANKING)
+            ativos = [f"{m}__n" for m in METRICAS_RANKING if f"{m}__n" in rollup.columns]
+            if rollup.empty or not all((rollup[c] > 0).any() for c in ativos):
+                rollup = self.mensal_assessor
+            with self._lock:
+                if self._mensal_assessor_corrente is None:
+                    self._mensal_assessor_corrente = rollup
+        return self._mensal_assessor_corrente
+
+    @staticmethod
+    def _agregar_mensal(df: pd.DataFrame) -> pd.DataFrame:
+        somas = [c for c in ("Net_Em_M", "Captacao_Liquida_em_M") if c in df.columns]
+        colunas = ["ano_mes", *somas, "clientes_positivo", "data"]
+        if df.empty or not {"Data_Posicao", "Net_Em_M"} <= set(df.columns):
+            return pd.DataFrame(columns=colunas)
+
+        ano_mes = df["Data_Posicao"].dt.strftime("%Y-%m")
+        auc = df.groupby(ano_mes)[somas].sum().rename_axis("ano_mes").reset_index()
+        positivo = df["Net_Em_M"] > 0
+        clientes = (
+            df[positivo].groupby(ano_mes[positivo]).size()
+            .rename_axis("ano_mes").reset_index(name="clientes_positivo")
+        )
+        out = pd.merge(auc, clientes, on="ano_mes", how="outer").fillna(0)
+        out["data"] = pd.to_datetime(out["ano_mes"] + "-01")
+        return out.sort_values("data")[colunas]
+
+    def _agregar_mensal_sql(self) -> pd.DataFrame:
+        """Mesmo resultado de _agregar_mensal, com SUM/COUNT por mês no SQLite."""
+        table, colunas_db = self.tabela_tipada()
+        somas = [c for c in ("Net_Em_M", "Captacao_Liquida_em_M") if c in colunas_db]
+        colunas = ["ano_mes", *somas, "clientes_positivo", "data"]
+        # TOTAL (e não SUM) devolve 0.0 em meses só com NULL, como o sum() do pandas
+        expr_somas = "".join(f'TOTAL("{c}") AS "{c}", ' for c in somas)
+        sql = (
+            f'SELECT substr("Data_Posicao", 1, 7) AS ano_mes, {expr_somas}'
+            f'COUNT(CASE WHEN "Net_Em_M" > 0 THEN 1 END) AS clientes_positivo '
+            f'FROM "{table}" WHERE "Data_Posicao" IS NOT NULL AND "Data_Posicao" <> \'\' '
+            f"GROUP BY 1 ORDER BY 1;"
+        )
+        with sqlite3.connect(str(self.db_path)) as conn:
+            out = pd.read_sql_query(sql, conn)
+        out["data"] = pd.to_datetime(out["ano_mes"] + "-01")
+        return out[colunas]
+
+    def _auc_inicial_sql(self, ano: int) -> float:
+        """SUM(Net_Em_M) na primeira Data_Posicao do ano (range scan no índice)."""
+        table, _ = self.tabela_tipada()
+        sql = (
+            f'SELECT TOTAL("Net_Em_M") FROM "{table}" WHERE "Data_Posicao" = '
+            f'(SELECT MIN("Data_Posicao") FROM "{table}" WHERE "Data_Posicao" >= ? AND "Data_Posicao" < ?);'
+        )
+        with sqlite3.connect(str(self.db_path)) as conn:
+            return float(conn.execute(sql, (f"{ano}-01-01", f"{ano + 1}-01-01")).fetchone()[0])
+
+    def serie(self, coluna: str) -> SerieMensal:
+        """Série mensal de 'coluna' do agregado mensal (ex.: Net_Em_M, Captacao_Liquida_em_M)."""
+        if coluna not in self._series:
+            self._series[coluna] = SerieMensal.de_frame(self.mensal, coluna)
+        return self._series[coluna]
+
+    def _ler_meses(self, meses: Tuple[str, ...]) -> pd.DataFrame:
+        """Linhas brutas dos meses: partições > range scan no SQLite > filtro do bruto."""
+        from particoes_positivador import ler_meses
+
+        tipada = self.tabela_tipada()
+        if tipada is None:
+            bruto = self.bruto
+            return bruto[_ano_mes_bruto(bruto).isin(meses)]
+
+        with etapa("positivador: partições mensais (Parquet)") as med:
+            df = ler_meses(self.db_path, meses)
+            med.linhas_saida = None if df is None else len(df)
+        if df is None:
+            table, _ = tipada
+            faixas = " OR ".join('("Data_Posicao" >= ? AND "Data_Posicao" < ?)' for _ in meses)
+            params = [v for m in meses for v in (f"{m}-01", _mes_seguinte(m))]
+            with etapa("positivador: recorte por mês (SQL)") as med, sqlite3.connect(str(self.db_path)) as conn:
+                df = pd.read_sql_query(f'SELECT * FROM "{table}" WHERE {faixas or "0"};', conn, params=params)
+                med.linhas_saida = len(df)
+        return to_shared_categoricals(df, CATEGORICAL_POSITIVADOR, self.db_path)
+
+    def meses(self, meses: Iterable[str]) -> pd.DataFrame:
+        """
+        Tratado só dos meses pedidos (AAAA-MM), mesmas colunas do tratado.
+        Guardado por conjunto de meses; compartilhado (não alterar).
+        """
+        chave = tuple(sorted(set(meses)))
+        if chave not in self._recortes:
+            # Fora do lock: sem schema tipado a leitura passa pelo bruto (que trava)
+            with etapa("positivador: recorte por mês") as med:
+                bruto = self._ler_meses(chave)
+                med.linhas_entrada = len(bruto)
+                recorte = tratar_dados_positivador_mtd(bruto.copy())
+            with self._lock:
+                self._recortes.setdefault(chave, recorte)
+        return self._recortes[chave]
+
+    @property
+    def ano_corrente(self) -> pd.DataFrame:
+        """
+        Recorte dos cards da TV: meses do ano da última posição do banco (o
+        mês de referência é o último deles). Sem datas válidas, o tratado.
+        """
+        meta = _metadados_por_geracao(self.db_path, self.geracao)
+        if not meta.meses:
+            return self.tratado
+        ano = meta.meses[-1][:4]
+        return self.meses(m for m in meta.meses if m.startswith(f"{ano}-"))
+
+    def auc_inicial_ano(self, ano: int) -> float:
+        """Soma do Net_Em_M na primeira posição do ano (ver kpis.obter_auc_inicial_ano)."""
+        if ano not in self._auc_inicial:
+            if self.tabela_tipada() is not None:
+                self._auc_inicial[ano] = self._auc_inicial_sql(ano)
+            else:
+                self._auc_inicial[ano] = obter_auc_inicial_ano(self.tratado, ano)
+        return self._auc_inicial[ano]
+
+
+def _mes_seguinte(mes: str) -> str:
+    """'2025-12' -> '2026-01-01' (limite superior exclusivo da faixa do mês)."""
+    ano, m = int(mes[:4]), int(mes[5:7])
+    return f"{ano + m // 12}-{m % 12 + 1:02d}-01"
+
+
+def _ano_mes_bruto(df: pd.DataFrame) -> pd.Series:
+    """AAAA-MM de cada linha do bruto (Data_Posicao ISO ou 'Data Posição' dd/mm/aaaa)."""
+    coluna = next((c for c in COLUNAS_DATA_POSICAO if c in df.columns), None)
+    if coluna is None:
+        return pd.Series("", index=df.index)
+    return converter_data_posicao(df[coluna]).dt.strftime("%Y-%m")
+
+
+@lru_cache(maxsize=2)
+def _dados_por_geracao(db_path: Path, geracao: tuple[int, int]) -> DadosPositivador:
+    return DadosPositivador(db_path, geracao)
+
+
+def obter_dados_positivador() -> Optional[DadosPositivador]:
+    """
+    Handle da geração atual do banco do Positivador (None se não houver banco).
+    Quando o ETL regrava o .db, a geração muda e um novo handle é criado.
+    """
+    db_path = localizar_db_positivador()
+    if db_path is None:
+        return None
+    return _dados_por_geracao(db_path, db_generation(db_path))
+
+
+# =============================================================================
+# METADADOS (SEM CARREGAR A TABELA)
+# =============================================================================
+
+@dataclass(frozen=True)
+class MetadadosPositivador:
+    ultima_data: Optional[pd.Timestamp]
+    meses: Tuple[str, ...]  # AAAA-MM, em ordem crescente
+
+
+def _expr_data_iso(coluna: str) -> str:
+    """Expressão SQL que devolve a data como AAAA-MM-DD (aceita ISO ou dd/mm/aaaa)."""
+    c = f'"{coluna}"'
+    return (
+        f"CASE WHEN {c} LIKE '__/__/____%' "
+        f"THEN substr({c}, 7, 4) || '-' || substr({c}, 4, 2) || '-' || substr({c}, 1, 2) "
+        f"ELSE substr({c}, 1, 10) END"
+    )
+
+
+def _ler_metadados(db_path: Path) -> MetadadosPositivador:
+    vazio = MetadadosPositivador(ultima_data=None, meses=())
+    with sqlite3.connect(str(db_path)) as conn:
+        table = _tabela_positivador(conn)
+        if table is None:
+            return vazio
+        colunas = {r[1] for r in conn.execute(f'PRAGMA table_info("{table}");')}
+        coluna = next((c for c in COLUNAS_DATA_POSICAO if c in colunas), None)
+        if coluna is None:
+            return vazio
+
+        if coluna == "Data_Posicao":
+            # Gravada em ISO pelo conversor e indexada: MAX e DISTINCT usam o índice
+            expr = f'substr("{coluna}", 1, 10)'
+            ultima = conn.execute(f'SELECT MAX("{coluna}") FROM "{table}";').fetchone()[0]
+        else:
+            expr = _expr_data_iso(coluna)
+            ultima = conn.execute(f'SELECT MAX({expr}) FROM "{table}";').fetchone()[0]
+        meses = conn.execute(
+            f'SELECT DISTINCT substr({expr}, 1, 7) AS m FROM "{table}" '
+            f'WHERE "{coluna}" IS NOT NULL AND "{coluna}" <> \'\' ORDER BY m;'
+        ).fetchall()
+
+    ultima_ts = pd.to_datetime(ultima, errors="coerce") if ultima else None
+    return MetadadosPositivador(
+        ultima_data=None if ultima_ts is None or pd.isna(ultima_ts) else ultima_ts,
+        meses=tuple(m[0] for m in meses if m[0]),
+    )
+
+
+@lru_cache(maxsize=2)
+def _metadados_por_geracao(db_path: Path, geracao: tuple[int, int]) -> MetadadosPositivador:
+    with etapa("positivador: metadados (SQL)"):
+        return _ler_metadados(db_path)
+
+
+def metadados_positivador() -> Optional[MetadadosPositivador]:
+    """
+    Última data de posição e meses disponíveis do banco do Positivador, lidos
+    por consulta (MAX/DISTINCT) e guardados por geração do arquivo.
+    None se não houver banco.
+    """
+    db_path = localizar_db_positivador()
+    if db_path is None:
+        return None
+    return _metadados_por_geracao(db_path, db_generation(db_path))
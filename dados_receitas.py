@@ -0,0 +1,198 @@
+# dados_receitas.py
+# Agregados da tabela 'dados' do DBV Capital_Receitas.db, sempre calculados no
+# SQLite (SUM/COUNT com GROUP BY), nunca carregando a tabela no pandas.
+#
+# Todo filtro vira predicado com parâmetros ligados (?), sobre colunas
+# indexadas pelo conversor:
+#   - escopo da sessão        -> linha_receita IN (...) das linhas do head
+#                                (db_utils.RevenueScope / read_sql_scoped)
+#   - linhas marcadas         -> linha_receita IN (...)
+#   - mes_ano >= ? / <= ?     -> período (AAAA-MM)
+#   - categoria / assessor IN (...)
+# Com o período limitado, o custo de cada gráfico depende das linhas do
+# período, não do tamanho do histórico.
+#
+# As leituras passam por db_utils.read_sql_scoped, que guarda cada resultado
+# no cache de loaders (politica_cache) por geração do banco, SQL, parâmetros
+# e escopo: heads com as mesmas linhas dividem o cache.
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e pelo
+# aquecimento em segundo plano (aquecimento.py).
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from db_utils import SCOPE_MARKER, RevenueScope, localizar_db, read_sql_scoped
+
+ARQUIVO_RECEITAS = "DBV Capital_Receitas.db"
+TABELA_RECEITAS = "dados"
+
+# Métricas somadas nos agregados (coluna -> rótulo)
+METRICAS_RECEITA: Dict[str, str] = {
+    "receita_bruta_total": "Receita Bruta",
+    "receita_liquida_total": "Receita Líquida",
+    "receita_bruta_escritorio": "Receita Bruta Escritório",
+    "receita_liquida_escritorio": "Receita Líquida Escritório",
+    "repasse_assessor_valor": "Repasse Assessor",
+    "repasse_dbv_valor": "Repasse DBV",
+    "repasse_mesa_valor": "Repasse Mesa",
+    "imposto_valor": "Imposto",
+}
+
+# Colunas aceitas em GROUP BY (nomes de coluna não podem ser parâmetros ligados)
+DIMENSOES_RECEITA = ("linha_receita", "categoria", "produto", "assessor", "fonte_receita", "empresa", "mesa")
+
+
+def localizar_db_receitas() -> Optional[Path]:
+    return localizar_db(ARQUIVO_RECEITAS)
+
+
+# =============================================================================
+# FILTROS
+# =============================================================================
+
+def rotulo_vazio(dimensao: str) -> str:
+    """Rótulo de por_dimensao para valores vazios/NULL (ex.: '(sem categoria)')."""
+    return f"(sem {dimensao})"
+
+
+@dataclass(frozen=True)
+class FiltroReceitas:
+    """
+    Filtro da página. `escopo` são as linhas que a sessão pode ver (sempre
+    aplicado); `linhas` são as marcadas na página: None não restringe além do
+    escopo, uma tupla vazia não devolve nada.
+    """
+
+    escopo: RevenueScope = RevenueScope()
+    linhas: Optional[Tuple[str, ...]] = None
+    mes_inicio: Optional[str] = None  # AAAA-MM, inclusivo
+    mes_fim: Optional[str] = None  # AAAA-MM, inclusivo
+    categorias: Tuple[str, ...] = ()
+    assessores: Tuple[str, ...] = ()
+
+    def where(self) -> Tuple[str, List[str]]:
+        """
+        Cláusula WHERE e parâmetros ligados, na ordem dos '?'. Começa pelo
+        marcador do escopo, preenchido por db_utils.read_sql_scoped.
+        """
+        condicoes: List[str] = [SCOPE_MARKER]
+        params: List[str] = []
+
+        def _em(coluna: str, valores: Sequence[str]) -> None:
+            if not valores:
+                condicoes.append("0")
+                return
+            # O rótulo de vazio de por_dimensao volta a ser NULL/''
+            reais = [v for v in valores if v != rotulo_vazio(coluna)]
+            alternativas = [f"{coluna} IN ({', '.join('?' * len(reais))})"] if reais else []
+            if len(reais) < len(valores):
+                alternativas.append(f"({coluna} IS NULL OR {coluna} = '')")
+            condicoes.append(alternativas[0] if len(alternativas) == 1 else f"({' OR '.join(alternativas)})")
+            params.extend(reais)
+
+        if self.linhas is not None:
+            _em("linha_receita", self.linhas)
+        if self.mes_inicio:
+            condicoes.append("mes_ano >= ?")
+            params.append(self.mes_inicio)
+        if self.mes_fim:
+            condicoes.append("mes_ano <= ?")
+            params.append(self.mes_fim)
+        if self.categorias:
+            _em("categoria", self.categorias)
+        if self.assessores:
+            _em("assessor", self.assessores)
+        return f"WHERE {' AND '.join(condicoes)}", params
+
+
+# =============================================================================
+# CONSULTAS
+# =============================================================================
+
+def _executar(sql: str, escopo: RevenueScope, params: Sequence[str] = ()) -> pd.DataFrame:
+    db_path = localizar_db_receitas()
+    if db_path is None:
+        raise FileNotFoundError(f"Banco {ARQUIVO_RECEITAS} não encontrado.")
+    return read_sql_scoped(sql, db_path, escopo, params)
+
+
+def _somas(metricas: Sequence[str]) -> str:
+    for m in metricas:
+        if m not in METRICAS_RECEITA:
+            raise ValueError(f"Métrica desconhecida: {m!r}")
+    # TOTAL devolve 0.0 (e não NULL) quando não há linhas
+    return ", ".join(f"TOTAL({m}) AS {m}" for m in metricas)
+
+
+def linhas_disponiveis(escopo: RevenueScope = RevenueScope()) -> List[str]:
+    """Linhas de receita do banco visíveis no escopo (DISTINCT no índice de linha_receita)."""
+    df = _executar(
+        f"SELECT DISTINCT linha_receita FROM {TABELA_RECEITAS} "
+        f"WHERE {SCOPE_MARKER} AND linha_receita IS NOT NULL AND linha_receita <> '' ORDER BY 1;",
+        escopo,
+    )
+    return df["linha_receita"].tolist()
+
+
+def meses_disponiveis(filtro: FiltroReceitas = FiltroReceitas()) -> List[str]:
+    """Meses (AAAA-MM) com lançamentos dentro do filtro, em ordem crescente."""
+    where, params = filtro.where()
+    df = _executar(
+        f"SELECT DISTINCT mes_ano FROM {TABELA_RECEITAS} {where} AND mes_ano IS NOT NULL ORDER BY 1;",
+        filtro.escopo,
+        params,
+    )
+    return df["mes_ano"].tolist()
+
+
+def totais(filtro: FiltroReceitas, metricas: Sequence[str] = tuple(METRICAS_RECEITA)) -> Dict[str, float]:
+    """Soma das métricas, nº de lançamentos e de clientes distintos no filtro."""
+    where, params = filtro.where()
+    df = _executar(
+        f"SELECT {_somas(metricas)}, COUNT(*) AS lancamentos, COUNT(DISTINCT cliente) AS clientes "
+        f"FROM {TABELA_RECEITAS} {where};",
+        filtro.escopo,
+        params,
+    )
+    return {c: float(df.at[0, c] or 0) for c in df.columns}
+
+
+def por_mes(
+    filtro: FiltroReceitas,
+    metricas: Sequence[str] = ("receita_bruta_total", "receita_liquida_total"),
+) -> pd.DataFrame:
+    """Colunas: mes_ano, métricas pedidas."""
+    where, params = filtro.where()
+    return _executar(
+        f"SELECT mes_ano, {_somas(metricas)} FROM {TABELA_RECEITAS} {where} AND mes_ano IS NOT NULL "
+        "GROUP BY mes_ano ORDER BY mes_ano;",
+        filtro.escopo,
+        params,
+    )
+
+
+def por_dimensao(
+    filtro: FiltroReceitas,
+    dimensao: str,
+    metrica: str = "receita_bruta_total",
+    n: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Soma de 'metrica' por 'dimensao' (linha_receita, categoria, produto,
+    assessor, ...), da maior para a menor; `n` limita ao Top N.
+    """
+    if dimensao not in DIMENSOES_RECEITA:
+        raise ValueError(f"dimensao deve ser uma de {DIMENSOES_RECEITA}: {dimensao!r}")
+    where, params = filtro.where()
+    limite = f" LIMIT {int(n)}" if n else ""
+    return _executar(
+        f"SELECT COALESCE(NULLIF({dimensao}, ''), '{rotulo_vazio(dimensao)}') AS {dimensao}, {_somas([metrica])}, "
+        f"COUNT(*) AS lancamentos FROM {TABELA_RECEITAS} {where} "
+        f"GROUP BY 1 ORDER BY 2 DESC{limite};",
+        filtro.escopo,
+        params,
+    )
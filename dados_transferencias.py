@@ -0,0 +1,171 @@
+# dados_transferencias.py
+# Fluxo mensal de transferências de clientes externos (DBV Capital_Transferências.db):
+# entradas e saídas (quantidade e PL) por assessor e mês, numa única passada.
+#
+# Regras (as mesmas do debug_transferencias.py):
+#   - só cliente = 'Externo' e status = 'Concluído', com PL preenchido
+#   - mês efetivo = data de solicitação ou, sem ela, data de transferência
+#     (aceita AAAA-MM-DD... e DD/MM/AAAA)
+#   - entrada conta para o assessor de destino; saída, para o de origem
+#     (na falta de um, usa o outro)
+#
+# O conversor (converter_para_sqlite.py) grava o resultado na tabela
+# 'fluxo_mensal' do próprio banco logo depois da importação; como o .db é
+# recriado a cada importação, a tabela sempre corresponde a 'dados'. Bancos
+# sem a tabela (gravados antes dela) são agregados na hora com o mesmo SQL.
+# O resultado entra no cache de loaders (politica_cache) com a geração do
+# banco na chave, sem TTL.
+#
+# Uso (materializar num banco já existente):
+#     python dados_transferencias.py ["DBV Capital_Transferências.db"]
+#
+# Não importa Streamlit: pode ser usado por páginas, benchmarks e pelo
+# aquecimento em segundo plano (aquecimento.py).
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from db_utils import db_generation, localizar_db
+from instrumentacao import etapa
+from politica_cache import politica
+
+ARQUIVO_TRANSFERENCIAS = "DBV Capital_Transferências.db"
+TABELA_TRANSFERENCIAS = "dados"
+TABELA_FLUXO_MENSAL = "fluxo_mensal"
+
+CLIENTE_EXTERNO = "Externo"
+STATUS_CONCLUIDO = "Concluído"
+TIPO_SAIDA = "Saída"
+
+_PARAMS = {"cliente": CLIENTE_EXTERNO, "status": STATUS_CONCLUIDO, "saida": TIPO_SAIDA}
+
+# Uma passada em 'dados': filtro, mês efetivo, assessor e somas de entrada e
+# saída no mesmo GROUP BY. Datas vazias ou '-' não começam com dígito.
+SQL_FLUXO_MENSAL = """
+WITH t AS (
+    SELECT
+        COALESCE(
+            CASE WHEN data_solicitacao GLOB '[0-9]*' THEN data_solicitacao END,
+            CASE WHEN data_transferencia GLOB '[0-9]*' THEN data_transferencia END
+        ) AS data_efetiva,
+        tipo = :saida AS saida,
+        CASE WHEN tipo = :saida
+            THEN COALESCE(NULLIF(codigo_assessor_origem, ''), NULLIF(codigo_assessor_destino, ''))
+            ELSE COALESCE(NULLIF(codigo_assessor_destino, ''), NULLIF(codigo_assessor_origem, ''))
+        END AS codigo_assessor,
+        CAST(pl AS REAL) AS pl
+    FROM dados
+    WHERE cliente = :cliente AND status = :status AND pl IS NOT NULL AND pl <> ''
+)
+SELECT
+    CASE WHEN instr(data_efetiva, '/') > 0
+        THEN substr(data_efetiva, 7, 4) || '-' || substr(data_efetiva, 4, 2)
+        ELSE substr(data_efetiva, 1, 7)
+    END AS ano_mes,
+    COALESCE(codigo_assessor, '') AS codigo_assessor,
+    SUM(NOT saida) AS entradas,
+    TOTAL(CASE WHEN NOT saida THEN pl END) AS pl_entrada,
+    SUM(saida) AS saidas,
+    TOTAL(CASE WHEN saida THEN pl END) AS pl_saida
+FROM t
+WHERE data_efetiva IS NOT NULL
+GROUP BY 1, 2
+ORDER BY 1, 2
+"""
+
+COLUNAS_FLUXO = ["ano_mes", "codigo_assessor", "entradas", "pl_entrada", "saidas", "pl_saida", "pl_liquido"]
+
+
+def localizar_db_transferencias() -> Optional[Path]:
+    return localizar_db(ARQUIVO_TRANSFERENCIAS)
+
+
+def _existe_tabela(conn: sqlite3.Connection, tabela: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?;", (tabela,)
+    ).fetchone() is not None
+
+
+# =============================================================================
+# ETL
+# =============================================================================
+
+def materializar_fluxo_mensal(conn: sqlite3.Connection) -> int:
+    """
+    (Re)grava a tabela fluxo_mensal a partir de 'dados' na conexão dada.
+    Devolve o número de linhas (assessor x mês) gravadas.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f'DROP TABLE IF EXISTS "{TABELA_FLUXO_MENSAL}";')
+    cursor.execute(f'''
+        CREATE TABLE "{TABELA_FLUXO_MENSAL}" (
+            ano_mes TEXT,
+            codigo_assessor TEXT,
+            entradas INTEGER,
+            pl_entrada REAL,
+            saidas INTEGER,
+            pl_saida REAL,
+            PRIMARY KEY (ano_mes, codigo_assessor)
+        )
+    ''')
+    cursor.execute(f'INSERT INTO "{TABELA_FLUXO_MENSAL}" {SQL_FLUXO_MENSAL};', _PARAMS)
+    conn.commit()
+    return conn.execute(f'SELECT COUNT(*) FROM "{TABELA_FLUXO_MENSAL}";').fetchone()[0]
+
+
+# =============================================================================
+# LEITURA
+# =============================================================================
+
+def _ler_fluxo(db_path: Path) -> pd.DataFrame:
+    with sqlite3.connect(str(db_path)) as conn:
+        if _existe_tabela(conn, TABELA_FLUXO_MENSAL):
+            df = pd.read_sql_query(f'SELECT * FROM "{TABELA_FLUXO_MENSAL}" ORDER BY 1, 2;', conn)
+        elif _existe_tabela(conn, TABELA_TRANSFERENCIAS):
+            df = pd.read_sql_query(SQL_FLUXO_MENSAL, conn, params=_PARAMS)
+        else:
+            return pd.DataFrame(columns=COLUNAS_FLUXO)
+    df["pl_liquido"] = df["pl_entrada"] - df["pl_saida"]
+    return df[COLUNAS_FLUXO]
+
+
+# Sem TTL: a geração está na chave (e o aquecimento não reaquece por tempo)
+@politica.cache("transferências")
+def _fluxo_por_geracao(db_path: Path, geracao: tuple[int, int]) -> pd.DataFrame:
+    with etapa("transferências: fluxo mensal") as med:
+        df = _ler_fluxo(db_path)
+        med.linhas_saida = len(df)
+        return df
+
+
+def obter_fluxo_transferencias() -> Optional[pd.DataFrame]:
+    """
+    Fluxo por mês (AAAA-MM) e assessor da geração atual do banco (None se não
+    houver banco). Colunas: COLUNAS_FLUXO.
+    """
+    db_path = localizar_db_transferencias()
+    if db_path is None:
+        return None
+    return _fluxo_por_geracao(db_path, db_generation(db_path))
+
+
+def transferencias_do_mes(fluxo: Optional[pd.DataFrame], ano_mes: str) -> Dict[str, float]:
+    """Totais do escritório no mês (AAAA-MM): entradas, saídas, PL de cada lado e líquido."""
+    chaves = ("entradas", "pl_entrada", "saidas", "pl_saida", "pl_liquido")
+    if fluxo is None or fluxo.empty:
+        return dict.fromkeys(chaves, 0.0)
+    mes = fluxo[fluxo["ano_mes"] == ano_mes]
+    return {c: float(mes[c].sum()) for c in chaves}
+
+
+if __name__ == "__main__":
+    alvo = Path(sys.argv[1]) if len(sys.argv) > 1 else localizar_db_transferencias()
+    if alvo is None or not Path(alvo).exists():
+        sys.exit("Banco de Transferências não encontrado.")
+    with sqlite3.connect(str(alvo)) as conn:
+        n = materializar_fluxo_mensal(conn)
+    print(f"Tabela {TABELA_FLUXO_MENSAL} gravada em {alvo}: {n} linhas.")
@@ -1,61 +1,109 @@
-import streamlit as st
+# dashboard.py
+# Cards de clientes FeeBased por status (todos, ativos + aprovados, ativos,
+# aprovados, pendentes).
+#
+# Fonte: o CSV enviado no upload ou, sem upload, o DBV Capital_FeeBased.db.
+# Os cards saem de uma única agregação por (Status, cliente) (kpis/feebased.py):
+#   - upload: lido por utils.load_data_rapido (cache pelo sha256 do
+#     conteúdo) e agregado uma vez por sha256; reenviar o mesmo arquivo ou
+#     qualquer rerun não relê o CSV. PL/taxa não numéricos ficam NaN (fora
+#     das somas e da média), como no caminho do banco
+#   - banco: só para sessão com login (sem login a página espera o upload,
+#     como antes). O GROUP BY roda no SQLite (db_utils.read_sql_scoped, cache
+#     por geração do .db), com o escopo de receita da sessão
+#     (auth.user_revenue_scope): head sem "Fee Based" não recebe linhas
+
 import pandas as pd
+import streamlit as st
+
+from auth import user_revenue_scope
+from db_utils import SCOPE_MARKER, RevenueScope, get_db_path_fee_based, read_sql_scoped
+from kpis import agregar_status_cliente, kpis_feebased
+from kpis.feebased import COL_CLIENTE, COL_STATUS
+from politica_cache import politica
+from utils import arquivo_csv, load_data_rapido
 
 st.set_page_config(page_title="Dashboard Clientes", layout="wide")
 st.title("Dashboard de Clientes")
 
-# Função para calcular KPIs
-def calcular_kpis(df):
-    n_clientes = df['Código do Cliente'].nunique()
-    pl_total = df['PL'].sum()
-    taxa_media = df['Taxa contratada'].mean()
-    return n_clientes, pl_total, taxa_media
+
+# =============================================================================
+# FONTES
+# =============================================================================
+
+@politica.cache("feebased: cards do upload", ttl_s=30 * 60)
+def kpis_upload(sha256: str, *, _df: pd.DataFrame) -> pd.DataFrame:
+    """Cards do upload de conteúdo `sha256` (o DataFrame fica fora da chave)."""
+    return kpis_feebased(agregar_status_cliente(_df))
+
+
+def _numero_sql(coluna: str) -> str:
+    """
+    Valor numérico da coluna, ou NULL quando o texto não é número (ex.: "Não
+    encontrado"), como o pd.to_numeric(errors="coerce") do caminho do upload.
+    CAST sozinho transformaria o texto em 0.0 e ele entraria nas somas e na
+    contagem.
+    """
+    return (
+        f"CASE WHEN typeof({coluna}) IN ('integer', 'real') THEN {coluna} "
+        f"WHEN trim({coluna}) GLOB '*[0-9]*' AND NOT trim({coluna}) GLOB '*[^0-9.eE+-]*' "
+        f"THEN CAST(trim({coluna}) AS REAL) END"
+    )
+
+
+# Mesmas colunas de agregar_status_cliente; o banco guarda números como texto
+SQL_AGREGADO_FEEBASED = f"""
+    SELECT
+        status AS "{COL_STATUS}",
+        codigo_cliente AS "{COL_CLIENTE}",
+        TOTAL({_numero_sql("pl")}) AS pl,
+        TOTAL({_numero_sql("taxa_contratacao")}) AS soma_taxa,
+        COUNT({_numero_sql("taxa_contratacao")}) AS n_taxa
+    FROM dados
+    WHERE {SCOPE_MARKER}
+    GROUP BY status, codigo_cliente;
+"""
+
+
+def kpis_banco(escopo: RevenueScope) -> pd.DataFrame:
+    return kpis_feebased(read_sql_scoped(SQL_AGREGADO_FEEBASED, get_db_path_fee_based(), escopo))
+
+
+def tabela_banco(escopo: RevenueScope) -> pd.DataFrame:
+    return read_sql_scoped(f"SELECT * FROM dados WHERE {SCOPE_MARKER};", get_db_path_fee_based(), escopo)
+
+
+# =============================================================================
+# PÁGINA
+# =============================================================================
 
 # Upload do arquivo CSV
 arquivo = st.file_uploader("Faça upload do arquivo CSV", type=["csv"])
+kpis = df = None
 if arquivo:
-    df = pd.read_csv(
-        arquivo,
-        encoding='utf-8',
-        sep=',',
-        decimal='.',
-        thousands=','
-    )
-    df.columns = [col.strip() for col in df.columns]
-
-    # Filtros
-    todos = df
-    ativos_aprovados = df[df['Status'].isin(['Ativo', 'Aprovado'])]
-    ativos = df[df['Status'] == 'Ativo']
-    aprovados = df[df['Status'] == 'Aprovado']
-    pendentes = df[df['Status'] == 'Pendente']
-
-    # Calcular KPIs
-    kpis = [
-        calcular_kpis(todos),
-        calcular_kpis(ativos_aprovados),
-        calcular_kpis(ativos),
-        calcular_kpis(aprovados),
-        calcular_kpis(pendentes)
-    ]
-    nomes = [
-        "Todos os Clientes",
-        "Ativos e Aprovados",
-        "Ativos",
-        "Aprovados",
-        "Pendentes"
-    ]
-
-    # Layout dos cards
-    cols = st.columns(5)
-    for i, col in enumerate(cols):
-        n, pl, taxa = kpis[i]
-        col.metric(nomes[i], f"{n} clientes")
-        col.metric("PL Total", f"R$ {pl:,.2f}")
-        col.metric("Taxa Média", f"{taxa:.2%}")
-
-    # Exibir tabela filtrada (opcional)
-    st.write("\n### Dados Filtrados")
-    st.dataframe(df)
-else:
+    enviado = arquivo_csv(arquivo)
+    df = load_data_rapido(enviado, invalidos_como_zero=False)
+    if not df.empty:
+        kpis = kpis_upload(enviado.sha256, _df=df)
+elif st.session_state.get('autenticado'):
+    # Escopo da sessão: head sem a linha "Fee Based" não vê nenhuma linha
+    escopo = user_revenue_scope()
+    try:
+        kpis, df = kpis_banco(escopo), tabela_banco(escopo)
+        st.caption("Sem upload: dados do DBV Capital_FeeBased.db.")
+    except FileNotFoundError:
+        pass
+if kpis is None:
     st.info("Faça upload do arquivo CSV para visualizar o dashboard.")
+    st.stop()
+
+# Layout dos cards
+cols = st.columns(len(kpis))
+for col, card in zip(cols, kpis.itertuples(index=False)):
+    col.metric(card.grupo, f"{card.clientes} clientes")
+    col.metric("PL Total", f"R$ {card.pl_total:,.2f}")
+    col.metric("Taxa Média", f"{card.taxa_media:.2%}")
+
+# Exibir tabela filtrada (opcional)
+st.write("\n### Dados Filtrados")
+st.dataframe(df)
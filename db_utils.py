@@ -1,13 +1,20 @@
 # db_utils.py
 # Utilitários de conexão e leitura dos bancos SQLite da DBV Capital
 
+import os
+import re
+from dataclasses import dataclass
 from pathlib import Path
 from functools import lru_cache
-from typing import Optional
+from threading import Lock
+from typing import Iterable, Optional, Sequence
 
 import pandas as pd
 import sqlite3
 
+from instrumentacao import etapa
+from politica_cache import politica
+
 
 # =============================================================================
 # BASES DE CAMINHO
@@ -21,11 +28,24 @@ PAGES_DIR = BASE_DIR / "pages"
 DATA_DIR = BASE_DIR / "data"
 CSV_EXPORT_DIR = BASE_DIR / "csv_export"
 
+# Se definida, todos os .db são lidos desta pasta (ex.: bases sintéticas dos
+# benchmarks), sem cair nas pastas padrão do projeto
+DATA_DIR_ENV_VAR = "DBV_DATA_DIR"
+
 
 # =============================================================================
 # LOCALIZAÇÃO DOS ARQUIVOS .DB
 # =============================================================================
 
+def get_db_dir() -> Path:
+    """
+    Pasta base dos bancos .db: a de DBV_DATA_DIR, se definida, senão a raiz
+    do projeto (mesma pasta usada pelas páginas).
+    """
+    override = os.environ.get(DATA_DIR_ENV_VAR)
+    return Path(override).resolve() if override else BASE_DIR
+
+
 def _find_file(filename: str) -> Path:
     """
     Procura o arquivo em algumas pastas padrão do projeto, na seguinte ordem:
@@ -33,9 +53,13 @@ def _find_file(filename: str) -> Path:
     2. data/
     3. raiz do projeto
 
+    Com DBV_DATA_DIR definida, procura apenas nessa pasta.
     Retorna um Path absoluto se encontrar, senão gera FileNotFoundError.
     """
-    search_dirs = [PAGES_DIR, DATA_DIR, BASE_DIR]
+    if os.environ.get(DATA_DIR_ENV_VAR):
+        search_dirs = [get_db_dir()]
+    else:
+        search_dirs = [PAGES_DIR, DATA_DIR, BASE_DIR]
 
     for folder in search_dirs:
         candidate = folder / filename
@@ -48,6 +72,24 @@ def _find_file(filename: str) -> Path:
     )
 
 
+def localizar_db(*nomes: str) -> Optional[Path]:
+    """
+    Primeiro dos arquivos `nomes` que existir em get_db_dir(), como Path
+    absoluto; None se nenhum existir. Sem DBV_DATA_DIR também procura
+    relativo à pasta atual (como as páginas faziam); com ela definida, só
+    nessa pasta: um benchmark com bases sintéticas não cai no banco real.
+    """
+    pastas = [get_db_dir()]
+    if not os.environ.get(DATA_DIR_ENV_VAR):
+        pastas.append(Path())
+    for pasta in pastas:
+        for nome in nomes:
+            p = pasta / nome
+            if p.exists():
+                return p.resolve()
+    return None
+
+
 def get_db_path_objetivos() -> Path:
     """
     Retorna o caminho absoluto do banco de Objetivos.
@@ -72,6 +114,29 @@ def get_db_path_auc_mesa_rv() -> Path:
     return _find_file("DBV Capital_AUC Mesa RV.db")
 
 
+def get_db_path_diversificador() -> Path:
+    """
+    Retorna o caminho absoluto do banco do Diversificador.
+    """
+    return _find_file("DBV Capital_Diversificador.db")
+
+
+def get_db_path_fee_based() -> Path:
+    """
+    Retorna o caminho absoluto do banco do FeeBased.
+    """
+    return _find_file("DBV Capital_FeeBased.db")
+
+
+def db_generation(db_path: Path) -> tuple[int, int]:
+    """
+    Identifica a "geração" de um arquivo .db: (mtime em ns, tamanho em bytes).
+    Muda sempre que o ETL regrava o banco, então serve de chave de cache.
+    """
+    st = Path(db_path).stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
 # =============================================================================
 # FUNÇÕES GENÉRICAS DE LEITURA
 # =============================================================================
@@ -138,6 +203,267 @@ def cached_query_generic(query: str, filename: str) -> pd.DataFrame:
     return read_sql(query, db_path)
 
 
+# =============================================================================
+# COLUNAS CATEGÓRICAS (DICIONÁRIO COMPARTILHADO POR GERAÇÃO DO BANCO)
+# =============================================================================
+
+# Colunas de texto repetitivo que valem a pena guardar como Categorical
+CATEGORICAL_POSITIVADOR = (
+    "Cliente", "cliente", "Assessor", "assessor", "assessor_code", "Segmento", "Status",
+)
+CATEGORICAL_DIVERSIFICADOR = (
+    "assessor", "cliente", "produto", "sub_produto", "ativo", "emissor",
+)
+CATEGORICAL_AUC_MESA_RV = ("cliente", "assessor", "tipo")
+
+# (arquivo .db, coluna) -> (geração, categorias na ordem em que apareceram)
+_category_dicts: dict[tuple[str, str], tuple[tuple[int, int], pd.Index]] = {}
+_category_lock = Lock()
+
+
+def _shared_categories(db_path: Path, column: str, values: pd.Series) -> pd.Index:
+    """
+    Devolve o dicionário de categorias da coluna para a geração atual do banco,
+    acrescentando ao final os valores ainda não vistos. Como as categorias só
+    crescem por append, os códigos inteiros de frames anteriores continuam válidos.
+    """
+    key = (str(Path(db_path).resolve()), column)
+    generation = db_generation(db_path)
+    with _category_lock:
+        current = _category_dicts.get(key)
+        if current is None or current[0] != generation:
+            cats = pd.Index([], dtype=object)
+        else:
+            cats = current[1]
+        uniques = pd.Index(values.dropna().unique(), dtype=object)
+        new = uniques[~uniques.isin(cats)]
+        if len(new):
+            cats = cats.append(new)
+        _category_dicts[key] = (generation, cats)
+        return cats
+
+
+def to_shared_categoricals(
+    df: pd.DataFrame,
+    columns: Iterable[str],
+    db_path: Path,
+) -> pd.DataFrame:
+    """
+    Converte as colunas informadas (as que existirem no df) em pandas Categorical,
+    já com strip aplicado. Todos os DataFrames lidos da mesma geração do banco
+    compartilham o mesmo dicionário, então os códigos inteiros são comparáveis
+    entre frames (merge/groupby sem voltar para string).
+
+    O caminho do banco fica em df.attrs["categorical_db"] para que etapas
+    posteriores (ex.: colunas derivadas) usem o mesmo dicionário.
+    """
+    for col in columns:
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype(object)
+        missing = s.isna()
+        s = s.astype(str).str.strip().mask(missing)
+        cats = _shared_categories(db_path, col, s)
+        df[col] = pd.Categorical(s, categories=cats)
+    df.attrs["categorical_db"] = str(db_path)
+    return df
+
+
+def adopt_shared_categoricals(df: pd.DataFrame, db_path: Path) -> pd.DataFrame:
+    """
+    Para frames que já chegam com colunas Categorical (ex.: do cache
+    compartilhado entre processos): registra as categorias no dicionário
+    compartilhado deste processo e só recodifica a coluna se o dicionário do
+    processo já tiver outra ordem.
+    """
+    for col in df.columns:
+        s = df[col]
+        if not isinstance(s.dtype, pd.CategoricalDtype):
+            continue
+        cats = _shared_categories(db_path, col, pd.Series(s.cat.categories.astype(object)))
+        if not s.cat.categories.astype(object).equals(cats):
+            df[col] = s.cat.set_categories(cats)
+    df.attrs["categorical_db"] = str(db_path)
+    return df
+
+
+def read_table(
+    db_path: Path,
+    table: str,
+    categorical: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Lê uma tabela inteira. Se 'categorical' for informado, essas colunas voltam
+    como Categorical com dicionário compartilhado (ver to_shared_categoricals).
+    """
+    df = read_sql(f'SELECT * FROM "{table}"', db_path)
+    if categorical:
+        df = to_shared_categoricals(df, categorical, db_path)
+    return df
+
+
+def read_table_shared(
+    db_path: Path,
+    table: str,
+    categorical: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    read_table() publicado no cache compartilhado entre processos
+    (cache_compartilhado.py): lido do SQLite uma vez por geração do banco e
+    aberto via mmap pelos demais. O DataFrame é somente leitura.
+    """
+    from cache_compartilhado import carregar_compartilhado
+
+    cols = tuple(categorical) if categorical else ()
+    nome = f"{table}-cat" if cols else table
+    df = carregar_compartilhado(db_path, nome, lambda: read_table(db_path, table, categorical=cols or None))
+    if cols:
+        df = adopt_shared_categoricals(df, db_path)
+    return df
+
+
+@lru_cache(maxsize=4)
+def _load_diversificador(db_path: Path, generation: tuple[int, int], categorical: bool) -> pd.DataFrame:
+    cols = CATEGORICAL_DIVERSIFICADOR if categorical else None
+    return read_table_shared(db_path, "dados", categorical=cols)
+
+
+def load_diversificador(categorical: bool = False) -> pd.DataFrame:
+    """
+    Carrega a tabela 'dados' do Diversificador (com cache por geração do banco).
+    Com categorical=True, assessor/cliente/produto/... vêm como Categorical,
+    o que reduz bastante a memória e acelera groupby/nunique.
+    Atenção: o DataFrame devolvido é compartilhado; copie antes de alterar.
+    """
+    db_path = get_db_path_diversificador()
+    return _load_diversificador(db_path, db_generation(db_path), categorical)
+
+
+# =============================================================================
+# ESCOPO POR LINHA DE RECEITA (HEADS)
+# =============================================================================
+
+# Linha de receita de toda a base FeeBased (a tabela não tem coluna de linha)
+FEE_BASED_LINHA = "Fee Based"
+
+# Como cada base se liga às linhas de receita:
+#   ("coluna", nome)  -> predicado "<nome> IN (?, ...)"
+#   ("linha", linha)  -> a base inteira é de uma linha: "? IN (?, ...)"
+SCOPED_DBS = {
+    "DBV Capital_Receitas.db": ("coluna", "linha_receita"),
+    "DBV Capital_Produtos.db": ("coluna", "linha_receita"),
+    "DBV Capital_FeeBased.db": ("linha", FEE_BASED_LINHA),
+}
+
+# Marcador, dentro da query, de onde entra o predicado do escopo
+SCOPE_MARKER = "{escopo}"
+
+
+@dataclass(frozen=True)
+class RevenueScope:
+    """
+    Linhas de receita visíveis para a sessão. linhas=None: sem restrição
+    (usuário mestre); uma tupla vazia não vê nada. As linhas ficam ordenadas e
+    sem repetição, então dois heads com as mesmas permissões têm o mesmo
+    escopo (e dividem o cache).
+    """
+
+    linhas: Optional[tuple[str, ...]] = None
+
+    @classmethod
+    def from_permissions(cls, linhas: Optional[Iterable[str]]) -> "RevenueScope":
+        """De session_state['linhas_permitidas']: vazio/None é acesso total."""
+        if not linhas:
+            return cls(None)
+        return cls(tuple(sorted({str(l) for l in linhas})))
+
+    @property
+    def restricted(self) -> bool:
+        return self.linhas is not None
+
+    def predicate(self, db_name: str) -> tuple[str, tuple[str, ...]]:
+        """
+        Predicado SQL (com parâmetros ligados) que limita uma leitura da base
+        'db_name' às linhas do escopo. ValueError se a base não tiver regra de
+        escopo: leitura restrita sem predicado vazaria linhas.
+        """
+        if not self.restricted:
+            return "1", ()
+        if db_name not in SCOPED_DBS:
+            raise ValueError(f"Base sem regra de escopo por linha: {db_name!r}")
+        if not self.linhas:
+            return "0", ()
+        tipo, valor = SCOPED_DBS[db_name]
+        marcadores = ", ".join("?" * len(self.linhas))
+        if tipo == "coluna":
+            return f"{valor} IN ({marcadores})", self.linhas
+        return f"? IN ({marcadores})", (valor, *self.linhas)
+
+
+# Literais de texto, identificadores entre aspas e comentários: um '?' ali
+# dentro não é parâmetro
+_SQL_NAO_CODIGO = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def _parametros_posicionais(sql: str) -> int:
+    """
+    Quantos '?' são parâmetros no trecho de SQL. ValueError para parâmetros
+    numerados ou nomeados (?1, :nome, @nome, $nome): a posição do escopo não
+    daria para calcular contando '?'.
+    """
+    codigo = _SQL_NAO_CODIGO.sub(" ", sql)
+    if re.search(r"\?\d|[:@$][A-Za-z_]", codigo):
+        raise ValueError("Query com escopo aceita só parâmetros posicionais ('?')")
+    return codigo.count("?")
+
+
+def scope_sql(query: str, db_name: str, scope: RevenueScope, params: Sequence = ()) -> tuple[str, tuple]:
+    """
+    Troca o marcador {escopo} da query pelo predicado do escopo e encaixa os
+    parâmetros dele na posição certa (conta os '?' antes do marcador, fora de
+    literais e comentários).
+    Ex.: "SELECT SUM(x) FROM dados WHERE {escopo} AND mes_ano >= ?"
+    """
+    if query.count(SCOPE_MARKER) != 1:
+        raise ValueError(f"A query deve ter exatamente um marcador {SCOPE_MARKER}")
+    antes, depois = query.split(SCOPE_MARKER)
+    params = tuple(params)
+    n = _parametros_posicionais(antes)
+    if n + _parametros_posicionais(depois) != len(params):
+        raise ValueError(
+            f"A query tem {n + _parametros_posicionais(depois)} parâmetros '?', foram passados {len(params)}"
+        )
+    predicado, params_escopo = scope.predicate(db_name)
+    return f"{antes}({predicado}){depois}", (*params[:n], *params_escopo, *params[n:])
+
+
+def read_sql_scoped(
+    query: str,
+    db_path: Path,
+    scope: RevenueScope,
+    params: Sequence = (),
+) -> pd.DataFrame:
+    """
+    read_sql() de uma base com escopo (Receitas, Produtos, FeeBased): a
+    query tem o marcador {escopo} e só devolve as linhas que a sessão pode
+    ver. Resultado guardado no cache de loaders (politica_cache) por geração
+    do banco, query, parâmetros e escopo, ou seja, por conjunto de permissões.
+    """
+    db_path = Path(db_path)
+    sql, todos = scope_sql(query, db_path.name, scope, params)
+    return _read_sql_scoped(db_path, db_generation(db_path), sql, todos)
+
+
+@politica.cache("consultas com escopo", ttl_s=30 * 60)
+def _read_sql_scoped(db_path: Path, generation: tuple[int, int], sql: str, params: tuple) -> pd.DataFrame:
+    with etapa(f"consulta com escopo: {db_path.stem}") as med:
+        df = read_sql(sql, db_path, params)
+        med.linhas_saida = len(df)
+        return df
+
+
 # =============================================================================
 # FUNÇÕES AUXILIARES (CSV EXPORT ETC.)
 # =============================================================================
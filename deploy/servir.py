@@ -0,0 +1,127 @@
+# deploy/servir.py
+# Sobe vários processos Streamlit (workers) do app e, opcionalmente, o Caddy
+# na frente deles com sessões fixas (deploy/Caddyfile).
+#
+# Um único `streamlit run Home.py` (como no .devcontainer) atende todas as TVs
+# e usuários em um só interpretador/GIL: os reruns pesados do Salão entram em
+# fila. Com N workers, cada navegador fica preso a um processo (cookie do
+# proxy) e os reruns rodam em paralelo, um por núcleo.
+#
+# Uso:
+#     python deploy/servir.py                       # 1 worker por núcleo, sem proxy
+#     python deploy/servir.py --workers 4 --caddy   # 4 workers + Caddy na porta 8501
+#
+# Workers que caírem são reiniciados. Ctrl+C (ou SIGTERM) encerra tudo.
+# Variáveis de ambiente (DBV_DATA_DIR, DBV_PERF_LOG, ...) são repassadas aos
+# workers; cada um recebe também DBV_WORKER_ID, que marca as linhas do
+# DBV_PERF_LOG ("worker") e as estatísticas do cache de loaders no painel de
+# desempenho, para separar os números por processo.
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+CADDYFILE = Path(__file__).resolve().parent / "Caddyfile"
+
+# Espera entre reinícios de um worker que caiu (evita loop de crash)
+ESPERA_REINICIO_S = 2.0
+
+
+def comando_worker(porta: int, endereco: str) -> List[str]:
+    # Mesmas flags do .devcontainer, com a porta do worker
+    return [
+        sys.executable, "-m", "streamlit", "run", str(RAIZ / "Home.py"),
+        "--server.port", str(porta),
+        "--server.address", endereco,
+        "--server.headless", "true",
+        "--server.enableCORS", "false",
+        "--server.enableXsrfProtection", "false",
+    ]
+
+
+def iniciar_worker(indice: int, porta: int, endereco: str) -> subprocess.Popen:
+    env = dict(os.environ, DBV_WORKER_ID=str(indice))
+    print(f"   worker {indice}: http://{endereco}:{porta}")
+    return subprocess.Popen(comando_worker(porta, endereco), cwd=str(RAIZ), env=env)
+
+
+def iniciar_caddy(porta_publica: int, upstreams: List[str]) -> subprocess.Popen:
+    caddy = shutil.which("caddy")
+    if caddy is None:
+        raise SystemExit("❌ caddy não encontrado no PATH (https://caddyserver.com/docs/install)")
+    env = dict(os.environ, DBV_PORTA=str(porta_publica), DBV_UPSTREAMS=" ".join(upstreams))
+    print(f"   caddy: http://0.0.0.0:{porta_publica} -> {', '.join(upstreams)}")
+    return subprocess.Popen(
+        [caddy, "run", "--config", str(CADDYFILE), "--adapter", "caddyfile"], cwd=str(RAIZ), env=env
+    )
+
+
+def encerrar(processos: List[subprocess.Popen], timeout: float = 10.0) -> None:
+    for p in processos:
+        if p.poll() is None:
+            p.terminate()
+    limite = time.monotonic() + timeout
+    for p in processos:
+        try:
+            p.wait(timeout=max(0.1, limite - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sobe N workers Streamlit (e o Caddy) para os dashboards DBV Capital.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Número de processos Streamlit (padrão: núcleos da máquina)")
+    parser.add_argument("--porta-base", type=int, default=8601,
+                        help="Porta do 1º worker; os demais usam as seguintes (padrão: 8601)")
+    parser.add_argument("--endereco", default="127.0.0.1",
+                        help="Endereço dos workers (padrão: só local, atrás do proxy)")
+    parser.add_argument("--caddy", action="store_true",
+                        help="Sobe também o Caddy com sessões fixas (deploy/Caddyfile)")
+    parser.add_argument("--porta", type=int, default=8501,
+                        help="Porta pública do Caddy (padrão: 8501)")
+    args = parser.parse_args(argv)
+
+    portas = [args.porta_base + i for i in range(max(1, args.workers))]
+    print(f"Subindo {len(portas)} worker(s)...")
+    workers: Dict[int, subprocess.Popen] = {
+        i: iniciar_worker(i, porta, args.endereco) for i, porta in enumerate(portas)
+    }
+    caddy = iniciar_caddy(args.porta, [f"{args.endereco}:{p}" for p in portas]) if args.caddy else None
+
+    parar = False
+
+    def _sinal(signum, frame):
+        nonlocal parar
+        parar = True
+
+    signal.signal(signal.SIGINT, _sinal)
+    signal.signal(signal.SIGTERM, _sinal)
+
+    try:
+        while not parar:
+            time.sleep(1.0)
+            for i, proc in list(workers.items()):
+                codigo = proc.poll()
+                if codigo is not None and not parar:
+                    print(f"⚠️ worker {i} saiu (código {codigo}); reiniciando")
+                    time.sleep(ESPERA_REINICIO_S)
+                    workers[i] = iniciar_worker(i, portas[i], args.endereco)
+            if caddy is not None and caddy.poll() is not None:
+                print(f"❌ caddy saiu (código {caddy.returncode}); encerrando")
+                return 1
+    finally:
+        print("Encerrando...")
+        encerrar(list(workers.values()) + ([caddy] if caddy is not None else []))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
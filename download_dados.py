@@ -0,0 +1,333 @@
+# download_dados.py
+# Download dos arquivos de dados (ex.: data/receitas.xlsx do Google Drive)
+# com retomada, revalidação e troca atômica.
+#
+#   - uma requests.Session por thread (conexão reaproveitada entre pedidos);
+#   - escrita em blocos de BLOCO_BYTES (1 MiB) num arquivo temporário
+#     "<destino>.parte"; o destino só é trocado (os.replace) depois de o
+#     download terminar e passar na verificação, então quem lê o destino
+#     sempre vê a cópia anterior inteira;
+#   - queda no meio do download: a próxima tentativa (ou a próxima execução)
+#     continua do tamanho já gravado com Range + If-Range; se o arquivo mudou
+#     no servidor, ele responde 200 e o download recomeça do zero;
+#   - verificação: tamanho (Content-Length) e, se informado, sha256 esperado;
+#     o sha256 calculado fica nos metadados. Resposta sem tamanho e sem sha256
+#     esperado é recusada (um corpo truncado passaria). Tamanho errado é
+#     tentado de novo (retomando); sha256 diferente não (baixaria o mesmo
+#     arquivo de novo);
+#   - revalidação: com o destino já baixado, um GET condicional (If-None-Match/
+#     If-Modified-Since com o ETag/Last-Modified gravados) não transfere nada
+#     quando o arquivo não mudou (304). Só revalida depois de
+#     DBV_DOWNLOAD_REVALIDAR_S segundos (padrão 3600) da última verificação.
+#
+# Metadados (ETag, Last-Modified, tamanho, sha256, hora da verificação) ficam
+# em "<destino>.meta.json"; os da cópia parcial, em "<destino>.parte.json".
+#
+# Uso:
+#     estado = download_dados.iniciar(url, "data/receitas.xlsx")  # thread em segundo plano
+#     download_dados.baixar(url, "data/receitas.xlsx")            # bloqueante
+#     python download_dados.py URL DESTINO [--sha256 HEX]
+#
+# Variável de ambiente:
+#     DBV_DOWNLOAD_REVALIDAR_S   intervalo mínimo entre revalidações (segundos)
+#
+# Não importa Streamlit: a página só lê o estado (EstadoDownload) da thread.
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import requests
+
+BLOCO_BYTES = 1 << 20
+TIMEOUT_S = (10, 60)  # conexão, leitura
+TENTATIVAS = 3
+REVALIDAR_ENV_VAR = "DBV_DOWNLOAD_REVALIDAR_S"
+REVALIDAR_PADRAO_S = 3600.0
+
+# Resultado de baixar()
+NAO_MODIFICADO = "não modificado"
+RECENTE = "verificado recentemente"
+BAIXADO = "baixado"
+RETOMADO = "retomado"
+
+
+class ErroVerificacao(Exception):
+    """Arquivo baixado não confere com o sha256 esperado, ou não dá para verificar."""
+
+
+class ErroTamanho(ErroVerificacao):
+    """Corpo menor/maior que o Content-Length: a próxima tentativa retoma."""
+
+
+def url_google_drive(id_arquivo: str) -> str:
+    return f"https://drive.google.com/uc?export=download&id={id_arquivo}"
+
+
+def intervalo_revalidacao() -> float:
+    try:
+        return float(os.environ.get(REVALIDAR_ENV_VAR, REVALIDAR_PADRAO_S))
+    except ValueError:
+        return REVALIDAR_PADRAO_S
+
+
+# =============================================================================
+# METADADOS
+# =============================================================================
+
+@dataclass
+class Metadados:
+    url: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    tamanho: Optional[int] = None
+    sha256: Optional[str] = None
+    verificado_em: float = 0.0
+
+    @classmethod
+    def ler(cls, caminho: Path) -> Optional["Metadados"]:
+        try:
+            return cls(**json.loads(caminho.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def gravar(self, caminho: Path) -> None:
+        tmp = caminho.with_name(caminho.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, caminho)
+
+
+def _caminhos(destino: Path) -> Dict[str, Path]:
+    return {
+        "meta": destino.with_name(destino.name + ".meta.json"),
+        "parte": destino.with_name(destino.name + ".parte"),
+        "parte_meta": destino.with_name(destino.name + ".parte.json"),
+    }
+
+
+def _validadores(resposta: requests.Response, url: str) -> Metadados:
+    """ETag/Last-Modified e tamanho total da resposta (200 ou 206)."""
+    total = None
+    if resposta.status_code == 206:
+        intervalo = resposta.headers.get("Content-Range", "")
+        if "/" in intervalo and not intervalo.endswith("/*"):
+            total = int(intervalo.rsplit("/", 1)[1])
+    elif resposta.headers.get("Content-Length"):
+        total = int(resposta.headers["Content-Length"])
+    return Metadados(
+        url=url,
+        etag=resposta.headers.get("ETag"),
+        last_modified=resposta.headers.get("Last-Modified"),
+        tamanho=total,
+    )
+
+
+# =============================================================================
+# DOWNLOAD
+# =============================================================================
+
+_sessoes = threading.local()
+
+
+def _sessao() -> requests.Session:
+    if not hasattr(_sessoes, "sessao"):
+        _sessoes.sessao = requests.Session()
+    return _sessoes.sessao
+
+
+def _pedir(sessao: requests.Session, url: str, destino: Path) -> requests.Response:
+    """
+    GET com Range/If-Range quando há cópia parcial ou condicional
+    (If-None-Match/If-Modified-Since) quando só há o destino baixado.
+    """
+    c = _caminhos(destino)
+    cabecalhos = {"Accept-Encoding": "identity"}
+    parte_meta = Metadados.ler(c["parte_meta"])
+    ja_gravado = c["parte"].stat().st_size if c["parte"].exists() else 0
+    if ja_gravado and parte_meta and parte_meta.url == url and (parte_meta.etag or parte_meta.last_modified):
+        cabecalhos["Range"] = f"bytes={ja_gravado}-"
+        cabecalhos["If-Range"] = parte_meta.etag or parte_meta.last_modified
+    else:
+        meta = Metadados.ler(c["meta"])
+        if destino.exists() and meta and meta.url == url:
+            if meta.etag:
+                cabecalhos["If-None-Match"] = meta.etag
+            if meta.last_modified:
+                cabecalhos["If-Modified-Since"] = meta.last_modified
+    resposta = sessao.get(url, headers=cabecalhos, stream=True, timeout=TIMEOUT_S)
+    if resposta.status_code == 416:
+        # Cópia parcial maior que o arquivo atual: descarta e pede tudo
+        resposta.close()
+        c["parte"].unlink(missing_ok=True)
+        c["parte_meta"].unlink(missing_ok=True)
+        return _pedir(sessao, url, destino)
+    return resposta
+
+
+def _transferir(
+    resposta: requests.Response,
+    meta: Metadados,
+    destino: Path,
+    progresso: Optional[Callable[[int, Optional[int]], None]],
+) -> Metadados:
+    """Grava o corpo em <destino>.parte (anexando se 206) e devolve os validadores."""
+    c = _caminhos(destino)
+    modo = "ab" if resposta.status_code == 206 else "wb"
+    meta.gravar(c["parte_meta"])
+    with open(c["parte"], modo, buffering=BLOCO_BYTES) as f:
+        gravado = f.tell()
+        for bloco in resposta.iter_content(chunk_size=BLOCO_BYTES):
+            f.write(bloco)
+            gravado += len(bloco)
+            if progresso:
+                progresso(gravado, meta.tamanho)
+    return meta
+
+
+def _verificar_e_trocar(destino: Path, meta: Metadados, sha256: Optional[str]) -> Metadados:
+    c = _caminhos(destino)
+    tamanho = c["parte"].stat().st_size
+    if meta.tamanho is not None and tamanho != meta.tamanho:
+        raise ErroTamanho(f"{destino.name}: {tamanho} bytes gravados, esperados {meta.tamanho}")
+    with open(c["parte"], "rb") as f:
+        meta.sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+    if sha256 and meta.sha256 != sha256.lower():
+        c["parte"].unlink(missing_ok=True)
+        c["parte_meta"].unlink(missing_ok=True)
+        raise ErroVerificacao(f"{destino.name}: sha256 {meta.sha256} difere do esperado {sha256}")
+    meta.tamanho = tamanho
+    meta.verificado_em = time.time()
+    os.replace(c["parte"], destino)
+    meta.gravar(c["meta"])
+    c["parte_meta"].unlink(missing_ok=True)
+    return meta
+
+
+def baixar(
+    url: str,
+    destino,
+    sha256: Optional[str] = None,
+    sessao: Optional[requests.Session] = None,
+    progresso: Optional[Callable[[int, Optional[int]], None]] = None,
+    forcar: bool = False,
+) -> str:
+    """
+    Baixa (ou revalida) `url` em `destino`. Devolve NAO_MODIFICADO, RECENTE,
+    BAIXADO ou RETOMADO. Erros de rede e tamanho errado são tentados de novo
+    (TENTATIVAS), continuando da cópia parcial; sha256 diferente ou resposta
+    sem como verificar levantam ErroVerificacao na hora. Em qualquer falha o
+    destino anterior fica intacto.
+    """
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    c = _caminhos(destino)
+    meta = Metadados.ler(c["meta"])
+    if (not forcar and destino.exists() and meta and meta.url == url and not c["parte"].exists()
+            and time.time() - meta.verificado_em < intervalo_revalidacao()):
+        return RECENTE
+
+    sessao = sessao or _sessao()
+    retomado = False
+    for tentativa in range(1, TENTATIVAS + 1):
+        try:
+            with _pedir(sessao, url, destino) as resposta:
+                if resposta.status_code == 304:
+                    meta.verificado_em = time.time()
+                    meta.gravar(c["meta"])
+                    return NAO_MODIFICADO
+                resposta.raise_for_status()
+                novo = _validadores(resposta, url)
+                if novo.tamanho is None and not sha256:
+                    raise ErroVerificacao(
+                        f"{destino.name}: resposta sem Content-Length e sem sha256 esperado; "
+                        "um download truncado não seria detectado"
+                    )
+                retomado = retomado or resposta.status_code == 206
+                _transferir(resposta, novo, destino, progresso)
+            _verificar_e_trocar(destino, novo, sha256)
+            return RETOMADO if retomado else BAIXADO
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                ErroTamanho):
+            if tentativa == TENTATIVAS:
+                raise
+            time.sleep(min(2 ** tentativa, 10))
+
+
+# =============================================================================
+# SEGUNDO PLANO
+# =============================================================================
+
+@dataclass
+class EstadoDownload:
+    """Estado do download de um destino (lido pela página a cada rerun)."""
+
+    destino: str
+    rodando: bool = True
+    bytes: int = 0
+    total: Optional[int] = None
+    resultado: Optional[str] = None
+    erro: Optional[str] = None
+    thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    @property
+    def fracao(self) -> Optional[float]:
+        return min(self.bytes / self.total, 1.0) if self.total else None
+
+    def esperar(self, timeout: Optional[float] = None) -> "EstadoDownload":
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self
+
+
+_estados: Dict[str, EstadoDownload] = {}
+_lock = threading.Lock()
+
+
+def _executar(estado: EstadoDownload, url: str, sha256: Optional[str], forcar: bool) -> None:
+    def progresso(gravado: int, total: Optional[int]) -> None:
+        estado.bytes, estado.total = gravado, total
+
+    try:
+        estado.resultado = baixar(url, estado.destino, sha256=sha256, progresso=progresso, forcar=forcar)
+    except Exception as e:  # noqa: BLE001 - a página mostra o erro; o destino anterior continua
+        estado.erro = str(e)
+    finally:
+        estado.rodando = False
+
+
+def iniciar(url: str, destino, sha256: Optional[str] = None, forcar: bool = False) -> EstadoDownload:
+    """
+    Baixa/revalida em uma thread daemon e devolve o estado na hora. Idempotente
+    por destino: enquanto um download do mesmo destino roda, devolve o mesmo
+    estado.
+    """
+    chave = str(Path(destino).resolve())
+    with _lock:
+        estado = _estados.get(chave)
+        if estado is not None and estado.rodando:
+            return estado
+        estado = EstadoDownload(destino=str(destino))
+        estado.thread = threading.Thread(
+            target=_executar, args=(estado, url, sha256, forcar), name="dbv-download", daemon=True,
+        )
+        _estados[chave] = estado
+        estado.thread.start()
+        return estado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baixa/revalida um arquivo de dados.")
+    parser.add_argument("url")
+    parser.add_argument("destino")
+    parser.add_argument("--sha256", default=None)
+    parser.add_argument("--forcar", action="store_true", help="Revalida mesmo se verificado recentemente")
+    args = parser.parse_args()
+    inicio = time.perf_counter()
+    resultado = baixar(args.url, args.destino, sha256=args.sha256, forcar=args.forcar)
+    print(f"{args.destino}: {resultado} em {time.perf_counter() - inicio:.2f}s")
@@ -0,0 +1,274 @@
+# instrumentacao.py
+# Medição leve de tempo por rerun (loaders, KPIs, gráficos, HTML) dos dashboards.
+#
+# Uso básico:
+#     iniciar_execucao("Dashboard_Salão")         # no topo do script da página
+#
+#     @medir()                                    # função comum
+#     def calcular(...): ...
+#
+#     @medir_cache(st.cache_data(show_spinner=False))   # loader com cache
+#     def carregar(...): ...
+#
+#     with etapa("render: coluna 1"):             # trecho de código
+#         ...
+#
+#     finalizar_execucao()                        # no fim do script
+#
+# Não importa Streamlit no carregamento do módulo: pode ser usado por scripts,
+# benchmarks e workers sem subir o dashboard.
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional
+
+# Se definida, cada rerun é acrescentado como uma linha JSON neste arquivo
+LOG_ENV_VAR = "DBV_PERF_LOG"
+# Índice do worker (definido por deploy/servir.py); marca log e painel
+WORKER_ENV_VAR = "DBV_WORKER_ID"
+
+
+def worker_id() -> Optional[str]:
+    """Worker deste processo (None fora do deploy/servir.py)."""
+    return os.environ.get(WORKER_ENV_VAR) or None
+
+
+@dataclass
+class Medicao:
+    nome: str
+    segundos: float = 0.0
+    nivel: int = 0
+    linhas_entrada: Optional[int] = None
+    linhas_saida: Optional[int] = None
+    cache: Optional[str] = None  # "hit" / "miss" (apenas loaders com cache)
+    erro: Optional[str] = None
+
+
+class _Execucao:
+    def __init__(self, pagina: str):
+        self.pagina = pagina
+        self.inicio = time.perf_counter()
+        self.timestamp = datetime.now().isoformat(timespec="seconds")
+        self.medicoes: List[Medicao] = []
+        self.nivel = 0
+
+
+# Um rerun do Streamlit roda inteiro na thread da sessão
+_estado = threading.local()
+
+
+def _execucao_atual() -> Optional[_Execucao]:
+    return getattr(_estado, "execucao", None)
+
+
+def _contar_linhas(obj: Any) -> Optional[int]:
+    """Número de linhas de DataFrame/Series/lista (ou do 1º item de uma tupla)."""
+    if obj is None:
+        return None
+    shape = getattr(obj, "shape", None)
+    if shape:
+        return int(shape[0])
+    if isinstance(obj, tuple) and obj:
+        return _contar_linhas(obj[0])
+    if isinstance(obj, (list, dict)):
+        return len(obj)
+    return None
+
+
+# =============================================================================
+# CICLO DE VIDA DO RERUN
+# =============================================================================
+
+def iniciar_execucao(pagina: str) -> None:
+    """Começa a coleta de um novo rerun (descarta o anterior, se não finalizado)."""
+    _estado.execucao = _Execucao(pagina)
+
+
+def medicoes_atuais() -> List[Medicao]:
+    execucao = _execucao_atual()
+    return list(execucao.medicoes) if execucao else []
+
+
+def finalizar_execucao() -> Optional[dict]:
+    """
+    Encerra o rerun atual e devolve o resumo (também gravado no JSONL de
+    DBV_PERF_LOG, quando configurado). O resumo fica disponível para o painel
+    de admin via ultimo_resumo().
+    """
+    execucao = _execucao_atual()
+    if execucao is None:
+        return None
+    _estado.execucao = None
+
+    resumo = {
+        "timestamp": execucao.timestamp,
+        "pagina": execucao.pagina,
+        "pid": os.getpid(),
+        "worker": worker_id(),
+        "total_segundos": round(time.perf_counter() - execucao.inicio, 6),
+        "medicoes": [asdict(m) for m in execucao.medicoes],
+    }
+    _estado.ultimo_resumo = resumo
+
+    caminho = os.environ.get(LOG_ENV_VAR)
+    if caminho:
+        try:
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+            with open(caminho, "a", encoding="utf-8") as f:
+                f.write(json.dumps(resumo, ensure_ascii=False) + "\n")
+        except OSError:
+            pass  # log é opcional; nunca derruba o dashboard
+    return resumo
+
+
+def ultimo_resumo() -> Optional[dict]:
+    return getattr(_estado, "ultimo_resumo", None)
+
+
+# =============================================================================
+# MEDIDORES
+# =============================================================================
+
+@contextmanager
+def etapa(nome: str, linhas_entrada: Optional[int] = None) -> Iterator[Medicao]:
+    """
+    Mede o tempo de parede de um trecho. O objeto Medicao é devolvido para que
+    o chamador possa preencher linhas_saida/cache. Fora de um rerun iniciado
+    não registra nada (custo ~zero).
+    """
+    med = Medicao(nome=nome, linhas_entrada=linhas_entrada)
+    execucao = _execucao_atual()
+    if execucao is None:
+        yield med
+        return
+
+    med.nivel = execucao.nivel
+    execucao.medicoes.append(med)
+    execucao.nivel += 1
+    inicio = time.perf_counter()
+    try:
+        yield med
+    except BaseException as e:
+        # st.stop()/st.rerun() também passam por aqui; registramos o nome
+        med.erro = type(e).__name__
+        raise
+    finally:
+        med.segundos = round(time.perf_counter() - inicio, 6)
+        execucao.nivel -= 1
+
+
+def medir(nome: Optional[str] = None) -> Callable:
+    """Decorator: mede a função, com linhas do 1º argumento e do retorno."""
+    def decorator(func: Callable) -> Callable:
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            entrada = _contar_linhas(args[0]) if args else None
+            with etapa(rotulo, linhas_entrada=entrada) as med:
+                resultado = func(*args, **kwargs)
+                med.linhas_saida = _contar_linhas(resultado)
+                return resultado
+
+        return wrapper
+
+    return decorator
+
+
+def medir_cache(cache_decorator: Callable, nome: Optional[str] = None) -> Callable:
+    """
+    Decorator para loaders com cache (ex.: st.cache_data(show_spinner=False)).
+    Aplica o cache no corpo da função e mede por fora, marcando "miss" quando o
+    corpo realmente executou e "hit" quando o valor veio do cache.
+    """
+    def decorator(func: Callable) -> Callable:
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def corpo(*args, **kwargs):
+            pilha = getattr(_estado, "cache_pilha", None)
+            if pilha:
+                pilha[-1] = True
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(corpo)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            pilha = getattr(_estado, "cache_pilha", None)
+            if pilha is None:
+                pilha = _estado.cache_pilha = []
+            pilha.append(False)
+            try:
+                with etapa(rotulo) as med:
+                    resultado = cached(*args, **kwargs)
+                    med.linhas_saida = _contar_linhas(resultado)
+            finally:
+                executou = pilha.pop()
+            med.cache = "miss" if executou else "hit"
+            return resultado
+
+        # Mantém a API do cache (ex.: carregar.clear())
+        for attr in ("clear",):
+            if hasattr(cached, attr):
+                setattr(wrapper, attr, getattr(cached, attr))
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# PAINEL DE ADMIN (STREAMLIT)
+# =============================================================================
+
+def painel_solicitado() -> bool:
+    """O painel é opt-in: só aparece com ?perf=1 na URL."""
+    import streamlit as st
+
+    return str(st.query_params.get("perf", "")).lower() in ("1", "true", "sim")
+
+
+def render_painel(resumo: Optional[dict] = None) -> None:
+    """
+    Mostra as medições do rerun num expander. Quem chama é responsável por
+    checar permissão (auth.is_master_user) e opt-in (painel_solicitado).
+    """
+    import pandas as pd
+    import streamlit as st
+
+    resumo = resumo or ultimo_resumo()
+    if not resumo:
+        return
+
+    with st.expander(f"⏱️ Desempenho do rerun — {resumo['total_segundos']:.3f}s", expanded=True):
+        if not resumo["medicoes"]:
+            st.write("Nenhuma etapa medida.")
+            return
+        df = pd.DataFrame(resumo["medicoes"])
+        df["nome"] = [" " * n + nome for n, nome in zip(df["nivel"], df["nome"])]
+        df["ms"] = (df["segundos"] * 1000).round(1)
+        st.dataframe(
+            df[["nome", "ms", "linhas_entrada", "linhas_saida", "cache", "erro"]],
+            use_container_width=True,
+            hide_index=True,
+        )
+        caminho = os.environ.get(LOG_ENV_VAR)
+        if caminho:
+            st.caption(f"Log JSONL: {caminho}")
+
+        from politica_cache import politica
+
+        stats = politica.estatisticas()
+        if not stats.empty:
+            uso_mb = stats.attrs["bytes_em_uso"] / 1024 / 1024
+            orcamento_mb = stats.attrs["orcamento_bytes"] / 1024 / 1024
+            processo = f"worker {stats.attrs['worker']}" if stats.attrs.get("worker") else "processo"
+            st.caption(f"Cache dos loaders ({processo}): {uso_mb:.1f} de {orcamento_mb:.0f} MB")
+            st.dataframe(stats, use_container_width=True, hide_index=True)
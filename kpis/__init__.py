@@ -0,0 +1,108 @@
+# kpis/
+# Núcleo de cálculo dos dashboards (KPIs, rankings, NPS), sem Streamlit.
+#
+# Tudo aqui recebe DataFrames já carregados e devolve números/DataFrames,
+# então pode ser importado por testes, benchmarks e workers em milissegundos.
+# As páginas continuam responsáveis por carregar (com cache) e renderizar.
+
+from kpis.assessores import (
+    ASSESSORES_MAP,
+    NOME_TO_COD,
+    extract_assessor_code,
+    obter_nome_assessor,
+)
+from kpis.feebased import GRUPOS_FEEBASED, agregar_status_cliente, kpis_feebased
+from kpis.habilitacoes import (
+    ETAPAS_ATIVACAO,
+    ETAPAS_FUNIL,
+    METRICAS_HABILITACOES,
+    PainelHabilitacoes,
+    fracao_do_mes,
+    pares_meta,
+)
+from kpis.nps import (
+    calcular_metricas_nps,
+    filtrar_por_pesquisa,
+    normalizar_colunas_nps,
+    top3_assessores_por_aderencia,
+)
+from kpis.objetivos import (
+    COLUNAS_OBJETIVOS,
+    METAS_RUMO_1BI_PADRAO,
+    CurvaMeta,
+    IndiceObjetivos,
+    calcular_indicadores_objetivos,
+    curva_rumo_1bi,
+    meta_objetivo,
+    projetado_vs_realizado,
+)
+from kpis.periodos import (
+    JANELAS_MOVEIS,
+    SerieMensal,
+    comparativos_estoque,
+    comparativos_fluxo,
+    variacao_pct,
+)
+from kpis.positivador import (
+    contar_clientes_net_positivo,
+    converter_data_posicao,
+    obter_auc_inicial_ano,
+    tratar_dados_positivador_mtd,
+    ultimo_periodo_comum,
+)
+from kpis.rankings import (
+    ItemRanking,
+    ranking_assessores,
+    rollup_mensal,
+    top3_ano_cap,
+    top3_assessores_por_pl,
+    top3_mes_cap,
+)
+from kpis.texto import como_texto, norm_upper_noaccents_series, strip_accents
+
+__all__ = [
+    "ASSESSORES_MAP",
+    "COLUNAS_OBJETIVOS",
+    "CurvaMeta",
+    "ETAPAS_ATIVACAO",
+    "ETAPAS_FUNIL",
+    "GRUPOS_FEEBASED",
+    "IndiceObjetivos",
+    "ItemRanking",
+    "JANELAS_MOVEIS",
+    "METAS_RUMO_1BI_PADRAO",
+    "METRICAS_HABILITACOES",
+    "NOME_TO_COD",
+    "PainelHabilitacoes",
+    "SerieMensal",
+    "agregar_status_cliente",
+    "calcular_indicadores_objetivos",
+    "calcular_metricas_nps",
+    "como_texto",
+    "comparativos_estoque",
+    "comparativos_fluxo",
+    "contar_clientes_net_positivo",
+    "converter_data_posicao",
+    "curva_rumo_1bi",
+    "extract_assessor_code",
+    "filtrar_por_pesquisa",
+    "fracao_do_mes",
+    "kpis_feebased",
+    "meta_objetivo",
+    "norm_upper_noaccents_series",
+    "normalizar_colunas_nps",
+    "obter_auc_inicial_ano",
+    "obter_nome_assessor",
+    "pares_meta",
+    "projetado_vs_realizado",
+    "ranking_assessores",
+    "rollup_mensal",
+    "strip_accents",
+    "top3_ano_cap",
+    "top3_assessores_por_aderencia",
+    "top3_assessores_por_pl",
+    "top3_mes_cap",
+    "tratar_dados_positivador_mtd",
+    "ultimo_periodo_comum",
+    "variacao_pct",
+]
@@ -0,0 +1,63 @@
+# kpis/assessores.py
+# Cadastro de assessores (código XP -> nome) e extração de código.
+
+import re
+from typing import Any, Optional
+
+ASSESSORES_MAP = {
+    "A92300": "Adil Amorim",
+    "A95715": "André Norat",
+    "A87867": "Arthur Linhares",
+    "A95796": "Artur Vaz",
+    "A95642": "Bruna Lewis",
+    "A26892": "Carlos Monteiro",
+    "A71490": "Cesar Lima",
+    "A93081": "Daniel Morone",
+    "A23594": "Diego Monteiro",
+    "A23454": "Eduardo Monteiro",
+    "A91619": "Eduardo Parente",
+    "A95635": "Enzo Rei",
+    "A50825": "Fabiane Souza",
+    "A46886": "Fábio Tomaz",
+    "A96625": "Gustavo Levy",
+    "A95717": "Henrique Vieira",
+    "A94115": "Israel Oliveira Moraes",
+    "A97328": "João Goldenberg ",
+    "A41471": "João Pedro Georg de Andrade",
+    "A69453": "Guilherme Peçanha",
+    "A51586": "Luiz Eduardo Mesquita",
+    "A28215": "Luiz Coimbra",
+    "A92301": "Marcus Faria",
+    "A38061": "Paulo Pinho",
+    "A69265": "Paulo Gomes",
+    "A25214": "Renato Zanin",
+    "A21652": "Rodrigo Teísta",
+    "A93282": "Samuel Monteiro",
+    "A72213": "Thiago Cordeiro",
+    "A26914": "Victor Garrido",
+}
+NOME_TO_COD = {v.upper(): k for k, v in ASSESSORES_MAP.items()}
+
+
+def obter_nome_assessor(codigo: str) -> str:
+    return ASSESSORES_MAP.get(codigo, codigo)
+
+
+def extract_assessor_code(x: Any) -> Optional[str]:
+    s = str(x or "").strip()
+    if not s:
+        return None
+    up = re.sub(r"\s+", " ", s).upper()
+
+    m = re.search(r"A\s*?(\d{5})", up)
+    if m:
+        return f"A{m.group(1)}"
+
+    m2 = re.search(r"(^|\D)(\d{5})(\D|$)", up)
+    if m2:
+        return f"A{m2.group(2)}"
+
+    if up in NOME_TO_COD:
+        return NOME_TO_COD[up]
+
+    return None
@@ -0,0 +1,68 @@
+# kpis/feebased.py
+# Cards da base FeeBased por grupo de status (dashboard.py).
+#
+# Uma única agregação por (Status, cliente) guarda o PL somado e a soma/
+# contagem da taxa. Todos os cards (todos, ativos + aprovados, ativos,
+# aprovados, pendentes) saem dessa tabela pequena: PL e taxa são aditivos
+# entre status, e os clientes distintos de um grupo são os códigos distintos
+# nas linhas dos seus status. A agregação vem do pandas (upload) ou do
+# SQLite (GROUP BY status, codigo_cliente), com as mesmas colunas.
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COL_STATUS = "Status"
+COL_CLIENTE = "Código do Cliente"
+COL_PL = "PL"
+COL_TAXA = "Taxa contratada"
+
+# Cards: rótulo -> status incluídos (None = todos, inclusive sem status)
+GRUPOS_FEEBASED: Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...] = (
+    ("Todos os Clientes", None),
+    ("Ativos e Aprovados", ("Ativo", "Aprovado")),
+    ("Ativos", ("Ativo",)),
+    ("Aprovados", ("Aprovado",)),
+    ("Pendentes", ("Pendente",)),
+)
+
+
+def agregar_status_cliente(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por (Status, Código do Cliente) do upload, com pl, soma_taxa e
+    n_taxa (taxas preenchidas). Status/cliente vazios viram grupos próprios;
+    PL/taxa não numéricos (ex.: "Não encontrado") não entram nas somas.
+    """
+    taxa = pd.to_numeric(df[COL_TAXA], errors="coerce")
+    base = pd.DataFrame({
+        COL_STATUS: df[COL_STATUS],
+        COL_CLIENTE: df[COL_CLIENTE],
+        "pl": pd.to_numeric(df[COL_PL], errors="coerce"),
+        "soma_taxa": taxa,
+        "n_taxa": taxa.notna().astype("int64"),
+    })
+    return (
+        base.groupby([COL_STATUS, COL_CLIENTE], dropna=False, sort=False)
+        .agg(pl=("pl", "sum"), soma_taxa=("soma_taxa", "sum"), n_taxa=("n_taxa", "sum"))
+        .reset_index()
+    )
+
+
+def kpis_feebased(agregado: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por card de GRUPOS_FEEBASED: grupo, clientes (distintos),
+    pl_total e taxa_media (média das taxas preenchidas; NaN se nenhuma).
+    """
+    status = agregado[COL_STATUS]
+    linhas = []
+    for nome, incluidos in GRUPOS_FEEBASED:
+        parte = agregado if incluidos is None else agregado[status.isin(incluidos)]
+        n_taxa = parte["n_taxa"].sum()
+        linhas.append({
+            "grupo": nome,
+            "clientes": int(parte[COL_CLIENTE].nunique()),
+            "pl_total": float(parte["pl"].sum()),
+            "taxa_media": float(parte["soma_taxa"].sum() / n_taxa) if n_taxa else np.nan,
+        })
+    return pd.DataFrame(linhas, columns=["grupo", "clientes", "pl_total", "taxa_media"])
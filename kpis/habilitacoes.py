@@ -0,0 +1,344 @@
+# kpis/habilitacoes.py
+# Habilitações: realizado vs. meta por assessor e mês (tabela 'dados' do
+# DBV Capital_Habilitacoes.db).
+#
+# A tabela traz pares <metrica>/meta_<metrica> lado a lado. PainelHabilitacoes
+# empilha os pares uma única vez num formato longo (uma posição por
+# assessor x mês x métrica, em arrays numpy) e calcula atingimento e ritmo de
+# todas as posições de uma vez; resumos do mês, funil e tabela por assessor
+# são só recortes/somas desses arrays.
+#
+# Tipos de métrica:
+#   - contagem: somada entre assessores; o ritmo compara o realizado com a
+#     meta proporcional aos dias corridos do mês (mês fechado: fração 1)
+#   - taxa (0-1): média entre assessores; ritmo = atingimento (taxa não acumula)
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CONTAGEM = "contagem"
+TAXA = "taxa"
+PREFIXO_META = "meta_"
+
+# coluna realizada -> (rótulo, tipo), na ordem de exibição
+METRICAS_HABILITACOES: Dict[str, Tuple[str, str]] = {
+    "lead_start": ("Lead Start", CONTAGEM),
+    "carteiras_simuladas_novos_clientes": ("Carteiras simuladas", CONTAGEM),
+    "habilitacoes_mais_300k": ("Habilitações +300k", CONTAGEM),
+    "habilitacoes_menos_300k": ("Habilitações -300k", CONTAGEM),
+    "conversao_mais_300k": ("Conversão +300k", TAXA),
+    "conversao_menos_300k": ("Conversão -300k", TAXA),
+    "perc_contas_acessadas_hub_mais_300k": ("Acessaram o Hub +300k", TAXA),
+    "perc_contas_acessadas_hub_menos_300k": ("Acessaram o Hub -300k", TAXA),
+    "perc_contas_mais_300k_com_ordem_enviada": ("Ordem enviada +300k", TAXA),
+    "perc_contas_menos_300k_com_ordem_enviada": ("Ordem enviada -300k", TAXA),
+    "perc_contas_aportaram_mais_300k": ("Aportaram +300k", TAXA),
+    "perc_contas_aportaram_menos_300k": ("Aportaram -300k", TAXA),
+}
+
+# Funil de novos clientes: etapa -> métricas de contagem somadas
+ETAPAS_FUNIL: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("Lead Start", ("lead_start",)),
+    ("Carteiras simuladas", ("carteiras_simuladas_novos_clientes",)),
+    ("Habilitações", ("habilitacoes_mais_300k", "habilitacoes_menos_300k")),
+)
+
+# Funil de ativação por faixa: etapa -> taxa (média entre assessores)
+ETAPAS_ATIVACAO: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "+300k": (
+        ("Conversão", "conversao_mais_300k"),
+        ("Acessaram o Hub", "perc_contas_acessadas_hub_mais_300k"),
+        ("Ordem enviada", "perc_contas_mais_300k_com_ordem_enviada"),
+        ("Aportaram", "perc_contas_aportaram_mais_300k"),
+    ),
+    "-300k": (
+        ("Conversão", "conversao_menos_300k"),
+        ("Acessaram o Hub", "perc_contas_acessadas_hub_menos_300k"),
+        ("Ordem enviada", "perc_contas_menos_300k_com_ordem_enviada"),
+        ("Aportaram", "perc_contas_aportaram_menos_300k"),
+    ),
+}
+
+Mes = Union[pd.Period, pd.Timestamp, str]
+
+
+def pares_meta(colunas: Iterable[str]) -> List[str]:
+    """
+    Métricas com par realizado/meta presente nas colunas: primeiro as
+    conhecidas (na ordem de METRICAS_HABILITACOES), depois pares novos.
+    """
+    colunas = list(colunas)
+    presentes = set(colunas)
+    conhecidas = [m for m in METRICAS_HABILITACOES if m in presentes and PREFIXO_META + m in presentes]
+    novas = [
+        c for c in colunas
+        if not c.startswith(PREFIXO_META) and PREFIXO_META + c in presentes and c not in METRICAS_HABILITACOES
+    ]
+    return conhecidas + novas
+
+
+def _rotulo_tipo(metrica: str) -> Tuple[str, str]:
+    if metrica in METRICAS_HABILITACOES:
+        return METRICAS_HABILITACOES[metrica]
+    tipo = TAXA if metrica.startswith(("conversao", "perc_")) else CONTAGEM
+    return metrica.replace("_", " ").capitalize(), tipo
+
+
+def fracao_do_mes(meses: pd.PeriodIndex, hoje: Union[pd.Timestamp, datetime]) -> np.ndarray:
+    """
+    Fração decorrida de cada mês em 'hoje': 1 para meses fechados, dias
+    corridos / dias do mês para o mês corrente e 0 para meses futuros.
+    """
+    hoje = pd.Timestamp(hoje).normalize()
+    corrente = pd.Period(hoje, freq="M")
+    ordinais = np.asarray(meses.asi8, dtype="int64")
+    return np.where(
+        ordinais < corrente.ordinal, 1.0,
+        np.where(ordinais == corrente.ordinal, hoje.day / corrente.days_in_month, 0.0),
+    )
+
+
+def _dividir(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den, NaN onde den não é positivo ou falta algum dos dois."""
+    out = np.full(np.shape(num), np.nan)
+    ok = np.isfinite(num) & np.isfinite(den) & (den > 0)
+    np.divide(num, den, out=out, where=ok)
+    return out
+
+
+class PainelHabilitacoes:
+    """
+    Pares realizado/meta em formato longo, montado uma vez por geração do
+    banco (ver dados_habilitacoes.py).
+
+    Cada posição k dos arrays é (assessor, mês, métrica): os códigos inteiros
+    indexam `assessores`, `meses` e `metricas`. atingimento e ritmo de todas
+    as posições são calculados numa passada só e guardados por dia de
+    referência.
+    """
+
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        df = df if df is not None else pd.DataFrame()
+        obrigatorias = {"codigo_assessor", "ano_mes"}
+        self.metricas: Tuple[str, ...] = tuple(pares_meta(df.columns)) if obrigatorias <= set(df.columns) else ()
+        self.rotulos: Tuple[str, ...] = tuple(_rotulo_tipo(m)[0] for m in self.metricas)
+        self.tipos: Tuple[str, ...] = tuple(_rotulo_tipo(m)[1] for m in self.metricas)
+        self._taxa = np.array([t == TAXA for t in self.tipos], dtype=bool)
+        self._por_hoje: Dict[pd.Timestamp, Tuple[np.ndarray, np.ndarray]] = {}
+
+        if not self.metricas or df.empty:
+            self.assessores = np.array([], dtype=object)
+            self.meses = pd.PeriodIndex([], freq="M")
+            self.comercial = np.array([], dtype=bool)
+            vazio = np.zeros(0, dtype="int64")
+            self._assessor, self._mes, self._metrica = vazio, vazio, vazio
+            self.realizado = self.meta = np.zeros(0)
+            return
+
+        meses = pd.to_datetime(df["ano_mes"], errors="coerce").dt.to_period("M")
+        validas = meses.notna().to_numpy() & df["codigo_assessor"].notna().to_numpy()
+        df, meses = df.loc[validas], meses[validas]
+
+        cod_assessor, uniq_assessor = pd.factorize(df["codigo_assessor"].astype(str).str.strip(), sort=True)
+        self.assessores = np.asarray(uniq_assessor, dtype=object)
+        cod_mes, uniq_mes = pd.factorize(meses, sort=True)
+        self.meses = pd.PeriodIndex(uniq_mes, freq="M")
+        # Assessor conta como comercial se estiver assim em qualquer mês
+        comercial_linha = (
+            df["comercial"].astype(str).str.strip().str.casefold().eq("comercial").to_numpy()
+            if "comercial" in df.columns else np.zeros(len(df), dtype=bool)
+        )
+        self.comercial = np.bincount(cod_assessor, weights=comercial_linha, minlength=len(self.assessores)) > 0
+
+        # (linhas x métricas) -> arrays longos, na ordem linha-major
+        realizado = df[list(self.metricas)].apply(pd.to_numeric, errors="coerce").to_numpy("float64")
+        meta = df[[PREFIXO_META + m for m in self.metricas]].apply(pd.to_numeric, errors="coerce").to_numpy("float64")
+        n_metricas = len(self.metricas)
+        self._assessor = np.repeat(cod_assessor.astype("int64"), n_metricas)
+        self._mes = np.repeat(cod_mes.astype("int64"), n_metricas)
+        self._metrica = np.tile(np.arange(n_metricas, dtype="int64"), len(df))
+        self.realizado = realizado.ravel()
+        self.meta = meta.ravel()
+
+    @property
+    def vazio(self) -> bool:
+        return self.realizado.size == 0
+
+    def __len__(self) -> int:
+        return int(self.realizado.size)
+
+    def _mes_idx(self, mes: Mes) -> Optional[int]:
+        periodo = pd.Period(mes, freq="M")
+        pos = self.meses.searchsorted(periodo)
+        if pos < len(self.meses) and self.meses[pos] == periodo:
+            return int(pos)
+        return None
+
+    # ------------------------------------------------------------------
+    # Cálculo vetorizado
+    # ------------------------------------------------------------------
+    def atingimento_e_ritmo(self, hoje: Optional[Union[pd.Timestamp, datetime]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Arrays alinhados às posições longas:
+          atingimento = realizado / meta
+          ritmo       = realizado / (meta * fração decorrida do mês) para
+                        contagens; igual ao atingimento para taxas
+        NaN onde não há meta positiva (ou o mês ainda não começou).
+        """
+        hoje = pd.Timestamp(hoje if hoje is not None else pd.Timestamp.today()).normalize()
+        # O painel é compartilhado entre threads (sessões e aquecimento): lê o
+        # dict uma vez e devolve a tupla local, mesmo que outra thread troque
+        # self._por_hoje por outro dia no meio do caminho
+        resultado = self._por_hoje.get(hoje)
+        if resultado is None:
+            atingimento = _dividir(self.realizado, self.meta)
+            fracao = fracao_do_mes(self.meses, hoje)[self._mes]
+            fracao = np.where(self._taxa[self._metrica], 1.0, fracao)
+            resultado = (atingimento, _dividir(self.realizado, self.meta * fracao))
+            self._por_hoje = {hoje: resultado}  # só o dia corrente fica guardado
+        return resultado
+
+    def longo(self, hoje: Optional[Union[pd.Timestamp, datetime]] = None) -> pd.DataFrame:
+        """Formato longo completo: ano_mes, codigo_assessor, metrica, realizado, meta, atingimento, ritmo."""
+        atingimento, ritmo = self.atingimento_e_ritmo(hoje)
+        return pd.DataFrame({
+            "ano_mes": self.meses[self._mes] if len(self.meses) else pd.PeriodIndex([], freq="M"),
+            "codigo_assessor": self.assessores[self._assessor],
+            "metrica": pd.Categorical.from_codes(self._metrica, categories=list(self.metricas)),
+            "realizado": self.realizado,
+            "meta": self.meta,
+            "atingimento": atingimento,
+            "ritmo": ritmo,
+        })
+
+    def _fracao(self, mes: Mes, hoje: Optional[Union[pd.Timestamp, datetime]]) -> float:
+        periodo = pd.PeriodIndex([pd.Period(mes, freq="M")])
+        return float(fracao_do_mes(periodo, hoje if hoje is not None else pd.Timestamp.today())[0])
+
+    def _filtro(self, mes: Mes, assessores: Optional[Sequence[str]], apenas_comercial: bool) -> np.ndarray:
+        idx = self._mes_idx(mes)
+        if idx is None:
+            return np.zeros(len(self), dtype=bool)
+        mascara = self._mes == idx
+        permitidos = np.ones(len(self.assessores), dtype=bool)
+        if assessores is not None:
+            permitidos &= np.isin(self.assessores, [str(a).strip() for a in assessores])
+        if apenas_comercial:
+            permitidos &= self.comercial
+        return mascara & permitidos[self._assessor]
+
+    # ------------------------------------------------------------------
+    # Recortes
+    # ------------------------------------------------------------------
+    def resumo_mes(
+        self,
+        mes: Mes,
+        hoje: Optional[Union[pd.Timestamp, datetime]] = None,
+        assessores: Optional[Sequence[str]] = None,
+        apenas_comercial: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Uma linha por métrica no mês: realizado e meta somados (contagens) ou
+        em média entre assessores (taxas), atingimento e ritmo do agregado.
+        """
+        sel = self._filtro(mes, assessores, apenas_comercial)
+        n_metricas = len(self.metricas)
+        cod = self._metrica[sel]
+        real, meta = self.realizado[sel], self.meta[sel]
+
+        def _agregar(valores: np.ndarray) -> np.ndarray:
+            ok = np.isfinite(valores)
+            soma = np.bincount(cod[ok], weights=valores[ok], minlength=n_metricas)
+            n = np.bincount(cod[ok], minlength=n_metricas)
+            media = _dividir(soma, n.astype("float64"))
+            return np.where(self._taxa, media, np.where(n > 0, soma, np.nan))
+
+        realizado, meta_agg = _agregar(real), _agregar(meta)
+        fracao = self._fracao(mes, hoje)
+        return pd.DataFrame({
+            "metrica": list(self.metricas),
+            "rotulo": list(self.rotulos),
+            "tipo": list(self.tipos),
+            "realizado": realizado,
+            "meta": meta_agg,
+            "atingimento": _dividir(realizado, meta_agg),
+            "ritmo": _dividir(realizado, meta_agg * np.where(self._taxa, 1.0, fracao)),
+        })
+
+    def funil(
+        self,
+        mes: Mes,
+        hoje: Optional[Union[pd.Timestamp, datetime]] = None,
+        assessores: Optional[Sequence[str]] = None,
+        apenas_comercial: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Funil de novos clientes do mês (ETAPAS_FUNIL): etapa, realizado, meta,
+        atingimento, ritmo e conversão da etapa anterior.
+        """
+        resumo = self.resumo_mes(mes, hoje, assessores, apenas_comercial).set_index("metrica")
+        linhas = []
+        for etapa, metricas in ETAPAS_FUNIL:
+            presentes = [m for m in metricas if m in resumo.index]
+            if presentes:
+                parte = resumo.loc[presentes]
+                linhas.append({"etapa": etapa, "realizado": parte["realizado"].sum(), "meta": parte["meta"].sum()})
+        out = pd.DataFrame(linhas, columns=["etapa", "realizado", "meta"]).astype({"realizado": "float64", "meta": "float64"})
+        realizado, meta = out["realizado"].to_numpy(), out["meta"].to_numpy()
+        out["atingimento"] = _dividir(realizado, meta)
+        out["ritmo"] = _dividir(realizado, meta * self._fracao(mes, hoje))
+        out["conversao_etapa"] = _dividir(realizado, out["realizado"].shift(1).to_numpy())
+        return out
+
+    def ativacao(
+        self,
+        mes: Mes,
+        assessores: Optional[Sequence[str]] = None,
+        apenas_comercial: bool = False,
+    ) -> pd.DataFrame:
+        """Taxas de ativação do mês por faixa (ETAPAS_ATIVACAO): faixa, etapa, realizado, meta, atingimento."""
+        resumo = self.resumo_mes(mes, None, assessores, apenas_comercial).set_index("metrica")
+        linhas = [
+            {
+                "faixa": faixa,
+                "etapa": etapa,
+                "realizado": resumo.at[metrica, "realizado"],
+                "meta": resumo.at[metrica, "meta"],
+                "atingimento": resumo.at[metrica, "atingimento"],
+            }
+            for faixa, etapas in ETAPAS_ATIVACAO.items()
+            for etapa, metrica in etapas
+            if metrica in resumo.index
+        ]
+        return pd.DataFrame(linhas, columns=["faixa", "etapa", "realizado", "meta", "atingimento"])
+
+    def por_assessor(
+        self,
+        mes: Mes,
+        valor: str = "atingimento",
+        hoje: Optional[Union[pd.Timestamp, datetime]] = None,
+        assessores: Optional[Sequence[str]] = None,
+        apenas_comercial: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Matriz assessor x métrica do mês com 'valor' (realizado, meta,
+        atingimento ou ritmo); índice codigo_assessor, colunas = métricas.
+        """
+        if valor in ("atingimento", "ritmo"):
+            valores = self.atingimento_e_ritmo(hoje)[0 if valor == "atingimento" else 1]
+        elif valor in ("realizado", "meta"):
+            valores = getattr(self, valor)
+        else:
+            raise ValueError(f"valor deve ser realizado, meta, atingimento ou ritmo: {valor!r}")
+        sel = self._filtro(mes, assessores, apenas_comercial)
+        linhas_assessor = np.unique(self._assessor[sel])
+        matriz = np.full((len(linhas_assessor), len(self.metricas)), np.nan)
+        matriz[np.searchsorted(linhas_assessor, self._assessor[sel]), self._metrica[sel]] = valores[sel]
+        return pd.DataFrame(
+            matriz,
+            index=pd.Index(self.assessores[linhas_assessor], name="codigo_assessor"),
+            columns=list(self.metricas),
+        )
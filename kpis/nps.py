@@ -0,0 +1,172 @@
+# kpis/nps.py
+# NPS: normalização das colunas do export, filtro por pesquisa e métricas.
+
+import re
+from typing import Dict
+
+import pandas as pd
+
+from kpis.texto import norm_upper_noaccents_series, strip_accents
+
+_EXPECTED_KEYS = {
+    "survey_id": {"survey id"},
+    "user_id": {"id do usuario", "id usuario", "usuario id"},
+    "customer_id": {"costumer id", "customer id", "cliente id"},
+    "data_resposta": {"data de resposta", "data resposta", "data"},
+    "pesquisa_relacionamento": {"pesquisa relacionamento"},
+    "nps_assessor": {"xp relacionamento aniversario nps assessor", "nps assessor"},
+    "status": {"status"},
+    "codigo_assessor": {"codigo assessor", "cod assessor", "codigo do assessor"},
+    "notificacao": {"notificacao", "notificacao ?"},
+}
+_POSSIBLE_NOTA_KEYS = {
+    "nota",
+    "nota nps",
+    "score",
+    "pontuacao",
+    "resposta nota",
+    "nps",
+    "xp relacionamento aniversario nps assessor",
+}
+
+
+def normalizar_colunas_nps(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    def _norm_key(txt: str) -> str:
+        s = strip_accents(str(txt)).lower()
+        s = re.sub(r"[^a-z0-9]+", " ", s).strip()
+        return re.sub(r"\s+", " ", s)
+
+    norm_map = {_norm_key(c): c for c in df.columns}
+    rename_dict = {}
+    for canonical, variants in _EXPECTED_KEYS.items():
+        for v in variants:
+            if v in norm_map:
+                rename_dict[norm_map[v]] = canonical
+                break
+    df = df.rename(columns=rename_dict)
+
+    nota_col = None
+    for c in df.columns:
+        if _norm_key(c) in _POSSIBLE_NOTA_KEYS:
+            nota_col = c
+            break
+
+    if nota_col is None:
+        best_col, best_cnt = None, -1
+        for c in df.columns:
+            s = pd.to_numeric(df[c], errors="coerce")
+            if s.notna().any():
+                cnt = int(s.between(0, 10, inclusive="both").sum())
+                if cnt > best_cnt and cnt > 0:
+                    best_col, best_cnt = c, cnt
+        nota_col = best_col
+
+    if nota_col:
+        df = df.rename(columns={nota_col: "nota"})
+
+    if "data_resposta" in df.columns:
+        df["data_resposta"] = pd.to_datetime(
+            df["data_resposta"], errors="coerce", dayfirst=True, infer_datetime_format=True
+        )
+    if "codigo_assessor" in df.columns:
+        df["codigo_assessor"] = df["codigo_assessor"].astype(str).str.strip().str.upper()
+    if "pesquisa_relacionamento" in df.columns:
+        df["pesquisa_relacionamento_norm"] = norm_upper_noaccents_series(
+            df["pesquisa_relacionamento"]
+        )
+    if "nota" in df.columns:
+        df["nota"] = pd.to_numeric(df["nota"], errors="coerce")
+    return df
+
+
+def filtrar_por_pesquisa(df_nps: pd.DataFrame, token_exato: str) -> pd.DataFrame:
+    """
+    Linhas da pesquisa `token_exato` (comparação sem acento/caixa).
+    Sem a coluna de pesquisa, devolve DataFrame vazio (quem chama avisa).
+    """
+    if df_nps.empty:
+        return pd.DataFrame()
+    if "pesquisa_relacionamento" not in df_nps.columns and "pesquisa_relacionamento_norm" not in df_nps.columns:
+        return pd.DataFrame()
+
+    token_norm = strip_accents(token_exato).upper().strip()
+    col_norm = "pesquisa_relacionamento_norm"
+    if col_norm not in df_nps.columns and "pesquisa_relacionamento" in df_nps.columns:
+        df_nps[col_norm] = norm_upper_noaccents_series(df_nps["pesquisa_relacionamento"])
+
+    return df_nps[df_nps[col_norm] == token_norm].copy()
+
+
+def calcular_metricas_nps(df_sub: pd.DataFrame) -> Dict[str, float]:
+    total = int(df_sub.shape[0]) if not df_sub.empty else 0
+    if total == 0:
+        return {
+            "total": 0,
+            "respondidos": 0,
+            "aderencia": 0.0,
+            "media": 0.0,
+            "nps": 0.0,
+            "promotores": 0,
+            "neutros": 0,
+            "detratores": 0,
+        }
+
+    s = pd.to_numeric(df_sub.get("nota"), errors="coerce")
+    valid = s.between(0, 10, inclusive="both")
+    den = int(valid.sum())
+
+    prom = int(((s >= 9) & (s <= 10) & valid).sum())
+    detr = int(((s >= 0) & (s <= 6) & valid).sum())
+    neut = int(((s >= 7) & (s <= 8) & valid).sum())
+
+    aderencia = (den / total) * 100.0 if total > 0 else 0.0
+    media = float(s[valid].mean()) if den > 0 else 0.0
+    nps = 100.0 * (prom / den - detr / den) if den > 0 else 0.0
+
+    return {
+        "total": total,
+        "respondidos": den,
+        "aderencia": aderencia,
+        "media": media,
+        "nps": nps,
+        "promotores": prom,
+        "neutros": neut,
+        "detratores": detr,
+    }
+
+
+def top3_assessores_por_aderencia(df_sub: pd.DataFrame) -> pd.DataFrame:
+    # Check for required columns (handle different possible column names)
+    assessor_col = next((col for col in ["codigo_assessor", "assessor_code", "assessor"] if col in df_sub.columns), None)
+    nota_col = next((col for col in ["nota", "rating", "score"] if col in df_sub.columns), None)
+    
+    if df_sub.empty or not assessor_col or not nota_col:
+        return pd.DataFrame(columns=["ASSESSOR", "ADERENCIA", "RESPOSTAS"])
+
+    df = df_sub.copy()
+    s_nota = pd.to_numeric(df[nota_col], errors="coerce")
+    df["_valid"] = s_nota.between(0, 10, inclusive="both")
+    total_validos = float(df["_valid"].sum())
+
+    agg = (
+        df[df["_valid"]]
+        .groupby(assessor_col)
+        .agg(total_respostas=(nota_col, "size"), respondidos=("_valid", "sum"))
+        .reset_index()
+    )
+
+    agg["share"] = (agg["respondidos"] / total_validos * 100.0) if total_validos > 0 else 0.0
+    agg = agg.nlargest(3, ["respondidos", "share"])
+
+    # Aqui mantemos ADERENCIA numérica (em %), sem formatar como string
+    out = agg[[assessor_col, "share", "respondidos"]].rename(
+        columns={
+            assessor_col: "ASSESSOR",
+            "respondidos": "RESPOSTAS",
+            "share": "ADERENCIA",
+        }
+    )
+    return out[["ASSESSOR", "ADERENCIA", "RESPOSTAS"]]
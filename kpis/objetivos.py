@@ -0,0 +1,330 @@
+# kpis/objetivos.py
+# Indicadores de Objetivos (captação líquida mês/ano e AUC vs. metas).
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from kpis.positivador import converter_data_posicao
+
+# Metas de AUC do "Rumo a 1BI" (valores acumulados em 31/12 de cada ano),
+# usadas quando a tabela objetivos não tem o ano
+METAS_RUMO_1BI_PADRAO = {2025: 600_000_000.0, 2026: 800_000_000.0, 2027: 1_000_000_000.0}
+
+# Nomes usados no código -> colunas reais da tabela objetivos
+COLUNAS_OBJETIVOS = {
+    "auc_objetivo_ano": "AUC Objetivo",
+    "cap_objetivo_ano": "Cap. Liq Objetivo",
+    "rec_objetivo_ano": "Receita Objetivo",
+    "c_ativadas_objetivo_ano": "Contas Ativadas",
+}
+
+
+def meta_objetivo(
+    objetivos_df: Optional[pd.DataFrame], ano_meta: int, coluna: str, fallback: float = 0.0
+) -> float:
+    """
+    Busca um valor de objetivo na tabela objetivos (já carregada) filtrando
+    por ano e coluna.
+
+    Regra:
+    - Se existir valor no banco:
+        - Se o fallback for 0 ou menor/igual ao valor do banco -> usa o valor do banco
+        - Se o fallback for MAIOR que o valor do banco -> usa o fallback (valor "forçado")
+    - Se não existir linha/coluna ou der erro -> usa o fallback
+    """
+    try:
+        if objetivos_df is None or objetivos_df.empty:
+            return float(fallback)
+
+        # Usar coluna mapeada ou original se não houver mapeamento
+        coluna_real = COLUNAS_OBJETIVOS.get(coluna, coluna)
+
+        # Usar a coluna 'Objetivo' diretamente
+        row_ano = objetivos_df.loc[objetivos_df["Objetivo"] == ano_meta]
+        if not row_ano.empty and coluna_real in row_ano.columns:
+            val_banco = float(row_ano[coluna_real].max())
+            if val_banco > 0:
+                # Se foi passado um fallback > 0 e ele é MAIOR que o valor do banco,
+                # damos prioridade ao fallback (meta "fixada" no código)
+                if fallback and fallback > val_banco:
+                    return float(fallback)
+                return val_banco
+
+        return float(fallback)
+    except Exception:
+        return float(fallback)
+
+
+def _regra_fallback(val_banco: Optional[float], fallback: float) -> float:
+    """Mesma regra de meta_objetivo para um valor já lido do banco."""
+    if val_banco is not None and val_banco > 0:
+        if fallback and fallback > val_banco:
+            return float(fallback)
+        return val_banco
+    return float(fallback)
+
+
+class IndiceObjetivos:
+    """
+    Tabela objetivos indexada por (ano, coluna real) -> maior valor do ano.
+    Montado uma vez (ver dados_objetivos.py, por geração do banco); cada
+    consulta é um acesso a dict em vez de filtrar o DataFrame.
+
+    curva_diaria(ano, coluna) é a meta acumulada dia a dia (equivalente ao
+    auc_diario_ano/cap_diario_ano acumulado): a "meta até hoje" vira um
+    índice no array.
+    """
+
+    def __init__(self, objetivos_df: Optional[pd.DataFrame] = None):
+        self._metas: Dict[Tuple[int, str], float] = {}
+        self._diarias: Dict[Tuple[int, str], np.ndarray] = {}
+        self._curva_rumo_1bi: Optional["CurvaMeta"] = None
+
+        if objetivos_df is None or objetivos_df.empty or "Objetivo" not in objetivos_df.columns:
+            return
+        anos = pd.to_numeric(objetivos_df["Objetivo"], errors="coerce")
+        for coluna in objetivos_df.columns:
+            if coluna == "Objetivo":
+                continue
+            valores = pd.to_numeric(objetivos_df[coluna], errors="coerce")
+            por_ano = valores.groupby(anos).max().dropna()
+            for ano, valor in por_ano.items():
+                self._metas[(int(ano), coluna)] = float(valor)
+
+    @property
+    def vazio(self) -> bool:
+        return not self._metas
+
+    @property
+    def anos(self) -> List[int]:
+        return sorted({ano for ano, _ in self._metas})
+
+    def valor(self, ano: int, coluna: str) -> Optional[float]:
+        """Valor do banco (None se não houver). Aceita nome do código ou coluna real."""
+        return self._metas.get((int(ano), COLUNAS_OBJETIVOS.get(coluna, coluna)))
+
+    def meta(self, ano: int, coluna: str, fallback: float = 0.0) -> float:
+        """Mesmo resultado de meta_objetivo(objetivos_df, ano, coluna, fallback)."""
+        return _regra_fallback(self.valor(ano, coluna), fallback)
+
+    def curva_diaria(self, ano: int, coluna: str) -> np.ndarray:
+        """
+        Meta acumulada até cada dia do ano: posição i = meta_anual * (i + 1) / dias_no_ano.
+        Array vazio se o ano/coluna não estiver na tabela.
+        """
+        chave = (int(ano), COLUNAS_OBJETIVOS.get(coluna, coluna))
+        if chave not in self._diarias:
+            meta_anual = self._metas.get(chave)
+            if meta_anual is None:
+                self._diarias[chave] = np.zeros(0)
+            else:
+                dias = 366 if pd.Timestamp(ano, 12, 31).dayofyear == 366 else 365
+                self._diarias[chave] = meta_anual * np.arange(1, dias + 1, dtype="float64") / dias
+        return self._diarias[chave]
+
+    def meta_ate(self, coluna: str, data: Union[pd.Timestamp, datetime]) -> float:
+        """Meta acumulada de 'coluna' do ano de 'data' até 'data' (inclusive)."""
+        data = pd.Timestamp(data)
+        curva = self.curva_diaria(data.year, coluna)
+        return float(curva[data.dayofyear - 1]) if len(curva) else 0.0
+
+    def curva_rumo_1bi(self) -> "CurvaMeta":
+        if self._curva_rumo_1bi is None:
+            self._curva_rumo_1bi = curva_rumo_1bi(self)
+        return self._curva_rumo_1bi
+
+
+def calcular_indicadores_objetivos(
+    df_pos: pd.DataFrame,
+    df_obj: pd.DataFrame,
+    hoje: datetime,
+    df_metas: Optional[pd.DataFrame] = None,
+    indice: Optional[IndiceObjetivos] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Captação do mês/ano e AUC contra as metas anuais.
+    As metas anuais de captação e AUC vêm de `indice` (IndiceObjetivos já
+    montado) ou, na falta dele, da tabela objetivos `df_metas`; sem nenhum
+    dos dois, essas metas ficam em 0.
+    """
+    if indice is None:
+        indice = IndiceObjetivos(df_metas)
+    hoje = pd.Timestamp(hoje or pd.Timestamp.today()).normalize()
+    ano_atual = hoje.year
+
+    df_pos = df_pos.copy()
+    if "Data_Posicao" in df_pos.columns:
+        df_pos["Data_Posicao"] = converter_data_posicao(df_pos["Data_Posicao"])
+    if "Captacao_Liquida_em_M" in df_pos.columns:
+        df_pos["Captacao_Liquida_em_M"] = pd.to_numeric(
+            df_pos["Captacao_Liquida_em_M"], errors="coerce"
+        ).fillna(0)
+    if "Net_Em_M" in df_pos.columns:
+        df_pos["Net_Em_M"] = pd.to_numeric(df_pos["Net_Em_M"], errors="coerce").fillna(0)
+
+    mesref_pos = None
+    if "Data_Posicao" in df_pos.columns and not df_pos["Data_Posicao"].isna().all():
+        mesref_pos = df_pos["Data_Posicao"].dt.to_period("M").max()
+
+    capliq_mes_atual = 0.0
+    if mesref_pos is not None and "Captacao_Liquida_em_M" in df_pos.columns:
+        grp_mes = df_pos.groupby(df_pos["Data_Posicao"].dt.to_period("M"))[
+            "Captacao_Liquida_em_M"
+        ].sum()
+        if mesref_pos in grp_mes.index:
+            capliq_mes_atual = float(grp_mes.loc[mesref_pos])
+
+    pace_mes = None
+    # Calcular pace para o mês atual da data de referência
+    mes_atual_period = pd.Period(year=hoje.year, month=hoje.month, freq='M')
+    mes_inicio = mes_atual_period.to_timestamp(how="start")
+    mes_fim = mes_atual_period.to_timestamp(how="end")
+    dias_mes = (mes_fim - mes_inicio).days + 1
+    dias_corridos = (hoje - mes_inicio).days + 1
+    pace_mes = dias_corridos / dias_mes
+
+    capliq_ano_atual = 0.0
+    if {"Data_Posicao", "Captacao_Liquida_em_M"} <= set(df_pos.columns):
+        df_y = df_pos[df_pos["Data_Posicao"].dt.year == ano_atual].copy()
+        cap_por_mes = df_y.groupby(df_y["Data_Posicao"].dt.month)["Captacao_Liquida_em_M"].sum()
+        capliq_ano_atual = float(cap_por_mes.sum())
+
+    # Meta anual e meta proporcional até hoje (curva diária do índice)
+    cap_meta_eoy = indice.valor(ano_atual, "Cap. Liq Objetivo") or 0.0
+    cap_meta_hoje = indice.meta_ate("Cap. Liq Objetivo", hoje)
+
+    df_obj = df_obj.copy()
+    # Converter coluna Objetivo para numérico se necessário
+    if "Objetivo" in df_obj.columns:
+        df_obj["Objetivo"] = pd.to_numeric(df_obj["Objetivo"], errors="coerce")
+    
+    objetivo_anual = 0.0
+    if "Cap. Liq Objetivo" in df_obj.columns and not df_obj.empty:
+        obj_ano = df_obj[df_obj["Objetivo"] == ano_atual]
+        objetivo_anual = (
+            float(obj_ano["Cap. Liq Objetivo"].max())
+            if not obj_ano.empty
+            else float(df_obj["Cap. Liq Objetivo"].max())
+        )
+
+    valor_alcancado_ano = capliq_ano_atual
+    mes_atual = hoje.month
+    obj_restante_ano = max(0.0, (objetivo_anual or 0.0) - valor_alcancado_ano)
+    meses_restantes = max(1, 12 - mes_atual + 1)
+    obj_capliq_mes_max = obj_restante_ano / meses_restantes
+
+    auc_meta_eoy = indice.valor(ano_atual, "AUC Objetivo") or 0.0
+    auc_meta_hoje = indice.meta_ate("AUC Objetivo", hoje)
+
+    auc_atual = 0.0
+    if (mesref_pos is not None) and {"Data_Posicao", "Net_Em_M"} <= set(df_pos.columns):
+        mask_mesrec = df_pos["Data_Posicao"].dt.to_period("M") == mesref_pos
+        auc_atual = float(df_pos.loc[mask_mesrec, "Net_Em_M"].sum())
+
+    return {
+        "capliq_mes": {
+            "valor": capliq_mes_atual,
+            "max": obj_capliq_mes_max,
+            "pace_target": (obj_capliq_mes_max * pace_mes)
+            if (pace_mes is not None and obj_capliq_mes_max is not None)
+            else None,
+            "mesref": str(mesref_pos) if mesref_pos is not None else "-",
+        },
+        "capliq_ano": {
+            "valor": capliq_ano_atual,
+            "max": cap_meta_eoy,
+            "pace_target": cap_meta_hoje,
+            "ano": ano_atual,
+        },
+        "auc": {
+            "valor": auc_atual,
+            "max": auc_meta_eoy,
+            "pace_target": auc_meta_hoje,
+            "mesref": str(mesref_pos) if mesref_pos is not None else "-",
+        },
+    }
+
+
+# =============================================================================
+# CURVA DE METAS (RUMO A 1BI)
+# =============================================================================
+
+Datas = Union[pd.Timestamp, datetime, str, pd.DatetimeIndex, pd.Series, np.ndarray, list]
+
+
+def _para_dias(datas) -> np.ndarray:
+    """Datas -> dias desde 1970-01-01 (float64), para usar com np.interp."""
+    dt = pd.to_datetime(pd.Series(np.atleast_1d(np.asarray(datas, dtype=object))), errors="coerce")
+    return dt.dt.normalize().to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+
+
+@dataclass(frozen=True)
+class CurvaMeta:
+    """
+    Meta projetada linear por partes entre marcos (data, valor). Antes do
+    primeiro marco vale o valor inicial; depois do último, o valor final.
+    """
+    marcos: pd.DatetimeIndex
+    valores: np.ndarray
+
+    @property
+    def objetivo_final(self) -> float:
+        return float(self.valores[-1])
+
+    @property
+    def data_final(self) -> pd.Timestamp:
+        return self.marcos[-1]
+
+    def projetado(self, datas: Datas) -> np.ndarray:
+        """Meta projetada para um array de datas (vetorizado com np.interp)."""
+        x = _para_dias(datas)
+        xp = self.marcos.to_numpy(dtype="datetime64[D]").astype("int64").astype("float64")
+        return np.interp(x, xp, self.valores)
+
+    def projetado_em(self, data: Union[pd.Timestamp, datetime, str]) -> float:
+        return float(self.projetado([data])[0])
+
+
+def curva_rumo_1bi(
+    objetivos: Union[IndiceObjetivos, pd.DataFrame, None],
+    metas_padrao: Optional[Dict[int, float]] = None,
+    coluna: str = "auc_objetivo_ano",
+) -> CurvaMeta:
+    """
+    Curva do "Rumo a 1BI": parte de 0 em 31/12 do ano anterior ao primeiro
+    marco e passa pela meta de AUC de cada ano em 31/12 (regra de
+    meta_objetivo, com os valores padrão como fallback). A curva é forçada a
+    ser crescente e a não passar do objetivo final.
+    """
+    indice = objetivos if isinstance(objetivos, IndiceObjetivos) else IndiceObjetivos(objetivos)
+    metas_padrao = metas_padrao or METAS_RUMO_1BI_PADRAO
+    anos = sorted(metas_padrao)
+    metas = [indice.meta(ano, coluna, metas_padrao[ano]) for ano in anos]
+
+    # Cada marco fica entre o anterior e o menor dos seguintes: curva crescente
+    # que não passa do objetivo final
+    ajustadas: list = []
+    for i in range(len(metas)):
+        piso = ajustadas[-1] if ajustadas else 0.0
+        ajustadas.append(max(piso, min(metas[i:])))
+
+    marcos = pd.DatetimeIndex([pd.Timestamp(anos[0] - 1, 12, 31)] + [pd.Timestamp(a, 12, 31) for a in anos])
+    return CurvaMeta(marcos=marcos, valores=np.array([0.0] + ajustadas, dtype="float64"))
+
+
+def projetado_vs_realizado(curva: CurvaMeta, realizado: pd.Series) -> pd.DataFrame:
+    """
+    Junta uma série realizada (índice de datas) com a meta projetada nas
+    mesmas datas. Colunas: data, realizado, projetado, diferenca.
+    """
+    if realizado is None or realizado.empty:
+        return pd.DataFrame(columns=["data", "realizado", "projetado", "diferenca"])
+    datas = pd.to_datetime(pd.Series(realizado.index), errors="coerce")
+    out = pd.DataFrame({"data": datas, "realizado": pd.to_numeric(realizado, errors="coerce").to_numpy()})
+    out["projetado"] = curva.projetado(out["data"])
+    out["diferenca"] = out["realizado"] - out["projetado"]
+    return out
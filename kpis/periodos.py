@@ -0,0 +1,137 @@
+# kpis/periodos.py
+# Janelas móveis e comparativos entre períodos (MoM, YoY, últimos 3/6/12
+# meses, ritmo vs. ano anterior) sobre uma série mensal já agregada.
+#
+# A série guarda a soma acumulada dos meses, então qualquer janela custa O(1):
+# montada uma vez por geração do banco (ver dados_positivador.py), novos cards
+# de comparação não varrem a base a cada render.
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+JANELAS_MOVEIS = (3, 6, 12)
+
+Mes = Union[pd.Period, pd.Timestamp, str]
+
+
+def variacao_pct(atual: Optional[float], anterior: Optional[float]) -> Optional[float]:
+    """Variação percentual de 'anterior' para 'atual' (None se não houver base)."""
+    if atual is None or anterior is None or anterior == 0:
+        return None
+    return (atual - anterior) / abs(anterior) * 100.0
+
+
+class SerieMensal:
+    """
+    Valores mensais contínuos (meses sem dado valem 0) com soma acumulada.
+    Meses fora do intervalo da série também valem 0.
+    """
+
+    def __init__(self, valores: pd.Series):
+        valores = pd.to_numeric(valores, errors="coerce").fillna(0)
+        if valores.empty:
+            self.inicio: Optional[pd.Period] = None
+            self.fim: Optional[pd.Period] = None
+            self._valores = np.zeros(0)
+        else:
+            idx = pd.PeriodIndex(valores.index, freq="M")
+            serie = valores.groupby(idx).sum()
+            completo = pd.period_range(serie.index.min(), serie.index.max(), freq="M")
+            self.inicio, self.fim = completo[0], completo[-1]
+            self._valores = serie.reindex(completo, fill_value=0).to_numpy(dtype="float64")
+        # _acum[i] = soma dos i primeiros meses
+        self._acum = np.concatenate([[0.0], np.cumsum(self._valores)])
+
+    @classmethod
+    def de_frame(cls, df: pd.DataFrame, coluna: str, date_col: str = "data") -> "SerieMensal":
+        """Série a partir de um agregado mensal (uma linha por mês)."""
+        if df is None or df.empty or coluna not in df.columns or date_col not in df.columns:
+            return cls(pd.Series(dtype="float64"))
+        meses = pd.to_datetime(df[date_col], errors="coerce").dt.to_period("M")
+        ok = meses.notna()
+        return cls(pd.Series(df.loc[ok, coluna].to_numpy(), index=meses[ok]))
+
+    @property
+    def vazia(self) -> bool:
+        return self.inicio is None
+
+    def _pos(self, mes: Mes) -> int:
+        return (pd.Period(mes, freq="M") - self.inicio).n
+
+    def soma(self, inicio: Mes, fim: Mes) -> float:
+        """Soma de inicio..fim (inclusive)."""
+        if self.vazia:
+            return 0.0
+        n = len(self._valores)
+        i = min(max(self._pos(inicio), 0), n)
+        j = min(max(self._pos(fim) + 1, 0), n)
+        return float(self._acum[j] - self._acum[i]) if j > i else 0.0
+
+    def valor(self, mes: Mes) -> float:
+        return self.soma(mes, mes)
+
+    def ultimos(self, fim: Mes, meses: int) -> float:
+        """Soma dos 'meses' meses terminando em 'fim' (inclusive)."""
+        fim = pd.Period(fim, freq="M")
+        return self.soma(fim - (meses - 1), fim)
+
+    def acumulado_ano(self, mes: Mes) -> float:
+        """Janeiro até 'mes' (inclusive) do mesmo ano."""
+        mes = pd.Period(mes, freq="M")
+        return self.soma(pd.Period(year=mes.year, month=1, freq="M"), mes)
+
+
+def comparativos_fluxo(serie: SerieMensal, mes: Mes) -> Dict[str, Optional[float]]:
+    """
+    Métricas de fluxo (ex.: captação líquida) no mês de referência:
+    valor do mês, MoM, YoY, somas dos últimos 3/6/12 meses, acumulado do ano
+    e ritmo vs. o mesmo período do ano anterior.
+    """
+    mes = pd.Period(mes, freq="M")
+    atual = serie.valor(mes)
+    mes_ant = serie.valor(mes - 1)
+    ano_ant = serie.valor(mes - 12)
+    ytd = serie.acumulado_ano(mes)
+    ytd_ant = serie.acumulado_ano(mes - 12)
+
+    out: Dict[str, Optional[float]] = {
+        "mes": atual,
+        "mes_anterior": mes_ant,
+        "mom_pct": variacao_pct(atual, mes_ant),
+        "mesmo_mes_ano_anterior": ano_ant,
+        "yoy_pct": variacao_pct(atual, ano_ant),
+        "acumulado_ano": ytd,
+        "acumulado_ano_anterior": ytd_ant,
+        "ritmo_vs_ano_anterior_pct": variacao_pct(ytd, ytd_ant),
+    }
+    for n in JANELAS_MOVEIS:
+        out[f"ultimos_{n}m"] = serie.ultimos(mes, n)
+        out[f"ultimos_{n}m_anterior"] = serie.ultimos(mes - n, n)
+    return out
+
+
+def comparativos_estoque(serie: SerieMensal, mes: Mes) -> Dict[str, Optional[float]]:
+    """
+    Métricas de estoque (ex.: AUC): posição do mês, MoM, YoY, médias dos
+    últimos 3/6/12 meses e variação desde dezembro do ano anterior.
+    """
+    mes = pd.Period(mes, freq="M")
+    atual = serie.valor(mes)
+    mes_ant = serie.valor(mes - 1)
+    ano_ant = serie.valor(mes - 12)
+    dez_ant = serie.valor(pd.Period(year=mes.year - 1, month=12, freq="M"))
+
+    out: Dict[str, Optional[float]] = {
+        "mes": atual,
+        "mes_anterior": mes_ant,
+        "mom_pct": variacao_pct(atual, mes_ant),
+        "mesmo_mes_ano_anterior": ano_ant,
+        "yoy_pct": variacao_pct(atual, ano_ant),
+        "dezembro_anterior": dez_ant,
+        "variacao_ano_pct": variacao_pct(atual, dez_ant),
+    }
+    for n in JANELAS_MOVEIS:
+        out[f"media_{n}m"] = serie.ultimos(mes, n) / n
+    return out
@@ -0,0 +1,150 @@
+# kpis/positivador.py
+# Preparação e agregados básicos do Positivador (AUC, clientes, competências).
+
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from db_utils import to_shared_categoricals
+from kpis.assessores import extract_assessor_code
+from kpis.texto import como_texto
+
+
+def converter_data_posicao(serie: pd.Series) -> pd.Series:
+    """
+    Data de posição -> datetime. O export grava 'Data Posição' como dd/mm/aaaa
+    (lido com formato explícito, nunca mês primeiro); o banco tipado grava ISO.
+    Colunas já datetime passam direto.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    texto = serie.astype("string").str.strip()
+    datas = pd.to_datetime(texto.str.slice(0, 10), format="%d/%m/%Y", errors="coerce")
+    resto = datas.isna() & texto.notna() & texto.ne("")
+    if resto.any():
+        datas = datas.fillna(pd.to_datetime(texto[resto], format="ISO8601", errors="coerce"))
+    return datas
+
+
+def tratar_dados_positivador_mtd(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normaliza as colunas do Positivador, aceitando tanto nomes antigos (Excel)
+    quanto os do novo banco DBV Capital_Positivador.db.
+    """
+    renomear = {
+        "Net Em M": "Net_Em_M",
+        "net_em_m": "Net_Em_M",
+        "Data Posição": "Data_Posicao",
+        "data_posicao": "Data_Posicao",
+        "Captação Líquida em M": "Captacao_Liquida_em_M",
+        "Captação Liq em M": "Captacao_Liquida_em_M",
+        "Captacao Liquida em M": "Captacao_Liquida_em_M",
+        "captacao_liquida_em_m": "Captacao_Liquida_em_M",
+        "Assessor": "assessor",
+        "cliente": "Cliente",
+    }
+
+    for origem, destino in renomear.items():
+        if origem in df.columns:
+            df = df.rename(columns={origem: destino})
+
+    if "Data_Posicao" in df.columns:
+        df["Data_Posicao"] = converter_data_posicao(df["Data_Posicao"])
+
+    for c in ["Net_Em_M", "Captacao_Liquida_em_M"]:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+
+    has_assessor_code = "assessor_code" in df.columns
+    if has_assessor_code:
+        df["assessor_code"] = como_texto(df["assessor_code"])
+        valid_codes = df["assessor_code"].str.match(r"^A\d{5}$", na=False).sum()
+    else:
+        valid_codes = 0
+
+    if (not has_assessor_code) or (valid_codes == 0):
+        if "assessor" in df.columns:
+            df["assessor"] = como_texto(df["assessor"], strip=False)
+            # Em colunas Categorical o map roda uma vez por categoria, não por linha
+            df["assessor_code"] = df["assessor"].map(extract_assessor_code)
+            df["assessor_code"] = df["assessor_code"].where(
+                df["assessor_code"].notna() & (df["assessor_code"] != ""),
+                pd.NA,
+            )
+        else:
+            df["assessor_code"] = pd.NA
+    else:
+        df["assessor_code"] = como_texto(df["assessor_code"])
+
+    if "Cliente" in df.columns:
+        df["Cliente"] = como_texto(df["Cliente"], strip=False)
+
+    # Frames categóricos: a coluna derivada usa o mesmo dicionário do loader
+    if df.attrs.get("categorical_db"):
+        df = to_shared_categoricals(df, ["assessor_code"], Path(df.attrs["categorical_db"]))
+
+    return df
+
+
+def obter_auc_inicial_ano(df: pd.DataFrame, ano: int) -> float:
+    """
+    Retorna o AUC inicial de um determinado ano, usando a primeira Data_Posicao desse ano.
+    Soma o Net_Em_M dessa data.
+    """
+    if df is None or df.empty:
+        return 0.0
+    if 'Data_Posicao' not in df.columns or 'Net_Em_M' not in df.columns:
+        return 0.0
+
+    aux = df.copy()
+    aux['Data_Posicao'] = converter_data_posicao(aux['Data_Posicao'])
+    aux = aux[aux['Data_Posicao'].dt.year == ano]
+    if aux.empty:
+        return 0.0
+
+    primeira_data = aux['Data_Posicao'].min()
+    auc_inicial = float(aux.loc[aux['Data_Posicao'] == primeira_data, 'Net_Em_M'].sum() or 0.0)
+    return auc_inicial
+
+
+def contar_clientes_net_positivo(df_pos: pd.DataFrame, periodM: pd.Period) -> int:
+    if df_pos.empty:
+        return 0
+    date_col = None
+    for cand in ["Data_Posicao", "Data_Atualizacao", "Data_Cadastro", "__data_pos__"]:
+        if cand in df_pos.columns:
+            date_col = cand
+            break
+    if not date_col:
+        return 0
+    aux = df_pos.copy()
+    aux["ym"] = pd.to_datetime(aux[date_col], errors="coerce").dt.to_period("M")
+    m = aux["ym"] == periodM
+    aux = aux.loc[m].copy()
+    return int(como_texto(aux.loc[aux["Net_Em_M"].fillna(0) > 0, "Cliente"], strip=False).nunique())
+
+
+def ultimo_periodo_comum(df_pos: pd.DataFrame, df_auc: pd.DataFrame) -> Optional[pd.Period]:
+    """
+    Tenta encontrar a última competência comum.
+    Se não encontrar, retorna a última competência do AUC (fallback).
+    """
+    if df_auc.empty or "data_parsed" not in df_auc.columns:
+        return None
+
+    m_auc_periods = pd.to_datetime(df_auc["data_parsed"], errors="coerce").dt.to_period("M").dropna()
+    if m_auc_periods.empty:
+        return None
+
+    unique_auc = set(m_auc_periods.astype(str).unique())
+
+    if not df_pos.empty and "Data_Posicao" in df_pos.columns:
+        m_pos_periods = converter_data_posicao(df_pos["Data_Posicao"]).dt.to_period("M").dropna()
+        m_pos = set(m_pos_periods.astype(str).unique())
+
+        inter = sorted(unique_auc & m_pos)
+        if inter:
+            return pd.Period(inter[-1])
+
+    return m_auc_periods.max()
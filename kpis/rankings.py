@@ -0,0 +1,149 @@
+# kpis/rankings.py
+# Rankings de assessores (captação no mês/ano, PL da Mesa RV).
+#
+# Motor de ranking: rollup_mensal() agrega a base uma vez por (mês, assessor)
+# e ranking_assessores() responde qualquer Top N (métrica x mês/ano) sobre esse
+# agregado com seleção parcial (nlargest), já com o nome do assessor. Novos
+# rankings na TV reaproveitam o mesmo agregado, sem varrer a base de novo.
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from kpis.assessores import obter_nome_assessor
+from kpis.texto import como_texto
+
+TOKENS_INVALIDOS = ["", "NONE", "NENHUM", "NA", "N/A", "NULL", "-", "NAN", "<NA>"]
+PERIODOS_RANKING = ("mes", "ano")
+
+
+@dataclass(frozen=True)
+class ItemRanking:
+    posicao: int
+    codigo: str
+    nome: str
+    valor: float
+
+
+def _coluna_grupo(df: pd.DataFrame, group_col: str) -> Optional[str]:
+    if group_col in df.columns:
+        return group_col
+    return "assessor" if "assessor" in df.columns else None
+
+
+def _grupos_validos(s: pd.Series) -> pd.Series:
+    """Códigos de assessor com tokens vazios/inválidos trocados por NA."""
+    s = como_texto(s)
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # Checa só o dicionário, não cada linha
+        cats = s.cat.categories
+        invalidas = cats[pd.Series(cats.astype(str)).str.upper().isin(TOKENS_INVALIDOS).to_numpy()]
+        return s.where(~s.isin(invalidas))
+    return s.where(~s.str.upper().isin(TOKENS_INVALIDOS))
+
+
+def rollup_mensal(
+    df: pd.DataFrame,
+    value_cols: Iterable[str],
+    date_col: str = "Data_Posicao",
+    group_col: str = "assessor_code",
+) -> pd.DataFrame:
+    """
+    Uma linha por (mes, grupo) com a soma de cada métrica e, em '<métrica>__n',
+    quantas linhas da base tinham valor != 0 (define o último período "com dados").
+    """
+    group_col = _coluna_grupo(df, group_col)
+    value_cols = [c for c in value_cols if c in df.columns]
+    if group_col is None or date_col not in df.columns or not value_cols:
+        return pd.DataFrame(columns=["mes", "grupo"])
+
+    datas = pd.to_datetime(df[date_col], errors="coerce")
+    base = pd.DataFrame({"mes": datas.dt.to_period("M"), "grupo": _grupos_validos(df[group_col])})
+    for c in value_cols:
+        valores = pd.to_numeric(df[c], errors="coerce").fillna(0)
+        base[c] = valores
+        base[f"{c}__n"] = (valores != 0).astype("int64")
+
+    base = base[base["mes"].notna() & base["grupo"].notna()]
+    return base.groupby(["mes", "grupo"], observed=True, sort=True).sum().reset_index()
+
+
+def ranking_assessores(
+    rollup: pd.DataFrame,
+    metrica: str,
+    periodo: str = "mes",
+    n: int = 5,
+) -> Tuple[List[ItemRanking], str]:
+    """
+    Top N de 'metrica' no ÚLTIMO mês (periodo="mes") ou ano (periodo="ano")
+    com algum valor != 0. Devolve os itens e o rótulo do período ("-" sem dados).
+    """
+    if periodo not in PERIODOS_RANKING:
+        raise ValueError(f"periodo deve ser um de {PERIODOS_RANKING}: {periodo!r}")
+    if rollup is None or rollup.empty or f"{metrica}__n" not in rollup.columns:
+        return [], "-"
+
+    ativos = rollup[rollup[f"{metrica}__n"] > 0]
+    if ativos.empty:
+        return [], "-"
+
+    if periodo == "mes":
+        ref = ativos["mes"].max()
+        sel = ativos[ativos["mes"] == ref]
+    else:
+        anos = ativos["mes"].dt.year
+        ref = int(anos.max())
+        sel = ativos[anos == ref]
+
+    serie = sel.groupby("grupo", observed=True)[metrica].sum().nlargest(n)
+    itens = [
+        ItemRanking(posicao=pos, codigo=str(cod), nome=obter_nome_assessor(str(cod)), valor=float(valor))
+        for pos, (cod, valor) in enumerate(serie.items(), start=1)
+    ]
+    return itens, str(ref)
+
+
+def top3_mes_cap(
+    df: pd.DataFrame,
+    date_col: str = "Data_Posicao",
+    value_col: str = "Captacao_Liquida_em_M",
+    group_col: str = "assessor_code",
+) -> Tuple[List[Tuple[str, float]], str]:
+    """
+    Retorna Top 3 por 'group_col' no ÚLTIMO mês com valor != 0.
+    """
+    rollup = rollup_mensal(df, [value_col], date_col=date_col, group_col=group_col)
+    itens, rotulo = ranking_assessores(rollup, value_col, periodo="mes")
+    return [(i.codigo, i.valor) for i in itens], rotulo
+
+
+def top3_ano_cap(
+    df: pd.DataFrame,
+    date_col: str = "Data_Posicao",
+    value_col: str = "Captacao_Liquida_em_M",
+    group_col: str = "assessor_code",
+) -> Tuple[List[Tuple[str, float]], str]:
+    """
+    Retorna Top 3 por 'group_col' no ÚLTIMO ano com valor != 0.
+    """
+    rollup = rollup_mensal(df, [value_col], date_col=date_col, group_col=group_col)
+    itens, rotulo = ranking_assessores(rollup, value_col, periodo="ano")
+    return [(i.codigo, i.valor) for i in itens], rotulo
+
+
+def top3_assessores_por_pl(df_auc_snapshot: pd.DataFrame) -> List[Tuple[str, Tuple[float, int]]]:
+    if df_auc_snapshot is None or df_auc_snapshot.empty:
+        return []
+    if not {"assessor", "auc_reais", "cliente"} <= set(df_auc_snapshot.columns):
+        return []
+
+    d = df_auc_snapshot.copy()
+    d["assessor"] = d["assessor"].astype(str).str.strip()
+
+    grouped = (
+        d.groupby("assessor")
+        .agg({"auc_reais": "sum", "cliente": "nunique"})
+        .nlargest(3, "auc_reais")
+    )
+    return [(idx, (row["auc_reais"], row["cliente"])) for idx, row in grouped.iterrows()]
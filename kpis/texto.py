@@ -0,0 +1,29 @@
+# kpis/texto.py
+# Normalização de textos e colunas (acentos, caixa, Categorical).
+
+import unicodedata
+
+import pandas as pd
+
+
+def strip_accents(txt: str) -> str:
+    if txt is None:
+        return ""
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", str(txt)) if not unicodedata.combining(ch)
+    )
+
+
+def norm_upper_noaccents_series(s: pd.Series) -> pd.Series:
+    return s.astype(str).map(strip_accents).str.upper().str.strip().fillna("")
+
+
+def como_texto(s: pd.Series, strip: bool = True) -> pd.Series:
+    """
+    Equivalente a s.astype(str).str.strip(), mas preserva colunas Categorical
+    (que já vêm normalizadas do loader) em vez de expandi-las para object.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    s = s.astype(str)
+    return s.str.strip() if strip else s
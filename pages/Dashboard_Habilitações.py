@@ -0,0 +1,168 @@
+# Dashboard_Habilitações.py
+#
+# Funil de novos clientes (Lead Start -> carteiras simuladas -> habilitações)
+# e taxas de ativação por faixa (+300k / -300k), realizado vs. meta, a partir
+# do DBV Capital_Habilitacoes.db.
+#
+# O painel (dados_habilitacoes.py / kpis.PainelHabilitacoes) é montado uma vez
+# por geração do banco, com atingimento e ritmo de todos os assessores e meses
+# já calculados: trocar mês ou filtro só recorta arrays.
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+sys.path.append(str(Path(__file__).parent.parent))
+import aquecimento  # noqa: E402
+from dados_habilitacoes import ARQUIVO_HABILITACOES, obter_painel_habilitacoes  # noqa: E402
+from kpis import obter_nome_assessor  # noqa: E402
+from instrumentacao import (  # noqa: E402
+    finalizar_execucao,
+    iniciar_execucao,
+    medir,
+    painel_solicitado,
+    render_painel,
+)
+
+iniciar_execucao("Dashboard_Habilitações.py")
+aquecimento.iniciar()
+
+# ---------------------------------------------------------------------
+# Bootstrapping: auth/visibility + page config
+# ---------------------------------------------------------------------
+from auth import (  # noqa: E402
+    apply_page_visibility_filter,
+    back_button,
+    check_auth,
+    is_master_user,
+)
+
+check_auth("Dashboard_Habilitações.py")
+apply_page_visibility_filter()
+
+st.set_page_config(layout="wide", page_title="Dashboard Habilitações", initial_sidebar_state="expanded")
+
+COR_PRIMARIA = "#20352f"
+COR_DESTAQUE = "#2ecc71"
+COR_SECUNDARIA = "#948161"
+
+
+def formatar_pct(valor: float) -> str:
+    return "-" if valor is None or not np.isfinite(valor) else f"{valor * 100:.0f}%"
+
+
+def formatar_qtd(valor: float) -> str:
+    return "-" if valor is None or not np.isfinite(valor) else f"{valor:,.0f}".replace(",", ".")
+
+
+# ---------------------------------------------------------------------
+# Gráficos
+# ---------------------------------------------------------------------
+@medir()
+def grafico_funil(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Funnel(
+        name="Meta", y=df["etapa"], x=df["meta"], marker_color=COR_SECUNDARIA,
+        textinfo="value", opacity=0.45,
+    ))
+    fig.add_trace(go.Funnel(
+        name="Realizado", y=df["etapa"], x=df["realizado"], marker_color=COR_PRIMARIA,
+        text=[f"{formatar_qtd(r)} ({formatar_pct(a)})" for r, a in zip(df["realizado"], df["atingimento"])],
+        textinfo="text",
+    ))
+    fig.update_layout(height=360, margin=dict(l=10, r=10, t=30, b=10), legend=dict(orientation="h", y=1.1))
+    return fig
+
+
+@medir()
+def grafico_ativacao(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_bar(
+        x=df["etapa"], y=df["realizado"], name="Realizado", marker_color=COR_PRIMARIA,
+        text=[formatar_pct(v) for v in df["realizado"]], textposition="auto",
+    )
+    fig.add_scatter(
+        x=df["etapa"], y=df["meta"], name="Meta", mode="markers",
+        marker=dict(color=COR_DESTAQUE, size=14, symbol="line-ew-open", line=dict(width=4)),
+    )
+    fig.update_layout(
+        height=320, margin=dict(l=10, r=10, t=30, b=10), legend=dict(orientation="h", y=1.12),
+        yaxis=dict(tickformat=".0%", range=[0, 1.05]),
+    )
+    return fig
+
+
+# ---------------------------------------------------------------------
+# Filtros
+# ---------------------------------------------------------------------
+back_button()
+st.title("Habilitações")
+
+painel = obter_painel_habilitacoes()
+if painel.vazio:
+    st.error(f"❌ Banco {ARQUIVO_HABILITACOES} não encontrado ou sem dados.")
+    st.stop()
+
+meses = [str(m) for m in painel.meses]
+with st.sidebar:
+    st.header("Filtros")
+    mes = st.selectbox("Mês", meses[::-1], index=0, key="hab_mes")
+    apenas_comercial = st.toggle("Apenas assessores comerciais", value=False, key="hab_comercial")
+    nomes = {cod: obter_nome_assessor(cod) for cod in painel.assessores}
+    assessores_sel = st.multiselect(
+        "Assessores", list(nomes), format_func=lambda c: nomes[c], key="hab_assessores",
+    )
+
+assessores = assessores_sel or None
+hoje = pd.Timestamp.today().normalize()
+
+# ---------------------------------------------------------------------
+# Funil de novos clientes
+# ---------------------------------------------------------------------
+funil = painel.funil(mes, hoje, assessores, apenas_comercial)
+st.caption(f"Mês: {mes} · ritmo = realizado vs. meta proporcional aos dias corridos")
+
+cols = st.columns(max(1, len(funil)))
+for col, linha in zip(cols, funil.itertuples(index=False)):
+    col.metric(
+        linha.etapa,
+        formatar_qtd(linha.realizado),
+        f"{formatar_pct(linha.atingimento)} da meta ({formatar_qtd(linha.meta)}) · ritmo {formatar_pct(linha.ritmo)}",
+        delta_color="off",
+    )
+
+col_funil, col_ativacao = st.columns([1, 1])
+with col_funil:
+    st.subheader("Funil de novos clientes")
+    st.plotly_chart(grafico_funil(funil), width="stretch")
+with col_ativacao:
+    st.subheader("Ativação por faixa")
+    ativacao = painel.ativacao(mes, assessores, apenas_comercial)
+    for faixa, df_faixa in ativacao.groupby("faixa", sort=False):
+        st.markdown(f"**{faixa}**")
+        st.plotly_chart(grafico_ativacao(df_faixa), width="stretch")
+
+# ---------------------------------------------------------------------
+# Atingimento por assessor
+# ---------------------------------------------------------------------
+st.subheader("Atingimento por assessor")
+tabela = painel.por_assessor(mes, "atingimento", hoje, assessores, apenas_comercial)
+if tabela.empty:
+    st.info("Sem assessores no filtro para o mês selecionado.")
+else:
+    tabela = tabela.rename(columns=dict(zip(painel.metricas, painel.rotulos)))
+    tabela.index = [nomes.get(c, c) for c in tabela.index]
+    st.dataframe(
+        (tabela * 100).round(0),
+        column_config={c: st.column_config.NumberColumn(c, format="%.0f%%") for c in tabela.columns},
+        width="stretch",
+    )
+
+# Painel de desempenho (apenas usuário master, opt-in via ?perf=1)
+_resumo_perf = finalizar_execucao()
+if is_master_user() and painel_solicitado():
+    render_painel(_resumo_perf)
@@ -0,0 +1,212 @@
+# Dashboard_Receitas.py
+#
+# Receitas por linha, categoria, produto e assessor. Todos os números e
+# gráficos vêm de agregados SQL (dados_receitas.py) sobre as colunas
+# indexadas do DBV Capital_Receitas.db; a tabela nunca é carregada inteira.
+# Heads só enxergam as linhas permitidas: o escopo da sessão
+# (auth.user_revenue_scope) entra em toda consulta como linha_receita IN (...).
+
+import sys
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+sys.path.append(str(Path(__file__).parent.parent))
+import aquecimento  # noqa: E402
+import dados_receitas  # noqa: E402
+from dados_receitas import METRICAS_RECEITA, FiltroReceitas  # noqa: E402
+from instrumentacao import (  # noqa: E402
+    finalizar_execucao,
+    iniciar_execucao,
+    medir,
+    painel_solicitado,
+    render_painel,
+)
+
+iniciar_execucao("Dashboard_Receitas.py")
+aquecimento.iniciar()
+
+# ---------------------------------------------------------------------
+# Bootstrapping: auth/visibility + page config
+# ---------------------------------------------------------------------
+from auth import (  # noqa: E402
+    apply_page_visibility_filter,
+    back_button,
+    check_auth,
+    is_master_user,
+    user_revenue_scope,
+)
+
+check_auth("Dashboard_Receitas.py")
+apply_page_visibility_filter()
+
+st.set_page_config(layout="wide", page_title="Dashboard Receitas", initial_sidebar_state="expanded")
+
+COR_PRIMARIA = "#20352f"
+COR_DESTAQUE = "#2ecc71"
+COR_SECUNDARIA = "#948161"
+
+# Quantos itens nos rankings por produto/assessor
+TOP_N = 15
+# Período padrão: últimos 12 meses com lançamentos
+MESES_PADRAO = 12
+
+
+def formatar_valor_curto(valor: Any) -> str:
+    """Formata valores de forma curta (K, M, bi) com R$."""
+    try:
+        valor = float(valor)
+    except (TypeError, ValueError):
+        return str(valor)
+    if abs(valor) >= 1_000_000_000:
+        return f"R$ {valor / 1_000_000_000:.1f} bi"
+    if abs(valor) >= 1_000_000:
+        return f"R$ {valor / 1_000_000:.1f} mi"
+    if abs(valor) >= 1_000:
+        return f"R$ {valor / 1_000:.1f} mil"
+    return f"R$ {valor:.0f}"
+
+
+# ---------------------------------------------------------------------
+# Gráficos
+# ---------------------------------------------------------------------
+@medir()
+def grafico_mensal(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_bar(
+        x=df["mes_ano"], y=df["receita_bruta_total"],
+        name=METRICAS_RECEITA["receita_bruta_total"], marker_color=COR_PRIMARIA,
+    )
+    fig.add_scatter(
+        x=df["mes_ano"], y=df["receita_liquida_total"], mode="lines+markers",
+        name=METRICAS_RECEITA["receita_liquida_total"], line=dict(color=COR_DESTAQUE, width=3),
+    )
+    fig.update_layout(
+        height=380, margin=dict(l=10, r=10, t=30, b=10),
+        legend=dict(orientation="h", y=1.1), xaxis=dict(type="category"),
+    )
+    return fig
+
+
+@medir()
+def grafico_barras(df: pd.DataFrame, dimensao: str, metrica: str) -> go.Figure:
+    df = df.iloc[::-1]  # maior no topo
+    fig = go.Figure(go.Bar(
+        x=df[metrica], y=df[dimensao], orientation="h", marker_color=COR_SECUNDARIA,
+        text=[formatar_valor_curto(v) for v in df[metrica]], textposition="auto",
+    ))
+    fig.update_layout(height=max(260, 28 * len(df) + 60), margin=dict(l=10, r=10, t=10, b=10))
+    return fig
+
+
+# ---------------------------------------------------------------------
+# Filtros (linhas permitidas + período)
+# ---------------------------------------------------------------------
+back_button()
+st.title("Receitas")
+
+escopo = user_revenue_scope()
+try:
+    linhas_visiveis = dados_receitas.linhas_disponiveis(escopo)
+except FileNotFoundError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+except Exception as e:
+    st.error(f"Erro ao ler o banco de Receitas: {e}")
+    st.stop()
+
+if not linhas_visiveis:
+    st.warning("Nenhuma linha de receita disponível para o seu usuário.")
+    st.stop()
+
+with st.sidebar:
+    st.header("Filtros")
+    linhas_sel = st.multiselect("Linha de receita", linhas_visiveis, default=linhas_visiveis, key="rec_linhas")
+
+# O escopo sempre filtra; as linhas marcadas só entram se não forem todas as visíveis
+if set(linhas_sel) != set(linhas_visiveis):
+    filtro_linhas = FiltroReceitas(escopo=escopo, linhas=tuple(sorted(linhas_sel)))
+else:
+    filtro_linhas = FiltroReceitas(escopo=escopo)
+
+meses = dados_receitas.meses_disponiveis(filtro_linhas)
+if not meses:
+    st.warning("Sem lançamentos para as linhas selecionadas.")
+    st.stop()
+
+with st.sidebar:
+    if len(meses) > 1:
+        inicio, fim = st.select_slider(
+            "Período", options=meses, value=(meses[max(0, len(meses) - MESES_PADRAO)], meses[-1]), key="rec_periodo",
+        )
+    else:
+        inicio = fim = meses[0]
+
+filtro = FiltroReceitas(escopo=escopo, linhas=filtro_linhas.linhas, mes_inicio=inicio, mes_fim=fim)
+
+with st.sidebar:
+    categorias = dados_receitas.por_dimensao(filtro, "categoria")["categoria"].tolist()
+    categorias_sel = st.multiselect("Categoria", categorias, key="rec_categorias")
+if categorias_sel:
+    filtro = FiltroReceitas(
+        escopo=escopo, linhas=filtro.linhas, mes_inicio=inicio, mes_fim=fim,
+        categorias=tuple(sorted(categorias_sel)),
+    )
+
+# ---------------------------------------------------------------------
+# KPIs
+# ---------------------------------------------------------------------
+tot = dados_receitas.totais(filtro)
+st.caption(f"Período: {inicio} a {fim} · {int(tot['lancamentos']):,} lançamentos".replace(",", "."))
+
+cols = st.columns(5)
+for col, metrica in zip(cols, (
+    "receita_bruta_total", "receita_liquida_total", "receita_liquida_escritorio", "repasse_assessor_valor",
+)):
+    col.metric(METRICAS_RECEITA[metrica], formatar_valor_curto(tot[metrica]))
+cols[4].metric("Clientes", f"{int(tot['clientes']):,}".replace(",", "."))
+
+# ---------------------------------------------------------------------
+# Evolução mensal
+# ---------------------------------------------------------------------
+st.subheader("Evolução mensal")
+st.plotly_chart(grafico_mensal(dados_receitas.por_mes(filtro)), width="stretch")
+
+# ---------------------------------------------------------------------
+# Quebras por dimensão
+# ---------------------------------------------------------------------
+col_linha, col_categoria = st.columns(2)
+with col_linha:
+    st.subheader("Por linha de receita")
+    df_linha = dados_receitas.por_dimensao(filtro, "linha_receita")
+    st.plotly_chart(grafico_barras(df_linha, "linha_receita", "receita_bruta_total"), width="stretch")
+with col_categoria:
+    st.subheader("Por categoria")
+    df_cat = dados_receitas.por_dimensao(filtro, "categoria", n=TOP_N)
+    st.plotly_chart(grafico_barras(df_cat, "categoria", "receita_bruta_total"), width="stretch")
+
+col_produto, col_assessor = st.columns(2)
+with col_produto:
+    st.subheader(f"Top {TOP_N} produtos")
+    df_prod = dados_receitas.por_dimensao(filtro, "produto", n=TOP_N)
+    st.plotly_chart(grafico_barras(df_prod, "produto", "receita_bruta_total"), width="stretch")
+with col_assessor:
+    st.subheader(f"Top {TOP_N} assessores (repasse)")
+    df_ass = dados_receitas.por_dimensao(filtro, "assessor", metrica="repasse_assessor_valor", n=TOP_N)
+    st.dataframe(
+        df_ass.rename(columns={
+            "assessor": "Assessor",
+            "repasse_assessor_valor": METRICAS_RECEITA["repasse_assessor_valor"],
+            "lancamentos": "Lançamentos",
+        }),
+        hide_index=True,
+        width="stretch",
+    )
+
+# Painel de desempenho (apenas usuário master, opt-in via ?perf=1)
+_resumo_perf = finalizar_execucao()
+if is_master_user() and painel_solicitado():
+    render_painel(_resumo_perf)
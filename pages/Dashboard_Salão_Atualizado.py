@@ -4,7 +4,6 @@ import re
 import sys
 import math
 import sqlite3
-import unicodedata
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
@@ -15,30 +14,31 @@ import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 
-# --- Carregar dados do Positivador (DBV Capital_Positivador.db) ---
-@st.cache_data(show_spinner=False)
-def carregar_dados_positivador() -> pd.DataFrame:
-    """
-    Carrega os dados do Positivador do banco de dados SQLite.
-    Retorna um DataFrame com as colunas Data_Posicao e Net_Em_M.
-    """
-    db_path = Path(__file__).parent.parent / 'DBV Capital_Positivador.db'
-    try:
-        conn = sqlite3.connect(str(db_path))
-        df = pd.read_sql_query("SELECT * FROM positivador", conn)
-        conn.close()
+sys.path.append(str(Path(__file__).parent.parent))
+import aquecimento  # noqa: E402
+from db_utils import localizar_db  # noqa: E402
+from politica_cache import politica  # noqa: E402
+from dados_nps import obter_dados_nps  # noqa: E402
+from dados_objetivos import obter_indice_objetivos  # noqa: E402
+from dados_positivador import metadados_positivador, obter_dados_positivador  # noqa: E402
+from dados_transferencias import obter_fluxo_transferencias, transferencias_do_mes  # noqa: E402
+import kpis  # noqa: E402
+from kpis import obter_nome_assessor  # noqa: E402
+from instrumentacao import (  # noqa: E402
+    etapa,
+    finalizar_execucao,
+    iniciar_execucao,
+    medir,
+    medir_cache,
+    painel_solicitado,
+    render_painel,
+)
 
-        # Garantir tipos corretos
-        df['Data_Posicao'] = pd.to_datetime(df['Data_Posicao'], errors='coerce')
-        df['Net_Em_M'] = pd.to_numeric(df['Net_Em_M'], errors='coerce').fillna(0)
-        
-        return df
-    except Exception as e:
-        st.error(f"Erro ao carregar dados do Positivador: {e}")
-        return pd.DataFrame()
+# Coleta de tempos deste rerun (loaders, KPIs, gráficos e HTML)
+iniciar_execucao("Dash_Salão_Atualizado.py")
 
-# DataFrame usado pelos gráficos de AUC
-df_positivador = carregar_dados_positivador()
+# TVs abrem a página direto: garante o aquecimento em segundo plano também aqui
+aquecimento.iniciar()
 
 # =====================================================
 # CONTROLE DE SEÇÕES - ATIVE/DESATIVE AQUI
@@ -51,97 +51,30 @@ EXIBIR_RENDA_VARIAVEL = False
 # =====================================================
 # FUNÇÃO PARA RENDERIZAR O PAINEL "RUMO A 1BI" NA TV
 # =====================================================
+@medir()
 def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
     """
     Renderiza o painel 'Rumo a 1BI' na coluna atual.
     Meta: Busca valor de 2027 na coluna 'auc_objetivo_ano' (AUC Objetivo).
     Projetado: Projeção linear de 01/01/2025 até 31/12/2027.
     """
-    # Define o Objetivo Final (2027) usando a função centralizada
-    OBJETIVO_FINAL = obter_meta_objetivo(2027, "auc_objetivo_ano", 1_000_000_000.0)
+    # Curva de metas 2025 -> 2027 (montada uma vez a partir da tabela objetivos)
+    curva = obter_curva_rumo_1bi()
+    OBJETIVO_FINAL = curva.objetivo_final
 
-    # AUC atual (Realizado)
-    v_auc = 0.0
-    try:
-        mets = calcular_indicadores_objetivos(df_pos_f, df_obj, hoje=data_ref)
-        if "auc" in mets and "valor" in mets["auc"]:
-            v_auc = float(mets["auc"]["valor"] or 0.0)
-    except Exception as e:
-        st.error(f"Erro ao carregar o AUC atual: {e}")
-        v_auc = 0.0
+    # AUC atual (Realizado): indicador já calculado para a data de referência
+    v_auc = float(mets.get("auc", {}).get("valor") or 0.0)
 
-    # --- CÁLCULO DO PROJETADO (CURVA 600M / 800M / 1BI) ---
+    # Projetado na data de atualização (interpolação linear entre os marcos)
     data_atualizacao = pd.Timestamp(data_ref)
-
-    # Metas por ano (valores acumulados de AUC alvo)
-    # 31/12/2025 -> ~600M
-    # 31/12/2026 -> ~800M
-    # 31/12/2027 -> 1BI (OBJETIVO_FINAL)
-    meta_2025 = obter_meta_objetivo(2025, "auc_objetivo_ano", 600_000_000.0)
-    meta_2026 = obter_meta_objetivo(2026, "auc_objetivo_ano", 800_000_000.0)
-    meta_2027 = OBJETIVO_FINAL  # normalmente 1_000_000_000.0
-
-    # Garante que a curva seja crescente e não ultrapasse o objetivo final
-    meta_2025 = max(0.0, min(meta_2025, meta_2026, meta_2027))
-    meta_2026 = max(meta_2025, min(meta_2026, meta_2027))
-    meta_2027 = max(meta_2026, meta_2027)
-
-    # Marcos de datas
-    d0 = pd.Timestamp(2025, 1, 1)
-    d1 = pd.Timestamp(2025, 12, 31)
-    d2 = pd.Timestamp(2026, 12, 31)
-    d3 = pd.Timestamp(2027, 12, 31)
-
-    # Valores de referência em cada marco
-    v0 = 0.0
-    v1 = meta_2025
-    v2 = meta_2026
-    v3 = meta_2027
-
-    def _interp_linear(data, di, df, vi, vf) -> float:
-        """
-        Interpola linearmente entre (di, vi) e (df, vf)
-        garantindo que no início seja vi e no fim seja vf.
-        """
-        if data <= di:
-            return float(vi)
-        if data >= df:
-            return float(vf)
-        total = (df - di).days
-        if total <= 0:
-            return float(vf)
-        decorrido = (data - di).days
-        return float(vi + (vf - vi) * (decorrido / total))
-
-    # Define o projetado conforme o ano em que estamos
-    if data_atualizacao < d0:
-        threshold_projetado = 0.0
-    elif data_atualizacao <= d1:
-        # 2025: Usar o mesmo cálculo do AUC 2025 para consistência
-        try:
-            mets_auc = calcular_indicadores_objetivos(df_pos_f, df_obj, hoje=data_atualizacao)
-            if "auc" in mets_auc and "pace_target" in mets_auc["auc"]:
-                threshold_projetado = float(mets_auc["auc"]["pace_target"])
-            else:
-                threshold_projetado = _interp_linear(data_atualizacao, d0, d1, v0, v1)
-        except Exception:
-            threshold_projetado = _interp_linear(data_atualizacao, d0, d1, v0, v1)
-    elif data_atualizacao <= d2:
-        # 2026: meta_2025 -> meta_2026 (ex.: 600M -> 800M)
-        threshold_projetado = _interp_linear(data_atualizacao, d1, d2, v1, v2)
-    elif data_atualizacao <= d3:
-        # 2027: meta_2026 -> meta_2027 (ex.: 800M -> 1BI)
-        threshold_projetado = _interp_linear(data_atualizacao, d2, d3, v2, v3)
-    else:
-        # Depois de 2027-12-31 considera objetivo cheio
-        threshold_projetado = float(meta_2027)
+    threshold_projetado = curva.projetado_em(data_atualizacao)
 
     # Cálculos auxiliares para os cards
     pct_auc = (v_auc / OBJETIVO_FINAL) * 100 if OBJETIVO_FINAL > 0 else 0
     restante_auc = max(0.0, OBJETIVO_FINAL - v_auc)
 
     # Dias restantes até o fim de 2027
-    dias_restantes = max(0, (d3 - data_atualizacao).days)
+    dias_restantes = max(0, (curva.data_final - data_atualizacao).days)
 
     # Comparação para a barra: Real vs Projetado (Pace)
     diff_pace = v_auc - threshold_projetado
@@ -221,15 +154,14 @@ def render_rumo_a_1bi(auc_base_inicial_2025: float = 0.0):
 
     # Top 3
     st.markdown("<div style='height: 0px;'></div>", unsafe_allow_html=True)
-    items_rumo_auc, _ = top3_mes_cap(df_pos_f, value_col="Net_Em_M")
+    items_rumo_auc, _ = ranking_assessores(dados_pos.mensal_assessor_corrente, "Net_Em_M", periodo="mes")
     _render_top3_horizontal(items_rumo_auc, header_text="Top 3 — AUC")
 
 
 # ---------------------------------------------------------------------
 # Bootstrapping: path + auth/visibility
 # ---------------------------------------------------------------------
-sys.path.append(str(Path(__file__).parent.parent))
-from auth import check_auth, apply_page_visibility_filter  # noqa: E402
+from auth import check_auth, apply_page_visibility_filter, is_master_user  # noqa: E402
 
 # IMPORTANTE: nome do arquivo atualizado
 check_auth("Dash_Salão_Atualizado.py")
@@ -992,44 +924,7 @@ div[data-testid="stVerticalBlock"]:has(.metric-card-kpi) {
 # ---------------------------------------------------------------------
 YELLOW = "#948161"
 GREEN = "#2ecc71"
-
-ASSESSORES_MAP = {
-    "A92300": "Adil Amorim",
-    "A95715": "André Norat",
-    "A87867": "Arthur Linhares",
-    "A95796": "Artur Vaz",
-    "A95642": "Bruna Lewis",
-    "A26892": "Carlos Monteiro",
-    "A71490": "Cesar Lima",
-    "A93081": "Daniel Morone",
-    "A23594": "Diego Monteiro",
-    "A23454": "Eduardo Monteiro",
-    "A91619": "Eduardo Parente",
-    "A95635": "Enzo Rei",
-    "A50825": "Fabiane Souza",
-    "A46886": "Fábio Tomaz",
-    "A96625": "Gustavo Levy",
-    "A95717": "Henrique Vieira",
-    "A94115": "Israel Oliveira Moraes",
-    "A97328": "João Goldenberg ",
-    "A41471": "João Pedro Georg de Andrade",
-    "A69453": "Guilherme Peçanha",
-    "A51586": "Luiz Eduardo Mesquita",
-    "A28215": "Luiz Coimbra",
-    "A92301": "Marcus Faria",
-    "A38061": "Paulo Pinho",
-    "A69265": "Paulo Gomes",
-    "A25214": "Renato Zanin",
-    "A21652": "Rodrigo Teísta",
-    "A93282": "Samuel Monteiro",
-    "A72213": "Thiago Cordeiro",
-    "A26914": "Victor Garrido",
-}
-NOME_TO_COD = {v.upper(): k for k, v in ASSESSORES_MAP.items()}
-
-
-def obter_nome_assessor(codigo: str) -> str:
-    return ASSESSORES_MAP.get(codigo, codigo)
+# Cadastro de assessores (ASSESSORES_MAP / obter_nome_assessor): kpis/assessores.py
 
 
 # ---------------------------------------------------------------------
@@ -1120,26 +1015,6 @@ def ultima_data(
     return s.max()
 
 
-def extract_assessor_code(x: Any) -> Optional[str]:
-    s = str(x or "").strip()
-    if not s:
-        return None
-    up = re.sub(r"\s+", " ", s).upper()
-
-    m = re.search(r"A\s*?(\d{5})", up)
-    if m:
-        return f"A{m.group(1)}"
-
-    m2 = re.search(r"(^|\D)(\d{5})(\D|$)", up)
-    if m2:
-        return f"A{m2.group(2)}"
-
-    if up in NOME_TO_COD:
-        return NOME_TO_COD[up]
-
-    return None
-
-
 def _primeiro_nome_sobrenome(nome_completo: str) -> str:
     if not nome_completo:
         return "-"
@@ -1162,100 +1037,42 @@ def _primeiro_nome_sobrenome(nome_completo: str) -> str:
     return f"{nome} {sobrenome}"
 
 
-def _strip_accents(txt: str) -> str:
-    if txt is None:
-        return ""
-    return "".join(
-        ch for ch in unicodedata.normalize("NFKD", str(txt)) if not unicodedata.combining(ch)
-    )
-
-
-def _norm_upper_noaccents_series(s: pd.Series) -> pd.Series:
-    return s.astype(str).map(_strip_accents).str.upper().str.strip().fillna("")
 
 
 # ---------------------------------------------------------------------
 # Data Loaders
 # ---------------------------------------------------------------------
-@st.cache_data(show_spinner=False)
-def carregar_dados_objetivos_pj1() -> pd.DataFrame:
-    caminho_db = Path(__file__).parent.parent / "DBV Capital_Objetivos.db"
-    conn = sqlite3.connect(str(caminho_db))
-    df = pd.read_sql_query("SELECT * FROM objetivos", conn)
-    conn.close()
-
-    # Converter coluna Objetivo para numérico
-    if "Objetivo" in df.columns:
-        df["Objetivo"] = pd.to_numeric(df["Objetivo"], errors="coerce")
-    
-    # Converter outras colunas para numérico se necessário
-    for c in [
-        "auc_objetivo_ano",
-        "auc_acumulado",
-        "auc_diario_ano",
-        "cap_objetivo_ano",
-        "cap_acumulado",
-        "cap_diario_ano",
-        "rec_objetivo_ano",
-        "rec_acumulado_ano",
-        "rec_diario_ano",
-        "c_ativadas_objetivo_ano",
-        "c_ativadas_acumulado_ano",
-        "c_ativadas_diario_ano",
-    ]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    return df
-
-
 def obter_meta_objetivo(ano_meta: int, coluna: str, fallback: float = 0.0) -> float:
     """
-    Busca um valor de objetivo na tabela objetivos filtrando por ano e coluna.
-
-    Regra:
-    - Se existir valor no banco:
-        - Se o fallback for 0 ou menor/igual ao valor do banco -> usa o valor do banco
-        - Se o fallback for MAIOR que o valor do banco -> usa o fallback (valor "forçado")
-    - Se não existir linha/coluna ou der erro -> usa o fallback
+    Meta do ano/coluna no índice da tabela objetivos (regra de fallback em
+    kpis.meta_objetivo). Se o banco não puder ser lido, usa o fallback.
     """
     try:
-        objetivos_df = carregar_dados_objetivos_pj1()
-        if objetivos_df.empty:
-            return float(fallback)
-
-        # Mapeamento de colunas esperadas -> colunas reais
-        col_mapping = {
-            "auc_objetivo_ano": "AUC Objetivo",
-            "cap_objetivo_ano": "Cap. Liq Objetivo", 
-            "rec_objetivo_ano": "Receita Objetivo",
-            "c_ativadas_objetivo_ano": "Contas Ativadas"
-        }
-        
-        # Usar coluna mapeada ou original se não houver mapeamento
-        coluna_real = col_mapping.get(coluna, coluna)
-
-        # Usar a coluna 'Objetivo' diretamente
-        row_ano = objetivos_df.loc[objetivos_df["Objetivo"] == ano_meta]
-        if not row_ano.empty and coluna_real in row_ano.columns:
-            val_banco = float(row_ano[coluna_real].max())
-            if val_banco > 0:
-                # Se foi passado um fallback > 0 e ele é MAIOR que o valor do banco,
-                # damos prioridade ao fallback (meta "fixada" no código)
-                if fallback and fallback > val_banco:
-                    return float(fallback)
-                return val_banco
-
-        return float(fallback)
+        return obter_indice_objetivos().meta(ano_meta, coluna, fallback)
     except Exception:
         return float(fallback)
 
 
-@st.cache_data(show_spinner=False)
-def carregar_dados_objetivos() -> pd.DataFrame:
-    caminho_db = Path(__file__).parent.parent / "DBV Capital_Objetivos.db"
-    if not caminho_db.exists():
-        caminho_db = Path("DBV Capital_Objetivos.db")
+def obter_curva_rumo_1bi() -> kpis.CurvaMeta:
+    """Curva de metas do Rumo a 1BI, guardada no índice de objetivos da geração atual."""
+    try:
+        indice = obter_indice_objetivos()
+    except Exception:
+        indice = kpis.IndiceObjetivos()
+    return indice.curva_rumo_1bi()
+
+
+class ErroObjetivos(Exception):
+    """Falha ao ler o banco de Objetivos (não entra no cache)."""
+
+
+# Erros sobem como exceção: o cache só guarda leituras boas, e o st.error
+# fica fora da função cacheada (aparece em todo rerun em que a leitura falha)
+@medir_cache(politica.cache("objetivos", ttl_s=60 * 60), nome="carregar_dados_objetivos")
+def _ler_dados_objetivos() -> pd.DataFrame:
+    caminho_db = localizar_db("DBV Capital_Objetivos.db")
+    if caminho_db is None:
+        raise ErroObjetivos("❌ Banco de Objetivos (DBV Capital_Objetivos.db) não encontrado.")
 
     conn = sqlite3.connect(str(caminho_db))
 
@@ -1266,8 +1083,7 @@ def carregar_dados_objetivos() -> pd.DataFrame:
         )["name"].tolist()
 
         if not tabs:
-            st.error("❌ Nenhuma tabela encontrada no banco de Objetivos.")
-            return pd.DataFrame()
+            raise ErroObjetivos("❌ Nenhuma tabela encontrada no banco de Objetivos.")
 
         if "objetivos_pj1" in tabs:
             table = "objetivos_pj1"
@@ -1278,9 +1094,10 @@ def carregar_dados_objetivos() -> pd.DataFrame:
 
         df = pd.read_sql_query(f'SELECT * FROM "{table}";', conn)
 
+    except ErroObjetivos:
+        raise
     except Exception as e:
-        st.error(f"Erro ao carregar dados de Objetivos: {e}")
-        return pd.DataFrame()
+        raise ErroObjetivos(f"Erro ao carregar dados de Objetivos: {e}") from e
     finally:
         conn.close()
 
@@ -1314,57 +1131,12 @@ def carregar_dados_objetivos() -> pd.DataFrame:
     return df
 
 
-@st.cache_data(show_spinner=False)
-def carregar_dados_positivador_mtd() -> pd.DataFrame:
-    """
-    Carrega o Positivador a partir do novo banco DBV Capital_Positivador.db,
-    mantendo compatibilidade com o antigo (MTD) caso ainda exista.
-    """
-    base_dir = Path(__file__).parent.parent
-
-    candidate_paths = [
-        base_dir / "DBV Capital_Positivador.db",
-        base_dir / "DBV Capital_Positivador_MTD.db",
-        Path("DBV Capital_Positivador.db"),
-        Path("DBV Capital_Positivador_MTD.db"),
-    ]
-
-    db_path = None
-    for p in candidate_paths:
-        if p.exists():
-            db_path = p
-            break
-
-    if db_path is None:
-        st.error("❌ Nenhum banco de Positivador encontrado (DBV ou MTD).")
-        return pd.DataFrame()
-
-    conn = sqlite3.connect(str(db_path))
+def carregar_dados_objetivos() -> pd.DataFrame:
     try:
-        tabs = pd.read_sql_query(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';", conn
-        )["name"].tolist()
-
-        if not tabs:
-            st.error("❌ Nenhuma tabela encontrada no banco de Positivador.")
-            return pd.DataFrame()
-
-        if "positivador" in tabs:
-            table = "positivador"
-        elif "positivador_mtd" in tabs:
-            table = "positivador_mtd"
-        else:
-            table = tabs[0]
-
-        df = pd.read_sql_query(f'SELECT * FROM "{table}";', conn)
-
-    except Exception as e:
-        st.error(f"Erro ao carregar dados do Positivador: {e}")
+        return _ler_dados_objetivos()
+    except ErroObjetivos as e:
+        st.error(str(e))
         return pd.DataFrame()
-    finally:
-        conn.close()
-
-    return df
 
 
 def obter_ultima_data_posicao() -> datetime:
@@ -1373,19 +1145,10 @@ def obter_ultima_data_posicao() -> datetime:
     Se não conseguir acessar o banco, retorna a data de hoje como fallback.
     """
     try:
-        # Carrega os dados do positivador
-        df = carregar_dados_positivador_mtd()
-        
-        # Verifica se a coluna Data_Posicao existe
-        if 'Data_Posicao' in df.columns:
-            # Converte para datetime se ainda não estiver no formato correto
-            if not pd.api.types.is_datetime64_any_dtype(df['Data_Posicao']):
-                df['Data_Posicao'] = pd.to_datetime(df['Data_Posicao'], errors='coerce')
-            
-            # Remove valores nulos e retorna a data mais recente
-            df = df.dropna(subset=['Data_Posicao'])
-            if not df.empty:
-                return df['Data_Posicao'].max().to_pydatetime()
+        # Consulta MAX direto no banco (não carrega a tabela), cache por geração
+        meta = metadados_positivador()
+        if meta is not None and meta.ultima_data is not None:
+            return meta.ultima_data.to_pydatetime()
     except Exception as e:
         st.error(f"Erro ao obter a última data do Positivador: {e}")
     
@@ -1401,192 +1164,28 @@ def obter_data_atualizacao_positivador() -> datetime:
     return obter_ultima_data_posicao()
 
 
-def tratar_dados_positivador_mtd(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Normaliza as colunas do Positivador, aceitando tanto nomes antigos (Excel)
-    quanto os do novo banco DBV Capital_Positivador.db.
-    """
-    renomear = {
-        "Net Em M": "Net_Em_M",
-        "net_em_m": "Net_Em_M",
-        "Data Posição": "Data_Posicao",
-        "data_posicao": "Data_Posicao",
-        "Captação Líquida em M": "Captacao_Liquida_em_M",
-        "Captação Liq em M": "Captacao_Liquida_em_M",
-        "Captacao Liquida em M": "Captacao_Liquida_em_M",
-        "captacao_liquida_em_m": "Captacao_Liquida_em_M",
-        "Assessor": "assessor",
-        "cliente": "Cliente",
-    }
-
-    for origem, destino in renomear.items():
-        if origem in df.columns:
-            df = df.rename(columns={origem: destino})
-
-    if "Data_Posicao" in df.columns:
-        df["Data_Posicao"] = pd.to_datetime(df["Data_Posicao"], errors="coerce")
-
-    for c in ["Net_Em_M", "Captacao_Liquida_em_M"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
-
-    has_assessor_code = "assessor_code" in df.columns
-    if has_assessor_code:
-        df["assessor_code"] = df["assessor_code"].astype(str).str.strip()
-        valid_codes = df["assessor_code"].str.match(r"^A\d{5}$", na=False).sum()
-    else:
-        valid_codes = 0
-
-    if (not has_assessor_code) or (valid_codes == 0):
-        if "assessor" in df.columns:
-            df["assessor"] = df["assessor"].astype(str)
-            df["assessor_code"] = df["assessor"].map(extract_assessor_code)
-            df["assessor_code"] = df["assessor_code"].where(
-                df["assessor_code"].notna() & (df["assessor_code"] != ""),
-                pd.NA,
-            )
-        else:
-            df["assessor_code"] = pd.NA
-    else:
-        df["assessor_code"] = df["assessor_code"].astype(str).str.strip()
-
-    if "Cliente" in df.columns:
-        df["Cliente"] = df["Cliente"].astype(str)
-
-    return df
+# Normalização de colunas/códigos de assessor: kpis.tratar_dados_positivador_mtd
+tratar_dados_positivador_mtd = medir("tratar_dados_positivador_mtd")(kpis.tratar_dados_positivador_mtd)
 
 
 # ---------------------------------------------------------------------
 # Loaders NPS / RV
 # ---------------------------------------------------------------------
-_EXPECTED_KEYS = {
-    "survey_id": {"survey id"},
-    "user_id": {"id do usuario", "id usuario", "usuario id"},
-    "customer_id": {"costumer id", "customer id", "cliente id"},
-    "data_resposta": {"data de resposta", "data resposta", "data"},
-    "pesquisa_relacionamento": {"pesquisa relacionamento"},
-    "nps_assessor": {"xp relacionamento aniversario nps assessor", "nps assessor"},
-    "status": {"status"},
-    "codigo_assessor": {"codigo assessor", "cod assessor", "codigo do assessor"},
-    "notificacao": {"notificacao", "notificacao ?"},
-}
-_POSSIBLE_NOTA_KEYS = {
-    "nota",
-    "nota nps",
-    "score",
-    "pontuacao",
-    "resposta nota",
-    "nps",
-    "xp relacionamento aniversario nps assessor",
-}
-
-
-def _rename_columns_to_canonical(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-
-    def _norm_key(txt: str) -> str:
-        s = _strip_accents(str(txt)).lower()
-        s = re.sub(r"[^a-z0-9]+", " ", s).strip()
-        return re.sub(r"\s+", " ", s)
-
-    norm_map = {_norm_key(c): c for c in df.columns}
-    rename_dict = {}
-    for canonical, variants in _EXPECTED_KEYS.items():
-        for v in variants:
-            if v in norm_map:
-                rename_dict[norm_map[v]] = canonical
-                break
-    df = df.rename(columns=rename_dict)
-
-    nota_col = None
-    for c in df.columns:
-        if _norm_key(c) in _POSSIBLE_NOTA_KEYS:
-            nota_col = c
-            break
-
-    if nota_col is None:
-        best_col, best_cnt = None, -1
-        for c in df.columns:
-            s = pd.to_numeric(df[c], errors="coerce")
-            if s.notna().any():
-                cnt = int(s.between(0, 10, inclusive="both").sum())
-                if cnt > best_cnt and cnt > 0:
-                    best_col, best_cnt = c, cnt
-        nota_col = best_col
-
-    if nota_col:
-        df = df.rename(columns={nota_col: "nota"})
-
-    if "data_resposta" in df.columns:
-        df["data_resposta"] = pd.to_datetime(
-            df["data_resposta"], errors="coerce", dayfirst=True, infer_datetime_format=True
-        )
-    if "codigo_assessor" in df.columns:
-        df["codigo_assessor"] = df["codigo_assessor"].astype(str).str.strip().str.upper()
-    if "pesquisa_relacionamento" in df.columns:
-        df["pesquisa_relacionamento_norm"] = _norm_upper_noaccents_series(
-            df["pesquisa_relacionamento"]
-        )
-    if "nota" in df.columns:
-        df["nota"] = pd.to_numeric(df["nota"], errors="coerce")
-    return df
-
-
-@st.cache_data(show_spinner=False)
+@medir()
 def carregar_dados_nps() -> pd.DataFrame:
+    # Leitura/descoberta da tabela em dados_nps, cache por geração do banco
     try:
-        dbp = None
-        for p in [
-            Path(__file__).parent.parent / "DBV Capital_NPS.db",
-            Path("DBV Capital_NPS.db"),
-        ]:
-            if p.exists():
-                dbp = p
-                break
-
-        if dbp is None:
-            st.error("❌ Banco NPS não encontrado.")
-            return pd.DataFrame()
-
-        with sqlite3.connect(str(dbp)) as conn:
-            tabs = pd.read_sql_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
-                conn,
-            )["name"].tolist()
-            if not tabs:
-                st.error("❌ Nenhuma tabela encontrada no banco NPS.")
-                return pd.DataFrame()
-
-            candidate, best_score = None, -1
-            for t in tabs:
-                try:
-                    df_head = pd.read_sql_query(f'SELECT * FROM "{t}" LIMIT 200;', conn)
-                except Exception:
-                    continue
-
-                df_norm = _rename_columns_to_canonical(df_head.copy())
-                score = (
-                    int(
-                        "pesquisa_relacionamento" in df_norm.columns
-                        or "pesquisa_relacionamento_norm" in df_norm.columns
-                    )
-                    + int("codigo_assessor" in df_norm.columns)
-                    + int("data_resposta" in df_norm.columns)
-                    + int("nota" in df_norm.columns)
-                )
-                if score > best_score:
-                    best_score = score
-                    candidate = t
-
-            if not candidate:
-                candidate = tabs[0]
-            df_all = pd.read_sql_query(f'SELECT * FROM "{candidate}";', conn)
-
-        return _rename_columns_to_canonical(df_all)
+        df = obter_dados_nps()
+    except LookupError as e:
+        st.error(f"❌ {e}")
+        return pd.DataFrame()
     except Exception as e:
         st.error(f"Erro ao carregar NPS: {e}")
         return pd.DataFrame()
+    if df is None:
+        st.error("❌ Banco NPS não encontrado.")
+        return pd.DataFrame()
+    return df
 
 
 def _parse_money_series_rv(s: pd.Series) -> pd.Series:
@@ -1609,16 +1208,10 @@ def _parse_money_series_rv(s: pd.Series) -> pd.Series:
 
 
 def _find_auc_db_path() -> Optional[Path]:
-    for p in [
-        Path(__file__).parent.parent / "DBV Capital_AUC Mesa RV.db",
-        Path("DBV Capital_AUC Mesa RV.db"),
-    ]:
-        if p.exists():
-            return p
-    return None
+    return localizar_db("DBV Capital_AUC Mesa RV.db")
 
 
-@st.cache_data(show_spinner=False)
+@medir_cache(politica.cache("auc_mesa_rv", ttl_s=30 * 60))
 def _load_auc_table(db_path: Path) -> pd.DataFrame:
     if not db_path or not Path(db_path).exists():
         return pd.DataFrame()
@@ -1654,204 +1247,25 @@ def _load_auc_table(db_path: Path) -> pd.DataFrame:
 # ---------------------------------------------------------------------
 # Lógica principal KPIs de Objetivos (Captação / AUC)
 # ---------------------------------------------------------------------
+@medir()
 def calcular_indicadores_objetivos(
     df_pos: pd.DataFrame, df_obj: pd.DataFrame, hoje: datetime
 ) -> Dict[str, Dict[str, Any]]:
-    hoje = pd.Timestamp(hoje or pd.Timestamp.today()).normalize()
-    ano_atual = hoje.year
-
-    df_pos = df_pos.copy()
-    if "Data_Posicao" in df_pos.columns:
-        df_pos["Data_Posicao"] = pd.to_datetime(df_pos["Data_Posicao"], errors="coerce")
-    if "Captacao_Liquida_em_M" in df_pos.columns:
-        df_pos["Captacao_Liquida_em_M"] = pd.to_numeric(
-            df_pos["Captacao_Liquida_em_M"], errors="coerce"
-        ).fillna(0)
-    if "Net_Em_M" in df_pos.columns:
-        df_pos["Net_Em_M"] = pd.to_numeric(df_pos["Net_Em_M"], errors="coerce").fillna(0)
-
-    mesref_pos = None
-    if "Data_Posicao" in df_pos.columns and not df_pos["Data_Posicao"].isna().all():
-        mesref_pos = df_pos["Data_Posicao"].dt.to_period("M").max()
-
-    capliq_mes_atual = 0.0
-    if mesref_pos is not None and "Captacao_Liquida_em_M" in df_pos.columns:
-        grp_mes = df_pos.groupby(df_pos["Data_Posicao"].dt.to_period("M"))[
-            "Captacao_Liquida_em_M"
-        ].sum()
-        if mesref_pos in grp_mes.index:
-            capliq_mes_atual = float(grp_mes.loc[mesref_pos])
-
-    pace_mes = None
-    # Calcular pace para o mês atual da data de referência
-    mes_atual_period = pd.Period(year=hoje.year, month=hoje.month, freq='M')
-    mes_inicio = mes_atual_period.to_timestamp(how="start")
-    mes_fim = mes_atual_period.to_timestamp(how="end")
-    dias_mes = (mes_fim - mes_inicio).days + 1
-    dias_corridos = (hoje - mes_inicio).days + 1
-    pace_mes = dias_corridos / dias_mes
-
-    capliq_ano_atual = 0.0
-    if {"Data_Posicao", "Captacao_Liquida_em_M"} <= set(df_pos.columns):
-        df_y = df_pos[df_pos["Data_Posicao"].dt.year == ano_atual].copy()
-        cap_por_mes = df_y.groupby(df_y["Data_Posicao"].dt.month)["Captacao_Liquida_em_M"].sum()
-        capliq_ano_atual = float(cap_por_mes.sum())
-
-    cap_meta_eoy = 0.0
-    cap_meta_hoje = 0.0
+    """Indicadores de captação/AUC (kpis) com as metas anuais do índice de objetivos."""
     try:
-        df_pj1 = carregar_dados_objetivos_pj1()
-        if not df_pj1.empty and "Objetivo" in df_pj1.columns:
-            base = df_pj1[df_pj1["Objetivo"] == ano_atual].copy()
-            if not base.empty:
-                # Usar diretamente o valor anual de Cap. Liq Objetivo
-                if "Cap. Liq Objetivo" in base.columns:
-                    cap_meta_eoy = float(base["Cap. Liq Objetivo"].max())
-                    # Para meta até hoje, usar proporção do ano
-                    dias_decorridos = (hoje - pd.Timestamp(ano_atual, 1, 1)).days + 1
-                    total_dias_ano = 366 if pd.Timestamp(ano_atual, 12, 31).dayofyear == 366 else 365
-                    cap_meta_hoje = (cap_meta_eoy * dias_decorridos) / total_dias_ano
+        indice = obter_indice_objetivos()
     except Exception:
-        cap_meta_hoje = 0.0
-        cap_meta_eoy = 0.0
+        indice = kpis.IndiceObjetivos()
+    return kpis.calcular_indicadores_objetivos(df_pos, df_obj, hoje, indice=indice)
 
-    df_obj = df_obj.copy()
-    # Converter coluna Objetivo para numérico se necessário
-    if "Objetivo" in df_obj.columns:
-        df_obj["Objetivo"] = pd.to_numeric(df_obj["Objetivo"], errors="coerce")
-    
-    objetivo_anual = 0.0
-    if "Cap. Liq Objetivo" in df_obj.columns and not df_obj.empty:
-        obj_ano = df_obj[df_obj["Objetivo"] == ano_atual]
-        objetivo_anual = (
-            float(obj_ano["Cap. Liq Objetivo"].max())
-            if not obj_ano.empty
-            else float(df_obj["Cap. Liq Objetivo"].max())
-        )
 
-    valor_alcancado_ano = capliq_ano_atual
-    mes_atual = hoje.month
-    obj_restante_ano = max(0.0, (objetivo_anual or 0.0) - valor_alcancado_ano)
-    meses_restantes = max(1, 12 - mes_atual + 1)
-    obj_capliq_mes_max = obj_restante_ano / meses_restantes
-
-    auc_meta_eoy = 0.0
-    auc_meta_hoje = 0.0
-    try:
-        df_pj1 = carregar_dados_objetivos_pj1()
-        if not df_pj1.empty and "Objetivo" in df_pj1.columns:
-            base_auc = df_pj1[df_pj1["Objetivo"] == ano_atual].copy()
-            if not base_auc.empty:
-                # Usar diretamente o valor anual de AUC Objetivo
-                if "AUC Objetivo" in base_auc.columns:
-                    auc_meta_eoy = float(base_auc["AUC Objetivo"].max())
-                    # Para meta até hoje, usar proporção do ano
-                    dias_decorridos = (hoje - pd.Timestamp(ano_atual, 1, 1)).days + 1
-                    total_dias_ano = 366 if pd.Timestamp(ano_atual, 12, 31).dayofyear == 366 else 365
-                    auc_meta_hoje = (auc_meta_eoy * dias_decorridos) / total_dias_ano
-    except Exception:
-        pass
-
-    auc_atual = 0.0
-    if (mesref_pos is not None) and {"Data_Posicao", "Net_Em_M"} <= set(df_pos.columns):
-        mask_mesrec = df_pos["Data_Posicao"].dt.to_period("M") == mesref_pos
-        auc_atual = float(df_pos.loc[mask_mesrec, "Net_Em_M"].sum())
-
-    return {
-        "capliq_mes": {
-            "valor": capliq_mes_atual,
-            "max": obj_capliq_mes_max,
-            "pace_target": (obj_capliq_mes_max * pace_mes)
-            if (pace_mes is not None and obj_capliq_mes_max is not None)
-            else None,
-            "mesref": str(mesref_pos) if mesref_pos is not None else "-",
-        },
-        "capliq_ano": {
-            "valor": capliq_ano_atual,
-            "max": cap_meta_eoy,
-            "pace_target": cap_meta_hoje,
-            "ano": ano_atual,
-        },
-        "auc": {
-            "valor": auc_atual,
-            "max": auc_meta_eoy,
-            "pace_target": auc_meta_hoje,
-            "mesref": str(mesref_pos) if mesref_pos is not None else "-",
-        },
-    }
-
-
-# ---------------------------------------------------------------------
-# Lógica auxiliar (NPS / RV)
-# ---------------------------------------------------------------------
-def _count_clientes_pos_netpos(df_pos: pd.DataFrame, periodM: pd.Period) -> int:
-    if df_pos.empty:
-        return 0
-    date_col = None
-    for cand in ["Data_Posicao", "Data_Atualizacao", "Data_Cadastro", "__data_pos__"]:
-        if cand in df_pos.columns:
-            date_col = cand
-            break
-    if not date_col:
-        return 0
-    aux = df_pos.copy()
-    aux["ym"] = pd.to_datetime(aux[date_col], errors="coerce").dt.to_period("M")
-    m = aux["ym"] == periodM
-    aux = aux.loc[m].copy()
-    return int(aux.loc[aux["Net_Em_M"].fillna(0) > 0, "Cliente"].astype(str).nunique())
-
-
-def _latest_common_period(df_pos: pd.DataFrame, df_auc: pd.DataFrame) -> Optional[pd.Period]:
-    """
-    Tenta encontrar a última competência comum.
-    Se não encontrar, retorna a última competência do AUC (fallback).
-    """
-    if df_auc.empty or "data_parsed" not in df_auc.columns:
-        return None
-
-    m_auc_periods = pd.to_datetime(df_auc["data_parsed"], errors="coerce").dt.to_period("M").dropna()
-    if m_auc_periods.empty:
-        return None
-
-    unique_auc = set(m_auc_periods.astype(str).unique())
-
-    if not df_pos.empty and "Data_Posicao" in df_pos.columns:
-        m_pos_periods = pd.to_datetime(df_pos["Data_Posicao"], errors="coerce").dt.to_period("M").dropna()
-        m_pos = set(m_pos_periods.astype(str).unique())
-
-        inter = sorted(unique_auc & m_pos)
-        if inter:
-            return pd.Period(inter[-1])
-
-    return m_auc_periods.max()
+obter_auc_inicial_ano = medir("obter_auc_inicial_ano")(kpis.obter_auc_inicial_ano)
 
 
 # ---------------------------------------------------------------------
 # Render Helpers
 # ---------------------------------------------------------------------
-def obter_auc_inicial_ano(df: pd.DataFrame, ano: int) -> float:
-    """
-    Retorna o AUC inicial de um determinado ano, usando a primeira Data_Posicao desse ano.
-    Soma o Net_Em_M dessa data.
-    """
-    if df is None or df.empty:
-        return 0.0
-    if 'Data_Posicao' not in df.columns or 'Net_Em_M' not in df.columns:
-        return 0.0
 
-    aux = df.copy()
-    aux['Data_Posicao'] = pd.to_datetime(aux['Data_Posicao'], errors='coerce')
-    aux = aux[aux['Data_Posicao'].dt.year == ano]
-    if aux.empty:
-        return 0.0
-
-    primeira_data = aux['Data_Posicao'].min()
-    auc_inicial = float(aux.loc[aux['Data_Posicao'] == primeira_data, 'Net_Em_M'].sum() or 0.0)
-    return auc_inicial
-
-
-# AUC base de janeiro/2025 para uso nas barras de progresso
-AUC_BASE_2025 = obter_auc_inicial_ano(df_positivador, 2025) if 'df_positivador' in globals() else 0.0
 
 
 def render_custom_progress_bars(
@@ -1913,111 +1327,11 @@ def render_custom_progress_bars(
     st.markdown(dedent(html_bars), unsafe_allow_html=True)
 
 
-def top3_mes_cap(
-    df: pd.DataFrame,
-    date_col: str = "Data_Posicao",
-    value_col: str = "Captacao_Liquida_em_M",
-    group_col: str = "assessor_code",
-) -> Tuple[List[Tuple[str, float]], str]:
-    """
-    Retorna Top 3 por 'group_col' no ÚLTIMO mês com valor != 0.
-    """
-    req = {date_col, value_col}
-    if date_col not in df.columns:
-        return [], "-"
-
-    if group_col not in df.columns:
-        if "assessor" in df.columns:
-            group_col = "assessor"
-        else:
-            return [], "-"
-
-    req.add(group_col)
-
-    if not req <= set(df.columns):
-        return [], "-"
-
-    dfx = df[list(req)].copy()
-    dfx[date_col] = pd.to_datetime(dfx[date_col], errors="coerce")
-    dfx[value_col] = pd.to_numeric(dfx[value_col], errors="coerce").fillna(0)
-
-    dfx[group_col] = dfx[group_col].astype(str).str.strip()
-    gnorm = dfx[group_col].str.upper()
-
-    invalid = gnorm.isin(["", "NONE", "NENHUM", "NA", "N/A", "NULL", "-", "NAN"])
-    dfx = dfx[~invalid]
-
-    dfx = dfx[dfx[value_col] != 0]
-
-    if dfx.empty:
-        return [], "-"
-
-    per_valid = dfx[date_col].dt.to_period("M").dropna()
-    if per_valid.empty:
-        return [], "-"
-
-    mesref = per_valid.max()
-    dmes = dfx[dfx[date_col].dt.to_period("M") == mesref]
-    if dmes.empty:
-        return [], str(mesref)
-
-    serie = dmes.groupby(group_col)[value_col].sum().sort_values(ascending=False)
-
-    return list(serie.items())[:5], str(mesref)
-
-
-def top3_ano_cap(
-    df: pd.DataFrame,
-    date_col: str = "Data_Posicao",
-    value_col: str = "Captacao_Liquida_em_M",
-    group_col: str = "assessor_code",
-) -> Tuple[List[Tuple[str, float]], str]:
-    """
-    Retorna Top 3 por 'group_col' no ÚLTIMO ano com valor != 0.
-    """
-    req = {date_col, value_col}
-    if date_col not in df.columns:
-        return [], "-"
-
-    if group_col not in df.columns:
-        if "assessor" in df.columns:
-            group_col = "assessor"
-        else:
-            return [], "-"
-
-    req.add(group_col)
-    if not req <= set(df.columns):
-        return [], "-"
-
-    dfx = df[list(req)].copy()
-    dfx[date_col] = pd.to_datetime(dfx[date_col], errors="coerce")
-    dfx[value_col] = pd.to_numeric(dfx[value_col], errors="coerce").fillna(0)
-
-    dfx[group_col] = dfx[group_col].astype(str).str.strip()
-    gnorm = dfx[group_col].str.upper()
-    invalid = gnorm.isin(["", "NONE", "NENHUM", "NA", "N/A", "NULL", "-", "NAN"])
-    dfx = dfx[~invalid]
-
-    dfx = dfx[dfx[value_col] != 0]
+# Rankings sobre o agregado por (mês, assessor) do handle do Positivador
+ranking_assessores = medir("ranking_assessores")(kpis.ranking_assessores)
 
-    if dfx.empty:
-        return [], "-"
 
-    anos = dfx[date_col].dt.year.dropna().astype(int).unique()
-    if len(anos) == 0:
-        return [], "-"
-
-    ano = int(sorted(anos)[-1])
-    dane = dfx[dfx[date_col].dt.year == ano]
-    if dane.empty:
-        return [], str(ano)
-
-    serie = dane.groupby(group_col)[value_col].sum().sort_values(ascending=False)
-
-    return list(serie.items())[:5], str(ano)
-
-
-def _render_top3_horizontal(items: List[Tuple[str, float]], header_text: str) -> None:
+def _render_top3_horizontal(items: List[kpis.ItemRanking], header_text: str) -> None:
     """
     Renderiza bloco Top 3 em formato VERTICAL (3 linhas),
     com medalhas e nomes dos assessores empilhados.
@@ -2031,9 +1345,8 @@ def _render_top3_horizontal(items: List[Tuple[str, float]], header_text: str) ->
 
     top3 = items[:3]
     nomes_curto = []
-    for ass, _ in top3:
-        full = obter_nome_assessor(ass) if ass else "-"
-        nomes_curto.append(_primeiro_nome_sobrenome(full))
+    for item in top3:
+        nomes_curto.append(_primeiro_nome_sobrenome(item.nome or "-"))
 
     css = """
     <style>
@@ -2122,91 +1435,19 @@ def _render_top3_horizontal(items: List[Tuple[str, float]], header_text: str) ->
     st.markdown(html, unsafe_allow_html=True)
 
 
+@medir()
 def _filtrar_por_pesquisa(df_nps: pd.DataFrame, token_exato: str) -> pd.DataFrame:
-    if df_nps.empty:
-        return pd.DataFrame()
-    if "pesquisa_relacionamento" not in df_nps.columns and "pesquisa_relacionamento_norm" not in df_nps.columns:
+    if (
+        not df_nps.empty
+        and "pesquisa_relacionamento" not in df_nps.columns
+        and "pesquisa_relacionamento_norm" not in df_nps.columns
+    ):
         st.warning("Coluna 'Pesquisa Relacionamento' não encontrada no NPS.")
-        return pd.DataFrame()
-
-    token_norm = _strip_accents(token_exato).upper().strip()
-    col_norm = "pesquisa_relacionamento_norm"
-    if col_norm not in df_nps.columns and "pesquisa_relacionamento" in df_nps.columns:
-        df_nps[col_norm] = _norm_upper_noaccents_series(df_nps["pesquisa_relacionamento"])
-
-    return df_nps[df_nps[col_norm] == token_norm].copy()
-
-
-def _calcular_metricas_nps(df_sub: pd.DataFrame) -> Dict[str, float]:
-    total = int(df_sub.shape[0]) if not df_sub.empty else 0
-    if total == 0:
-        return {
-            "total": 0,
-            "respondidos": 0,
-            "aderencia": 0.0,
-            "media": 0.0,
-            "nps": 0.0,
-            "promotores": 0,
-            "neutros": 0,
-            "detratores": 0,
-        }
-
-    s = pd.to_numeric(df_sub.get("nota"), errors="coerce")
-    valid = s.between(0, 10, inclusive="both")
-    den = int(valid.sum())
-
-    prom = int(((s >= 9) & (s <= 10) & valid).sum())
-    detr = int(((s >= 0) & (s <= 6) & valid).sum())
-    neut = int(((s >= 7) & (s <= 8) & valid).sum())
-
-    aderencia = (den / total) * 100.0 if total > 0 else 0.0
-    media = float(s[valid].mean()) if den > 0 else 0.0
-    nps = 100.0 * (prom / den - detr / den) if den > 0 else 0.0
-
-    return {
-        "total": total,
-        "respondidos": den,
-        "aderencia": aderencia,
-        "media": media,
-        "nps": nps,
-        "promotores": prom,
-        "neutros": neut,
-        "detratores": detr,
-    }
+    return kpis.filtrar_por_pesquisa(df_nps, token_exato)
 
 
-def _top3_assessores_por_aderencia(df_sub: pd.DataFrame) -> pd.DataFrame:
-    # Check for required columns (handle different possible column names)
-    assessor_col = next((col for col in ["codigo_assessor", "assessor_code", "assessor"] if col in df_sub.columns), None)
-    nota_col = next((col for col in ["nota", "rating", "score"] if col in df_sub.columns), None)
-    
-    if df_sub.empty or not assessor_col or not nota_col:
-        return pd.DataFrame(columns=["ASSESSOR", "ADERENCIA", "RESPOSTAS"])
-
-    df = df_sub.copy()
-    s_nota = pd.to_numeric(df[nota_col], errors="coerce")
-    df["_valid"] = s_nota.between(0, 10, inclusive="both")
-    total_validos = float(df["_valid"].sum())
-
-    agg = (
-        df[df["_valid"]]
-        .groupby(assessor_col)
-        .agg(total_respostas=(nota_col, "size"), respondidos=("_valid", "sum"))
-        .reset_index()
-    )
-
-    agg["share"] = (agg["respondidos"] / total_validos * 100.0) if total_validos > 0 else 0.0
-    agg = agg.sort_values(["respondidos", "share"], ascending=[False, False]).head(3)
-
-    # Aqui mantemos ADERENCIA numérica (em %), sem formatar como string
-    out = agg[[assessor_col, "share", "respondidos"]].rename(
-        columns={
-            assessor_col: "ASSESSOR",
-            "respondidos": "RESPOSTAS",
-            "share": "ADERENCIA",
-        }
-    )
-    return out[["ASSESSOR", "ADERENCIA", "RESPOSTAS"]]
+_calcular_metricas_nps = medir("_calcular_metricas_nps")(kpis.calcular_metricas_nps)
+_top3_assessores_por_aderencia = medir("_top3_assessores_por_aderencia")(kpis.top3_assessores_por_aderencia)
 
 
 def render_top3_assessores_aderencia_table(df_top: pd.DataFrame, header_text: str) -> None:
@@ -2257,22 +1498,7 @@ def render_top3_assessores_aderencia_table(df_top: pd.DataFrame, header_text: st
     st.markdown(table_html, unsafe_allow_html=True)
 
 
-def top3_assessores_por_pl(df_auc_snapshot: pd.DataFrame) -> List[Tuple[str, Tuple[float, int]]]:
-    if df_auc_snapshot is None or df_auc_snapshot.empty:
-        return []
-    if not {"assessor", "auc_reais", "cliente"} <= set(df_auc_snapshot.columns):
-        return []
-
-    d = df_auc_snapshot.copy()
-    d["assessor"] = d["assessor"].astype(str).str.strip()
-
-    grouped = (
-        d.groupby("assessor")
-        .agg({"auc_reais": "sum", "cliente": "nunique"})
-        .sort_values("auc_reais", ascending=False)
-        .head(3)
-    )
-    return [(idx, (row["auc_reais"], row["cliente"])) for idx, row in grouped.iterrows()]
+top3_assessores_por_pl = medir("top3_assessores_por_pl")(kpis.top3_assessores_por_pl)
 
 
 def render_ranking_table_pl(items: List[Tuple[str, Tuple[float, int]]], header_text: str) -> str:
@@ -2318,8 +1544,16 @@ def render_ranking_table_pl(items: List[Tuple[str, Tuple[float, int]]], header_t
 # ---------------------------------------------------------------------
 with st.spinner("Carregando dados..."):
     try:
-        df_pos = carregar_dados_positivador_mtd()
-        df_pos = tratar_dados_positivador_mtd(df_pos)
+        # Positivador: handle único por geração do .db (lido e tratado uma vez
+        # por processo); os frames são compartilhados e não devem ser alterados.
+        # Os cards só precisam do ano corrente: lido das partições mensais,
+        # não do histórico inteiro
+        dados_pos = obter_dados_positivador()
+        if dados_pos is None:
+            st.error("❌ Nenhum banco de Positivador encontrado (DBV ou MTD).")
+            df_pos = pd.DataFrame()
+        else:
+            df_pos = dados_pos.ano_corrente
         df_obj = carregar_dados_objetivos()
     except Exception as e:
         st.error(f"Erro ao carregar bases de Objetivos/Positivador: {e}")
@@ -2329,7 +1563,10 @@ if df_pos.empty or df_obj.empty:
     st.warning("Sem dados suficientes em Positivador ou Objetivos.")
     st.stop()
 
-df_pos_f = df_pos.copy()
+df_pos_f = df_pos
+
+# AUC base de janeiro/2025 para uso nas barras de progresso
+AUC_BASE_2025 = dados_pos.auc_inicial_ano(2025)
 
 # -----------------------------------------------------------------
 # NOVA REGRA DE DATA DE REFERÊNCIA:
@@ -2500,34 +1737,11 @@ with st.container():
 col_upper_left, _, col_upper_right = st.columns([20, 1, 10], gap="small")
 
 # Coluna esquerda superior (2/3): Gráfico de Crescimento AUC e Clientes Ativos
-with col_upper_left:
+with col_upper_left, etapa("render: gráfico crescimento AUC"):
     # Gráfico 1: Crescimento AUC e Clientes Ativos
-    if not df_positivador.empty:
-        # Preparar dados mensais
-        df_positivador['ano_mes'] = df_positivador['Data_Posicao'].dt.strftime('%Y-%m')
-        
-        # Calcular AUC mensal (Net_Em_M somado por mês)
-        df_auc_mensal = df_positivador.groupby('ano_mes')['Net_Em_M'].sum().reset_index()
-        
-        # Calcular quantidade de clientes com AUC > 0 por mês
-        df_clientes_positivo = (
-            df_positivador[df_positivador['Net_Em_M'] > 0]
-            .groupby('ano_mes')
-            .size()
-            .reset_index(name='clientes_positivo')
-        )
-        
-        # Juntar dados de AUC e Clientes Ativos
-        df_growth_auc = pd.merge(
-            df_auc_mensal,
-            df_clientes_positivo,
-            on='ano_mes',
-            how='outer'
-        ).fillna(0)
-        
-        # Converter para data e ordenar
-        df_growth_auc['data'] = pd.to_datetime(df_growth_auc['ano_mes'] + '-01')
-        df_growth_auc = df_growth_auc.sort_values('data')
+    # AUC mensal e clientes com AUC > 0 por mês (agregado uma vez por geração do banco)
+    df_growth_auc = dados_pos.mensal
+    if not df_growth_auc.empty:
         
         # --------- ESCALA DO EIXO EM MILHÕES (Y2) -----------
         min_auc = float(df_growth_auc['Net_Em_M'].min() or 0.0)
@@ -2652,7 +1866,7 @@ with col_upper_left:
         st.warning("Dados insuficientes para exibir o gráfico de Crescimento AUC e Clientes Ativos.")
 
 # Coluna direita superior (1/3): NPS
-with col_upper_right:
+with col_upper_right, etapa("render: card NPS"):
     if not dfx.empty:
         nps_color = "#ffffff"
 
@@ -2817,7 +2031,7 @@ c1, c2, c3, c4 = st.columns(4)
 col1, col2, col3, col4 = c1, c2, c3, c4
 
 # COLUNA 1: CAPTAÇÃO LÍQUIDA MÊS
-with col1:
+with col1, etapa("render: captação mês"):
     st.markdown(
         """
         <div class="metric-card-kpi">
@@ -2954,22 +2168,50 @@ with col1:
     """
     st.markdown(cards_mes_html, unsafe_allow_html=True)
 
+    # Transferências líquidas de clientes externos no mês de referência
+    # (fluxo mensal materializado pelo ETL; sem banco, o card não aparece)
+    try:
+        fluxo_transf = obter_fluxo_transferencias()
+    except Exception as e:
+        fluxo_transf = None
+        st.caption(f"Transferências indisponíveis: {e}")
+    if fluxo_transf is not None:
+        transf_mes = transferencias_do_mes(fluxo_transf, data_ref.strftime("%Y-%m"))
+        liquido_transf = transf_mes["pl_liquido"]
+        transf_style = "color: #e74c3c;" if liquido_transf < 0 else ""
+        transf_border = (
+            "border-left-color: #e74c3c !important;"
+            if liquido_transf < 0
+            else "border-left-color: var(--accent) !important;"
+        )
+        st.markdown(
+            f"""
+            <div class="metric-pill metric-pill-top"
+                 style="{transf_border} min-height: 40px; display:flex; flex-direction:column; justify-content:center; margin-top: 6px;">
+              <div class="label" style="font-size: 11px;">Transferências Líquidas (Mês)</div>
+              <div class="value" style="{transf_style} font-size: 0.9rem; font-weight: bold;">
+                {formatar_valor_curto(liquido_transf)}
+              </div>
+              <div class="label" style="font-size: 10px;">
+                {int(transf_mes["entradas"])} entradas ({formatar_valor_curto(transf_mes["pl_entrada"])})
+                · {int(transf_mes["saidas"])} saídas ({formatar_valor_curto(transf_mes["pl_saida"])})
+              </div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
     st.markdown("<div style='height: 0px;'></div>", unsafe_allow_html=True)
 
     # Top 3 de CAPTAÇÃO LÍQUIDA no MÊS (última competência disponível)
-    items_mes, _ = top3_mes_cap(
-        df_pos_f,
-        date_col="Data_Posicao",
-        value_col="Captacao_Liquida_em_M",
-        group_col="assessor_code",
-    )
+    items_mes, _ = ranking_assessores(dados_pos.mensal_assessor_corrente, "Captacao_Liquida_em_M", periodo="mes")
     _render_top3_horizontal(items_mes, header_text="TOP 3 - Captação Mês")
 
     st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 # COLUNA 2: CAPTAÇÃO LÍQUIDA ANO
-with col2:
+with col2, etapa("render: captação ano"):
     st.markdown(
         """
         <div class="metric-card-kpi">
@@ -3086,13 +2328,13 @@ with col2:
 
     st.markdown("<div style='height: 0px;'></div>", unsafe_allow_html=True)
 
-    items_ano_col, _ = top3_ano_cap(df_pos_f)
+    items_ano_col, _ = ranking_assessores(dados_pos.mensal_assessor_corrente, "Captacao_Liquida_em_M", periodo="ano")
     _render_top3_horizontal(items_ano_col, header_text="Top 3 — Captação Ano")
 
     st.markdown("</div>", unsafe_allow_html=True)
 
 # COLUNA 3: AUC - 2025
-with col3:
+with col3, etapa("render: AUC"):
     st.markdown(
         """
         <div class="metric-card-kpi">
@@ -3208,7 +2450,7 @@ with col3:
 
         st.markdown("<div style='height: 0px;'></div>", unsafe_allow_html=True)
 
-        items_auc, _ = top3_mes_cap(df_pos_f, value_col="Net_Em_M")
+        items_auc, _ = ranking_assessores(dados_pos.mensal_assessor_corrente, "Net_Em_M", periodo="mes")
         _render_top3_horizontal(items_auc, header_text="Top 3 — AUC")
 
     except Exception as e:
@@ -3217,7 +2459,7 @@ with col3:
     st.markdown("</div>", unsafe_allow_html=True)
 
 # COLUNA 4: Rumo a 1Bi
-with col4:
+with col4, etapa("render: rumo a 1BI"):
     st.markdown(
         """
         <div class="metric-card-kpi">
@@ -3244,6 +2486,11 @@ with col4:
 # Close the dashboard root div
 st.markdown("</div>", unsafe_allow_html=True)
 
+# Painel de desempenho (apenas usuário master, opt-in via ?perf=1)
+_resumo_perf = finalizar_execucao()
+if is_master_user() and painel_solicitado():
+    render_painel(_resumo_perf)
+
 # A data de atualização foi movida para o painel do gráfico de crescimento AUC x Clientes Ativos
 
 #1223
\ No newline at end of file
@@ -0,0 +1,158 @@
+# particoes_positivador.py
+# Positivador particionado por mês em Parquet, ao lado do .db:
+#
+#     DBV Capital_Positivador.particoes/
+#         _origem.json                      geração do .db que originou o export
+#         ano_mes=2025-01/parte-0.parquet
+#         ano_mes=2025-02/parte-0.parquet
+#         ...
+#
+# O conversor (converter_para_sqlite.py) exporta as partições depois de
+# gravar um banco com schema tipado; os loaders (dados_positivador.py) leem só
+# os meses pedidos (partition pruning pelo nome da pasta), então os cards do
+# mês/ano corrente leem 1-12 partições qualquer que seja o tamanho do
+# histórico.
+#
+# As partições só valem para a geração (mtime, tamanho) do .db gravada em
+# _origem.json: se o banco for regravado sem novo export, ler_meses() devolve
+# None e quem chama cai no SQLite (range scan em Data_Posicao).
+#
+# Uso (reexportar um banco já existente):
+#     python particoes_positivador.py ["DBV Capital_Positivador.db"]
+#
+# Não importa Streamlit. Requer pyarrow (já instalado com o Streamlit).
+
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from db_utils import db_generation
+
+ARQUIVO_ORIGEM = "_origem.json"
+COLUNA_PARTICAO = "ano_mes"
+# Linhas por leitura do SQLite ao exportar
+LINHAS_POR_LOTE = 200_000
+
+
+def diretorio_particoes(db_path: Path) -> Path:
+    """Pasta das partições de um banco: '<nome do .db sem extensão>.particoes'."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.particoes")
+
+
+def _tabela_e_schema(conn: sqlite3.Connection):
+    """Tabela do Positivador e schema Arrow a partir dos tipos declarados (REAL -> float64)."""
+    import pyarrow as pa
+
+    from dados_positivador import _schema_tipado, _tabela_positivador
+
+    table = _tabela_positivador(conn)
+    if table is None or not _schema_tipado(conn, table):
+        return None, None
+    campos = [
+        pa.field(r[1], pa.float64() if (r[2] or "").upper() == "REAL" else pa.string())
+        for r in conn.execute(f'PRAGMA table_info("{table}");')
+    ]
+    campos.append(pa.field(COLUNA_PARTICAO, pa.string()))
+    return table, pa.schema(campos)
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def exportar_particoes(db_path: Path) -> Optional[Path]:
+    """
+    Regrava as partições mensais do banco (schema tipado). Escreve numa pasta
+    temporária e troca pela atual no fim: leitores nunca veem um export pela
+    metade. Devolve a pasta, ou None se o banco não tiver schema tipado.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    db_path = Path(db_path)
+    destino = diretorio_particoes(db_path)
+    tmp = destino.with_name(destino.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    with sqlite3.connect(str(db_path)) as conn:
+        table, schema = _tabela_e_schema(conn)
+        if table is None:
+            return None
+        lotes = pd.read_sql_query(f'SELECT * FROM "{table}";', conn, chunksize=LINHAS_POR_LOTE)
+        for n, lote in enumerate(lotes):
+            lote[COLUNA_PARTICAO] = lote["Data_Posicao"].str.slice(0, 7)
+            ds.write_dataset(
+                pa.Table.from_pandas(lote, schema=schema, preserve_index=False),
+                tmp,
+                format="parquet",
+                partitioning=ds.partitioning(pa.schema([schema.field(COLUNA_PARTICAO)]), flavor="hive"),
+                basename_template=f"parte-{n}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+    tmp.mkdir(exist_ok=True)  # tabela vazia: pasta só com a origem
+    origem = {"db": db_path.name, "geracao": list(db_generation(db_path))}
+    (tmp / ARQUIVO_ORIGEM).write_text(json.dumps(origem), encoding="utf-8")
+
+    antigo = destino.with_name(destino.name + ".antigo")
+    shutil.rmtree(antigo, ignore_errors=True)
+    if destino.exists():
+        destino.rename(antigo)
+    tmp.rename(destino)
+    shutil.rmtree(antigo, ignore_errors=True)
+    return destino
+
+
+# =============================================================================
+# LEITURA
+# =============================================================================
+
+def particoes_atuais(db_path: Path) -> bool:
+    """True se existe export de partições para a geração atual do banco."""
+    try:
+        origem = json.loads((diretorio_particoes(db_path) / ARQUIVO_ORIGEM).read_text(encoding="utf-8"))
+        return tuple(origem["geracao"]) == db_generation(db_path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def ler_meses(db_path: Path, meses: Iterable[str]) -> Optional[pd.DataFrame]:
+    """
+    Linhas dos meses pedidos (AAAA-MM), lendo só as pastas desses meses.
+    Mesmas colunas e tipos da tabela no SQLite (sem a coluna de partição).
+    None se não houver partições da geração atual.
+    """
+    if not particoes_atuais(db_path):
+        return None
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # Arquivos iniciados por '_' (a origem) são ignorados pela descoberta.
+    # Partição com schema explícito: o filtro vale mesmo sem nenhum arquivo.
+    particao = ds.partitioning(pa.schema([pa.field(COLUNA_PARTICAO, pa.string())]), flavor="hive")
+    dataset = ds.dataset(diretorio_particoes(db_path), format="parquet", partitioning=particao)
+    if not dataset.files:
+        # Tabela vazia no export: sem parquet para dar o schema, vem do SQLite
+        with sqlite3.connect(str(db_path)) as conn:
+            _, schema = _tabela_e_schema(conn)
+        if schema is None:
+            return None
+        return schema.empty_table().drop_columns([COLUNA_PARTICAO]).to_pandas()
+    filtro = ds.field(COLUNA_PARTICAO).isin(sorted(set(meses)))
+    tabela = dataset.to_table(filter=filtro)
+    return tabela.drop_columns([COLUNA_PARTICAO]).to_pandas()
+
+
+if __name__ == "__main__":
+    from dados_positivador import localizar_db_positivador
+
+    alvo = Path(sys.argv[1]) if len(sys.argv) > 1 else localizar_db_positivador()
+    if alvo is None or not Path(alvo).exists():
+        sys.exit("Banco do Positivador não encontrado.")
+    pasta = exportar_particoes(alvo)
+    print(f"Partições gravadas em: {pasta}" if pasta else "Banco sem schema tipado: nada exportado.")
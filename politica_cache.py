@@ -0,0 +1,254 @@
+# politica_cache.py
+# Política central de cache dos loaders (substitui o @st.cache_data sem
+# limites das páginas).
+#
+# O st.cache_data sem ttl/max_entries guarda para sempre cada combinação de
+# argumentos (caminho de banco, etc.): em semanas de servidor ligado o RSS só
+# cresce. Aqui todos os loaders dividem UM orçamento de memória:
+#   - o tamanho de cada valor é medido ao entrar (DataFrames com
+#     memory_usage(deep=True));
+#   - passando do orçamento, saem as entradas usadas há mais tempo (LRU),
+#     de qualquer loader;
+#   - cada loader tem seu TTL (o banco é regravado pelo ETL sem mudar os
+#     argumentos do loader);
+#   - estatísticas por loader (hits, misses, expirações, despejos, esperas,
+#     bytes) aparecem no painel de desempenho (?perf=1);
+#   - um cálculo por chave de cada vez (como o st.cache_data): sessões (ou a
+#     thread de aquecimento) que erram a mesma chave ao mesmo tempo esperam o
+#     primeiro cálculo em vez de rodar o loader de novo;
+#   - argumentos sem hash são erro (TypeError): uma chave por repr() poderia
+#     juntar entradas diferentes (repr truncado de DataFrame ou lista longa);
+#   - como no st.cache_data, argumentos nomeados que começam com "_" ficam
+#     fora da chave (ex.: o conteúdo de um upload, já identificado pelo
+#     sha256): não são guardados nem contados no orçamento.
+#
+# Uso (junto com instrumentacao.medir_cache):
+#     @medir_cache(politica.cache("nps", ttl_s=15 * 60))
+#     def carregar_dados_nps() -> pd.DataFrame: ...
+#
+# Variável de ambiente:
+#     DBV_CACHE_MB   orçamento total em MB (padrão 256)
+#
+# Os handles por geração do .db (dados_positivador, dados_objetivos,
+# db_utils) continuam em lru_cache: já são limitados a 2-4 gerações.
+#
+# Não importa Streamlit: vale por processo (worker), para todas as sessões.
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+import pandas as pd
+
+from instrumentacao import worker_id
+
+ORCAMENTO_ENV_VAR = "DBV_CACHE_MB"
+ORCAMENTO_PADRAO_MB = 256
+
+
+def tamanho_bytes(valor: Any) -> int:
+    """Tamanho aproximado em memória de um valor cacheado."""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(tamanho_bytes(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_bytes(v) for v in valor.values())
+    return sys.getsizeof(valor)
+
+
+def _copy_on_write() -> bool:
+    """Copy-on-write ativo: padrão no pandas 3; no 2.x só se ligado na opção."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return bool(pd.get_option("mode.copy_on_write"))
+    except (KeyError, pd.errors.OptionError):
+        return False  # pandas 1.x: não existe
+
+
+def _entregar(valor: Any) -> Any:
+    """
+    Como o st.cache_data (que devolve cópias), quem chama pode alterar o
+    DataFrame sem estragar o cache. Com copy-on-write basta a cópia rasa (só
+    copia dados se alguém escrever); sem ele (pandas 1.x/2.x no padrão), um
+    .loc[...] = ou fillna(inplace=True) numa cópia rasa alteraria a entrada
+    do cache, então a cópia é profunda.
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy(deep=not _copy_on_write())
+    return valor
+
+
+@dataclass
+class _Entrada:
+    valor: Any
+    bytes: int
+    expira_em: float
+
+
+@dataclass
+class _Calculo:
+    """Trava de uma chave em cálculo e quantas threads a usam."""
+
+    trava: threading.Lock = field(default_factory=threading.Lock)
+    usuarios: int = 0
+
+
+@dataclass
+class EstatisticasLoader:
+    hits: int = 0
+    misses: int = 0
+    expiracoes: int = 0
+    despejos: int = 0
+    esperas: int = 0  # misses servidos pelo cálculo de outra thread
+    entradas: int = 0
+    bytes: int = 0
+    ttl_s: Optional[float] = None
+
+
+@dataclass
+class PoliticaCache:
+    """Cache LRU com orçamento de bytes global e TTL por loader."""
+
+    orcamento_bytes: int
+    _entradas: "OrderedDict[tuple, _Entrada]" = field(default_factory=OrderedDict)
+    _stats: Dict[str, EstatisticasLoader] = field(default_factory=dict)
+    _calculos: Dict[tuple, _Calculo] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    bytes_em_uso: int = 0
+
+    # ---------------------------------------------------------------- interno
+    def _remover(self, chave: tuple) -> None:
+        entrada = self._entradas.pop(chave)
+        self.bytes_em_uso -= entrada.bytes
+        est = self._stats[chave[0]]
+        est.entradas -= 1
+        est.bytes -= entrada.bytes
+
+    def _obter(self, chave: tuple, contar: bool = True) -> tuple[bool, Any]:
+        """contar=False: releitura depois de esperar o cálculo (já contou o miss)."""
+        with self._lock:
+            est = self._stats[chave[0]]
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada.expira_em <= time.monotonic():
+                self._remover(chave)
+                est.expiracoes += contar
+                entrada = None
+            if entrada is None:
+                est.misses += contar
+                return False, None
+            self._entradas.move_to_end(chave)
+            if contar:
+                est.hits += 1
+            else:
+                est.esperas += 1
+            return True, entrada.valor
+
+    @contextmanager
+    def _calculando(self, chave: tuple) -> Iterator[None]:
+        """Um cálculo por chave de cada vez; a trava some com o último usuário."""
+        with self._lock:
+            calculo = self._calculos.setdefault(chave, _Calculo())
+            calculo.usuarios += 1
+        try:
+            with calculo.trava:
+                yield
+        finally:
+            with self._lock:
+                calculo.usuarios -= 1
+                if not calculo.usuarios:
+                    del self._calculos[chave]
+
+    def _guardar(self, chave: tuple, valor: Any, ttl_s: Optional[float]) -> None:
+        tamanho = tamanho_bytes(valor)
+        if tamanho > self.orcamento_bytes:
+            return  # não cabe nem sozinho: devolve sem cachear
+        expira = time.monotonic() + ttl_s if ttl_s is not None else float("inf")
+        with self._lock:
+            if chave in self._entradas:
+                self._remover(chave)
+            while self._entradas and self.bytes_em_uso + tamanho > self.orcamento_bytes:
+                antiga = next(iter(self._entradas))
+                self._remover(antiga)
+                self._stats[antiga[0]].despejos += 1
+            self._entradas[chave] = _Entrada(valor, tamanho, expira)
+            self.bytes_em_uso += tamanho
+            est = self._stats[chave[0]]
+            est.entradas += 1
+            est.bytes += tamanho
+
+    # ------------------------------------------------------------------- API
+    def cache(self, nome: str, ttl_s: Optional[float] = None) -> Callable:
+        """
+        Decorator de loader. `nome` identifica o loader nas estatísticas;
+        `ttl_s=None` mantém até ser despejado pelo orçamento.
+        """
+        def decorator(func: Callable) -> Callable:
+            with self._lock:
+                self._stats.setdefault(nome, EstatisticasLoader(ttl_s=ttl_s))
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                chave = (nome, _chave_argumentos(nome, args, kwargs))
+                achou, valor = self._obter(chave)
+                if not achou:
+                    with self._calculando(chave):
+                        # Outra thread pode ter calculado enquanto esta esperava
+                        achou, valor = self._obter(chave, contar=False)
+                        if not achou:
+                            valor = func(*args, **kwargs)
+                            self._guardar(chave, valor, ttl_s)
+                return _entregar(valor)
+
+            wrapper.clear = lambda: self.limpar(nome)
+            return wrapper
+
+        return decorator
+
+    def limpar(self, nome: Optional[str] = None) -> None:
+        """Esvazia o cache de um loader (ou de todos)."""
+        with self._lock:
+            for chave in [c for c in self._entradas if nome is None or c[0] == nome]:
+                self._remover(chave)
+
+    def estatisticas(self) -> pd.DataFrame:
+        """Uma linha por loader, mais o total/orçamento em attrs."""
+        with self._lock:
+            linhas = [{"loader": nome, **vars(est)} for nome, est in self._stats.items()]
+            df = pd.DataFrame(linhas, columns=["loader", *EstatisticasLoader.__dataclass_fields__])
+            df.attrs.update(
+                bytes_em_uso=self.bytes_em_uso,
+                orcamento_bytes=self.orcamento_bytes,
+                worker=worker_id(),
+            )
+        return df
+
+
+def _chave_argumentos(nome: str, args: tuple, kwargs: dict) -> Hashable:
+    chave = (args, tuple(sorted((k, v) for k, v in kwargs.items() if not k.startswith("_"))))
+    try:
+        hash(chave)
+    except TypeError as erro:
+        raise TypeError(f"Cache {nome!r}: argumentos precisam ter hash ({erro})") from erro
+    return chave
+
+
+def _orcamento_do_ambiente() -> int:
+    try:
+        mb = float(os.environ.get(ORCAMENTO_ENV_VAR, ORCAMENTO_PADRAO_MB))
+    except ValueError:
+        mb = ORCAMENTO_PADRAO_MB
+    return int(mb * 1024 * 1024)
+
+
+# Instância única do processo, usada pelas páginas
+politica = PoliticaCache(orcamento_bytes=_orcamento_do_ambiente())
@@ -0,0 +1,5 @@
+# Testes rodam a partir da raiz do repositório (módulos dados_*, kpis, ...).
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
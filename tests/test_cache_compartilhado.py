@@ -0,0 +1,79 @@
+# cache_compartilhado: troca de geração apaga o .arrow e a trava antigos,
+# contadores exatos entre threads e trava apagada enquanto alguém espera.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import cache_compartilhado as cc
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def pasta(tmp_path, monkeypatch):
+    monkeypatch.setenv(cc.CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def banco(tmp_path):
+    db = tmp_path / "DBV Capital_Teste.db"
+    db.write_bytes(b"x")
+    return db
+
+
+def arquivos(pasta):
+    return sorted(p.name for p in pasta.iterdir() if not p.name.endswith(".tmp"))
+
+
+def test_nova_geracao_apaga_arrow_e_trava_antigos(pasta, banco):
+    df = pd.DataFrame({"a": [1, 2]})
+    cc.carregar_compartilhado(banco, "tabela", lambda: df, geracao=(1, 10))
+    cc.carregar_compartilhado(banco, "tabela-mensal", lambda: df, geracao=(1, 10))
+    cc.carregar_compartilhado(banco, "tabela", lambda: df, geracao=(2, 20))
+
+    prefixo = cc._prefixo(banco, "tabela")
+    mensal = cc._prefixo(banco, "tabela-mensal")
+    assert arquivos(pasta) == sorted([
+        f"{prefixo}-2-20.arrow", f"{prefixo}-2-20.lock",
+        f"{mensal}-1-10.arrow", f"{mensal}-1-10.lock",   # outro nome com o mesmo começo fica
+    ])
+
+    assert cc.limpar(banco) == 2
+    assert arquivos(pasta) == []
+
+
+def test_contadores_entre_threads(pasta, banco):
+    df = pd.DataFrame({"a": range(10)})
+    cc.carregar_compartilhado(banco, "t", lambda: df, geracao=(1, 1))
+    antes = dict(cc.estatisticas)
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cc.carregar_compartilhado(banco, "t", lambda: df, geracao=(1, 1)), range(400)))
+    assert cc.estatisticas["aberturas"] - antes["aberturas"] == 400
+    assert cc.estatisticas["publicacoes"] == antes["publicacoes"]
+
+
+@pytest.mark.skipif(cc.fcntl is None, reason="sem flock")
+def test_trava_apagada_durante_a_espera(tmp_path, monkeypatch):
+    caminho = tmp_path / "x.lock"
+    flock = cc.fcntl.flock
+    chamadas = []
+
+    class FcntlApagando:
+        LOCK_EX, LOCK_UN = cc.fcntl.LOCK_EX, cc.fcntl.LOCK_UN
+
+        @staticmethod
+        def flock(fd, op):
+            # Na primeira espera, outro processo troca de geração e apaga a trava
+            if op == cc.fcntl.LOCK_EX and not chamadas:
+                caminho.unlink()
+            chamadas.append(op)
+            flock(fd, op)
+
+    monkeypatch.setattr(cc, "fcntl", FcntlApagando)
+    with cc._TravaArquivo(caminho) as trava:
+        assert chamadas.count(cc.fcntl.LOCK_EX) == 2
+        assert os.fstat(trava._fd).st_ino == os.stat(caminho).st_ino
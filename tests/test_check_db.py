@@ -0,0 +1,63 @@
+# check_db --stats: distintos exatos em colunas indexadas e estimativa da
+# amostra sem o viés de sqrt(N*n) do GEE em colunas de ids.
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+import check_db
+
+N = 50_000
+
+
+@pytest.fixture(scope="module")
+def banco(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("check_db") / "t.db"
+    rng = np.random.default_rng(0)
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, u TEXT, idx TEXT, ids TEXT, cat TEXT, zipf TEXT)")
+        conn.execute("CREATE UNIQUE INDEX t_u ON t(u)")
+        conn.execute("CREATE INDEX t_idx ON t(idx, cat)")
+        conn.executemany(
+            "INSERT INTO t (u, idx, ids, cat, zipf) VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"u{i}", f"c{i % 777}", f"id{i}", f"cat{i % 12}", f"z{z}")
+                for i, z in enumerate(rng.zipf(1.5, N) % 10_000)
+            ),
+        )
+    return str(caminho), conn_distintos(caminho)
+
+
+def conn_distintos(caminho) -> dict:
+    with sqlite3.connect(caminho) as conn:
+        return {
+            c: conn.execute(f'SELECT COUNT(DISTINCT "{c}") FROM t;').fetchone()[0]
+            for c in ("id", "u", "idx", "ids", "cat", "zipf")
+        }
+
+
+def test_colunas_indexadas_sao_exatas(banco):
+    caminho, reais = banco
+    colunas = {c["nome"]: c for c in check_db.table_stats(caminho, "t", sample_size=1_000)["colunas"]}
+    for nome in ("id", "u", "idx"):
+        assert colunas[nome]["distintos_exato"]
+        assert colunas[nome]["distintos"] == reais[nome]
+    assert not colunas["ids"]["distintos_exato"]
+
+
+def test_estimativa_da_amostra(banco):
+    caminho, reais = banco
+    colunas = {c["nome"]: c for c in check_db.table_stats(caminho, "t", sample_size=5_000)["colunas"]}
+    assert colunas["ids"]["distintos"] == reais["ids"]
+    assert colunas["cat"]["distintos"] == reais["cat"]
+    assert reais["zipf"] / 2 <= colunas["zipf"]["distintos"] <= reais["zipf"] * 2
+
+
+@pytest.mark.parametrize("freqs, esperado", [
+    ({1: 100}, 10_000),        # amostra toda de únicos: N
+    ({50: 20}, 20),            # poucas categorias, todas repetidas: d
+    ({}, 0),
+])
+def test_estimador(freqs, esperado):
+    assert check_db._estimate_distinct(10_000, freqs) == esperado
@@ -0,0 +1,57 @@
+# utils.load_data_rapido: mesmo arquivo (caminho ou upload) lido uma vez pelo
+# sha256, sem os bytes do upload dentro do cache.
+
+import pandas as pd
+
+import utils
+from politica_cache import politica
+
+CSV = (
+    "Status,Código do Cliente,PL,Taxa contratada,Data Contratação\n"
+    "Ativo ,1,\"1,000.50\",0.01,05/03/2025\n"
+    "Ativo,2,Não encontrado,Não encontrado,06/03/2025 10:30\n"
+    "Pendente,3,200,0.02,\n"
+).encode("utf-8")
+
+
+class Upload:
+    """Imita o st.file_uploader (só getvalue)."""
+
+    def __init__(self, conteudo: bytes):
+        self.conteudo = conteudo
+
+    def getvalue(self) -> bytes:
+        return self.conteudo
+
+
+def test_tipagem():
+    df = utils.load_data_rapido(CSV)
+    assert df["Status"].tolist() == ["Ativo", "Ativo", "Pendente"]
+    assert df["PL"].tolist() == [1000.5, 0.0, 200.0]
+    assert df[utils.COLUNA_DATA].tolist()[:2] == [pd.Timestamp(2025, 3, 5), pd.Timestamp(2025, 3, 6, 10, 30)]
+    assert pd.isna(df[utils.COLUNA_DATA].iloc[2])
+
+    sem_zero = utils.load_data_rapido(CSV, invalidos_como_zero=False)
+    assert sem_zero["Taxa contratada"].isna().tolist() == [False, True, False]
+
+
+def test_cache_pelo_sha256_sem_os_bytes(tmp_path):
+    politica.limpar("csv tipado")
+    caminho = tmp_path / "feebased.csv"
+    caminho.write_bytes(CSV)
+
+    chamadas = []
+    original = utils.ler_csv_tipado
+    utils.ler_csv_tipado = lambda *a: chamadas.append(a) or original(*a)
+    try:
+        a = utils.load_data_rapido(Upload(CSV))
+        b = utils.load_data_rapido(Upload(bytes(CSV)))
+        c = utils.load_data_rapido(str(caminho))
+    finally:
+        utils.ler_csv_tipado = original
+    assert len(chamadas) == 1
+    pd.testing.assert_frame_equal(a, b)
+    pd.testing.assert_frame_equal(a, c)
+
+    chaves = [c for c in politica._entradas if c[0] == "csv tipado"]
+    assert chaves == [("csv tipado", ((utils.arquivo_csv(CSV).sha256, True), ()))]
@@ -0,0 +1,107 @@
+# kpis.curva_rumo_1bi / CurvaMeta contra o projetado de antes em
+# render_rumo_a_1bi (pace_target proporcional em 2025 e _interp_linear
+# entre as metas de 31/12 depois).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import METAS_RUMO_1BI_PADRAO, CurvaMeta, curva_rumo_1bi, projetado_vs_realizado
+from kpis.objetivos import meta_objetivo
+
+
+def objetivos(metas: dict) -> pd.DataFrame:
+    return pd.DataFrame({"Objetivo": list(metas), "AUC Objetivo": list(metas.values())})
+
+
+def projetado_referencia(df_obj: pd.DataFrame, data: pd.Timestamp) -> float:
+    """Projetado de render_rumo_a_1bi antes da CurvaMeta, condensado."""
+    final = meta_objetivo(df_obj, 2027, "auc_objetivo_ano", 1_000_000_000.0)
+    m25 = meta_objetivo(df_obj, 2025, "auc_objetivo_ano", 600_000_000.0)
+    m26 = meta_objetivo(df_obj, 2026, "auc_objetivo_ano", 800_000_000.0)
+    m27 = final
+    m25 = max(0.0, min(m25, m26, m27))
+    m26 = max(m25, min(m26, m27))
+    m27 = max(m26, m27)
+    d0, d1, d2, d3 = (pd.Timestamp(2025, 1, 1), pd.Timestamp(2025, 12, 31),
+                      pd.Timestamp(2026, 12, 31), pd.Timestamp(2027, 12, 31))
+
+    def interp(di, df, vi, vf):
+        return float(vi + (vf - vi) * ((data - di).days / (df - di).days))
+
+    if data < d0:
+        return 0.0
+    if data <= d1:
+        # pace_target de calcular_indicadores_objetivos: meta anual do banco * dias / 365
+        meta_banco = float(df_obj.loc[df_obj["Objetivo"] == 2025, "AUC Objetivo"].max())
+        return meta_banco * ((data - d0).days + 1) / 365
+    if data <= d2:
+        return interp(d1, d2, m25, m26)
+    if data <= d3:
+        return interp(d2, d3, m26, m27)
+    return float(m27)
+
+
+# Dia sim, dois não, mais as viradas de ano
+DATAS = pd.date_range("2024-11-01", "2028-02-29", freq="3D").union(
+    pd.DatetimeIndex([f"{a}-{md}" for a in range(2024, 2029) for md in ("01-01", "12-31")])
+)
+
+
+@pytest.mark.parametrize("metas", [
+    {2025: 600e6, 2026: 800e6, 2027: 1e9},
+    {2025: 650e6, 2026: 820e6, 2027: 1.2e9},
+    {2025: 600e6, 2026: 700e6, 2027: 9e8},      # 2026 e 2027 abaixo do padrão: valem os padrões
+    {2025: 700e6, 2026: 900e6},                 # 2027 ausente: padrão de 1BI
+])
+def test_equivale_ao_projetado_anterior(metas):
+    df_obj = objetivos(metas)
+    curva = curva_rumo_1bi(df_obj)
+    novo = curva.projetado(DATAS)
+    esperado = np.array([projetado_referencia(df_obj, d) for d in DATAS])
+    np.testing.assert_allclose(novo, esperado, rtol=1e-12, atol=1e-3)
+
+
+@pytest.mark.parametrize("metas, esperado", [
+    ({}, [0.0, 600e6, 800e6, 1e9]),
+    ({2025: 9e8, 2026: 8.5e8, 2027: 1e9}, [0.0, 8.5e8, 8.5e8, 1e9]),     # crescente
+    ({2025: 7e8, 2026: 9e8, 2027: 6e8}, [0.0, 7e8, 9e8, 1e9]),           # 2027 no padrão
+    ({2025: 1.3e9, 2026: 1.1e9, 2027: 1.2e9}, [0.0, 1.1e9, 1.1e9, 1.2e9]),  # teto no final
+])
+def test_marcos(metas, esperado):
+    curva = curva_rumo_1bi(objetivos(metas) if metas else None)
+    assert list(curva.marcos.strftime("%Y-%m-%d")) == ["2024-12-31", "2025-12-31", "2026-12-31", "2027-12-31"]
+    np.testing.assert_array_equal(curva.valores, esperado)
+    assert curva.objetivo_final == esperado[-1]
+    assert np.all(np.diff(curva.valores) >= 0)
+
+
+def test_metas_padrao_e_coluna():
+    df = pd.DataFrame({"Objetivo": [2030], "Cap. Liq Objetivo": [50.0]})
+    curva = curva_rumo_1bi(df, metas_padrao={2029: 10.0, 2030: 40.0}, coluna="cap_objetivo_ano")
+    assert list(curva.valores) == [0.0, 10.0, 50.0]
+    assert curva.data_final == pd.Timestamp(2030, 12, 31)
+    assert METAS_RUMO_1BI_PADRAO[2027] == 1e9
+
+
+@pytest.mark.parametrize("data, esperado", [
+    ("2019-06-01", 0.0),
+    ("2020-01-01", 0.0),
+    ("2020-01-11", 10.0),
+    (pd.Timestamp("2020-01-21 15:30"), 20.0),   # hora não conta
+    ("2020-02-10", 40.0),
+    ("2021-01-01", 40.0),
+])
+def test_projetado_em(data, esperado):
+    curva = CurvaMeta(pd.DatetimeIndex(["2020-01-01", "2020-01-31", "2020-02-10"]), np.array([0.0, 30.0, 40.0]))
+    assert curva.projetado_em(data) == pytest.approx(esperado)
+
+
+def test_projetado_vs_realizado():
+    curva = CurvaMeta(pd.DatetimeIndex(["2020-01-01", "2020-01-11"]), np.array([0.0, 10.0]))
+    realizado = pd.Series([3.0, 12.0], index=["2020-01-06", "2020-01-20"])
+    out = projetado_vs_realizado(curva, realizado)
+    assert list(out.columns) == ["data", "realizado", "projetado", "diferenca"]
+    assert list(out["projetado"]) == [5.0, 10.0]
+    assert list(out["diferenca"]) == [-2.0, 2.0]
+    assert projetado_vs_realizado(curva, pd.Series(dtype="float64")).empty
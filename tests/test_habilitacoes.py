@@ -0,0 +1,133 @@
+# kpis.PainelHabilitacoes num quadro pequeno: fração do mês, soma vs. média
+# por tipo de métrica, funil, matriz por assessor e uso entre threads.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import PainelHabilitacoes
+from kpis.habilitacoes import fracao_do_mes
+
+HOJE = pd.Timestamp("2025-03-10")
+
+
+@pytest.mark.parametrize("mes, esperado", [
+    ("2025-02", 1.0),           # fechado
+    ("2025-03", 10 / 31),       # corrente
+    ("2025-04", 0.0),           # futuro
+    ("2024-12", 1.0),
+])
+def test_fracao_do_mes(mes, esperado):
+    assert fracao_do_mes(pd.PeriodIndex([mes], freq="M"), HOJE)[0] == pytest.approx(esperado)
+
+
+def test_fracao_no_ultimo_dia_e_ano_bissexto():
+    meses = pd.PeriodIndex(["2024-02"], freq="M")
+    assert fracao_do_mes(meses, pd.Timestamp("2024-02-29 18:00"))[0] == 1.0
+    assert fracao_do_mes(meses, pd.Timestamp("2024-02-15"))[0] == pytest.approx(15 / 29)
+
+
+@pytest.fixture
+def painel():
+    return PainelHabilitacoes(pd.DataFrame({
+        "ano_mes": ["2025-02-01", "2025-02-01", "2025-03-01", "2025-03-01", "2025-03-01"],
+        "codigo_assessor": ["A1", "A2", "A1", "A2", " A3 "],
+        "comercial": ["Comercial", "Não Comercial", "Comercial", "Não Comercial", "Não Comercial"],
+        "lead_start": ["4", "6", 10, 20, None],
+        "meta_lead_start": [10, 10, 10, 10, 10],
+        "carteiras_simuladas_novos_clientes": [2, 3, 5, 5, 0],
+        "meta_carteiras_simuladas_novos_clientes": [5, 5, 5, 5, 5],
+        "habilitacoes_mais_300k": [1, 0, 2, 1, 0],
+        "meta_habilitacoes_mais_300k": [1, 1, 1, 1, 1],
+        "habilitacoes_menos_300k": [0, 1, 1, 0, 0],
+        "meta_habilitacoes_menos_300k": [1, 1, 1, 1, 1],
+        "conversao_mais_300k": [0.5, 0.7, 0.2, 0.6, 0.4],
+        "meta_conversao_mais_300k": [0.8, 0.8, 0.8, 0.8, 0.0],
+    }))
+
+
+def test_montagem(painel):
+    assert list(painel.assessores) == ["A1", "A2", "A3"]
+    assert list(painel.meses.astype(str)) == ["2025-02", "2025-03"]
+    assert list(painel.comercial) == [True, False, False]
+    assert len(painel) == 5 * 5
+
+
+def test_resumo_soma_contagens_e_media_taxas(painel):
+    resumo = painel.resumo_mes("2025-03", HOJE).set_index("metrica")
+    fracao = 10 / 31
+
+    lead = resumo.loc["lead_start"]
+    assert lead["realizado"] == 30  # NaN do A3 fica fora da soma
+    assert lead["meta"] == 30
+    assert lead["atingimento"] == pytest.approx(1.0)
+    assert lead["ritmo"] == pytest.approx(1.0 / fracao)
+
+    conversao = resumo.loc["conversao_mais_300k"]
+    assert conversao["tipo"] == "taxa"
+    assert conversao["realizado"] == pytest.approx(0.4)
+    assert conversao["meta"] == pytest.approx(1.6 / 3)
+    assert conversao["ritmo"] == pytest.approx(conversao["atingimento"])
+
+    fechado = painel.resumo_mes("2025-02", HOJE).set_index("metrica").loc["lead_start"]
+    assert fechado["ritmo"] == pytest.approx(fechado["atingimento"]) == pytest.approx(0.5)
+
+
+def test_resumo_filtros(painel):
+    comercial = painel.resumo_mes("2025-03", HOJE, apenas_comercial=True).set_index("metrica")
+    assert comercial.at["lead_start", "realizado"] == 10
+    so_a2 = painel.resumo_mes("2025-03", HOJE, assessores=["A2"]).set_index("metrica")
+    assert so_a2.at["lead_start", "realizado"] == 20
+    sem_mes = painel.resumo_mes("2030-01", HOJE)
+    assert sem_mes["realizado"].isna().all()
+
+
+def test_atingimento_e_ritmo_por_posicao(painel):
+    longo = painel.longo(HOJE).set_index(["ano_mes", "codigo_assessor", "metrica"])
+    a1 = longo.loc[(pd.Period("2025-03", "M"), "A1", "lead_start")]
+    assert a1["atingimento"] == pytest.approx(1.0)
+    assert a1["ritmo"] == pytest.approx(31 / 10)
+    # Meta zero: sem atingimento
+    assert np.isnan(longo.loc[(pd.Period("2025-03", "M"), "A3", "conversao_mais_300k"), "atingimento"])
+
+
+def test_funil(painel):
+    funil = painel.funil("2025-03", HOJE).set_index("etapa")
+    assert list(funil.index) == ["Lead Start", "Carteiras simuladas", "Habilitações"]
+    assert funil.at["Carteiras simuladas", "realizado"] == 10
+    assert funil.at["Habilitações", "realizado"] == 4  # +300k e -300k somadas
+    assert funil.at["Habilitações", "meta"] == 6
+    assert funil.at["Carteiras simuladas", "conversao_etapa"] == pytest.approx(10 / 30)
+    assert np.isnan(funil.at["Lead Start", "conversao_etapa"])
+
+
+def test_por_assessor(painel):
+    realizado = painel.por_assessor("2025-03", "realizado")
+    assert list(realizado.index) == ["A1", "A2", "A3"]
+    assert realizado.at["A2", "lead_start"] == 20
+    assert np.isnan(realizado.at["A3", "lead_start"])
+
+    ritmo = painel.por_assessor("2025-02", "ritmo", HOJE)
+    assert list(ritmo.index) == ["A1", "A2"]
+    assert ritmo.at["A1", "lead_start"] == pytest.approx(0.4)
+
+    with pytest.raises(ValueError):
+        painel.por_assessor("2025-03", "outro")
+
+
+def test_painel_vazio():
+    painel = PainelHabilitacoes(pd.DataFrame({"ano_mes": [], "codigo_assessor": []}))
+    assert painel.vazio
+    assert painel.resumo_mes("2025-03", HOJE).empty
+
+
+def test_atingimento_e_ritmo_entre_threads(painel):
+    # Sessões e aquecimento dividem o painel, cada uma com o seu "hoje"
+    dias = [pd.Timestamp("2025-03-10"), pd.Timestamp("2025-03-20")] * 200
+    esperado = {d: painel.atingimento_e_ritmo(d)[1].copy() for d in dias[:2]}
+    with ThreadPoolExecutor(8) as pool:
+        resultados = list(pool.map(lambda d: (d, painel.atingimento_e_ritmo(d)[1]), dias))
+    for dia, ritmo in resultados:
+        np.testing.assert_array_equal(ritmo, esperado[dia])
@@ -0,0 +1,65 @@
+# db_utils.localizar_db: com DBV_DATA_DIR definida, só procura nessa pasta
+# (bases sintéticas nunca caem no banco real da pasta atual).
+
+import pytest
+
+import dados_habilitacoes
+import dados_nps
+import dados_objetivos
+import dados_positivador
+import dados_receitas
+import dados_transferencias
+from db_utils import DATA_DIR_ENV_VAR, localizar_db
+
+LOCALIZADORES = [
+    dados_positivador.localizar_db_positivador,
+    dados_objetivos.localizar_db_objetivos,
+    dados_nps.localizar_db_nps,
+    dados_receitas.localizar_db_receitas,
+    dados_habilitacoes.localizar_db_habilitacoes,
+    dados_transferencias.localizar_db_transferencias,
+]
+
+
+@pytest.fixture
+def pastas(tmp_path, monkeypatch):
+    sintetica, atual = tmp_path / "sintetica", tmp_path / "atual"
+    sintetica.mkdir()
+    atual.mkdir()
+    monkeypatch.chdir(atual)
+    return sintetica, atual
+
+
+def test_override_sem_o_arquivo_nao_cai_na_pasta_atual(pastas, monkeypatch):
+    sintetica, atual = pastas
+    (atual / "banco.db").touch()
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(sintetica))
+    assert localizar_db("banco.db") is None
+
+    (sintetica / "banco.db").touch()
+    assert localizar_db("banco.db") == (sintetica / "banco.db").resolve()
+
+
+def test_sem_override_usa_a_pasta_atual(pastas, monkeypatch):
+    _, atual = pastas
+    monkeypatch.delenv(DATA_DIR_ENV_VAR, raising=False)
+    monkeypatch.setattr("db_utils.BASE_DIR", atual.parent)
+    (atual / "banco.db").touch()
+    assert localizar_db("outro.db", "banco.db") == (atual / "banco.db").resolve()
+
+
+def test_ordem_dos_nomes(pastas, monkeypatch):
+    sintetica, _ = pastas
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(sintetica))
+    (sintetica / "b.db").touch()
+    (sintetica / "a.db").touch()
+    assert localizar_db("a.db", "b.db").name == "a.db"
+
+
+@pytest.mark.parametrize("localizar", LOCALIZADORES, ids=lambda f: f.__name__)
+def test_modulos_respeitam_o_override(localizar, pastas, monkeypatch):
+    sintetica, _ = pastas
+    monkeypatch.setenv(DATA_DIR_ENV_VAR, str(sintetica))
+    # A pasta atual do processo real (raiz do repo) tem os bancos de produção
+    monkeypatch.chdir(dados_positivador.__file__.rsplit("/", 1)[0])
+    assert localizar() is None
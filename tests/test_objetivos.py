@@ -0,0 +1,96 @@
+# kpis.IndiceObjetivos: meta() com a mesma regra de meta_objetivo e
+# meta_ate() igual à meta proporcional de antes (meta anual * dias / dias do ano).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import IndiceObjetivos, calcular_indicadores_objetivos
+from kpis.objetivos import meta_objetivo
+
+OBJETIVOS = pd.DataFrame({
+    "Objetivo": [2024, 2025, 2025, 2026],
+    "AUC Objetivo": [400e6, 550e6, 650e6, 0.0],
+    "Cap. Liq Objetivo": [80e6, 120e6, 100e6, np.nan],
+})
+
+
+@pytest.fixture
+def indice():
+    return IndiceObjetivos(OBJETIVOS)
+
+
+@pytest.mark.parametrize("ano, coluna, fallback", [
+    (2025, "auc_objetivo_ano", 0.0),          # maior valor do ano
+    (2025, "AUC Objetivo", 600e6),            # fallback menor: vale o banco
+    (2025, "auc_objetivo_ano", 700e6),        # fallback maior: vale o fallback
+    (2025, "cap_objetivo_ano", 0.0),
+    (2024, "Cap. Liq Objetivo", 50e6),
+    (2026, "auc_objetivo_ano", 800e6),        # zero no banco: fallback
+    (2026, "cap_objetivo_ano", 5.0),          # NaN no banco: fallback
+    (2027, "auc_objetivo_ano", 1e9),          # ano ausente
+    (2025, "rec_objetivo_ano", 3.0),          # coluna ausente
+])
+def test_meta_igual_a_meta_objetivo(indice, ano, coluna, fallback):
+    assert indice.meta(ano, coluna, fallback) == meta_objetivo(OBJETIVOS, ano, coluna, fallback)
+
+
+def test_valor_e_anos(indice):
+    assert indice.anos == [2024, 2025, 2026]
+    assert indice.valor(2025, "auc_objetivo_ano") == indice.valor(2025, "AUC Objetivo") == 650e6
+    assert indice.valor(2026, "cap_objetivo_ano") is None
+    assert indice.valor(2030, "AUC Objetivo") is None
+
+
+def meta_proporcional(meta_eoy: float, hoje: pd.Timestamp) -> float:
+    """Meta até hoje de antes em calcular_indicadores_objetivos."""
+    dias_decorridos = (hoje - pd.Timestamp(hoje.year, 1, 1)).days + 1
+    total_dias_ano = 366 if pd.Timestamp(hoje.year, 12, 31).dayofyear == 366 else 365
+    return (meta_eoy * dias_decorridos) / total_dias_ano
+
+
+@pytest.mark.parametrize("coluna, ano", [
+    ("AUC Objetivo", 2024),     # bissexto
+    ("AUC Objetivo", 2025),
+    ("cap_objetivo_ano", 2025),
+])
+def test_meta_ate_igual_a_proporcional(indice, coluna, ano):
+    meta_eoy = indice.valor(ano, coluna)
+    for hoje in pd.date_range(f"{ano}-01-01", f"{ano}-12-31", freq="D"):
+        assert indice.meta_ate(coluna, hoje) == pytest.approx(meta_proporcional(meta_eoy, hoje), rel=1e-12)
+
+
+def test_curva_diaria(indice):
+    curva = indice.curva_diaria(2024, "auc_objetivo_ano")
+    assert len(curva) == 366 and curva[-1] == 400e6
+    assert indice.curva_diaria(2024, "AUC Objetivo") is curva
+    assert len(indice.curva_diaria(2030, "AUC Objetivo")) == 0
+    assert indice.meta_ate("AUC Objetivo", pd.Timestamp("2030-06-30")) == 0.0
+
+
+@pytest.mark.parametrize("df", [
+    None,
+    pd.DataFrame(),
+    pd.DataFrame({"AUC Objetivo": [1.0]}),
+])
+def test_indice_vazio(df):
+    indice = IndiceObjetivos(df)
+    assert indice.vazio
+    assert indice.meta(2025, "auc_objetivo_ano", 600e6) == 600e6
+
+
+@pytest.mark.parametrize("hoje", ["2025-01-01", "2025-03-15", "2025-12-31"])
+def test_pace_target_dos_indicadores(indice, hoje):
+    hoje = pd.Timestamp(hoje)
+    df_pos = pd.DataFrame({
+        "Data_Posicao": ["2025-02-28", "2025-03-31"],
+        "Captacao_Liquida_em_M": [1.0, 2.0],
+        "Net_Em_M": [10.0, 20.0],
+    })
+    mets = calcular_indicadores_objetivos(df_pos, OBJETIVOS, hoje, indice=indice)
+    assert mets["auc"]["max"] == 650e6
+    assert mets["auc"]["pace_target"] == pytest.approx(meta_proporcional(650e6, hoje))
+    assert mets["capliq_ano"]["max"] == 120e6
+    assert mets["capliq_ano"]["pace_target"] == pytest.approx(meta_proporcional(120e6, hoje))
+    # Sem índice, as metas saem da tabela passada em df_metas
+    assert calcular_indicadores_objetivos(df_pos, OBJETIVOS, hoje, df_metas=OBJETIVOS) == mets
@@ -0,0 +1,22 @@
+# Partições do Positivador: export de tabela vazia (pasta só com a origem).
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import converter_para_sqlite  # noqa: E402
+from particoes_positivador import exportar_particoes, ler_meses  # noqa: E402
+
+
+def test_ler_meses_sem_particoes(tmp_path):
+    db_path = tmp_path / "DBV Capital_Positivador.db"
+    with sqlite3.connect(db_path) as conn:
+        converter_para_sqlite.criar_tabela_positivador(conn)
+        colunas = [r[1] for r in conn.execute('PRAGMA table_info("positivador");')]
+    assert exportar_particoes(db_path) is not None
+
+    df = ler_meses(db_path, ["2025-12"])
+    assert df is not None and df.empty
+    assert list(df.columns) == colunas
@@ -0,0 +1,112 @@
+# kpis.SerieMensal e comparativos: somas por janela via soma acumulada contra
+# a soma direta dos meses.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import SerieMensal, comparativos_estoque, comparativos_fluxo, variacao_pct
+
+# Março/2024 sem dado (vale 0); dois lançamentos em maio/2024
+MENSAL = pd.DataFrame({
+    "data": ["2024-01-31", "2024-02-29", "2024-04-30", "2024-05-31", "2024-05-31",
+             "2024-12-31", "2025-01-31", "2025-02-28", "2025-03-31", "2025-04-30"],
+    "valor": [10.0, -4.0, 6.0, 1.0, 2.0, 8.0, 5.0, 3.0, -2.0, 7.0],
+})
+
+
+@pytest.fixture
+def serie():
+    return SerieMensal.de_frame(MENSAL, "valor")
+
+
+def soma_direta(inicio, fim):
+    meses = pd.to_datetime(MENSAL["data"]).dt.to_period("M")
+    return float(MENSAL.loc[(meses >= pd.Period(inicio, "M")) & (meses <= pd.Period(fim, "M")), "valor"].sum())
+
+
+def test_intervalo(serie):
+    assert (str(serie.inicio), str(serie.fim)) == ("2024-01", "2025-04")
+    assert serie.valor("2024-03") == 0.0
+    assert serie.valor("2024-05") == 3.0
+
+
+@pytest.mark.parametrize("inicio, fim", [
+    ("2024-01", "2025-04"),
+    ("2024-02", "2024-05"),
+    ("2023-06", "2024-02"),     # começa antes da série
+    ("2025-03", "2026-01"),     # termina depois
+    ("2023-01", "2023-12"),     # todo antes
+    ("2026-01", "2026-12"),     # todo depois
+    ("2024-06", "2024-05"),     # invertido
+])
+def test_soma(serie, inicio, fim):
+    assert serie.soma(inicio, fim) == pytest.approx(soma_direta(inicio, fim))
+
+
+@pytest.mark.parametrize("fim, meses, esperado", [
+    ("2025-04", 3, 8.0),
+    ("2025-04", 12, 24.0),
+    ("2024-02", 6, 6.0),
+])
+def test_ultimos(serie, fim, meses, esperado):
+    assert serie.ultimos(fim, meses) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize("mes, esperado", [
+    ("2024-05", 15.0),
+    (pd.Timestamp("2025-02-10"), 8.0),
+    (pd.Period("2025-04", "M"), 13.0),
+])
+def test_acumulado_ano(serie, mes, esperado):
+    assert serie.acumulado_ano(mes) == pytest.approx(esperado)
+
+
+def test_janelas_aleatorias_contra_soma_direta():
+    rng = np.random.default_rng(1)
+    meses = pd.period_range("2020-01", "2025-12", freq="M")
+    valores = pd.Series(rng.normal(size=len(meses)), index=meses)
+    amostra = valores.sample(frac=0.8, random_state=1)  # fora de ordem e com buracos
+    s = SerieMensal(amostra)
+    base = valores.where(valores.index.isin(amostra.index), 0.0)
+    for _ in range(200):
+        i, j = sorted(rng.integers(0, len(meses), 2))
+        assert s.soma(meses[i], meses[j]) == pytest.approx(float(base.iloc[i:j + 1].sum()))
+
+
+def test_serie_vazia():
+    s = SerieMensal.de_frame(pd.DataFrame(), "valor")
+    assert s.vazia
+    assert s.soma("2025-01", "2025-12") == 0.0
+    assert comparativos_fluxo(s, "2025-01")["mom_pct"] is None
+
+
+@pytest.mark.parametrize("atual, anterior, esperado", [
+    (110.0, 100.0, 10.0),
+    (-50.0, -100.0, 50.0),      # base negativa: sinal segue o movimento
+    (5.0, 0.0, None),
+    (None, 1.0, None),
+])
+def test_variacao_pct(atual, anterior, esperado):
+    assert variacao_pct(atual, anterior) == (esperado if esperado is None else pytest.approx(esperado))
+
+
+def test_comparativos_fluxo(serie):
+    c = comparativos_fluxo(serie, "2025-04")
+    assert c["mes"] == 7.0 and c["mes_anterior"] == -2.0
+    assert c["mom_pct"] == pytest.approx(450.0)
+    assert c["mesmo_mes_ano_anterior"] == 6.0
+    assert c["yoy_pct"] == pytest.approx(100 / 6)
+    assert c["acumulado_ano"] == 13.0 and c["acumulado_ano_anterior"] == 12.0
+    assert c["ritmo_vs_ano_anterior_pct"] == pytest.approx(100 / 12)
+    assert c["ultimos_3m"] == 8.0 and c["ultimos_3m_anterior"] == 13.0
+    assert c["ultimos_12m"] == pytest.approx(soma_direta("2024-05", "2025-04"))
+    assert c["ultimos_12m_anterior"] == pytest.approx(soma_direta("2023-05", "2024-04"))
+
+
+def test_comparativos_estoque(serie):
+    c = comparativos_estoque(serie, "2025-02")
+    assert c["dezembro_anterior"] == 8.0
+    assert c["variacao_ano_pct"] == pytest.approx(-62.5)
+    assert c["media_3m"] == pytest.approx(16.0 / 3)
+    assert c["media_12m"] == pytest.approx(soma_direta("2024-03", "2025-02") / 12)
@@ -0,0 +1,91 @@
+# politica_cache: um cálculo por chave (sessões simultâneas esperam o
+# primeiro) e argumentos sem hash recusados.
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from politica_cache import PoliticaCache
+
+
+def test_misses_simultaneos_calculam_uma_vez():
+    politica = PoliticaCache(orcamento_bytes=1 << 20)
+    chamadas = []
+
+    @politica.cache("lento")
+    def carregar(chave):
+        chamadas.append(chave)
+        time.sleep(0.2)
+        return pd.DataFrame({"x": [chave]})
+
+    barreira = threading.Barrier(8)
+    resultados = []
+
+    def sessao():
+        barreira.wait()
+        resultados.append(carregar(1))
+
+    threads = [threading.Thread(target=sessao) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert chamadas == [1]
+    assert all(df["x"].tolist() == [1] for df in resultados)
+    est = politica.estatisticas().set_index("loader").loc["lento"]
+    assert est["misses"] + est["hits"] == 8
+    assert est["esperas"] == est["misses"] - 1
+    assert not politica._calculos
+
+
+def test_chaves_diferentes_nao_se_esperam():
+    politica = PoliticaCache(orcamento_bytes=1 << 20)
+    liberar = threading.Event()
+
+    @politica.cache("bloqueia")
+    def carregar(chave):
+        if chave == "a":
+            liberar.wait(5)
+        return chave
+
+    t = threading.Thread(target=carregar, args=("a",))
+    t.start()
+    inicio = time.perf_counter()
+    assert carregar("b") == "b"
+    assert time.perf_counter() - inicio < 1
+    liberar.set()
+    t.join()
+
+
+def test_erro_nao_e_cacheado_e_libera_a_chave():
+    politica = PoliticaCache(orcamento_bytes=1 << 20)
+    tentativas = []
+
+    @politica.cache("falha")
+    def carregar():
+        tentativas.append(1)
+        if len(tentativas) == 1:
+            raise OSError("banco ocupado")
+        return 42
+
+    with pytest.raises(OSError):
+        carregar()
+    assert carregar() == 42
+    assert carregar() == 42
+    assert len(tentativas) == 2
+    assert not politica._calculos
+
+
+def test_argumentos_sem_hash_sao_recusados():
+    politica = PoliticaCache(orcamento_bytes=1 << 20)
+
+    @politica.cache("lista")
+    def somar(valores):
+        return sum(valores)
+
+    with pytest.raises(TypeError, match="lista"):
+        somar([1, 2, 3])
+    assert somar((1, 2, 3)) == 6
@@ -0,0 +1,51 @@
+# 'Data Posição' (dd/mm/aaaa) lida igual nos metadados (SQL) e no frame
+# tratado: o último mês dos metadados é o último mês do tratado.
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import dados_positivador as dp
+from db_utils import db_generation
+from kpis import converter_data_posicao
+
+RAIZ = Path(__file__).resolve().parent.parent
+DB_EMBARCADO = RAIZ / "DBV Capital_Positivador.db"
+
+
+def _ultimo_mes_tratado(db_path: Path) -> str:
+    dados = dp.DadosPositivador(db_path, db_generation(db_path))
+    return dados.tratado["Data_Posicao"].max().strftime("%Y-%m")
+
+
+def test_converter_data_posicao_dia_primeiro():
+    serie = pd.Series(["08/12/2025", "2025-08-12", "", None])
+    datas = converter_data_posicao(serie)
+    assert datas.iloc[0] == pd.Timestamp("2025-12-08")
+    assert datas.iloc[1] == pd.Timestamp("2025-08-12")
+    assert datas.iloc[2:].isna().all()
+
+
+def test_metadados_e_tratado_no_mesmo_mes_export(tmp_path):
+    db_path = tmp_path / "DBV Capital_Positivador.db"
+    df = pd.DataFrame({
+        "Assessor": ["A23000", "A23000", "A23017"],
+        "Cliente": ["1", "2", "3"],
+        "Net Em M": [100.0, 200.0, 300.0],
+        "Captação Líquida em M": [1.0, 2.0, 3.0],
+        "Data Posição": ["08/11/2025", "08/12/2025", "08/12/2025"],
+    })
+    with sqlite3.connect(db_path) as conn:
+        df.to_sql("positivador", conn, index=False)
+
+    meta = dp._ler_metadados(db_path)
+    assert meta.meses == ("2025-11", "2025-12")
+    assert meta.meses[-1] == _ultimo_mes_tratado(db_path)
+
+
+@pytest.mark.skipif(not DB_EMBARCADO.exists(), reason="sem o banco do Positivador")
+def test_metadados_e_tratado_no_mesmo_mes_banco_embarcado():
+    meta = dp._ler_metadados(DB_EMBARCADO)
+    assert meta.meses[-1] == _ultimo_mes_tratado(DB_EMBARCADO)
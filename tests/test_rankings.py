@@ -0,0 +1,106 @@
+# kpis.rollup_mensal / ranking_assessores contra a versão anterior dos
+# top3_mes_cap / top3_ano_cap da página (varredura de df_pos a cada ranking).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import ItemRanking, ranking_assessores, rollup_mensal, top3_ano_cap, top3_mes_cap
+
+INVALIDOS = ["", "NONE", "NENHUM", "NA", "N/A", "NULL", "-", "NAN"]
+
+
+def top_referencia(df, periodo, value_col="Captacao_Liquida_em_M", n=5):
+    """top3_mes_cap/top3_ano_cap de antes do motor de ranking, condensados."""
+    dfx = df[["Data_Posicao", "assessor_code", value_col]].copy()
+    dfx["Data_Posicao"] = pd.to_datetime(dfx["Data_Posicao"], errors="coerce")
+    dfx[value_col] = pd.to_numeric(dfx[value_col], errors="coerce").fillna(0)
+    dfx["assessor_code"] = dfx["assessor_code"].astype(str).str.strip()
+    dfx = dfx[~dfx["assessor_code"].str.upper().isin(INVALIDOS)]
+    dfx = dfx[dfx[value_col] != 0]
+    if dfx.empty:
+        return [], "-"
+    if periodo == "mes":
+        chave = dfx["Data_Posicao"].dt.to_period("M")
+    else:
+        chave = dfx["Data_Posicao"].dt.year
+    ref = chave.dropna().max()
+    if pd.isna(ref):
+        return [], "-"
+    serie = dfx[chave == ref].groupby("assessor_code")[value_col].sum().sort_values(ascending=False)
+    return list(serie.items())[:n], str(int(ref) if periodo == "ano" else ref)
+
+
+def base_aleatoria(semente: int, linhas: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    codigos = np.array(["A92300", "A95715", " A87867 ", "A26892", "A71490", "A93081", "A23594", "", "-", "nan"])
+    datas = pd.date_range("2024-01-31", "2025-06-30", freq="ME")
+    valores = rng.normal(0, 3, linhas).round(4)
+    valores[rng.random(linhas) < 0.3] = 0.0
+    return pd.DataFrame({
+        "Data_Posicao": rng.choice(datas, linhas),
+        "assessor_code": rng.choice(codigos, linhas),
+        "Captacao_Liquida_em_M": valores,
+    })
+
+
+def como_pares(itens):
+    return [(cod, pytest.approx(valor)) for cod, valor in itens]
+
+
+@pytest.mark.parametrize("semente", range(8))
+@pytest.mark.parametrize("periodo, funcao", [("mes", top3_mes_cap), ("ano", top3_ano_cap)])
+def test_equivale_a_versao_anterior(semente, periodo, funcao):
+    df = base_aleatoria(semente)
+    esperado, rotulo = top_referencia(df, periodo)
+    itens, rotulo_novo = funcao(df)
+    assert rotulo_novo == rotulo
+    assert itens == como_pares(esperado)
+
+
+@pytest.mark.parametrize("linhas, periodo, esperado", [
+    # Último mês com valor != 0 é fevereiro, mesmo com março presente
+    ([("2025-01-31", "A1", 5.0), ("2025-02-28", "A1", -1.0), ("2025-03-31", "A1", 0.0)],
+     "mes", ([("A1", -1.0)], "2025-02")),
+    # Grupo só com zeros no mês de referência fica fora
+    ([("2025-02-28", "A1", 2.0), ("2025-02-28", "A2", 0.0), ("2025-02-28", "A3", -4.0)],
+     "mes", ([("A1", 2.0), ("A3", -4.0)], "2025-02")),
+    # Ano soma todos os meses do último ano ativo
+    ([("2024-12-31", "A1", 9.0), ("2025-01-31", "A1", 1.0), ("2025-05-31", "A1", 2.0), ("2025-05-31", "A2", 4.0)],
+     "ano", ([("A2", 4.0), ("A1", 3.0)], "2025")),
+    # Tokens inválidos e datas ruins não contam
+    ([("2025-01-31", "NULL", 7.0), ("xx", "A1", 8.0), ("2025-01-31", " A1 ", 1.0)],
+     "mes", ([("A1", 1.0)], "2025-01")),
+    ([("2025-01-31", "A1", 0.0)], "mes", ([], "-")),
+])
+def test_casos(linhas, periodo, esperado):
+    df = pd.DataFrame(linhas, columns=["Data_Posicao", "assessor_code", "Captacao_Liquida_em_M"])
+    funcao = top3_mes_cap if periodo == "mes" else top3_ano_cap
+    itens, rotulo = funcao(df)
+    assert (itens, rotulo) == esperado
+    assert top_referencia(df, periodo) == esperado
+
+
+def test_varias_metricas_num_rollup_so():
+    df = pd.DataFrame({
+        "Data_Posicao": ["2025-01-31", "2025-01-31", "2025-02-28", "2025-02-28"],
+        "assessor_code": ["A92300", "A95715", "A92300", "A95715"],
+        "Captacao_Liquida_em_M": [1.0, 2.0, 0.0, 0.0],
+        "Net_Em_M": [10.0, 20.0, 30.0, 5.0],
+    })
+    rollup = rollup_mensal(df, ["Captacao_Liquida_em_M", "Net_Em_M", "ausente"])
+    assert {"Captacao_Liquida_em_M__n", "Net_Em_M__n"} <= set(rollup.columns)
+    assert "ausente" not in rollup.columns
+
+    cap, rotulo_cap = ranking_assessores(rollup, "Captacao_Liquida_em_M")
+    auc, rotulo_auc = ranking_assessores(rollup, "Net_Em_M", n=1)
+    assert rotulo_cap == "2025-01" and rotulo_auc == "2025-02"
+    assert cap[0] == ItemRanking(posicao=1, codigo="A95715", nome="André Norat", valor=2.0)
+    assert auc == [ItemRanking(posicao=1, codigo="A92300", nome="Adil Amorim", valor=30.0)]
+
+
+def test_entradas_sem_dados_e_periodo_invalido():
+    assert ranking_assessores(pd.DataFrame(), "x") == ([], "-")
+    assert ranking_assessores(rollup_mensal(pd.DataFrame({"Data_Posicao": []}), ["x"]), "x") == ([], "-")
+    with pytest.raises(ValueError):
+        ranking_assessores(pd.DataFrame(), "x", periodo="semana")
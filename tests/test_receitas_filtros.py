@@ -0,0 +1,37 @@
+# Filtro de categoria da página de Receitas: a opção '(sem categoria)' vinda
+# de por_dimensao seleciona as linhas com categoria vazia ou NULL.
+
+import sqlite3
+
+import pandas as pd
+
+import converter_para_sqlite
+import dados_receitas
+from dados_receitas import FiltroReceitas, rotulo_vazio
+
+
+def _banco(pasta):
+    with sqlite3.connect(pasta / dados_receitas.ARQUIVO_RECEITAS) as conn:
+        converter_para_sqlite.criar_tabela_receitas(conn)
+        pd.DataFrame({
+            "linha_receita": ["Investimentos"] * 4,
+            "categoria": ["Fundos", "", None, "Renda Fixa"],
+            "mes_ano": ["2025-01"] * 4,
+            "receita_bruta_total": [10.0, 20.0, 30.0, 40.0],
+        }).to_sql(dados_receitas.TABELA_RECEITAS, conn, if_exists="append", index=False)
+
+
+def test_categoria_sem_rotulo(tmp_path, monkeypatch):
+    monkeypatch.setenv("DBV_DATA_DIR", str(tmp_path))
+    _banco(tmp_path)
+
+    opcoes = dados_receitas.por_dimensao(FiltroReceitas(), "categoria")["categoria"].tolist()
+    assert rotulo_vazio("categoria") in opcoes
+
+    vazias = dados_receitas.por_dimensao(
+        FiltroReceitas(categorias=(rotulo_vazio("categoria"),)), "categoria"
+    )
+    assert vazias["receita_bruta_total"].sum() == 50.0
+
+    misto = FiltroReceitas(categorias=("Fundos", rotulo_vazio("categoria")))
+    assert dados_receitas.por_dimensao(misto, "categoria")["receita_bruta_total"].sum() == 60.0
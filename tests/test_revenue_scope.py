@@ -0,0 +1,110 @@
+# db_utils.RevenueScope / scope_sql: predicado de cada tipo de escopo e a
+# posição dos parâmetros dele na query.
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from db_utils import FEE_BASED_LINHA, SCOPE_MARKER, RevenueScope, read_sql_scoped, scope_sql
+
+RECEITAS = "DBV Capital_Receitas.db"
+FEEBASED = "DBV Capital_FeeBased.db"
+
+
+@pytest.mark.parametrize("linhas, esperado", [
+    (None, RevenueScope(None)),
+    ([], RevenueScope(None)),
+    (["Seguros", "Câmbio", "Seguros"], RevenueScope(("Câmbio", "Seguros"))),
+])
+def test_from_permissions(linhas, esperado):
+    assert RevenueScope.from_permissions(linhas) == esperado
+
+
+@pytest.mark.parametrize("escopo, base, esperado", [
+    (RevenueScope(None), RECEITAS, ("1", ())),
+    (RevenueScope(None), "Outra.db", ("1", ())),
+    (RevenueScope(()), RECEITAS, ("0", ())),
+    (RevenueScope(("Câmbio", "Seguros")), RECEITAS, ("linha_receita IN (?, ?)", ("Câmbio", "Seguros"))),
+    (RevenueScope(("Seguros",)), FEEBASED, ("? IN (?)", (FEE_BASED_LINHA, "Seguros"))),
+])
+def test_predicado(escopo, base, esperado):
+    assert escopo.predicate(base) == esperado
+
+
+def test_base_sem_regra_com_escopo_restrito_e_erro():
+    with pytest.raises(ValueError, match="sem regra"):
+        RevenueScope(("Seguros",)).predicate("DBV Capital_NPS.db")
+
+
+def test_parametros_antes_e_depois_do_marcador():
+    sql, params = scope_sql(
+        f"SELECT * FROM dados WHERE mes_ano >= ? AND {SCOPE_MARKER} AND mes_ano <= ?",
+        RECEITAS, RevenueScope(("A", "B")), ("2025-01", "2025-06"),
+    )
+    assert sql == "SELECT * FROM dados WHERE mes_ano >= ? AND (linha_receita IN (?, ?)) AND mes_ano <= ?"
+    assert params == ("2025-01", "A", "B", "2025-06")
+
+
+def test_interrogacao_em_literal_e_comentario_nao_conta():
+    sql, params = scope_sql(
+        f"SELECT 'quem?' AS \"col?\" FROM dados -- filtro?\n"
+        f"WHERE produto <> 'a''?' AND /* ? */ mes_ano = ? AND {SCOPE_MARKER} AND categoria = ?",
+        RECEITAS, RevenueScope(("A",)), ("2025-01", "Fundos"),
+    )
+    assert params == ("2025-01", "A", "Fundos")
+    assert sql.endswith("AND (linha_receita IN (?)) AND categoria = ?")
+
+
+@pytest.mark.parametrize("query, params, erro", [
+    ("SELECT * FROM dados", (), "marcador"),
+    (f"SELECT * FROM dados WHERE {SCOPE_MARKER} OR {SCOPE_MARKER}", (), "marcador"),
+    (f"SELECT * FROM dados WHERE {SCOPE_MARKER} AND mes_ano = ?", (), "parâmetros"),
+    (f"SELECT * FROM dados WHERE {SCOPE_MARKER} AND mes_ano = :mes", ("2025-01",), "posicionais"),
+    (f"SELECT * FROM dados WHERE mes_ano = ?1 AND {SCOPE_MARKER}", ("2025-01",), "posicionais"),
+])
+def test_queries_invalidas(query, params, erro):
+    with pytest.raises(ValueError, match=erro):
+        scope_sql(query, RECEITAS, RevenueScope(("A",)), params)
+
+
+@pytest.fixture
+def bancos(tmp_path):
+    receitas = tmp_path / RECEITAS
+    with sqlite3.connect(receitas) as conn:
+        pd.DataFrame({
+            "linha_receita": ["Investimentos", "Seguros", "Câmbio", "Seguros"],
+            "mes_ano": ["2025-01", "2025-01", "2025-02", "2025-03"],
+            "valor": [1.0, 2.0, 3.0, 4.0],
+        }).to_sql("dados", conn, index=False)
+    feebased = tmp_path / FEEBASED
+    with sqlite3.connect(feebased) as conn:
+        pd.DataFrame({"codigo_cliente": ["1", "2"]}).to_sql("dados", conn, index=False)
+    return receitas, feebased
+
+
+@pytest.mark.parametrize("linhas, esperado", [
+    (None, 10.0),
+    ((), 0.0),
+    (("Seguros",), 6.0),
+    (("Seguros", "Câmbio"), 9.0),
+])
+def test_leitura_no_sqlite(bancos, linhas, esperado):
+    receitas, _ = bancos
+    df = read_sql_scoped(
+        f"SELECT TOTAL(valor) AS v FROM dados WHERE mes_ano >= ? AND {SCOPE_MARKER};",
+        receitas, RevenueScope(linhas), ("2025-01",),
+    )
+    assert df["v"].iloc[0] == esperado
+
+
+@pytest.mark.parametrize("linhas, esperado", [
+    (None, 2),
+    ((), 0),
+    (("Investimentos",), 0),
+    (("Investimentos", FEE_BASED_LINHA), 2),
+])
+def test_feebased_linha_inteira(bancos, linhas, esperado):
+    _, feebased = bancos
+    df = read_sql_scoped(f"SELECT * FROM dados WHERE {SCOPE_MARKER};", feebased, RevenueScope(linhas))
+    assert len(df) == esperado
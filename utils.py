@@ -1,6 +1,25 @@
+import hashlib
+import importlib.util
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import Any
+
 import pandas as pd
 import streamlit as st
-from datetime import datetime
+
+from politica_cache import politica
+
+# Nomes do export -> nomes usados pelo app
+COLUNAS_APP = {
+    'Data Contratação': 'Data de Contratação',
+    'Taxa Contratação': 'Taxa contratada',
+    'P/L': 'PL',
+    'Código Cliente': 'Código do Cliente',
+    'Nome Cliente': 'Nome do Cliente'
+}
 
 @st.cache_data
 def load_data(caminho_arquivo):
@@ -21,13 +40,7 @@ def load_data(caminho_arquivo):
         )
 
         # Renomeia as colunas para o padrão esperado pelo app, garantindo a compatibilidade.
-        df.rename(columns={
-            'Data Contratação': 'Data de Contratação',
-            'Taxa Contratação': 'Taxa contratada',
-            'P/L': 'PL',
-            'Código Cliente': 'Código do Cliente',
-            'Nome Cliente': 'Nome do Cliente'
-        }, inplace=True)
+        df.rename(columns=COLUNAS_APP, inplace=True)
 
         # Pré-processamento dos dados
         if 'Status' in df.columns:
@@ -59,3 +72,137 @@ def load_data(caminho_arquivo):
     except Exception as e:
         st.error(f"Ocorreu um erro inesperado ao carregar o arquivo: {e}")
         return pd.DataFrame()
+
+
+# =============================================================================
+# CARGA RÁPIDA (TIPADA)
+# =============================================================================
+#
+# load_data_rapido(fonte) devolve o mesmo layout de load_data, mas:
+#   - lê todas as colunas como texto (sem inferência de tipos), com o motor
+#     CSV do PyArrow quando instalado;
+#   - tipa só as colunas conhecidas: PL/Taxa com uma passada de regex
+#     (vírgula = milhar, como no read_csv de load_data) e a data pelos
+#     formatos do export (DD/MM/AAAA [HH:MM[:SS]]), deixando o parse misto
+#     (elemento a elemento) só para o que sobrar;
+#   - guarda o resultado no cache de loaders (politica_cache) pelo sha256 do
+#     conteúdo: o mesmo arquivo (ou upload) não é relido; arquivo alterado
+#     gera outra chave. Só o sha256 entra na chave: os bytes do upload ficam
+#     fora do cache (não ocupam memória nem contam no DBV_CACHE_MB). O hash
+#     de um caminho é recalculado só quando mtime/tamanho mudam.
+# Colunas fora de COLUNAS_APP/Status ficam como texto. O upload do
+# dashboard.py passa por aqui também (invalidos_como_zero=False).
+
+COLUNA_DATA = 'Data de Contratação'
+COLUNAS_NUMERICAS = ('PL', 'Taxa contratada')
+FORMATOS_DATA = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y')
+MOTOR_CSV = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+
+def limpar_numeros(serie: pd.Series, invalidos_como_zero: bool = True) -> pd.Series:
+    """
+    Texto -> float numa passada: remove tudo que não é dígito, '.' ou '-'
+    (R$, espaços, separador de milhar ','); inválidos e vazios viram 0 (como
+    em load_data) ou NaN com invalidos_como_zero=False.
+    """
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = serie.str.replace(r'[^\d.\-]', '', regex=True)
+    numeros = pd.to_numeric(serie, errors='coerce')
+    if invalidos_como_zero:
+        numeros = numeros.fillna(0)
+    return numeros.astype('float64')
+
+
+def _datas_por_formato(serie: pd.Series, formato: str) -> pd.Series:
+    if MOTOR_CSV == 'pyarrow':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        datas = pc.strptime(pa.array(serie, type=pa.string()), format=formato, unit='us', error_is_null=True)
+        return pd.Series(datas.to_numpy(zero_copy_only=False), index=serie.index, name=serie.name)
+    return pd.to_datetime(serie, format=formato, errors='coerce')
+
+
+def converter_datas(serie: pd.Series) -> pd.Series:
+    """
+    DD/MM/AAAA [HH:MM[:SS]] -> datetime com formato explícito (vetorizado,
+    kernel do PyArrow quando disponível); só os valores em outro formato
+    passam pelo parse misto (dayfirst).
+    """
+    datas = _datas_por_formato(serie, FORMATOS_DATA[0])
+    for formato in FORMATOS_DATA[1:]:
+        faltando = datas.isna() & serie.notna()
+        if not faltando.any():
+            return datas
+        datas = datas.fillna(_datas_por_formato(serie[faltando], formato))
+    faltando = datas.isna() & serie.notna() & serie.str.strip().ne('')
+    if faltando.any():
+        datas = datas.fillna(
+            pd.to_datetime(serie[faltando], format='mixed', dayfirst=True, errors='coerce')
+        )
+    return datas
+
+
+@dataclass(frozen=True)
+class ArquivoCSV:
+    """Fonte do CSV (caminho ou bytes) e o sha256 do conteúdo (chave do cache)."""
+
+    sha256: str
+    fonte: Any = field(compare=False, repr=False)
+
+
+@lru_cache(maxsize=64)
+def _sha256_por_versao(caminho: str, mtime_ns: int, tamanho: int) -> str:
+    with open(caminho, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def arquivo_csv(fonte: Any) -> ArquivoCSV:
+    """Caminho ou arquivo enviado (st.file_uploader / bytes) -> ArquivoCSV."""
+    if isinstance(fonte, (str, os.PathLike)):
+        st_ = os.stat(fonte)
+        return ArquivoCSV(_sha256_por_versao(os.fspath(fonte), st_.st_mtime_ns, st_.st_size), os.fspath(fonte))
+    conteudo = fonte if isinstance(fonte, bytes) else fonte.getvalue()
+    return ArquivoCSV(hashlib.sha256(conteudo).hexdigest(), conteudo)
+
+
+def ler_csv_tipado(fonte: Any, invalidos_como_zero: bool = True) -> pd.DataFrame:
+    """Lê e tipa o CSV (sem cache). `fonte`: caminho ou bytes."""
+    df = pd.read_csv(
+        BytesIO(fonte) if isinstance(fonte, bytes) else fonte,
+        encoding='utf-8',
+        sep=',',
+        dtype=str,
+        engine=MOTOR_CSV,
+    )
+    df.columns = [col.strip() for col in df.columns]
+    df = df.rename(columns=COLUNAS_APP)
+    if 'Status' in df.columns:
+        df['Status'] = df['Status'].str.strip()
+    if COLUNA_DATA in df.columns:
+        df[COLUNA_DATA] = converter_datas(df[COLUNA_DATA])
+    for col in COLUNAS_NUMERICAS:
+        if col in df.columns:
+            df[col] = limpar_numeros(df[col], invalidos_como_zero)
+    return df
+
+
+@politica.cache("csv tipado", ttl_s=30 * 60)
+def _csv_por_hash(sha256: str, invalidos_como_zero: bool, *, _fonte: Any) -> pd.DataFrame:
+    return ler_csv_tipado(_fonte, invalidos_como_zero)
+
+
+def load_data_rapido(fonte: Any, invalidos_como_zero: bool = True) -> pd.DataFrame:
+    """
+    Versão rápida de load_data (ver bloco acima): mesmo layout e mesmas
+    mensagens de erro, com cache pelo conteúdo do arquivo. `fonte`: caminho,
+    upload, bytes ou ArquivoCSV já calculado.
+    """
+    try:
+        arquivo = fonte if isinstance(fonte, ArquivoCSV) else arquivo_csv(fonte)
+        return _csv_por_hash(arquivo.sha256, invalidos_como_zero, _fonte=arquivo.fonte)
+    except FileNotFoundError:
+        st.error(f"Erro: O arquivo '{fonte}' não foi encontrado. Verifique se ele está na mesma pasta do aplicativo.")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"Ocorreu um erro inesperado ao carregar o arquivo: {e}")
+        return pd.DataFrame()